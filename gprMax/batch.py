@@ -0,0 +1,239 @@
+# Copyright (C) 2015-2018: The University of Edinburgh
+#                 Authors: Craig Warren and Antonis Giannopoulos
+#
+# This file is part of gprMax.
+#
+# gprMax is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gprMax is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gprMax.  If not, see <http://www.gnu.org/licenses/>.
+
+import copy
+
+import numpy as np
+import psutil
+
+from gprMax.constants import floattype
+from gprMax.materials import Material
+from gprMax.receivers import Rx
+
+# Largest number of models in a batch if it is chosen from the available
+# memory. The field updates of a batch stream the field arrays of each of its
+# models, and beyond a few models the cost of streaming more arrays at once
+# outweighs reading the material IDs and update coefficients once.
+maxbatchauto = 4
+
+
+def batch_size(nmodels, maxbatch, G):
+    """Gets the number of models to run in each batch, i.e. as many models
+        as the arrays of half of the available memory (RAM) can hold (up to
+        the largest number of models in a batch), and spread evenly over the
+        batches.
+
+    Args:
+        nmodels (int): Number of models to run.
+        maxbatch (int): Largest number of models in a batch (0 to use maxbatchauto).
+        G (class): Grid class instance - holds essential parameters describing the model.
+
+    Returns:
+        nbatch (int): Number of models in each batch.
+    """
+
+    nbatch = max(1, int(0.5 * psutil.virtual_memory().available // BatchModel.memory_usage(G)))
+    nbatch = min(nbatch, maxbatch or maxbatchauto)
+    nbatches = -(-nmodels // nbatch)
+
+    return -(-nmodels // nbatches)
+
+
+class Batch(object):
+    """
+    Batch of models with the same geometry (--geometry-fixed), e.g. the
+        traces of a B-scan, that are advanced together (see solve_cpu_batch).
+        The field arrays of the models are stacked in arrays with an extra
+        first dimension, so that the field updates read the material IDs and
+        update coefficients once for all the models. Everything else that
+        differs between the models (PML and dispersive arrays, sources,
+        receivers and snapshots) is held for each model (see BatchModel),
+        and set on the grid to update or output a model.
+    """
+
+    def __init__(self, nmodels, G):
+        """
+        Args:
+            nmodels (int): Number of models in the batch.
+            G (class): Grid class instance - holds essential parameters describing the model.
+        """
+
+        self.Ex, self.Ey, self.Ez, self.Hx, self.Hy, self.Hz = (np.zeros((nmodels, G.nx + 1, G.ny + 1, G.nz + 1), dtype=floattype) for field in range(6))
+        self.models = []
+
+        # Arrays and objects of the grid, to restore once the batch has been run
+        self.gridstate = BatchModel.get_state(G)
+
+    @property
+    def fields(self):
+        """Field arrays of the batch, i.e. Ex, Ey, Ez, Hx, Hy, Hz."""
+        return self.Ex, self.Ey, self.Ez, self.Hx, self.Hy, self.Hz
+
+    def add_model(self, modelrun, appendmodelnumber, G):
+        """Adds a model to the batch, with the sources and receivers at their
+            current positions on the grid.
+
+        Args:
+            modelrun (int): Model run number.
+            appendmodelnumber (str): Text to append to filenames of the model.
+            G (class): Grid class instance - holds essential parameters describing the model.
+
+        Returns:
+            model (class): BatchModel class instance.
+        """
+
+        model = BatchModel(len(self.models), modelrun, appendmodelnumber, self, G)
+        self.models.append(model)
+
+        return model
+
+    def restore(self, G):
+        """Restores the arrays and objects of the grid.
+
+        Args:
+            G (class): Grid class instance - holds essential parameters describing the model.
+        """
+
+        BatchModel.set_state(self.gridstate, G)
+
+
+class BatchModel(object):
+    """Arrays and objects of a model in a batch (see Batch)."""
+
+    def __init__(self, index, modelrun, appendmodelnumber, batch, G):
+        """
+        Args:
+            index (int): Index of the model in the batch.
+            modelrun (int): Model run number.
+            appendmodelnumber (str): Text to append to filenames of the model.
+            batch (class): Batch class instance.
+            G (class): Grid class instance - holds essential parameters describing the model.
+        """
+
+        self.modelrun = modelrun
+        self.appendmodelnumber = appendmodelnumber
+
+        fields = tuple(field[index] for field in batch.fields)
+        pmlfields = [tuple(np.zeros_like(phi) for phi in (pml.EPhi1, pml.EPhi2, pml.HPhi1, pml.HPhi2)) for pml in G.pmls]
+        if Material.maxpoles != 0:
+            dispersive = tuple(np.zeros_like(T) for T in (G.Tx, G.Ty, G.Tz))
+            if G.dispersiveedges is not None:
+                dispersive += ([np.zeros_like(E) for E in G.Edispersive],)
+        else:
+            dispersive = ()
+
+        # Sources and receivers that can be stepped (and transmission lines
+        # and receivers, which store values) are copied
+        sources = ([copy.copy(source) for source in G.hertziandipoles],
+                   [copy.copy(source) for source in G.magneticdipoles],
+                   G.voltagesources,
+                   [copy.deepcopy(tl) for tl in G.transmissionlines])
+        rxs = [copy.deepcopy(rx) for rx in G.rxs]
+        snapshots = [copy.copy(snap) for snap in G.snapshots]
+
+        self.state = (fields, pmlfields, dispersive, sources, rxs, snapshots)
+
+        # Arrays of receiver coordinates and to store field components for receivers
+        self.rxcoords = None
+        self.rxs = None
+
+        # PML slabs for updating all PML slabs in a single parallel region
+        self.pmlslabs = None
+
+        # Monitor of the decay of the fields, and number of iterations run
+        # (fewer than the number of iterations if the model is stopped early)
+        self.monitor = None
+        self.iterationsrun = G.iterations
+        self.running = True
+
+    @staticmethod
+    def get_state(G):
+        """Gets the arrays and objects of the grid that differ between the models of a batch.
+
+        Args:
+            G (class): Grid class instance - holds essential parameters describing the model.
+
+        Returns:
+            state (tuple): Arrays and objects of the grid.
+        """
+
+        fields = (G.Ex, G.Ey, G.Ez, G.Hx, G.Hy, G.Hz)
+        pmlfields = [(pml.EPhi1, pml.EPhi2, pml.HPhi1, pml.HPhi2) for pml in G.pmls]
+        if Material.maxpoles != 0:
+            dispersive = (G.Tx, G.Ty, G.Tz)
+            if G.dispersiveedges is not None:
+                dispersive += (G.Edispersive,)
+        else:
+            dispersive = ()
+        sources = (G.hertziandipoles, G.magneticdipoles, G.voltagesources, G.transmissionlines)
+
+        return (fields, pmlfields, dispersive, sources, G.rxs, G.snapshots)
+
+    @staticmethod
+    def set_state(state, G):
+        """Sets the arrays and objects of the grid that differ between the models of a batch.
+
+        Args:
+            state (tuple): Arrays and objects of the grid (see get_state).
+            G (class): Grid class instance - holds essential parameters describing the model.
+        """
+
+        fields, pmlfields, dispersive, sources, rxs, snapshots = state
+        G.Ex, G.Ey, G.Ez, G.Hx, G.Hy, G.Hz = fields
+        for pml, phi in zip(G.pmls, pmlfields):
+            pml.EPhi1, pml.EPhi2, pml.HPhi1, pml.HPhi2 = phi
+        if dispersive:
+            G.Tx, G.Ty, G.Tz = dispersive[:3]
+            if G.dispersiveedges is not None:
+                G.Edispersive = dispersive[3]
+        G.hertziandipoles, G.magneticdipoles, G.voltagesources, G.transmissionlines = sources
+        G.rxs = rxs
+        G.snapshots = snapshots
+
+    @staticmethod
+    def memory_usage(G):
+        """Estimates the amount of memory (RAM) required for each model of a batch.
+
+        Args:
+            G (class): Grid class instance - holds essential parameters describing the model.
+
+        Returns:
+            memestimate (int): Estimate of required memory in bytes
+        """
+
+        memestimate = 6 * (G.nx + 1) * (G.ny + 1) * (G.nz + 1) * np.dtype(floattype).itemsize
+        memestimate += sum(phi.nbytes for pml in G.pmls for phi in (pml.EPhi1, pml.EPhi2, pml.HPhi1, pml.HPhi2))
+        if Material.maxpoles != 0:
+            memestimate += sum(T.nbytes for T in (G.Tx, G.Ty, G.Tz))
+            if G.dispersiveedges is not None:
+                memestimate += sum(E.nbytes for E in G.Edispersive)
+        memestimate += len(Rx.allowableoutputs) * G.iterations * len(G.rxs) * np.dtype(floattype).itemsize
+        memestimate += sum(output.nbytes for rx in G.rxs for output in rx.outputs.values())
+        memestimate += sum(tl.voltage.nbytes + tl.current.nbytes + tl.Vtotal.nbytes + tl.Itotal.nbytes for tl in G.transmissionlines)
+
+        return memestimate
+
+    def activate(self, G):
+        """Sets the arrays and objects of the model on the grid, i.e. to update or output the model.
+
+        Args:
+            G (class): Grid class instance - holds essential parameters describing the model.
+        """
+
+        BatchModel.set_state(self.state, G)
+        G.iterationsrun = self.iterationsrun
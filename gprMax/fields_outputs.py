@@ -19,35 +19,109 @@
 from string import Template
 
 import h5py
+import numpy as np
 
 from gprMax._version import __version__
+from gprMax.grid import Ix
+from gprMax.grid import Iy
+from gprMax.grid import Iz
 
 
-def store_outputs(iteration, Ex, Ey, Ez, Hx, Hy, Hz, G):
+def store_outputs(iteration, Ex, Ey, Ez, Hx, Hy, Hz, rxcoords, rxs, G):
     """Stores field component values for every receiver and transmission line.
 
     Args:
         iteration (int): Current iteration number.
         Ex, Ey, Ez, Hx, Hy, Hz (memory view): Current electric and magnetic field values.
+        rxcoords (list): Indices and coordinates of receivers for each of the allowable outputs.
+        rxs (array): Array to store field components for receivers - rows are field components; columns are iterations; pages are receivers.
         G (class): Grid class instance - holds essential parameters describing the model.
     """
 
-    for rx in G.rxs:
-        for output in rx.outputs:
-            # Store electric or magnetic field components
-            if 'I' not in output:
-                field = locals()[output]
-                rx.outputs[output][iteration] = field[rx.xcoord, rx.ycoord, rx.zcoord]
-            # Store current component
-            else:
-                func = globals()[output]
-                rx.outputs[output][iteration] = func(rx.xcoord, rx.ycoord, rx.zcoord, Hx, Hy, Hz, G)
+    fields = (Ex, Ey, Ez, Hx, Hy, Hz)
+    for component, (rxindices, x, y, z) in enumerate(rxcoords):
+        if not rxindices.size:
+            continue
+        # Store electric or magnetic field components
+        if component < len(fields):
+            rxs[component, iteration, rxindices] = fields[component][x, y, z]
+        # Store current components
+        else:
+            func = (Ix, Iy, Iz)[component - len(fields)]
+            rxs[component, iteration, rxindices] = func(x, y, z, Hx, Hy, Hz, G)
 
     for tl in G.transmissionlines:
         tl.Vtotal[iteration] = tl.voltage[tl.antpos]
         tl.Itotal[iteration] = tl.current[tl.antpos]
 
 
+class FieldDecayMonitor(object):
+    """
+    Monitors the decay of the fields to stop a model before the end of its
+        time window (#time_window_decay). The energy of the fields is checked
+        every so many iterations, and the model is stopped once the waveforms
+        of all sources and the energy have decayed by the given number of
+        decibels, i.e. the waveforms relative to their peak amplitudes, and
+        the energy relative to the largest energy that has been checked. The
+        energy has to have decayed on two checks in a row.
+    """
+
+    def __init__(self, G):
+        """
+        Args:
+            G (class): Grid class instance - holds essential parameters describing the model.
+        """
+
+        self.interval = G.timewindowdecayinterval
+        self.threshold = 10**(-G.timewindowdecay / 10)
+
+        # Iteration after which the waveforms of all sources have decayed
+        amplitude = 10**(-G.timewindowdecay / 20)
+        waveforms = [src.waveformvaluesJ for src in G.voltagesources + G.hertziandipoles]
+        waveforms += [src.waveformvaluesM for src in G.magneticdipoles]
+        waveforms += [tl.Vinc for tl in G.transmissionlines]
+        self.sourcesdecayed = 0
+        for waveform in waveforms:
+            waveform = np.abs(waveform)
+            active = np.flatnonzero(waveform > amplitude * waveform.max())
+            if active.size:
+                self.sourcesdecayed = max(self.sourcesdecayed, active[-1] + 1)
+
+        self.peakenergy = 0
+        self.checksdecayed = 0
+
+    def due(self, iteration):
+        """Checks if the energy should be checked on an iteration.
+
+        Args:
+            iteration (int): Current iteration number (from zero).
+
+        Returns:
+            (bool): Whether the energy should be checked.
+        """
+
+        return iteration % self.interval == 0
+
+    def decayed(self, iteration, energy):
+        """Checks if the fields have decayed, i.e. if the model can be stopped.
+
+        Args:
+            iteration (int): Current iteration number (from zero).
+            energy (float): Energy of the fields on the iteration (see field_energy).
+
+        Returns:
+            (bool): Whether the fields have decayed.
+        """
+
+        self.peakenergy = max(self.peakenergy, energy)
+        if iteration >= self.sourcesdecayed and energy <= self.threshold * self.peakenergy:
+            self.checksdecayed += 1
+        else:
+            self.checksdecayed = 0
+
+        return self.checksdecayed >= 2
+
+
 kernel_template_store_outputs = Template("""
 
 // Macros for converting subscripts to linear index:
@@ -59,12 +133,13 @@ kernel_template_store_outputs = Template("""
 // Stores field component values for every receiver //
 //////////////////////////////////////////////////////
 
-__global__ void store_outputs(int NRX, int iteration, const int* __restrict__ rxcoords, $REAL *rxs, const $REAL* __restrict__ Ex, const $REAL* __restrict__ Ey, const $REAL* __restrict__ Ez, const $REAL* __restrict__ Hx, const $REAL* __restrict__ Hy, const $REAL* __restrict__ Hz) {
+__global__ void store_outputs(int NRX, int iteration, $REAL dx, $REAL dy, $REAL dz, const int* __restrict__ rxcoords, $REAL *rxs, const $REAL* __restrict__ Ex, const $REAL* __restrict__ Ey, const $REAL* __restrict__ Ez, const $REAL* __restrict__ Hx, const $REAL* __restrict__ Hy, const $REAL* __restrict__ Hz) {
 
     //  This function stores field component values for every receiver in the model.
     //
     //  Args:
     //      NRX: Total number of receivers in the model
+    //      dx, dy, dz: Spatial discretisations
     //      rxs: Array to store field components for receivers - rows are field components; columns are iterations; pages are receivers
     //      E, H: Access to field component arrays
 
@@ -83,6 +158,17 @@ __global__ void store_outputs(int NRX, int iteration, const int* __restrict__ rx
         rxs[INDEX3D_RXS(3,iteration,rx)] = Hx[INDEX3D_FIELDS(i,j,k)];
         rxs[INDEX3D_RXS(4,iteration,rx)] = Hy[INDEX3D_FIELDS(i,j,k)];
         rxs[INDEX3D_RXS(5,iteration,rx)] = Hz[INDEX3D_FIELDS(i,j,k)];
+
+        // Currents are zero on the lower boundaries of the grid
+        if (j != 0 && k != 0) {
+            rxs[INDEX3D_RXS(6,iteration,rx)] = dy * (Hy[INDEX3D_FIELDS(i,j,k-1)] - Hy[INDEX3D_FIELDS(i,j,k)]) + dz * (Hz[INDEX3D_FIELDS(i,j,k)] - Hz[INDEX3D_FIELDS(i,j-1,k)]);
+        }
+        if (i != 0 && k != 0) {
+            rxs[INDEX3D_RXS(7,iteration,rx)] = dx * (Hx[INDEX3D_FIELDS(i,j,k)] - Hx[INDEX3D_FIELDS(i,j,k-1)]) + dz * (Hz[INDEX3D_FIELDS(i-1,j,k)] - Hz[INDEX3D_FIELDS(i,j,k)]);
+        }
+        if (i != 0 && j != 0) {
+            rxs[INDEX3D_RXS(8,iteration,rx)] = dx * (Hx[INDEX3D_FIELDS(i,j-1,k)] - Hx[INDEX3D_FIELDS(i,j,k)]) + dy * (Hy[INDEX3D_FIELDS(i,j,k)] - Hy[INDEX3D_FIELDS(i-1,j,k)]);
+        }
     }
 }
 
@@ -101,7 +187,7 @@ def write_hdf5_outputfile(outputfile, Ex, Ey, Ez, Hx, Hy, Hz, G):
     f = h5py.File(outputfile, 'w')
     f.attrs['gprMax'] = __version__
     f.attrs['Title'] = G.title
-    f.attrs['Iterations'] = G.iterations
+    f.attrs['Iterations'] = G.iterationsrun
     f.attrs['nx, ny, nz'] = (G.nx, G.ny, G.nz)
     f.attrs['dx, dy, dz'] = (G.dx, G.dy, G.dz)
     f.attrs['dt'] = G.dt
@@ -126,11 +212,11 @@ def write_hdf5_outputfile(outputfile, Ex, Ey, Ez, Hx, Hy, Hz, G):
         grp.attrs['Resistance'] = tl.resistance
         grp.attrs['dl'] = tl.dl
         # Save incident voltage and current
-        grp['Vinc'] = tl.Vinc
-        grp['Iinc'] = tl.Iinc
+        grp['Vinc'] = tl.Vinc[:G.iterationsrun]
+        grp['Iinc'] = tl.Iinc[:G.iterationsrun]
         # Save total voltage and current
-        f['/tls/tl' + str(tlindex + 1) + '/Vtotal'] = tl.Vtotal
-        f['/tls/tl' + str(tlindex + 1) + '/Itotal'] = tl.Itotal
+        f['/tls/tl' + str(tlindex + 1) + '/Vtotal'] = tl.Vtotal[:G.iterationsrun]
+        f['/tls/tl' + str(tlindex + 1) + '/Itotal'] = tl.Itotal[:G.iterationsrun]
 
     # Create group, add positional data and write field component arrays for receivers
     for rxindex, rx in enumerate(G.rxs):
@@ -140,4 +226,4 @@ def write_hdf5_outputfile(outputfile, Ex, Ey, Ez, Hx, Hy, Hz, G):
         grp.attrs['Position'] = (rx.xcoord * G.dx, rx.ycoord * G.dy, rx.zcoord * G.dz)
 
         for output in rx.outputs:
-            f['/rxs/rx' + str(rxindex + 1) + '/' + output] = rx.outputs[output]
+            f['/rxs/rx' + str(rxindex + 1) + '/' + output] = rx.outputs[output][:G.iterationsrun]
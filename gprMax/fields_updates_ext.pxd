@@ -0,0 +1,41 @@
+# Copyright (C) 2015-2018: The University of Edinburgh
+#                 Authors: Craig Warren and Antonis Giannopoulos
+#
+# This file is part of gprMax.
+#
+# gprMax is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gprMax is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gprMax.  If not, see <http://www.gnu.org/licenses/>.
+
+import numpy as np
+cimport numpy as np
+
+from gprMax.constants cimport floattype_t
+from gprMax.constants cimport complextype_t
+from gprMax.constants cimport idtype_t
+
+# Electric and magnetic field updates, which can also be called without the GIL
+# (e.g. from the compiled solver)
+cpdef void update_electric(int nx, int ny, int nz, int nthreads, floattype_t[:, ::1] updatecoeffsE, idtype_t[:, :, :, ::1] ID, floattype_t[:, :, ::1] Ex, floattype_t[:, :, ::1] Ey, floattype_t[:, :, ::1] Ez, floattype_t[:, :, ::1] Hx, floattype_t[:, :, ::1] Hy, floattype_t[:, :, ::1] Hz) noexcept nogil
+cpdef void update_electric_dispersive_multipole_A(int nx, int ny, int nz, int nthreads, int maxpoles, floattype_t[:, ::1] updatecoeffsE, complextype_t[:, ::1] updatecoeffsdispersive, idtype_t[:, :, :, ::1] ID, complextype_t[:, :, :, ::1] Tx, complextype_t[:, :, :, ::1] Ty, complextype_t[:, :, :, ::1] Tz, floattype_t[:, :, ::1] Ex, floattype_t[:, :, ::1] Ey, floattype_t[:, :, ::1] Ez, floattype_t[:, :, ::1] Hx, floattype_t[:, :, ::1] Hy, floattype_t[:, :, ::1] Hz) noexcept nogil
+cpdef void update_electric_dispersive_multipole_B(int nx, int ny, int nz, int nthreads, int maxpoles, complextype_t[:, ::1] updatecoeffsdispersive, idtype_t[:, :, :, ::1] ID, complextype_t[:, :, :, ::1] Tx, complextype_t[:, :, :, ::1] Ty, complextype_t[:, :, :, ::1] Tz, floattype_t[:, :, ::1] Ex, floattype_t[:, :, ::1] Ey, floattype_t[:, :, ::1] Ez) noexcept nogil
+cpdef void update_electric_dispersive_1pole_A(int nx, int ny, int nz, int nthreads, floattype_t[:, ::1] updatecoeffsE, complextype_t[:, ::1] updatecoeffsdispersive, idtype_t[:, :, :, ::1] ID, complextype_t[:, :, :, ::1] Tx, complextype_t[:, :, :, ::1] Ty, complextype_t[:, :, :, ::1] Tz, floattype_t[:, :, ::1] Ex, floattype_t[:, :, ::1] Ey, floattype_t[:, :, ::1] Ez, floattype_t[:, :, ::1] Hx, floattype_t[:, :, ::1] Hy, floattype_t[:, :, ::1] Hz) noexcept nogil
+cpdef void update_electric_dispersive_1pole_B(int nx, int ny, int nz, int nthreads, complextype_t[:, ::1] updatecoeffsdispersive, idtype_t[:, :, :, ::1] ID, complextype_t[:, :, :, ::1] Tx, complextype_t[:, :, :, ::1] Ty, complextype_t[:, :, :, ::1] Tz, floattype_t[:, :, ::1] Ex, floattype_t[:, :, ::1] Ey, floattype_t[:, :, ::1] Ez) noexcept nogil
+cpdef void update_electric_dispersive_sparse_A(int nthreads, int maxpoles, floattype_t[:, ::1] updatecoeffsE, complextype_t[:, ::1] updatecoeffsdispersive, idtype_t[:, :, :, ::1] ID, int[:, ::1] edgesx, int[:, ::1] edgesy, int[:, ::1] edgesz, complextype_t[:, ::1] Tx, complextype_t[:, ::1] Ty, complextype_t[:, ::1] Tz, floattype_t[::1] Exdispersive, floattype_t[::1] Eydispersive, floattype_t[::1] Ezdispersive, floattype_t[:, :, ::1] Ex, floattype_t[:, :, ::1] Ey, floattype_t[:, :, ::1] Ez, floattype_t[:, :, ::1] Hx, floattype_t[:, :, ::1] Hy, floattype_t[:, :, ::1] Hz) noexcept nogil
+cpdef void set_electric_dispersive_sparse(int nthreads, int[:, ::1] edgesx, int[:, ::1] edgesy, int[:, ::1] edgesz, floattype_t[::1] Exdispersive, floattype_t[::1] Eydispersive, floattype_t[::1] Ezdispersive, floattype_t[:, :, ::1] Ex, floattype_t[:, :, ::1] Ey, floattype_t[:, :, ::1] Ez) noexcept nogil
+cpdef void update_electric_dispersive_sparse_B(int nthreads, int maxpoles, complextype_t[:, ::1] updatecoeffsdispersive, idtype_t[:, :, :, ::1] ID, int[:, ::1] edgesx, int[:, ::1] edgesy, int[:, ::1] edgesz, complextype_t[:, ::1] Tx, complextype_t[:, ::1] Ty, complextype_t[:, ::1] Tz, floattype_t[:, :, ::1] Ex, floattype_t[:, :, ::1] Ey, floattype_t[:, :, ::1] Ez) noexcept nogil
+cpdef void update_magnetic(int nx, int ny, int nz, int nthreads, floattype_t[:, ::1] updatecoeffsH, idtype_t[:, :, :, ::1] ID, floattype_t[:, :, ::1] Ex, floattype_t[:, :, ::1] Ey, floattype_t[:, :, ::1] Ez, floattype_t[:, :, ::1] Hx, floattype_t[:, :, ::1] Hy, floattype_t[:, :, ::1] Hz) noexcept nogil
+
+# Electric and magnetic field updates of tiles of 3D models (for the tiled
+# updates of the compiled solver)
+cdef void update_electric_tile_chunk(Py_ssize_t xs, Py_ssize_t xf, Py_ssize_t chunk, Py_ssize_t nchunks, int nx, int ny, int nz, floattype_t[:, ::1] updatecoeffsE, idtype_t[:, :, :, ::1] ID, floattype_t[:, :, ::1] Ex, floattype_t[:, :, ::1] Ey, floattype_t[:, :, ::1] Ez, floattype_t[:, :, ::1] Hx, floattype_t[:, :, ::1] Hy, floattype_t[:, :, ::1] Hz) noexcept nogil
+cdef void update_magnetic_tile_chunk(Py_ssize_t xs, Py_ssize_t xf, Py_ssize_t chunk, Py_ssize_t nchunks, int nx, int ny, int nz, floattype_t[:, ::1] updatecoeffsH, idtype_t[:, :, :, ::1] ID, floattype_t[:, :, ::1] Ex, floattype_t[:, :, ::1] Ey, floattype_t[:, :, ::1] Ez, floattype_t[:, :, ::1] Hx, floattype_t[:, :, ::1] Hy, floattype_t[:, :, ::1] Hz) noexcept nogil
@@ -18,29 +18,34 @@
 
 import numpy as np
 cimport numpy as np
+cimport cython
 from cython.parallel import prange
 
+from gprMax.constants import e0
+from gprMax.constants import m0
 from gprMax.constants cimport floattype_t
 from gprMax.constants cimport complextype_t
+from gprMax.constants cimport idtype_t
 
 
 ###############################################
 # Electric field updates - standard materials #
 ###############################################
+@cython.cdivision(True)
 cpdef void update_electric(
                     int nx,
                     int ny,
                     int nz,
                     int nthreads,
                     floattype_t[:, ::1] updatecoeffsE,
-                    np.uint32_t[:, :, :, ::1] ID,
+                    idtype_t[:, :, :, ::1] ID,
                     floattype_t[:, :, ::1] Ex,
                     floattype_t[:, :, ::1] Ey,
                     floattype_t[:, :, ::1] Ez,
                     floattype_t[:, :, ::1] Hx,
                     floattype_t[:, :, ::1] Hy,
                     floattype_t[:, :, ::1] Hz
-            ):
+            ) noexcept nogil:
     """This function updates the electric field components.
 
     Args:
@@ -50,31 +55,66 @@ cpdef void update_electric(
     """
 
     cdef Py_ssize_t i, j, k
+    cdef Py_ssize_t chunk, n, stop, na, nb, a, b, b0, b1
     cdef int materialEx, materialEy, materialEz
 
+    # 2D models - the two active dimensions are collapsed into a single index
+    # which is split into a chunk for each thread, so that the work is shared
+    # evenly between threads whatever the first active dimension is
+
     # 2D - Ex component
     if nx == 1:
-        for i in prange(0, nx, nogil=True, schedule='static', num_threads=nthreads):
-            for j in range(1, ny):
-                for k in range(1, nz):
-                    materialEx = ID[0, i, j, k]
-                    Ex[i, j, k] = updatecoeffsE[materialEx, 0] * Ex[i, j, k] + updatecoeffsE[materialEx, 2] * (Hz[i, j, k] - Hz[i, j - 1, k]) - updatecoeffsE[materialEx, 3] * (Hy[i, j, k] - Hy[i, j, k - 1])
+        na = ny - 1
+        nb = nz - 1
+        for chunk in prange(0, nthreads, nogil=True, schedule='static', num_threads=nthreads):
+            n = chunk * na * nb // nthreads
+            stop = (chunk + 1) * na * nb // nthreads
+            while n < stop:
+                a = n // nb
+                b0 = n - a * nb
+                b1 = min(nb, b0 + stop - n)
+                j = a + 1
+                for b in range(b0, b1):
+                    k = b + 1
+                    materialEx = ID[0, 0, j, k]
+                    Ex[0, j, k] = updatecoeffsE[materialEx, 0] * Ex[0, j, k] + updatecoeffsE[materialEx, 2] * (Hz[0, j, k] - Hz[0, j - 1, k]) - updatecoeffsE[materialEx, 3] * (Hy[0, j, k] - Hy[0, j, k - 1])
+                n = n + b1 - b0
 
     # 2D - Ey component
     elif ny == 1:
-        for i in prange(1, nx, nogil=True, schedule='static', num_threads=nthreads):
-            for j in range(0, ny):
-                for k in range(1, nz):
-                    materialEy = ID[1, i, j, k]
-                    Ey[i, j, k] = updatecoeffsE[materialEy, 0] * Ey[i, j, k] + updatecoeffsE[materialEy, 3] * (Hx[i, j, k] - Hx[i, j, k - 1]) - updatecoeffsE[materialEy, 1] * (Hz[i, j, k] - Hz[i - 1, j, k])
+        na = nx - 1
+        nb = nz - 1
+        for chunk in prange(0, nthreads, nogil=True, schedule='static', num_threads=nthreads):
+            n = chunk * na * nb // nthreads
+            stop = (chunk + 1) * na * nb // nthreads
+            while n < stop:
+                a = n // nb
+                b0 = n - a * nb
+                b1 = min(nb, b0 + stop - n)
+                i = a + 1
+                for b in range(b0, b1):
+                    k = b + 1
+                    materialEy = ID[1, i, 0, k]
+                    Ey[i, 0, k] = updatecoeffsE[materialEy, 0] * Ey[i, 0, k] + updatecoeffsE[materialEy, 3] * (Hx[i, 0, k] - Hx[i, 0, k - 1]) - updatecoeffsE[materialEy, 1] * (Hz[i, 0, k] - Hz[i - 1, 0, k])
+                n = n + b1 - b0
 
     # 2D - Ez component
     elif nz == 1:
-        for i in prange(1, nx, nogil=True, schedule='static', num_threads=nthreads):
-            for j in range(1, ny):
-                for k in range(0, nz):
-                    materialEz = ID[2, i, j, k]
-                    Ez[i, j, k] = updatecoeffsE[materialEz, 0] * Ez[i, j, k] + updatecoeffsE[materialEz, 1] * (Hy[i, j, k] - Hy[i - 1, j, k]) - updatecoeffsE[materialEz, 2] * (Hx[i, j, k] - Hx[i, j - 1, k])
+        na = nx - 1
+        nb = ny - 1
+        for chunk in prange(0, nthreads, nogil=True, schedule='static', num_threads=nthreads):
+            n = chunk * na * nb // nthreads
+            stop = (chunk + 1) * na * nb // nthreads
+            while n < stop:
+                a = n // nb
+                b0 = n - a * nb
+                b1 = min(nb, b0 + stop - n)
+                i = a + 1
+                for b in range(b0, b1):
+                    j = b + 1
+                    materialEz = ID[2, i, j, 0]
+                    Ez[i, j, 0] = updatecoeffsE[materialEz, 0] * Ez[i, j, 0] + updatecoeffsE[materialEz, 1] * (Hy[i, j, 0] - Hy[i - 1, j, 0]) - updatecoeffsE[materialEz, 2] * (Hx[i, j, 0] - Hx[i, j - 1, 0])
+                n = n + b1 - b0
 
     # 3D
     else:
@@ -110,6 +150,7 @@ cpdef void update_electric(
 #################################################
 # Electric field updates - dispersive materials #
 #################################################
+@cython.cdivision(True)
 cpdef void update_electric_dispersive_multipole_A(
                     int nx,
                     int ny,
@@ -118,7 +159,7 @@ cpdef void update_electric_dispersive_multipole_A(
                     int maxpoles,
                     floattype_t[:, ::1] updatecoeffsE,
                     complextype_t[:, ::1] updatecoeffsdispersive,
-                    np.uint32_t[:, :, :, ::1] ID,
+                    idtype_t[:, :, :, ::1] ID,
                     complextype_t[:, :, :, ::1] Tx,
                     complextype_t[:, :, :, ::1] Ty,
                     complextype_t[:, :, :, ::1] Tz,
@@ -128,7 +169,7 @@ cpdef void update_electric_dispersive_multipole_A(
                     floattype_t[:, :, ::1] Hx,
                     floattype_t[:, :, ::1] Hy,
                     floattype_t[:, :, ::1] Hz
-            ):
+            ) noexcept nogil:
     """This function updates the electric field components when dispersive materials (with multiple poles) are present.
 
     Args:
@@ -139,11 +180,79 @@ cpdef void update_electric_dispersive_multipole_A(
     """
 
     cdef Py_ssize_t i, j, k, pole
+    cdef Py_ssize_t chunk, n, stop, na, nb, a, b, b0, b1
     cdef int material
     cdef float phi = 0
 
-    # Ex component
-    if ny != 1 or nz != 1:
+    # 2D - Ex component
+    if nx == 1:
+        na = ny - 1
+        nb = nz - 1
+        for chunk in prange(0, nthreads, nogil=True, schedule='static', num_threads=nthreads):
+            n = chunk * na * nb // nthreads
+            stop = (chunk + 1) * na * nb // nthreads
+            while n < stop:
+                a = n // nb
+                b0 = n - a * nb
+                b1 = min(nb, b0 + stop - n)
+                j = a + 1
+                for b in range(b0, b1):
+                    k = b + 1
+                    material = ID[0, 0, j, k]
+                    phi = 0
+                    for pole in range(maxpoles):
+                        phi = phi + updatecoeffsdispersive[material, pole * 3].real * Tx[pole, 0, j, k].real
+                        Tx[pole, 0, j, k] = updatecoeffsdispersive[material, 1 + (pole * 3)] * Tx[pole, 0, j, k] + updatecoeffsdispersive[material, 2 + (pole * 3)] * Ex[0, j, k]
+                    Ex[0, j, k] = updatecoeffsE[material, 0] * Ex[0, j, k] + updatecoeffsE[material, 2] * (Hz[0, j, k] - Hz[0, j - 1, k]) - updatecoeffsE[material, 3] * (Hy[0, j, k] - Hy[0, j, k - 1]) - updatecoeffsE[material, 4] * phi
+                n = n + b1 - b0
+
+    # 2D - Ey component
+    elif ny == 1:
+        na = nx - 1
+        nb = nz - 1
+        for chunk in prange(0, nthreads, nogil=True, schedule='static', num_threads=nthreads):
+            n = chunk * na * nb // nthreads
+            stop = (chunk + 1) * na * nb // nthreads
+            while n < stop:
+                a = n // nb
+                b0 = n - a * nb
+                b1 = min(nb, b0 + stop - n)
+                i = a + 1
+                for b in range(b0, b1):
+                    k = b + 1
+                    material = ID[1, i, 0, k]
+                    phi = 0
+                    for pole in range(maxpoles):
+                        phi = phi + updatecoeffsdispersive[material, pole * 3].real * Ty[pole, i, 0, k].real
+                        Ty[pole, i, 0, k] = updatecoeffsdispersive[material, 1 + (pole * 3)] * Ty[pole, i, 0, k] + updatecoeffsdispersive[material, 2 + (pole * 3)] * Ey[i, 0, k]
+                    Ey[i, 0, k] = updatecoeffsE[material, 0] * Ey[i, 0, k] + updatecoeffsE[material, 3] * (Hx[i, 0, k] - Hx[i, 0, k - 1]) - updatecoeffsE[material, 1] * (Hz[i, 0, k] - Hz[i - 1, 0, k]) - updatecoeffsE[material, 4] * phi
+                n = n + b1 - b0
+
+    # 2D - Ez component
+    elif nz == 1:
+        na = nx - 1
+        nb = ny - 1
+        for chunk in prange(0, nthreads, nogil=True, schedule='static', num_threads=nthreads):
+            n = chunk * na * nb // nthreads
+            stop = (chunk + 1) * na * nb // nthreads
+            while n < stop:
+                a = n // nb
+                b0 = n - a * nb
+                b1 = min(nb, b0 + stop - n)
+                i = a + 1
+                for b in range(b0, b1):
+                    j = b + 1
+                    material = ID[2, i, j, 0]
+                    phi = 0
+                    for pole in range(maxpoles):
+                        phi = phi + updatecoeffsdispersive[material, pole * 3].real * Tz[pole, i, j, 0].real
+                        Tz[pole, i, j, 0] = updatecoeffsdispersive[material, 1 + (pole * 3)] * Tz[pole, i, j, 0] + updatecoeffsdispersive[material, 2 + (pole * 3)] * Ez[i, j, 0]
+                    Ez[i, j, 0] = updatecoeffsE[material, 0] * Ez[i, j, 0] + updatecoeffsE[material, 1] * (Hy[i, j, 0] - Hy[i - 1, j, 0]) - updatecoeffsE[material, 2] * (Hx[i, j, 0] - Hx[i, j - 1, 0]) - updatecoeffsE[material, 4] * phi
+                n = n + b1 - b0
+
+    # 3D
+    else:
+        # Ex component
         for i in prange(0, nx, nogil=True, schedule='static', num_threads=nthreads):
             for j in range(1, ny):
                 for k in range(1, nz):
@@ -154,8 +263,7 @@ cpdef void update_electric_dispersive_multipole_A(
                         Tx[pole, i, j, k] = updatecoeffsdispersive[material, 1 + (pole * 3)] * Tx[pole, i, j, k] + updatecoeffsdispersive[material, 2 + (pole * 3)] * Ex[i, j, k]
                     Ex[i, j, k] = updatecoeffsE[material, 0] * Ex[i, j, k] + updatecoeffsE[material, 2] * (Hz[i, j, k] - Hz[i, j - 1, k]) - updatecoeffsE[material, 3] * (Hy[i, j, k] - Hy[i, j, k - 1]) - updatecoeffsE[material, 4] * phi
 
-    # Ey component
-    if nx != 1 or nz != 1:
+        # Ey component
         for i in prange(1, nx, nogil=True, schedule='static', num_threads=nthreads):
             for j in range(0, ny):
                 for k in range(1, nz):
@@ -166,8 +274,7 @@ cpdef void update_electric_dispersive_multipole_A(
                         Ty[pole, i, j, k] = updatecoeffsdispersive[material, 1 + (pole * 3)] * Ty[pole, i, j, k] + updatecoeffsdispersive[material, 2 + (pole * 3)] * Ey[i, j, k]
                     Ey[i, j, k] = updatecoeffsE[material, 0] * Ey[i, j, k] + updatecoeffsE[material, 3] * (Hx[i, j, k] - Hx[i, j, k - 1]) - updatecoeffsE[material, 1] * (Hz[i, j, k] - Hz[i - 1, j, k]) - updatecoeffsE[material, 4] * phi
 
-    # Ez component
-    if nx != 1 or ny != 1:
+        # Ez component
         for i in prange(1, nx, nogil=True, schedule='static', num_threads=nthreads):
             for j in range(1, ny):
                 for k in range(0, nz):
@@ -179,7 +286,7 @@ cpdef void update_electric_dispersive_multipole_A(
                     Ez[i, j, k] = updatecoeffsE[material, 0] * Ez[i, j, k] + updatecoeffsE[material, 1] * (Hy[i, j, k] - Hy[i - 1, j, k]) - updatecoeffsE[material, 2] * (Hx[i, j, k] - Hx[i, j - 1, k]) - updatecoeffsE[material, 4] * phi
 
 
-
+@cython.cdivision(True)
 cpdef void update_electric_dispersive_multipole_B(
                     int nx,
                     int ny,
@@ -187,14 +294,14 @@ cpdef void update_electric_dispersive_multipole_B(
                     int nthreads,
                     int maxpoles,
                     complextype_t[:, ::1] updatecoeffsdispersive,
-                    np.uint32_t[:, :, :, ::1] ID,
+                    idtype_t[:, :, :, ::1] ID,
                     complextype_t[:, :, :, ::1] Tx,
                     complextype_t[:, :, :, ::1] Ty,
                     complextype_t[:, :, :, ::1] Tz,
                     floattype_t[:, :, ::1] Ex,
                     floattype_t[:, :, ::1] Ey,
                     floattype_t[:, :, ::1] Ez
-            ):
+            ) noexcept nogil:
     """This function updates a temporary dispersive material array when disperisive materials (with multiple poles) are present.
 
     Args:
@@ -205,10 +312,69 @@ cpdef void update_electric_dispersive_multipole_B(
     """
 
     cdef Py_ssize_t i, j, k, pole
+    cdef Py_ssize_t chunk, n, stop, na, nb, a, b, b0, b1
     cdef int material
 
-    # Ex component
-    if ny != 1 or nz != 1:
+    # 2D - Ex component
+    if nx == 1:
+        na = ny - 1
+        nb = nz - 1
+        for chunk in prange(0, nthreads, nogil=True, schedule='static', num_threads=nthreads):
+            n = chunk * na * nb // nthreads
+            stop = (chunk + 1) * na * nb // nthreads
+            while n < stop:
+                a = n // nb
+                b0 = n - a * nb
+                b1 = min(nb, b0 + stop - n)
+                j = a + 1
+                for b in range(b0, b1):
+                    k = b + 1
+                    material = ID[0, 0, j, k]
+                    for pole in range(maxpoles):
+                        Tx[pole, 0, j, k] = Tx[pole, 0, j, k] - updatecoeffsdispersive[material, 2 + (pole * 3)] * Ex[0, j, k]
+                n = n + b1 - b0
+
+    # 2D - Ey component
+    elif ny == 1:
+        na = nx - 1
+        nb = nz - 1
+        for chunk in prange(0, nthreads, nogil=True, schedule='static', num_threads=nthreads):
+            n = chunk * na * nb // nthreads
+            stop = (chunk + 1) * na * nb // nthreads
+            while n < stop:
+                a = n // nb
+                b0 = n - a * nb
+                b1 = min(nb, b0 + stop - n)
+                i = a + 1
+                for b in range(b0, b1):
+                    k = b + 1
+                    material = ID[1, i, 0, k]
+                    for pole in range(maxpoles):
+                        Ty[pole, i, 0, k] = Ty[pole, i, 0, k] - updatecoeffsdispersive[material, 2 + (pole * 3)] * Ey[i, 0, k]
+                n = n + b1 - b0
+
+    # 2D - Ez component
+    elif nz == 1:
+        na = nx - 1
+        nb = ny - 1
+        for chunk in prange(0, nthreads, nogil=True, schedule='static', num_threads=nthreads):
+            n = chunk * na * nb // nthreads
+            stop = (chunk + 1) * na * nb // nthreads
+            while n < stop:
+                a = n // nb
+                b0 = n - a * nb
+                b1 = min(nb, b0 + stop - n)
+                i = a + 1
+                for b in range(b0, b1):
+                    j = b + 1
+                    material = ID[2, i, j, 0]
+                    for pole in range(maxpoles):
+                        Tz[pole, i, j, 0] = Tz[pole, i, j, 0] - updatecoeffsdispersive[material, 2 + (pole * 3)] * Ez[i, j, 0]
+                n = n + b1 - b0
+
+    # 3D
+    else:
+        # Ex component
         for i in prange(0, nx, nogil=True, schedule='static', num_threads=nthreads):
             for j in range(1, ny):
                 for k in range(1, nz):
@@ -216,8 +382,7 @@ cpdef void update_electric_dispersive_multipole_B(
                     for pole in range(maxpoles):
                         Tx[pole, i, j, k] = Tx[pole, i, j, k] - updatecoeffsdispersive[material, 2 + (pole * 3)] * Ex[i, j, k]
 
-    # Ey component
-    if nx != 1 or nz != 1:
+        # Ey component
         for i in prange(1, nx, nogil=True, schedule='static', num_threads=nthreads):
             for j in range(0, ny):
                 for k in range(1, nz):
@@ -225,8 +390,7 @@ cpdef void update_electric_dispersive_multipole_B(
                     for pole in range(maxpoles):
                         Ty[pole, i, j, k] = Ty[pole, i, j, k] - updatecoeffsdispersive[material, 2 + (pole * 3)] * Ey[i, j, k]
 
-    # Ez component
-    if nx != 1 or ny != 1:
+        # Ez component
         for i in prange(1, nx, nogil=True, schedule='static', num_threads=nthreads):
             for j in range(1, ny):
                 for k in range(0, nz):
@@ -235,6 +399,7 @@ cpdef void update_electric_dispersive_multipole_B(
                         Tz[pole, i, j, k] = Tz[pole, i, j, k] - updatecoeffsdispersive[material, 2 + (pole * 3)] * Ez[i, j, k]
 
 
+@cython.cdivision(True)
 cpdef void update_electric_dispersive_1pole_A(
                     int nx,
                     int ny,
@@ -242,7 +407,7 @@ cpdef void update_electric_dispersive_1pole_A(
                     int nthreads,
                     floattype_t[:, ::1] updatecoeffsE,
                     complextype_t[:, ::1] updatecoeffsdispersive,
-                    np.uint32_t[:, :, :, ::1] ID,
+                    idtype_t[:, :, :, ::1] ID,
                     complextype_t[:, :, :, ::1] Tx,
                     complextype_t[:, :, :, ::1] Ty,
                     complextype_t[:, :, :, ::1] Tz,
@@ -252,7 +417,7 @@ cpdef void update_electric_dispersive_1pole_A(
                     floattype_t[:, :, ::1] Hx,
                     floattype_t[:, :, ::1] Hy,
                     floattype_t[:, :, ::1] Hz
-            ):
+            ) noexcept nogil:
     """This function updates the electric field components when dispersive materials (with 1 pole) are present.
 
     Args:
@@ -262,11 +427,73 @@ cpdef void update_electric_dispersive_1pole_A(
     """
 
     cdef Py_ssize_t i, j, k
+    cdef Py_ssize_t chunk, n, stop, na, nb, a, b, b0, b1
     cdef int material
     cdef float phi = 0
 
-    # Ex component
-    if ny != 1 or nz != 1:
+    # 2D - Ex component
+    if nx == 1:
+        na = ny - 1
+        nb = nz - 1
+        for chunk in prange(0, nthreads, nogil=True, schedule='static', num_threads=nthreads):
+            n = chunk * na * nb // nthreads
+            stop = (chunk + 1) * na * nb // nthreads
+            while n < stop:
+                a = n // nb
+                b0 = n - a * nb
+                b1 = min(nb, b0 + stop - n)
+                j = a + 1
+                for b in range(b0, b1):
+                    k = b + 1
+                    material = ID[0, 0, j, k]
+                    phi = updatecoeffsdispersive[material, 0].real * Tx[0, 0, j, k].real
+                    Tx[0, 0, j, k] = updatecoeffsdispersive[material, 1] * Tx[0, 0, j, k] + updatecoeffsdispersive[material, 2] * Ex[0, j, k]
+                    Ex[0, j, k] = updatecoeffsE[material, 0] * Ex[0, j, k] + updatecoeffsE[material, 2] * (Hz[0, j, k] - Hz[0, j - 1, k]) - updatecoeffsE[material, 3] * (Hy[0, j, k] - Hy[0, j, k - 1]) - updatecoeffsE[material, 4] * phi
+                n = n + b1 - b0
+
+    # 2D - Ey component
+    elif ny == 1:
+        na = nx - 1
+        nb = nz - 1
+        for chunk in prange(0, nthreads, nogil=True, schedule='static', num_threads=nthreads):
+            n = chunk * na * nb // nthreads
+            stop = (chunk + 1) * na * nb // nthreads
+            while n < stop:
+                a = n // nb
+                b0 = n - a * nb
+                b1 = min(nb, b0 + stop - n)
+                i = a + 1
+                for b in range(b0, b1):
+                    k = b + 1
+                    material = ID[1, i, 0, k]
+                    phi = updatecoeffsdispersive[material, 0].real * Ty[0, i, 0, k].real
+                    Ty[0, i, 0, k] = updatecoeffsdispersive[material, 1] * Ty[0, i, 0, k] + updatecoeffsdispersive[material, 2] * Ey[i, 0, k]
+                    Ey[i, 0, k] = updatecoeffsE[material, 0] * Ey[i, 0, k] + updatecoeffsE[material, 3] * (Hx[i, 0, k] - Hx[i, 0, k - 1]) - updatecoeffsE[material, 1] * (Hz[i, 0, k] - Hz[i - 1, 0, k]) - updatecoeffsE[material, 4] * phi
+                n = n + b1 - b0
+
+    # 2D - Ez component
+    elif nz == 1:
+        na = nx - 1
+        nb = ny - 1
+        for chunk in prange(0, nthreads, nogil=True, schedule='static', num_threads=nthreads):
+            n = chunk * na * nb // nthreads
+            stop = (chunk + 1) * na * nb // nthreads
+            while n < stop:
+                a = n // nb
+                b0 = n - a * nb
+                b1 = min(nb, b0 + stop - n)
+                i = a + 1
+                for b in range(b0, b1):
+                    j = b + 1
+                    material = ID[2, i, j, 0]
+                    phi = updatecoeffsdispersive[material, 0].real * Tz[0, i, j, 0].real
+                    Tz[0, i, j, 0] = updatecoeffsdispersive[material, 1] * Tz[0, i, j, 0] + updatecoeffsdispersive[material, 2] * Ez[i, j, 0]
+                    Ez[i, j, 0] = updatecoeffsE[material, 0] * Ez[i, j, 0] + updatecoeffsE[material, 1] * (Hy[i, j, 0] - Hy[i - 1, j, 0]) - updatecoeffsE[material, 2] * (Hx[i, j, 0] - Hx[i, j - 1, 0]) - updatecoeffsE[material, 4] * phi
+                n = n + b1 - b0
+
+    # 3D
+    else:
+        # Ex component
         for i in prange(0, nx, nogil=True, schedule='static', num_threads=nthreads):
             for j in range(1, ny):
                 for k in range(1, nz):
@@ -275,8 +502,7 @@ cpdef void update_electric_dispersive_1pole_A(
                     Tx[0, i, j, k] = updatecoeffsdispersive[material, 1] * Tx[0, i, j, k] + updatecoeffsdispersive[material, 2] * Ex[i, j, k]
                     Ex[i, j, k] = updatecoeffsE[material, 0] * Ex[i, j, k] + updatecoeffsE[material, 2] * (Hz[i, j, k] - Hz[i, j - 1, k]) - updatecoeffsE[material, 3] * (Hy[i, j, k] - Hy[i, j, k - 1]) - updatecoeffsE[material, 4] * phi
 
-    # Ey component
-    if nx != 1 or nz != 1:
+        # Ey component
         for i in prange(1, nx, nogil=True, schedule='static', num_threads=nthreads):
             for j in range(0, ny):
                 for k in range(1, nz):
@@ -285,8 +511,7 @@ cpdef void update_electric_dispersive_1pole_A(
                     Ty[0, i, j, k] = updatecoeffsdispersive[material, 1] * Ty[0, i, j, k] + updatecoeffsdispersive[material, 2] * Ey[i, j, k]
                     Ey[i, j, k] = updatecoeffsE[material, 0] * Ey[i, j, k] + updatecoeffsE[material, 3] * (Hx[i, j, k] - Hx[i, j, k - 1]) - updatecoeffsE[material, 1] * (Hz[i, j, k] - Hz[i - 1, j, k]) - updatecoeffsE[material, 4] * phi
 
-    # Ez component
-    if nx != 1 or ny != 1:
+        # Ez component
         for i in prange(1, nx, nogil=True, schedule='static', num_threads=nthreads):
             for j in range(1, ny):
                 for k in range(0, nz):
@@ -296,20 +521,21 @@ cpdef void update_electric_dispersive_1pole_A(
                     Ez[i, j, k] = updatecoeffsE[material, 0] * Ez[i, j, k] + updatecoeffsE[material, 1] * (Hy[i, j, k] - Hy[i - 1, j, k]) - updatecoeffsE[material, 2] * (Hx[i, j, k] - Hx[i, j - 1, k]) - updatecoeffsE[material, 4] * phi
 
 
+@cython.cdivision(True)
 cpdef void update_electric_dispersive_1pole_B(
                     int nx,
                     int ny,
                     int nz,
                     int nthreads,
                     complextype_t[:, ::1] updatecoeffsdispersive,
-                    np.uint32_t[:, :, :, ::1] ID,
+                    idtype_t[:, :, :, ::1] ID,
                     complextype_t[:, :, :, ::1] Tx,
                     complextype_t[:, :, :, ::1] Ty,
                     complextype_t[:, :, :, ::1] Tz,
                     floattype_t[:, :, ::1] Ex,
                     floattype_t[:, :, ::1] Ey,
                     floattype_t[:, :, ::1] Ez
-            ):
+            ) noexcept nogil:
     """This function updates a temporary dispersive material array when disperisive materials (with 1 pole) are present.
 
     Args:
@@ -319,26 +545,80 @@ cpdef void update_electric_dispersive_1pole_B(
     """
 
     cdef Py_ssize_t i, j, k
+    cdef Py_ssize_t chunk, n, stop, na, nb, a, b, b0, b1
     cdef int material
 
-    # Ex component
-    if ny != 1 or nz != 1:
+    # 2D - Ex component
+    if nx == 1:
+        na = ny - 1
+        nb = nz - 1
+        for chunk in prange(0, nthreads, nogil=True, schedule='static', num_threads=nthreads):
+            n = chunk * na * nb // nthreads
+            stop = (chunk + 1) * na * nb // nthreads
+            while n < stop:
+                a = n // nb
+                b0 = n - a * nb
+                b1 = min(nb, b0 + stop - n)
+                j = a + 1
+                for b in range(b0, b1):
+                    k = b + 1
+                    material = ID[0, 0, j, k]
+                    Tx[0, 0, j, k] = Tx[0, 0, j, k] - updatecoeffsdispersive[material, 2] * Ex[0, j, k]
+                n = n + b1 - b0
+
+    # 2D - Ey component
+    elif ny == 1:
+        na = nx - 1
+        nb = nz - 1
+        for chunk in prange(0, nthreads, nogil=True, schedule='static', num_threads=nthreads):
+            n = chunk * na * nb // nthreads
+            stop = (chunk + 1) * na * nb // nthreads
+            while n < stop:
+                a = n // nb
+                b0 = n - a * nb
+                b1 = min(nb, b0 + stop - n)
+                i = a + 1
+                for b in range(b0, b1):
+                    k = b + 1
+                    material = ID[1, i, 0, k]
+                    Ty[0, i, 0, k] = Ty[0, i, 0, k] - updatecoeffsdispersive[material, 2] * Ey[i, 0, k]
+                n = n + b1 - b0
+
+    # 2D - Ez component
+    elif nz == 1:
+        na = nx - 1
+        nb = ny - 1
+        for chunk in prange(0, nthreads, nogil=True, schedule='static', num_threads=nthreads):
+            n = chunk * na * nb // nthreads
+            stop = (chunk + 1) * na * nb // nthreads
+            while n < stop:
+                a = n // nb
+                b0 = n - a * nb
+                b1 = min(nb, b0 + stop - n)
+                i = a + 1
+                for b in range(b0, b1):
+                    j = b + 1
+                    material = ID[2, i, j, 0]
+                    Tz[0, i, j, 0] = Tz[0, i, j, 0] - updatecoeffsdispersive[material, 2] * Ez[i, j, 0]
+                n = n + b1 - b0
+
+    # 3D
+    else:
+        # Ex component
         for i in prange(0, nx, nogil=True, schedule='static', num_threads=nthreads):
             for j in range(1, ny):
                 for k in range(1, nz):
                     material = ID[0, i, j, k]
                     Tx[0, i, j, k] = Tx[0, i, j, k] - updatecoeffsdispersive[material, 2] * Ex[i, j, k]
 
-    # Ey component
-    if nx != 1 or nz != 1:
+        # Ey component
         for i in prange(1, nx, nogil=True, schedule='static', num_threads=nthreads):
             for j in range(0, ny):
                 for k in range(1, nz):
                     material = ID[1, i, j, k]
                     Ty[0, i, j, k] = Ty[0, i, j, k] - updatecoeffsdispersive[material, 2] * Ey[i, j, k]
 
-    # Ez component
-    if nx != 1 or ny != 1:
+        # Ez component
         for i in prange(1, nx, nogil=True, schedule='static', num_threads=nthreads):
             for j in range(1, ny):
                 for k in range(0, nz):
@@ -346,23 +626,195 @@ cpdef void update_electric_dispersive_1pole_B(
                     Tz[0, i, j, k] = Tz[0, i, j, k] - updatecoeffsdispersive[material, 2] * Ez[i, j, k]
 
 
+##################################################################
+# Electric field updates - dispersive materials (sparse storage) #
+##################################################################
+@cython.cdivision(True)
+cpdef void update_electric_dispersive_sparse_A(
+                    int nthreads,
+                    int maxpoles,
+                    floattype_t[:, ::1] updatecoeffsE,
+                    complextype_t[:, ::1] updatecoeffsdispersive,
+                    idtype_t[:, :, :, ::1] ID,
+                    int[:, ::1] edgesx,
+                    int[:, ::1] edgesy,
+                    int[:, ::1] edgesz,
+                    complextype_t[:, ::1] Tx,
+                    complextype_t[:, ::1] Ty,
+                    complextype_t[:, ::1] Tz,
+                    floattype_t[::1] Exdispersive,
+                    floattype_t[::1] Eydispersive,
+                    floattype_t[::1] Ezdispersive,
+                    floattype_t[:, :, ::1] Ex,
+                    floattype_t[:, :, ::1] Ey,
+                    floattype_t[:, :, ::1] Ez,
+                    floattype_t[:, :, ::1] Hx,
+                    floattype_t[:, :, ::1] Hy,
+                    floattype_t[:, :, ::1] Hz
+            ) noexcept nogil:
+    """This function does the dispersive update of the edges of dispersive materials when the temporary
+        dispersive material arrays are stored only for these edges. The dispersive update is stored (as it
+        requires present electric field values), the standard update is then done for every edge (see
+        update_electric), and then the edges of dispersive materials are set (see set_electric_dispersive_sparse).
+
+    Args:
+        nthreads (int): Number of threads to use
+        maxpoles (int): Maximum number of poles
+        updatecoeffs, ID (memoryviews): Access to update coeffients and ID arrays
+        edges (memoryviews): Cell coordinates of the edges of dispersive materials for each field component
+        T (memoryviews): Access to temporary arrays, i.e. for each edge of dispersive materials and pole
+        Edispersive (memoryviews): Access to arrays to store the dispersive update of each edge of dispersive materials
+        E, H (memoryviews): Access to field component arrays
+    """
+
+    cdef Py_ssize_t n, i, j, k, pole
+    cdef int material
+    cdef float phi = 0
+
+    # Ex component
+    for n in prange(0, edgesx.shape[0], nogil=True, schedule='static', num_threads=nthreads):
+        i = edgesx[n, 0]
+        j = edgesx[n, 1]
+        k = edgesx[n, 2]
+        material = ID[0, i, j, k]
+        phi = 0
+        for pole in range(maxpoles):
+            phi = phi + updatecoeffsdispersive[material, pole * 3].real * Tx[n, pole].real
+            Tx[n, pole] = updatecoeffsdispersive[material, 1 + (pole * 3)] * Tx[n, pole] + updatecoeffsdispersive[material, 2 + (pole * 3)] * Ex[i, j, k]
+        Exdispersive[n] = updatecoeffsE[material, 0] * Ex[i, j, k] + updatecoeffsE[material, 2] * (Hz[i, j, k] - Hz[i, j - 1, k]) - updatecoeffsE[material, 3] * (Hy[i, j, k] - Hy[i, j, k - 1]) - updatecoeffsE[material, 4] * phi
+
+    # Ey component
+    for n in prange(0, edgesy.shape[0], nogil=True, schedule='static', num_threads=nthreads):
+        i = edgesy[n, 0]
+        j = edgesy[n, 1]
+        k = edgesy[n, 2]
+        material = ID[1, i, j, k]
+        phi = 0
+        for pole in range(maxpoles):
+            phi = phi + updatecoeffsdispersive[material, pole * 3].real * Ty[n, pole].real
+            Ty[n, pole] = updatecoeffsdispersive[material, 1 + (pole * 3)] * Ty[n, pole] + updatecoeffsdispersive[material, 2 + (pole * 3)] * Ey[i, j, k]
+        Eydispersive[n] = updatecoeffsE[material, 0] * Ey[i, j, k] + updatecoeffsE[material, 3] * (Hx[i, j, k] - Hx[i, j, k - 1]) - updatecoeffsE[material, 1] * (Hz[i, j, k] - Hz[i - 1, j, k]) - updatecoeffsE[material, 4] * phi
+
+    # Ez component
+    for n in prange(0, edgesz.shape[0], nogil=True, schedule='static', num_threads=nthreads):
+        i = edgesz[n, 0]
+        j = edgesz[n, 1]
+        k = edgesz[n, 2]
+        material = ID[2, i, j, k]
+        phi = 0
+        for pole in range(maxpoles):
+            phi = phi + updatecoeffsdispersive[material, pole * 3].real * Tz[n, pole].real
+            Tz[n, pole] = updatecoeffsdispersive[material, 1 + (pole * 3)] * Tz[n, pole] + updatecoeffsdispersive[material, 2 + (pole * 3)] * Ez[i, j, k]
+        Ezdispersive[n] = updatecoeffsE[material, 0] * Ez[i, j, k] + updatecoeffsE[material, 1] * (Hy[i, j, k] - Hy[i - 1, j, k]) - updatecoeffsE[material, 2] * (Hx[i, j, k] - Hx[i, j - 1, k]) - updatecoeffsE[material, 4] * phi
+
+
+cpdef void set_electric_dispersive_sparse(
+                    int nthreads,
+                    int[:, ::1] edgesx,
+                    int[:, ::1] edgesy,
+                    int[:, ::1] edgesz,
+                    floattype_t[::1] Exdispersive,
+                    floattype_t[::1] Eydispersive,
+                    floattype_t[::1] Ezdispersive,
+                    floattype_t[:, :, ::1] Ex,
+                    floattype_t[:, :, ::1] Ey,
+                    floattype_t[:, :, ::1] Ez
+            ) noexcept nogil:
+    """This function sets the electric field components of the edges of dispersive materials to their
+        dispersive update (see update_electric_dispersive_sparse_A), after the standard update of every edge.
+
+    Args:
+        nthreads (int): Number of threads to use
+        edges (memoryviews): Cell coordinates of the edges of dispersive materials for each field component
+        Edispersive (memoryviews): Access to arrays storing the dispersive update of each edge of dispersive materials
+        E (memoryviews): Access to field component arrays
+    """
+
+    cdef Py_ssize_t n
+
+    for n in prange(0, edgesx.shape[0], nogil=True, schedule='static', num_threads=nthreads):
+        Ex[edgesx[n, 0], edgesx[n, 1], edgesx[n, 2]] = Exdispersive[n]
+    for n in prange(0, edgesy.shape[0], nogil=True, schedule='static', num_threads=nthreads):
+        Ey[edgesy[n, 0], edgesy[n, 1], edgesy[n, 2]] = Eydispersive[n]
+    for n in prange(0, edgesz.shape[0], nogil=True, schedule='static', num_threads=nthreads):
+        Ez[edgesz[n, 0], edgesz[n, 1], edgesz[n, 2]] = Ezdispersive[n]
+
+
+@cython.cdivision(True)
+cpdef void update_electric_dispersive_sparse_B(
+                    int nthreads,
+                    int maxpoles,
+                    complextype_t[:, ::1] updatecoeffsdispersive,
+                    idtype_t[:, :, :, ::1] ID,
+                    int[:, ::1] edgesx,
+                    int[:, ::1] edgesy,
+                    int[:, ::1] edgesz,
+                    complextype_t[:, ::1] Tx,
+                    complextype_t[:, ::1] Ty,
+                    complextype_t[:, ::1] Tz,
+                    floattype_t[:, :, ::1] Ex,
+                    floattype_t[:, :, ::1] Ey,
+                    floattype_t[:, :, ::1] Ez
+            ) noexcept nogil:
+    """This function updates the temporary dispersive material arrays when they are stored only for the edges of dispersive materials.
+
+    Args:
+        nthreads (int): Number of threads to use
+        maxpoles (int): Maximum number of poles
+        updatecoeffs, ID (memoryviews): Access to update coeffients and ID arrays
+        edges (memoryviews): Cell coordinates of the edges of dispersive materials for each field component
+        T, E (memoryviews): Access to temporary and field component arrays
+    """
+
+    cdef Py_ssize_t n, i, j, k, pole
+    cdef int material
+
+    # Ex component
+    for n in prange(0, edgesx.shape[0], nogil=True, schedule='static', num_threads=nthreads):
+        i = edgesx[n, 0]
+        j = edgesx[n, 1]
+        k = edgesx[n, 2]
+        material = ID[0, i, j, k]
+        for pole in range(maxpoles):
+            Tx[n, pole] = Tx[n, pole] - updatecoeffsdispersive[material, 2 + (pole * 3)] * Ex[i, j, k]
+
+    # Ey component
+    for n in prange(0, edgesy.shape[0], nogil=True, schedule='static', num_threads=nthreads):
+        i = edgesy[n, 0]
+        j = edgesy[n, 1]
+        k = edgesy[n, 2]
+        material = ID[1, i, j, k]
+        for pole in range(maxpoles):
+            Ty[n, pole] = Ty[n, pole] - updatecoeffsdispersive[material, 2 + (pole * 3)] * Ey[i, j, k]
+
+    # Ez component
+    for n in prange(0, edgesz.shape[0], nogil=True, schedule='static', num_threads=nthreads):
+        i = edgesz[n, 0]
+        j = edgesz[n, 1]
+        k = edgesz[n, 2]
+        material = ID[2, i, j, k]
+        for pole in range(maxpoles):
+            Tz[n, pole] = Tz[n, pole] - updatecoeffsdispersive[material, 2 + (pole * 3)] * Ez[i, j, k]
+
+
 ##########################
 # Magnetic field updates #
 ##########################
+@cython.cdivision(True)
 cpdef void update_magnetic(
                     int nx,
                     int ny,
                     int nz,
                     int nthreads,
                     floattype_t[:, ::1] updatecoeffsH,
-                    np.uint32_t[:, :, :, ::1] ID,
+                    idtype_t[:, :, :, ::1] ID,
                     floattype_t[:, :, ::1] Ex,
                     floattype_t[:, :, ::1] Ey,
                     floattype_t[:, :, ::1] Ez,
                     floattype_t[:, :, ::1] Hx,
                     floattype_t[:, :, ::1] Hy,
                     floattype_t[:, :, ::1] Hz
-            ):
+            ) noexcept nogil:
     """This function updates the magnetic field components.
 
     Args:
@@ -372,33 +824,108 @@ cpdef void update_magnetic(
     """
 
     cdef Py_ssize_t i, j, k
+    cdef Py_ssize_t chunk, n, stop, na, nb, a, b, b0, b1
     cdef int materialHx, materialHy, materialHz
 
-    # 2D
-    if nx == 1 or ny == 1 or nz == 1:
-        # Hx component
-        if ny == 1 or nz == 1:
-            for i in prange(1, nx, nogil=True, schedule='static', num_threads=nthreads):
-                for j in range(0, ny):
-                    for k in range(0, nz):
-                        materialHx = ID[3, i, j, k]
-                        Hx[i, j, k] = updatecoeffsH[materialHx, 0] * Hx[i, j, k] - updatecoeffsH[materialHx, 2] * (Ez[i, j + 1, k] - Ez[i, j, k]) + updatecoeffsH[materialHx, 3] * (Ey[i, j, k + 1] - Ey[i, j, k])
+    # 2D - Hy and Hz components
+    if nx == 1:
+        na = ny - 1
+        nb = nz
+        for chunk in prange(0, nthreads, nogil=True, schedule='static', num_threads=nthreads):
+            n = chunk * na * nb // nthreads
+            stop = (chunk + 1) * na * nb // nthreads
+            while n < stop:
+                a = n // nb
+                b0 = n - a * nb
+                b1 = min(nb, b0 + stop - n)
+                j = a + 1
+                for k in range(b0, b1):
+                    materialHy = ID[4, 0, j, k]
+                    Hy[0, j, k] = updatecoeffsH[materialHy, 0] * Hy[0, j, k] - updatecoeffsH[materialHy, 3] * (Ex[0, j, k + 1] - Ex[0, j, k]) + updatecoeffsH[materialHy, 1] * (Ez[1, j, k] - Ez[0, j, k])
+                n = n + b1 - b0
+
+        na = ny
+        nb = nz - 1
+        for chunk in prange(0, nthreads, nogil=True, schedule='static', num_threads=nthreads):
+            n = chunk * na * nb // nthreads
+            stop = (chunk + 1) * na * nb // nthreads
+            while n < stop:
+                a = n // nb
+                b0 = n - a * nb
+                b1 = min(nb, b0 + stop - n)
+                j = a
+                for b in range(b0, b1):
+                    k = b + 1
+                    materialHz = ID[5, 0, j, k]
+                    Hz[0, j, k] = updatecoeffsH[materialHz, 0] * Hz[0, j, k] - updatecoeffsH[materialHz, 1] * (Ey[1, j, k] - Ey[0, j, k]) + updatecoeffsH[materialHz, 2] * (Ex[0, j + 1, k] - Ex[0, j, k])
+                n = n + b1 - b0
+
+    # 2D - Hx and Hz components
+    elif ny == 1:
+        na = nx - 1
+        nb = nz
+        for chunk in prange(0, nthreads, nogil=True, schedule='static', num_threads=nthreads):
+            n = chunk * na * nb // nthreads
+            stop = (chunk + 1) * na * nb // nthreads
+            while n < stop:
+                a = n // nb
+                b0 = n - a * nb
+                b1 = min(nb, b0 + stop - n)
+                i = a + 1
+                for k in range(b0, b1):
+                    materialHx = ID[3, i, 0, k]
+                    Hx[i, 0, k] = updatecoeffsH[materialHx, 0] * Hx[i, 0, k] - updatecoeffsH[materialHx, 2] * (Ez[i, 1, k] - Ez[i, 0, k]) + updatecoeffsH[materialHx, 3] * (Ey[i, 0, k + 1] - Ey[i, 0, k])
+                n = n + b1 - b0
+
+        na = nx
+        nb = nz - 1
+        for chunk in prange(0, nthreads, nogil=True, schedule='static', num_threads=nthreads):
+            n = chunk * na * nb // nthreads
+            stop = (chunk + 1) * na * nb // nthreads
+            while n < stop:
+                a = n // nb
+                b0 = n - a * nb
+                b1 = min(nb, b0 + stop - n)
+                i = a
+                for b in range(b0, b1):
+                    k = b + 1
+                    materialHz = ID[5, i, 0, k]
+                    Hz[i, 0, k] = updatecoeffsH[materialHz, 0] * Hz[i, 0, k] - updatecoeffsH[materialHz, 1] * (Ey[i + 1, 0, k] - Ey[i, 0, k]) + updatecoeffsH[materialHz, 2] * (Ex[i, 1, k] - Ex[i, 0, k])
+                n = n + b1 - b0
+
+    # 2D - Hx and Hy components
+    elif nz == 1:
+        na = nx - 1
+        nb = ny
+        for chunk in prange(0, nthreads, nogil=True, schedule='static', num_threads=nthreads):
+            n = chunk * na * nb // nthreads
+            stop = (chunk + 1) * na * nb // nthreads
+            while n < stop:
+                a = n // nb
+                b0 = n - a * nb
+                b1 = min(nb, b0 + stop - n)
+                i = a + 1
+                for j in range(b0, b1):
+                    materialHx = ID[3, i, j, 0]
+                    Hx[i, j, 0] = updatecoeffsH[materialHx, 0] * Hx[i, j, 0] - updatecoeffsH[materialHx, 2] * (Ez[i, j + 1, 0] - Ez[i, j, 0]) + updatecoeffsH[materialHx, 3] * (Ey[i, j, 1] - Ey[i, j, 0])
+                n = n + b1 - b0
+
+        na = nx
+        nb = ny - 1
+        for chunk in prange(0, nthreads, nogil=True, schedule='static', num_threads=nthreads):
+            n = chunk * na * nb // nthreads
+            stop = (chunk + 1) * na * nb // nthreads
+            while n < stop:
+                a = n // nb
+                b0 = n - a * nb
+                b1 = min(nb, b0 + stop - n)
+                i = a
+                for b in range(b0, b1):
+                    j = b + 1
+                    materialHy = ID[4, i, j, 0]
+                    Hy[i, j, 0] = updatecoeffsH[materialHy, 0] * Hy[i, j, 0] - updatecoeffsH[materialHy, 3] * (Ex[i, j, 1] - Ex[i, j, 0]) + updatecoeffsH[materialHy, 1] * (Ez[i + 1, j, 0] - Ez[i, j, 0])
+                n = n + b1 - b0
 
-        # Hy component
-        if nx == 1 or nz == 1:
-            for i in prange(0, nx, nogil=True, schedule='static', num_threads=nthreads):
-                for j in range(1, ny):
-                    for k in range(0, nz):
-                        materialHy = ID[4, i, j, k]
-                        Hy[i, j, k] = updatecoeffsH[materialHy, 0] * Hy[i, j, k] - updatecoeffsH[materialHy, 3] * (Ex[i, j, k + 1] - Ex[i, j, k]) + updatecoeffsH[materialHy, 1] * (Ez[i + 1, j, k] - Ez[i, j, k])
-
-        # Hz component
-        if nx == 1 or ny == 1:
-            for i in prange(0, nx, nogil=True, schedule='static', num_threads=nthreads):
-                for j in range(0, ny):
-                    for k in range(1, nz):
-                        materialHz = ID[5, i, j, k]
-                        Hz[i, j, k] = updatecoeffsH[materialHz, 0] * Hz[i, j, k] - updatecoeffsH[materialHz, 1] * (Ey[i + 1, j, k] - Ey[i, j, k]) + updatecoeffsH[materialHz, 2] * (Ex[i, j + 1, k] - Ex[i, j, k])
     # 3D
     else:
         for i in prange(0, nx, nogil=True, schedule='static', num_threads=nthreads):
@@ -410,3 +937,293 @@ cpdef void update_magnetic(
                     Hx[i + 1, j, k] = updatecoeffsH[materialHx, 0] * Hx[i + 1, j, k] - updatecoeffsH[materialHx, 2] * (Ez[i + 1, j + 1, k] - Ez[i + 1, j, k]) + updatecoeffsH[materialHx, 3] * (Ey[i + 1, j, k + 1] - Ey[i + 1, j, k])
                     Hy[i, j + 1, k] = updatecoeffsH[materialHy, 0] * Hy[i, j + 1, k] - updatecoeffsH[materialHy, 3] * (Ex[i, j + 1, k + 1] - Ex[i, j + 1, k]) + updatecoeffsH[materialHy, 1] * (Ez[i + 1, j + 1, k] - Ez[i, j + 1, k])
                     Hz[i, j, k + 1] = updatecoeffsH[materialHz, 0] * Hz[i, j, k + 1] - updatecoeffsH[materialHz, 1] * (Ey[i + 1, j, k + 1] - Ey[i, j, k + 1]) + updatecoeffsH[materialHz, 2] * (Ex[i, j + 1, k + 1] - Ex[i, j, k + 1])
+
+
+####################################################################
+# Electric and magnetic field updates - tiles (3D, standard media) #
+####################################################################
+@cython.cdivision(True)
+cdef void update_electric_tile_chunk(
+                    Py_ssize_t xs,
+                    Py_ssize_t xf,
+                    Py_ssize_t chunk,
+                    Py_ssize_t nchunks,
+                    int nx,
+                    int ny,
+                    int nz,
+                    floattype_t[:, ::1] updatecoeffsE,
+                    idtype_t[:, :, :, ::1] ID,
+                    floattype_t[:, :, ::1] Ex,
+                    floattype_t[:, :, ::1] Ey,
+                    floattype_t[:, :, ::1] Ez,
+                    floattype_t[:, :, ::1] Hx,
+                    floattype_t[:, :, ::1] Hy,
+                    floattype_t[:, :, ::1] Hz
+            ) noexcept nogil:
+    """This function updates the electric field components for a chunk of a
+        tile of a 3D model, i.e. the x indices xs to xf of the grid, for the
+        cache-blocked (tiled) updates of the compiled solver. The x and y
+        indices of the tile are collapsed into a single index which is split
+        into nchunks chunks of equal size. The updates are the same as those
+        of update_electric, including the components at i = 0, j = 0 and
+        k = 0.
+
+    Args:
+        xs, xf (int): x indices of the tile
+        chunk, nchunks (int): Chunk to update and number of chunks
+        nx, ny, nz (int): Grid size in cells
+        updatecoeffs, ID, E, H (memoryviews): Access to update coeffients, ID and field component arrays
+    """
+
+    cdef Py_ssize_t i, j, k, n, stop
+    cdef int materialEx, materialEy, materialEz
+
+    n = chunk * (xf - xs) * ny // nchunks
+    stop = (chunk + 1) * (xf - xs) * ny // nchunks
+    while n < stop:
+        i = xs + n // ny
+        j = n % ny
+        n = n + 1
+        if i >= nx:
+            continue
+
+        # Ex components at i = 0
+        if i == 0:
+            if j >= 1:
+                for k in range(1, nz):
+                    materialEx = ID[0, 0, j, k]
+                    Ex[0, j, k] = updatecoeffsE[materialEx, 0] * Ex[0, j, k] + updatecoeffsE[materialEx, 2] * (Hz[0, j, k] - Hz[0, j - 1, k]) - updatecoeffsE[materialEx, 3] * (Hy[0, j, k] - Hy[0, j, k - 1])
+
+        # Ey components at j = 0
+        elif j == 0:
+            for k in range(1, nz):
+                materialEy = ID[1, i, 0, k]
+                Ey[i, 0, k] = updatecoeffsE[materialEy, 0] * Ey[i, 0, k] + updatecoeffsE[materialEy, 3] * (Hx[i, 0, k] - Hx[i, 0, k - 1]) - updatecoeffsE[materialEy, 1] * (Hz[i, 0, k] - Hz[i - 1, 0, k])
+
+        else:
+            for k in range(1, nz):
+                materialEx = ID[0, i, j, k]
+                materialEy = ID[1, i, j, k]
+                materialEz = ID[2, i, j, k]
+                Ex[i, j, k] = updatecoeffsE[materialEx, 0] * Ex[i, j, k] + updatecoeffsE[materialEx, 2] * (Hz[i, j, k] - Hz[i, j - 1, k]) - updatecoeffsE[materialEx, 3] * (Hy[i, j, k] - Hy[i, j, k - 1])
+                Ey[i, j, k] = updatecoeffsE[materialEy, 0] * Ey[i, j, k] + updatecoeffsE[materialEy, 3] * (Hx[i, j, k] - Hx[i, j, k - 1]) - updatecoeffsE[materialEy, 1] * (Hz[i, j, k] - Hz[i - 1, j, k])
+                Ez[i, j, k] = updatecoeffsE[materialEz, 0] * Ez[i, j, k] + updatecoeffsE[materialEz, 1] * (Hy[i, j, k] - Hy[i - 1, j, k]) - updatecoeffsE[materialEz, 2] * (Hx[i, j, k] - Hx[i, j - 1, k])
+
+            # Ez components at k = 0
+            materialEz = ID[2, i, j, 0]
+            Ez[i, j, 0] = updatecoeffsE[materialEz, 0] * Ez[i, j, 0] + updatecoeffsE[materialEz, 1] * (Hy[i, j, 0] - Hy[i - 1, j, 0]) - updatecoeffsE[materialEz, 2] * (Hx[i, j, 0] - Hx[i, j - 1, 0])
+
+
+@cython.cdivision(True)
+cdef void update_magnetic_tile_chunk(
+                    Py_ssize_t xs,
+                    Py_ssize_t xf,
+                    Py_ssize_t chunk,
+                    Py_ssize_t nchunks,
+                    int nx,
+                    int ny,
+                    int nz,
+                    floattype_t[:, ::1] updatecoeffsH,
+                    idtype_t[:, :, :, ::1] ID,
+                    floattype_t[:, :, ::1] Ex,
+                    floattype_t[:, :, ::1] Ey,
+                    floattype_t[:, :, ::1] Ez,
+                    floattype_t[:, :, ::1] Hx,
+                    floattype_t[:, :, ::1] Hy,
+                    floattype_t[:, :, ::1] Hz
+            ) noexcept nogil:
+    """This function updates the magnetic field components for a chunk of a
+        tile of a 3D model (see update_electric_tile_chunk). The updates are
+        the same as those of update_magnetic, where the components with the
+        same x index, i.e. Hx[i], Hy[i] and Hz[i], are in the same tile.
+
+    Args:
+        xs, xf (int): x indices of the tile
+        chunk, nchunks (int): Chunk to update and number of chunks
+        nx, ny, nz (int): Grid size in cells
+        updatecoeffs, ID, E, H (memoryviews): Access to update coeffients, ID and field component arrays
+    """
+
+    cdef Py_ssize_t i, j, k, n, stop
+    cdef int materialHx, materialHy, materialHz
+
+    n = chunk * (xf - xs) * ny // nchunks
+    stop = (chunk + 1) * (xf - xs) * ny // nchunks
+    while n < stop:
+        i = xs + n // ny
+        j = n % ny
+        n = n + 1
+        if i >= 1:
+            for k in range(0, nz):
+                materialHx = ID[3, i, j, k]
+                Hx[i, j, k] = updatecoeffsH[materialHx, 0] * Hx[i, j, k] - updatecoeffsH[materialHx, 2] * (Ez[i, j + 1, k] - Ez[i, j, k]) + updatecoeffsH[materialHx, 3] * (Ey[i, j, k + 1] - Ey[i, j, k])
+        if i < nx:
+            for k in range(0, nz):
+                materialHy = ID[4, i, j + 1, k]
+                materialHz = ID[5, i, j, k + 1]
+                Hy[i, j + 1, k] = updatecoeffsH[materialHy, 0] * Hy[i, j + 1, k] - updatecoeffsH[materialHy, 3] * (Ex[i, j + 1, k + 1] - Ex[i, j + 1, k]) + updatecoeffsH[materialHy, 1] * (Ez[i + 1, j + 1, k] - Ez[i, j + 1, k])
+                Hz[i, j, k + 1] = updatecoeffsH[materialHz, 0] * Hz[i, j, k + 1] - updatecoeffsH[materialHz, 1] * (Ey[i + 1, j, k + 1] - Ey[i, j, k + 1]) + updatecoeffsH[materialHz, 2] * (Ex[i, j + 1, k + 1] - Ex[i, j, k + 1])
+
+
+####################################################################
+# Electric and magnetic field updates - batches of models with the #
+# same geometry                                                    #
+####################################################################
+@cython.cdivision(True)
+cpdef void update_electric_batch(
+                    int nx,
+                    int ny,
+                    int nz,
+                    int nthreads,
+                    floattype_t[:, ::1] updatecoeffsE,
+                    idtype_t[:, :, :, ::1] ID,
+                    floattype_t[:, :, :, ::1] Ex,
+                    floattype_t[:, :, :, ::1] Ey,
+                    floattype_t[:, :, :, ::1] Ez,
+                    floattype_t[:, :, :, ::1] Hx,
+                    floattype_t[:, :, :, ::1] Hy,
+                    floattype_t[:, :, :, ::1] Hz
+            ) noexcept nogil:
+    """This function updates the electric field components of a batch of models with the same geometry,
+        e.g. the traces of a B-scan. The field arrays have an extra first dimension for the models, and
+        each row (in z) of edges is updated for every model in turn, so that the material IDs of the
+        row are read once for all the models.
+
+    Args:
+        nx, ny, nz (int): Grid size in cells
+        nthreads (int): Number of threads to use
+        updatecoeffs, ID, E, H (memoryviews): Access to update coeffients, ID and field component arrays
+    """
+
+    cdef Py_ssize_t i, j, k, m, n
+    cdef Py_ssize_t nmodels = Ex.shape[0]
+    cdef int materialEx, materialEy, materialEz
+
+    # The edges updated are the same as in update_electric for 3D and 2D
+    # models, i.e. Ex for i = 0 to nx - 1, Ey for j = 0 to ny - 1, and Ez
+    # for k = 0 to nz - 1, and for 1 to n - 1 in the other directions. Away
+    # from the i = 0 and j = 0 rows all three components are updated together.
+    for n in prange(0, nx * ny, nogil=True, schedule='static', num_threads=nthreads):
+        i = n // ny
+        j = n - i * ny
+        for m in range(0, nmodels):
+            if i > 0 and j > 0:
+                for k in range(1, nz):
+                    materialEx = ID[0, i, j, k]
+                    materialEy = ID[1, i, j, k]
+                    materialEz = ID[2, i, j, k]
+                    Ex[m, i, j, k] = updatecoeffsE[materialEx, 0] * Ex[m, i, j, k] + updatecoeffsE[materialEx, 2] * (Hz[m, i, j, k] - Hz[m, i, j - 1, k]) - updatecoeffsE[materialEx, 3] * (Hy[m, i, j, k] - Hy[m, i, j, k - 1])
+                    Ey[m, i, j, k] = updatecoeffsE[materialEy, 0] * Ey[m, i, j, k] + updatecoeffsE[materialEy, 3] * (Hx[m, i, j, k] - Hx[m, i, j, k - 1]) - updatecoeffsE[materialEy, 1] * (Hz[m, i, j, k] - Hz[m, i - 1, j, k])
+                    Ez[m, i, j, k] = updatecoeffsE[materialEz, 0] * Ez[m, i, j, k] + updatecoeffsE[materialEz, 1] * (Hy[m, i, j, k] - Hy[m, i - 1, j, k]) - updatecoeffsE[materialEz, 2] * (Hx[m, i, j, k] - Hx[m, i, j - 1, k])
+                materialEz = ID[2, i, j, 0]
+                Ez[m, i, j, 0] = updatecoeffsE[materialEz, 0] * Ez[m, i, j, 0] + updatecoeffsE[materialEz, 1] * (Hy[m, i, j, 0] - Hy[m, i - 1, j, 0]) - updatecoeffsE[materialEz, 2] * (Hx[m, i, j, 0] - Hx[m, i, j - 1, 0])
+            elif j > 0:
+                for k in range(1, nz):
+                    materialEx = ID[0, i, j, k]
+                    Ex[m, i, j, k] = updatecoeffsE[materialEx, 0] * Ex[m, i, j, k] + updatecoeffsE[materialEx, 2] * (Hz[m, i, j, k] - Hz[m, i, j - 1, k]) - updatecoeffsE[materialEx, 3] * (Hy[m, i, j, k] - Hy[m, i, j, k - 1])
+            elif i > 0:
+                for k in range(1, nz):
+                    materialEy = ID[1, i, j, k]
+                    Ey[m, i, j, k] = updatecoeffsE[materialEy, 0] * Ey[m, i, j, k] + updatecoeffsE[materialEy, 3] * (Hx[m, i, j, k] - Hx[m, i, j, k - 1]) - updatecoeffsE[materialEy, 1] * (Hz[m, i, j, k] - Hz[m, i - 1, j, k])
+
+
+@cython.cdivision(True)
+cpdef void update_magnetic_batch(
+                    int nx,
+                    int ny,
+                    int nz,
+                    int nthreads,
+                    floattype_t[:, ::1] updatecoeffsH,
+                    idtype_t[:, :, :, ::1] ID,
+                    floattype_t[:, :, :, ::1] Ex,
+                    floattype_t[:, :, :, ::1] Ey,
+                    floattype_t[:, :, :, ::1] Ez,
+                    floattype_t[:, :, :, ::1] Hx,
+                    floattype_t[:, :, :, ::1] Hy,
+                    floattype_t[:, :, :, ::1] Hz
+            ) noexcept nogil:
+    """This function updates the magnetic field components of a batch of models with the same geometry
+        (see update_electric_batch).
+
+    Args:
+        nx, ny, nz (int): Grid size in cells
+        nthreads (int): Number of threads to use
+        updatecoeffs, ID, E, H (memoryviews): Access to update coeffients, ID and field component arrays
+    """
+
+    cdef Py_ssize_t i, j, k, m, n
+    cdef Py_ssize_t nmodels = Ex.shape[0]
+    cdef int materialHx, materialHy, materialHz
+    # 3D - the edges updated are the same as in update_magnetic
+    if nx > 1 and ny > 1 and nz > 1:
+        for n in prange(0, nx * ny, nogil=True, schedule='static', num_threads=nthreads):
+            i = n // ny
+            j = n - i * ny
+            for m in range(0, nmodels):
+                for k in range(0, nz):
+                    materialHx = ID[3, i + 1, j, k]
+                    materialHy = ID[4, i, j + 1, k]
+                    materialHz = ID[5, i, j, k + 1]
+                    Hx[m, i + 1, j, k] = updatecoeffsH[materialHx, 0] * Hx[m, i + 1, j, k] - updatecoeffsH[materialHx, 2] * (Ez[m, i + 1, j + 1, k] - Ez[m, i + 1, j, k]) + updatecoeffsH[materialHx, 3] * (Ey[m, i + 1, j, k + 1] - Ey[m, i + 1, j, k])
+                    Hy[m, i, j + 1, k] = updatecoeffsH[materialHy, 0] * Hy[m, i, j + 1, k] - updatecoeffsH[materialHy, 3] * (Ex[m, i, j + 1, k + 1] - Ex[m, i, j + 1, k]) + updatecoeffsH[materialHy, 1] * (Ez[m, i + 1, j + 1, k] - Ez[m, i, j + 1, k])
+                    Hz[m, i, j, k + 1] = updatecoeffsH[materialHz, 0] * Hz[m, i, j, k + 1] - updatecoeffsH[materialHz, 1] * (Ey[m, i + 1, j, k + 1] - Ey[m, i, j, k + 1]) + updatecoeffsH[materialHz, 2] * (Ex[m, i, j + 1, k + 1] - Ex[m, i, j, k + 1])
+
+    # 2D - the edges updated are the same as in update_magnetic, i.e. Hx for
+    # i = 1 to nx - 1, Hy for j = 1 to ny - 1, and Hz for k = 1 to nz - 1,
+    # and for 0 to n - 1 in the other directions
+    else:
+        for n in prange(0, nx * ny, nogil=True, schedule='static', num_threads=nthreads):
+            i = n // ny
+            j = n - i * ny
+            for m in range(0, nmodels):
+                if i > 0:
+                    for k in range(0, nz):
+                        materialHx = ID[3, i, j, k]
+                        Hx[m, i, j, k] = updatecoeffsH[materialHx, 0] * Hx[m, i, j, k] - updatecoeffsH[materialHx, 2] * (Ez[m, i, j + 1, k] - Ez[m, i, j, k]) + updatecoeffsH[materialHx, 3] * (Ey[m, i, j, k + 1] - Ey[m, i, j, k])
+                if j > 0:
+                    for k in range(0, nz):
+                        materialHy = ID[4, i, j, k]
+                        Hy[m, i, j, k] = updatecoeffsH[materialHy, 0] * Hy[m, i, j, k] - updatecoeffsH[materialHy, 3] * (Ex[m, i, j, k + 1] - Ex[m, i, j, k]) + updatecoeffsH[materialHy, 1] * (Ez[m, i + 1, j, k] - Ez[m, i, j, k])
+                for k in range(1, nz):
+                    materialHz = ID[5, i, j, k]
+                    Hz[m, i, j, k] = updatecoeffsH[materialHz, 0] * Hz[m, i, j, k] - updatecoeffsH[materialHz, 1] * (Ey[m, i + 1, j, k] - Ey[m, i, j, k]) + updatecoeffsH[materialHz, 2] * (Ex[m, i, j + 1, k] - Ex[m, i, j, k])
+
+
+################
+# Field energy #
+################
+cpdef double field_energy(
+                    int nx,
+                    int ny,
+                    int nz,
+                    int nthreads,
+                    floattype_t[:, :, ::1] Ex,
+                    floattype_t[:, :, ::1] Ey,
+                    floattype_t[:, :, ::1] Ez,
+                    floattype_t[:, :, ::1] Hx,
+                    floattype_t[:, :, ::1] Hy,
+                    floattype_t[:, :, ::1] Hz
+            ):
+    """This function calculates the energy of the electric and magnetic fields (in free space), i.e. the
+        sum over the grid of e0 * E^2 + m0 * H^2 for every field component, which is twice the energy
+        in free space divided by the volume of a cell. It is used to monitor the decay of the fields.
+
+    Args:
+        nx, ny, nz (int): Grid size in cells
+        nthreads (int): Number of threads to use
+        E, H (memoryviews): Access to field component arrays
+
+    Returns:
+        energy (double): Energy of the fields
+    """
+
+    cdef Py_ssize_t i, j, k
+    cdef double energyE = 0, energyH = 0
+
+    for i in prange(0, nx + 1, nogil=True, schedule='static', num_threads=nthreads):
+        for j in range(0, ny + 1):
+            for k in range(0, nz + 1):
+                energyE += <double>Ex[i, j, k] * Ex[i, j, k] + <double>Ey[i, j, k] * Ey[i, j, k] + <double>Ez[i, j, k] * Ez[i, j, k]
+                energyH += <double>Hx[i, j, k] * Hx[i, j, k] + <double>Hy[i, j, k] * Hy[i, j, k] + <double>Hz[i, j, k] * Hz[i, j, k]
+
+    return e0 * energyE + m0 * energyH
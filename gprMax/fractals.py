@@ -16,17 +16,64 @@
 # You should have received a copy of the GNU General Public License
 # along with gprMax.  If not, see <http://www.gnu.org/licenses/>.
 
+import hashlib
+import os
+
 import numpy as np
+from scipy import fft
 
 from gprMax.constants import floattype
-from gprMax.constants import complextype
-from gprMax.fractals_generate_ext import generate_fractal2D
-from gprMax.fractals_generate_ext import generate_fractal3D
+from gprMax.fractals_generate_ext import filter_fractal2D
+from gprMax.fractals_generate_ext import filter_fractal3D
+from gprMax.fractals_generate_ext import build_grass_blades
+from gprMax.fractals_generate_ext import build_grass_roots
 from gprMax.utilities import round_value
 
 np.seterr(divide='raise')
 
 
+def generate_fractal(shape, b, weighting, seed, nthreads):
+    """Generate a 2D or 3D array with a fractal distribution, i.e. random
+        numbers convolved with the fractal function, using real FFTs (in the
+        precision of floattype) so only half of the frequencies are stored.
+
+    Args:
+        shape (tuple): Size of the array.
+        b (float): Constant related to fractal dimension.
+        weighting (array): Weighting vector.
+        seed (int): Seed for the random number generator.
+        nthreads (int): Number of threads to use.
+
+    Returns:
+        fractal (array): Array with a fractal distribution.
+    """
+
+    # Positional vector at centre of array, scaled by weighting
+    v1 = weighting * np.array(shape) / 2
+
+    # Array of random numbers to be convolved with the fractal function,
+    # generated a slice at a time (the same sequence as for the whole array)
+    # to avoid a double precision copy of the array
+    R = np.random.RandomState(seed)
+    A = np.empty(shape, dtype=floattype)
+    for i in range(shape[0]):
+        A[i] = R.randn(*shape[1:])
+
+    # Real FFT
+    A = fft.rfftn(A, workers=nthreads, overwrite_x=True)
+
+    # Generate fractal
+    if len(shape) == 2:
+        filter_fractal2D(shape[0], shape[1], nthreads, b, weighting, v1, A)
+    else:
+        filter_fractal3D(shape[0], shape[1], shape[2], nthreads, b, weighting, v1, A)
+
+    # Inverse real FFT
+    fractal = fft.irfftn(A, s=shape, workers=nthreads, overwrite_x=True)
+
+    return fractal
+
+
 class FractalSurface(object):
     """Fractal surfaces."""
 
@@ -74,27 +121,7 @@ class FractalSurface(object):
         elif self.zs == self.zf:
             surfacedims = (self.nx, self.ny)
 
-        self.fractalsurface = np.zeros(surfacedims, dtype=complextype)
-
-        # Positional vector at centre of array, scaled by weighting
-        v1 = np.array([self.weighting[0] * (surfacedims[0]) / 2, self.weighting[1] * (surfacedims[1]) / 2])
-
-        # 2D array of random numbers to be convolved with the fractal function
-        R = np.random.RandomState(self.seed)
-        A = R.randn(surfacedims[0], surfacedims[1])
-
-        # 2D FFT
-        A = np.fft.fftn(A)
-        # Shift the zero frequency component to the centre of the array
-        A = np.fft.fftshift(A)
-
-        # Generate fractal
-        generate_fractal2D(surfacedims[0], surfacedims[1], G.nthreads, self.b, self.weighting, v1, A, self.fractalsurface)
-
-        # Shift the zero frequency component to start of the array
-        self.fractalsurface = np.fft.ifftshift(self.fractalsurface)
-        # Take the real part (numerical errors can give rise to an imaginary part) of the IFFT
-        self.fractalsurface = np.real(np.fft.ifftn(self.fractalsurface))
+        self.fractalsurface = generate_fractal(surfacedims, self.b, self.weighting, self.seed, G.nthreads).astype(np.float64)
         # Scale the fractal volume according to requested range
         fractalmin = np.amin(self.fractalsurface)
         fractalmax = np.amax(self.fractalsurface)
@@ -156,32 +183,28 @@ class FractalVolume(object):
         # Adjust weighting to account for filter scaling
         self.weighting = np.multiply(self.weighting, filterscaling)
 
-        self.fractalvolume = np.zeros((self.nx, self.ny, self.nz), dtype=complextype)
-
-        # Positional vector at centre of array, scaled by weighting
-        v1 = np.array([self.weighting[0] * self.nx / 2, self.weighting[1] * self.ny / 2, self.weighting[2] * self.nz / 2])
-
-        # 3D array of random numbers to be convolved with the fractal function
-        R = np.random.RandomState(self.seed)
-        A = R.randn(self.nx, self.ny, self.nz)
-
-        # 3D FFT
-        A = np.fft.fftn(A)
-        # Shift the zero frequency component to the centre of the array
-        A = np.fft.fftshift(A)
-
-        # Generate fractal
-        generate_fractal3D(self.nx, self.ny, self.nz, G.nthreads, self.b, self.weighting, v1, A, self.fractalvolume)
+        # Seeded fractals are read from the cache (if there is one) if they
+        # have already been generated
+        if G.fractalcache and self.seed is not None:
+            key = ((self.nx, self.ny, self.nz), self.dimension, tuple(self.weighting), self.seed, np.dtype(floattype).name)
+            cachefile = os.path.join(G.fractalcache, 'fractal_{}.npy'.format(hashlib.sha1(repr(key).encode()).hexdigest()))
+            if os.path.isfile(cachefile):
+                self.fractalvolume = np.load(cachefile)
+            else:
+                self.fractalvolume = generate_fractal((self.nx, self.ny, self.nz), self.b, self.weighting, self.seed, G.nthreads)
+                # Write to a temporary file first, so other models never read a partly written file
+                os.makedirs(G.fractalcache, exist_ok=True)
+                tmpfile = '{}.{}.tmp'.format(cachefile, os.getpid())
+                with open(tmpfile, 'wb') as f:
+                    np.save(f, self.fractalvolume)
+                os.replace(tmpfile, cachefile)
+        else:
+            self.fractalvolume = generate_fractal((self.nx, self.ny, self.nz), self.b, self.weighting, self.seed, G.nthreads)
 
-        # Shift the zero frequency component to the start of the array
-        self.fractalvolume = np.fft.ifftshift(self.fractalvolume)
-        # Take the real part (numerical errors can give rise to an imaginary part) of the IFFT
-        self.fractalvolume = np.real(np.fft.ifftn(self.fractalvolume))
         # Bin fractal values
         bins = np.linspace(np.amin(self.fractalvolume), np.amax(self.fractalvolume), self.nbins)
-        for j in range(self.ny):
-            for k in range(self.nz):
-                self.fractalvolume[:, j, k] = np.digitize(self.fractalvolume[:, j, k], bins, right=True)
+        for i in range(self.nx):
+            self.fractalvolume[i] = np.digitize(self.fractalvolume[i], bins, right=True)
 
     def generate_volume_mask(self):
         """
@@ -219,11 +242,10 @@ class Grass(object):
         self.R5 = np.random.RandomState(self.seed)
         self.R6 = np.random.RandomState(self.seed)
 
-        for i in range(self.numblades):
-            self.geometryparams[i, 0] = 10 + 20 * self.R1.random_sample()
-            self.geometryparams[i, 1] = 10 + 20 * self.R2.random_sample()
-            self.geometryparams[i, 2] = self.R3.choice([-1, 1])
-            self.geometryparams[i, 3] = self.R4.choice([-1, 1])
+        self.geometryparams[:, 0] = 10 + 20 * self.R1.random_sample(self.numblades)
+        self.geometryparams[:, 1] = 10 + 20 * self.R2.random_sample(self.numblades)
+        self.geometryparams[:, 2] = self.R3.choice([-1, 1], self.numblades)
+        self.geometryparams[:, 3] = self.R4.choice([-1, 1], self.numblades)
 
     def calculate_blade_geometry(self, blade, height):
         """Calculates the x and y coordinates for a given height of grass blade.
@@ -260,3 +282,43 @@ class Grass(object):
         y = round(self.geometryparams[root, 5])
 
         return x, y
+
+    def build_blades(self, mask, heights, sa, sb, cs, cf):
+        """Builds the blades of grass on a surface of a fractal box, i.e. sets
+            the mask for grass, with the same geometry as
+            calculate_blade_geometry.
+
+        Args:
+            mask (array): Mask of the fractal box, with its axes permuted so
+                            that the last axis is normal to the surface.
+            heights (array): Height of each blade of grass (zero if there is no blade).
+            sa, sb (int): Offset of the surface in the first and second axes of the mask.
+            cs (int): Start of the fractal box in the direction normal to the surface.
+            cf (int): Maximum height of the blades of grass.
+        """
+
+        build_grass_blades(sa, sb, cs, cf, heights, self.geometryparams, mask)
+
+    def build_roots(self, mask, heights, sa, sb, cs, cf, originalcf):
+        """Builds the roots of grass under a surface of a fractal box, i.e. sets
+            the mask for grass, with the same geometry (and random numbers) as
+            calculate_root_geometry.
+
+        Args:
+            mask (array): Mask of the fractal box, with its axes permuted so
+                            that the last axis is normal to the surface.
+            heights (array): Height of each blade of grass (zero if there is no blade).
+            sa, sb (int): Offset of the surface in the first and second axes of the mask.
+            cs, cf (int): Start and end of the fractal box in the direction normal to the surface.
+            originalcf (int): End of the fractal box (before any grass) in the direction normal to the surface.
+        """
+
+        # Random numbers for the most steps the roots can take, i.e. from the
+        # end of the fractal box down to the depth of each root
+        depths = heights[heights > 0]
+        steps = cf - np.maximum(np.floor(originalcf - (depths - originalcf)) + 1, cs + 1)
+        nsteps = int(np.sum(np.maximum(steps, 0)))
+        R5 = self.R5.random_sample(nsteps)
+        R6 = self.R6.random_sample(nsteps)
+
+        build_grass_roots(sa, sb, cs, cf, originalcf, heights, self.geometryparams, R5, R6, mask)
@@ -19,44 +19,101 @@
 import numpy as np
 cimport numpy as np
 from cython.parallel import prange
+from libc.math cimport floor, rint, sqrt
 
 from gprMax.constants cimport complextype_t
+from gprMax.constants cimport floattype_t
 
 
-cpdef void generate_fractal2D(int nx, int ny, int nthreads, int b, np.float64_t[:] weighting, np.float64_t[:] v1, np.complex128_t[:, ::1] A, complextype_t[:, ::1] fractalsurface):
-    """This function generates a fractal surface for a 2D array.
-        
+cdef double squared_component(int i, int n, double weighting, double v1) noexcept nogil:
+    """Calculates the square of the component of the positional vector, scaled
+        by weighting, relative to the centre of the array, for an index of an
+        array where the zero frequency component is at the start of the array,
+        i.e. at the index of the array after shifting the zero frequency
+        component to the centre.
+
+    Args:
+        i (int): Index in the array.
+        n (int): Size of the array.
+        weighting (double): Weighting of the direction.
+        v1 (double): Component of positional vector at centre of array, scaled by weighting.
+
+    Returns:
+        v (double): Square of the component of the positional vector.
+    """
+
+    cdef float v2
+
+    # Positional vector for the position in the shifted array
+    v2 = weighting * ((i + n // 2) % n)
+
+    return (v2 - v1)**2
+
+
+cdef double fractal_weight(double rr2, int b) noexcept nogil:
+    """Calculates the fractal function for a squared distance from the centre
+        of the array.
+
+    Args:
+        rr2 (double): Square of norm of positional vector relative to centre of the array.
+        b (int): Constant related to fractal dimension.
+
+    Returns:
+        weight (double): Value of fractal function.
+    """
+
+    cdef int n
+    cdef float rr
+    cdef double rrb = 1
+
+    rr = sqrt(rr2)
+
+    # Catch potential divide by zero
+    if rr == 0:
+        rr = 0.9
+
+    # Integer power of norm
+    for n in range(b if b > 0 else -b):
+        rrb *= rr
+    if b < 0:
+        rrb = 1 / rrb
+
+    return 1 / rrb
+
+
+cpdef void filter_fractal2D(int nx, int ny, int nthreads, int b, np.float64_t[:] weighting, np.float64_t[:] v1, complextype_t[:, ::1] A):
+    """This function applies the fractal function to the real FFT of a 2D
+        array of random numbers, in place. The fractal function is averaged
+        with its value for the negative frequency, so that the filtered
+        array is the FFT of a real array (the real part of the IFFT of
+        filtering the full FFT).
+
     Args:
         nx, ny (int): Fractal surface size in cells
         nthreads (int): Number of threads to use
         b (int): Constant related to fractal dimension
         weighting (memoryview): Access to weighting vector
         v1 (memoryview): Access to positional vector at centre of array, scaled by weighting
-        A (memoryview): Access to array containing random numbers (to be convolved with fractal function)
-        fractalsurface (memoryview): Access to array containing fractal surface data
+        A (memoryview): Access to array containing real FFT of random numbers, i.e. ny // 2 + 1 frequencies in the last direction
     """
 
     cdef Py_ssize_t i, j
-    cdef float v2x, v2y, rr
+    cdef double x, xneg
 
     for i in prange(nx, nogil=True, schedule='static', num_threads=nthreads):
-        for j in range(ny):
-                # Positional vector for current position
-                v2x = weighting[0] * i
-                v2y = weighting[1] * j
-
-                # Calulate norm of v2 - v1
-                rr = ((v2x - v1[0])**2 + (v2y - v1[1])**2)**(1/2)
-
-                # Catch potential divide by zero
-                if rr == 0:
-                    rr = 0.9
+        x = squared_component(i, nx, weighting[0], v1[0])
+        xneg = squared_component((nx - i) % nx, nx, weighting[0], v1[0])
+        for j in range(A.shape[1]):
+            A[i, j] = A[i, j] * ((fractal_weight(x + squared_component(j, ny, weighting[1], v1[1]), b)
+                                  + fractal_weight(xneg + squared_component((ny - j) % ny, ny, weighting[1], v1[1]), b)) / 2)
 
-                fractalsurface[i, j] = A[i, j] * 1 / (rr**b)
 
-
-cpdef void generate_fractal3D(int nx, int ny, int nz, int nthreads, int b, np.float64_t[:] weighting, np.float64_t[:] v1, np.complex128_t[:, :, ::1] A, complextype_t[:, :, ::1] fractalvolume):
-    """This function generates a fractal volume for a 3D array.
+cpdef void filter_fractal3D(int nx, int ny, int nz, int nthreads, int b, np.float64_t[:] weighting, np.float64_t[:] v1, complextype_t[:, :, ::1] A):
+    """This function applies the fractal function to the real FFT of a 3D
+        array of random numbers, in place. The fractal function is averaged
+        with its value for the negative frequency, so that the filtered
+        array is the FFT of a real array (the real part of the IFFT of
+        filtering the full FFT).
 
     Args:
         nx, ny, nz (int): Fractal volume size in cells
@@ -64,26 +121,120 @@ cpdef void generate_fractal3D(int nx, int ny, int nz, int nthreads, int b, np.fl
         b (int): Constant related to fractal dimension
         weighting (memoryview): Access to weighting vector
         v1 (memoryview): Access to positional vector at centre of array, scaled by weighting
-        A (memoryview): Access to array containing random numbers (to be convolved with fractal function)
-        fractalvolume (memoryview): Access to array containing fractal volume data
+        A (memoryview): Access to array containing real FFT of random numbers, i.e. nz // 2 + 1 frequencies in the last direction
     """
 
     cdef Py_ssize_t i, j, k
-    cdef float v2x, v2y, v2z, rr
+    cdef double x, xneg, xy, xyneg
 
     for i in prange(nx, nogil=True, schedule='static', num_threads=nthreads):
+        x = squared_component(i, nx, weighting[0], v1[0])
+        xneg = squared_component((nx - i) % nx, nx, weighting[0], v1[0])
         for j in range(ny):
-            for k in range(nz):
-                # Positional vector for current position
-                v2x = weighting[0] * i
-                v2y = weighting[1] * j
-                v2z = weighting[2] * k
+            xy = x + squared_component(j, ny, weighting[1], v1[1])
+            xyneg = xneg + squared_component((ny - j) % ny, ny, weighting[1], v1[1])
+            for k in range(A.shape[2]):
+                A[i, j, k] = A[i, j, k] * ((fractal_weight(xy + squared_component(k, nz, weighting[2], v1[2]), b)
+                                            + fractal_weight(xyneg + squared_component((nz - k) % nz, nz, weighting[2], v1[2]), b)) / 2)
+
+
+cdef int blade_offset(double direction, double curvature, int height) noexcept nogil:
+    """Calculates the offset of a blade of grass at a given height, rounded to
+        the nearest cell (half values are rounded towards zero), as in
+        Grass.calculate_blade_geometry.
+
+    Args:
+        direction (double): Direction (-1 or 1) the blade curves in.
+        curvature (double): Constant that controls the curvature of the blade.
+        height (int): Height of grass blade.
+
+    Returns:
+        offset (int): Offset of grass blade.
+    """
 
-                # Calulate norm of v2 - v1
-                rr = ((v2x - v1[0])**2 + (v2y - v1[1])**2 + (v2z - v1[2])**2)**(1/2)
+    cdef double x, magnitude, rounded
 
-                # Catch potential divide by zero
-                if rr == 0:
-                    rr = 0.9
+    x = direction * (height / curvature) * (height / curvature)
+    magnitude = x if x >= 0 else -x
+    rounded = floor(magnitude)
+    if magnitude - rounded > 0.5:
+        rounded += 1
+
+    return <int>rounded if x >= 0 else -<int>rounded
+
+
+cpdef void build_grass_blades(int sa, int sb, int cs, int cf, np.float64_t[:, ::1] heights, floattype_t[:, ::1] geometryparams, np.int8_t[:, :, :] mask):
+    """This function builds the blades of grass on a surface of a fractal box,
+        i.e. sets the mask of the fractal box for grass, in the same order as
+        the blades are numbered. The mask is a view with its axes permuted so
+        that the last axis is normal to the surface.
+
+    Args:
+        sa, sb (int): Offset of the surface in the first and second axes of the mask
+        cs (int): Start of the fractal box in the direction normal to the surface
+        cf (int): Maximum height of the blades of grass
+        heights (memoryview): Access to array containing height of each blade of grass (zero if there is no blade)
+        geometryparams (memoryview): Access to array containing geometry parameters of the blades of grass
+        mask (memoryview): Access to array containing mask of the fractal box
+    """
+
+    cdef Py_ssize_t a, b, c
+    cdef int blade, height, aa, bb
+
+    blade = 0
+    for a in range(heights.shape[0]):
+        for b in range(heights.shape[1]):
+            if heights[a, b] > 0:
+                height = 0
+                for c in range(cs, cf):
+                    if c < heights[a, b] and mask[a + sa, b + sb, c - cs] != 1:
+                        aa = a + sa + blade_offset(geometryparams[blade, 2], geometryparams[blade, 0], height)
+                        bb = b + sb + blade_offset(geometryparams[blade, 3], geometryparams[blade, 1], height)
+                        # If these coordinates are outwith fractal volume stop building the blade
+                        if aa < 0 or aa >= mask.shape[0] or bb < 0 or bb >= mask.shape[1]:
+                            break
+                        mask[aa, bb, c - cs] = 3
+                        height += 1
+                blade += 1
+
+
+cpdef void build_grass_roots(int sa, int sb, int cs, int cf, int originalcf, np.float64_t[:, ::1] heights, floattype_t[:, ::1] geometryparams, np.float64_t[::1] R5, np.float64_t[::1] R6, np.int8_t[:, :, :] mask):
+    """This function builds the roots of grass under a surface of a fractal
+        box, i.e. sets the mask of the fractal box for grass, in the same order
+        as the roots are numbered. The roots are random walks, which use the
+        random numbers in order as in Grass.calculate_root_geometry. The mask
+        is a view with its axes permuted so that the last axis is normal to the
+        surface.
+
+    Args:
+        sa, sb (int): Offset of the surface in the first and second axes of the mask
+        cs, cf (int): Start and end of the fractal box in the direction normal to the surface
+        originalcf (int): End of the fractal box (before any grass) in the direction normal to the surface
+        heights (memoryview): Access to array containing height of each blade of grass (zero if there is no blade)
+        geometryparams (memoryview): Access to array containing geometry parameters of the roots of grass
+        R5, R6 (memoryview): Access to arrays containing random numbers for the random walks of the roots
+        mask (memoryview): Access to array containing mask of the fractal box
+    """
 
-                fractalvolume[i, j, k] = A[i, j, k] * 1 / (rr**b)
+    cdef Py_ssize_t a, b, c, n
+    cdef int root, aa, bb
+
+    root = 0
+    n = 0
+    for a in range(heights.shape[0]):
+        for b in range(heights.shape[1]):
+            if heights[a, b] > 0:
+                c = cf - 1
+                while c > cs:
+                    if c > originalcf - (heights[a, b] - originalcf) and mask[a + sa, b + sb, c - cs] == 1:
+                        geometryparams[root, 4] = <floattype_t>(<double>geometryparams[root, 4] + (-1 + 2 * R5[n]))
+                        geometryparams[root, 5] = <floattype_t>(<double>geometryparams[root, 5] + (-1 + 2 * R6[n]))
+                        n += 1
+                        aa = a + sa + <int>rint(geometryparams[root, 4])
+                        bb = b + sb + <int>rint(geometryparams[root, 5])
+                        # If these coordinates are outwith the fractal volume stop building the root
+                        if aa < 0 or aa >= mask.shape[0] or bb < 0 or bb >= mask.shape[1]:
+                            break
+                        mask[aa, bb, c - cs] = 3
+                    c -= 1
+                root += 1
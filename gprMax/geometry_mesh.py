@@ -0,0 +1,204 @@
+# Copyright (C) 2015-2018: The University of Edinburgh
+#                 Authors: Craig Warren and Antonis Giannopoulos
+#
+# This file is part of gprMax.
+#
+# gprMax is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gprMax is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gprMax.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+
+import numpy as np
+
+from gprMax.exceptions import CmdInputError
+from gprMax.geometry_primitives_ext import build_triangle_mesh
+
+# Binary STL: 80 byte header, number of triangles, then a normal, three
+# vertices and an attribute byte count for each triangle
+stl_dtype = np.dtype([('normal', '<f4', (3,)),
+                      ('vertices', '<f4', (3, 3)),
+                      ('attribute', '<u2')])
+
+
+def read_stl(filename):
+    """Reads the triangles of a mesh from a binary or ASCII STL file.
+
+    Args:
+        filename (str): Name of STL file.
+
+    Returns:
+        triangles (array): Coordinates of the vertices of the triangles, shape (n, 3, 3).
+    """
+
+    size = os.path.getsize(filename)
+    with open(filename, 'rb') as f:
+        header = f.read(84)
+
+    # Binary files are identified by their size, as the header of some
+    # binary files also starts with 'solid'
+    if len(header) == 84 and size == 84 + stl_dtype.itemsize * int(np.frombuffer(header[80:], dtype='<u4')[0]):
+        data = np.fromfile(filename, dtype=stl_dtype, offset=84)
+        triangles = data['vertices'].astype(np.float64)
+    else:
+        with open(filename, 'r') as f:
+            words = np.array(f.read().split())
+        vertices = np.flatnonzero(words == 'vertex')
+        if len(vertices) % 3:
+            raise CmdInputError('STL file {} has facets without three vertices'.format(filename))
+        try:
+            triangles = words[vertices[:, np.newaxis] + np.arange(1, 4)].astype(np.float64).reshape(-1, 3, 3)
+        except ValueError:
+            raise CmdInputError('STL file {} has vertices with invalid coordinates'.format(filename))
+
+    return triangles
+
+
+def read_obj(filename):
+    """Reads the triangles of a mesh from a Wavefront OBJ file. Faces with more
+        than three vertices are split into triangles, and texture coordinates
+        and normals are ignored.
+
+    Args:
+        filename (str): Name of OBJ file.
+
+    Returns:
+        triangles (array): Coordinates of the vertices of the triangles, shape (n, 3, 3).
+    """
+
+    vertices = []
+    faces = []
+    with open(filename, 'r') as f:
+        for line in f:
+            tmp = line.split()
+            if not tmp:
+                continue
+            elif tmp[0] == 'v':
+                vertices.append([float(value) for value in tmp[1:4]])
+            elif tmp[0] == 'f':
+                # Indices start at 1, or are relative to the last vertex if negative
+                face = []
+                for vertex in tmp[1:]:
+                    index = int(vertex.split('/')[0])
+                    face.append(index - 1 if index > 0 else len(vertices) + index)
+                for n in range(1, len(face) - 1):
+                    faces.append([face[0], face[n], face[n + 1]])
+
+    vertices = np.array(vertices, dtype=np.float64).reshape(-1, 3)
+    faces = np.array(faces, dtype=np.int64).reshape(-1, 3)
+    if np.any((faces < 0) | (faces >= len(vertices))):
+        raise CmdInputError('OBJ file {} has faces with vertices that do not exist'.format(filename))
+
+    return vertices[faces]
+
+
+def read_mesh(filename):
+    """Reads the triangles of a mesh from a STL or OBJ file.
+
+    Args:
+        filename (str): Name of STL or OBJ file.
+
+    Returns:
+        triangles (array): Coordinates of the vertices of the triangles, shape (n, 3, 3).
+    """
+
+    extension = os.path.splitext(filename)[1].lower()
+    if extension == '.stl':
+        triangles = read_stl(filename)
+    elif extension == '.obj':
+        triangles = read_obj(filename)
+    else:
+        raise CmdInputError('Mesh file {} must be either a STL (.stl) or OBJ (.obj) file'.format(filename))
+
+    if len(triangles) == 0:
+        raise CmdInputError('Mesh file {} does not contain any triangles'.format(filename))
+
+    # The inside of the mesh is found from the parity of the number of
+    # crossings of the mesh, so the mesh must be closed, i.e. every edge must
+    # be shared by an even number of triangles
+    openedges = count_open_edges(triangles)
+    if openedges:
+        raise CmdInputError('Mesh file {} is not a closed surface ({} edges are not shared by an even number of triangles)'.format(filename, openedges))
+
+    return triangles
+
+
+def count_open_edges(triangles):
+    """Counts the edges of a triangle mesh that are not shared by an even
+        number of triangles, i.e. edges on holes or boundaries of the mesh.
+        Vertices are matched by their exact coordinates.
+
+    Args:
+        triangles (array): Coordinates of the vertices of the triangles, shape (n, 3, 3).
+
+    Returns:
+        (int): Number of open edges.
+    """
+
+    # Number the vertices, comparing their coordinates as bytes (adding zero
+    # makes any negative zeros positive)
+    coords = np.ascontiguousarray(triangles, dtype=np.float64).reshape(-1, 3) + 0.0
+    coords = coords.view(np.dtype((np.void, coords.itemsize * 3))).ravel()
+    vertices, numbers = np.unique(coords, return_inverse=True)
+    numbers = numbers.reshape(-1, 3).astype(np.int64)
+
+    # Each edge as a single key from its sorted vertex numbers, ignoring edges
+    # of degenerate triangles between a vertex and itself
+    edges = np.sort(np.concatenate((numbers[:, [0, 1]], numbers[:, [1, 2]], numbers[:, [2, 0]])), axis=1)
+    edges = edges[edges[:, 0] != edges[:, 1]]
+    counts = np.unique(edges[:, 0] * len(vertices) + edges[:, 1], return_counts=True)[1]
+
+    return int(np.count_nonzero(counts % 2))
+
+
+def process_mesh(triangles, offset, scale, numID, numIDx, numIDy, numIDz, averaging, G):
+    """Builds the cells inside a closed triangle mesh, which sets values in
+        the solid, rigid and ID arrays. A cell is inside the mesh if its centre
+        is inside the mesh, using the parity of the number of crossings of the
+        mesh along a ray in the z direction.
+
+    Args:
+        triangles (array): Coordinates of the vertices of the triangles, shape (n, 3, 3).
+        offset (array): Coordinates in the model to position the origin of the mesh.
+        scale (float): Factor to scale the coordinates of the mesh to metres.
+        numID, numIDx, numIDy, numIDz (int): Numeric ID of material.
+        averaging (bool): Whether material property averaging will occur for the object.
+        G (class): Grid class instance - holds essential parameters describing the model.
+
+    Returns:
+        extent (array): Lower and upper coordinates of the bounding box of the mesh in the model, shape (2, 3).
+    """
+
+    points = triangles * scale + offset
+    extent = np.array([points.min(axis=(0, 1)), points.max(axis=(0, 1))])
+
+    # Coordinates in cells relative to the centre of cell 0, 0, 0
+    cells = points / np.array([G.dx, G.dy, G.dz]) - 0.5
+
+    # Triangles anticlockwise in the xy-plane, excluding those with no area
+    # in the xy-plane, which a ray in the z direction cannot cross
+    a, b, c = cells[:, 0], cells[:, 1], cells[:, 2]
+    area = (b[:, 0] - a[:, 0]) * (c[:, 1] - a[:, 1]) - (b[:, 1] - a[:, 1]) * (c[:, 0] - a[:, 0])
+    cells = cells[area != 0]
+    clockwise = area[area != 0] < 0
+    cells[clockwise, 1], cells[clockwise, 2] = cells[clockwise, 2], cells[clockwise, 1].copy()
+
+    # Columns of cells with centres in the bounding box of each triangle
+    lower = np.ceil(cells[:, :, :2].min(axis=1))
+    upper = np.floor(cells[:, :, :2].max(axis=1))
+    columns = np.empty((len(cells), 4), dtype=np.int32)
+    columns[:, 0::2] = np.clip(lower, 0, G.solid.shape[:2])
+    columns[:, 1::2] = np.clip(upper, -1, np.array(G.solid.shape[:2]) - 1)
+
+    build_triangle_mesh(np.ascontiguousarray(cells), columns, numID, numIDx, numIDy, numIDz, averaging, G.nthreads, G.solid, G.rigidE, G.rigidH, G.ID)
+
+    return extent
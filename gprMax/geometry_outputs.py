@@ -27,6 +27,7 @@ from gprMax._version import __version__
 from gprMax.geometry_outputs_ext import define_normal_geometry
 from gprMax.geometry_outputs_ext import define_fine_geometry
 from gprMax.utilities import round_value
+from gprMax.yee_cell_setget_rigid_ext import unpack_rigid
 
 
 class GeometryView(object):
@@ -346,36 +347,40 @@ class GeometryObjects(object):
         fdata.attrs['Title'] = G.title
         fdata.attrs['dx, dy, dz'] = (G.dx, G.dy, G.dz)
 
-        # Get minimum and maximum integers of materials in geometry objects volume
-        minmat = np.amin(G.ID[:, self.xs:self.xf + 1, self.ys:self.yf + 1, self.zs:self.zf + 1])
-        maxmat = np.amax(G.ID[:, self.xs:self.xf + 1, self.ys:self.yf + 1, self.zs:self.zf + 1])
+        # Get minimum and maximum integers of materials in geometry objects
+        # volume
+        minmat = np.uint32(np.amin(G.ID[:, self.xs:self.xf + 1, self.ys:self.yf + 1, self.zs:self.zf + 1]))
+        maxmat = np.uint32(np.amax(G.ID[:, self.xs:self.xf + 1, self.ys:self.yf + 1, self.zs:self.zf + 1]))
         fdata['/data'] = G.solid[self.xs:self.xf + 1, self.ys:self.yf + 1, self.zs:self.zf + 1].astype('int16') - minmat
         pbar.update(self.solidsize)
-        fdata['/rigidE'] = G.rigidE[:, self.xs:self.xf + 1, self.ys:self.yf + 1, self.zs:self.zf + 1]
-        fdata['/rigidH'] = G.rigidH[:, self.xs:self.xf + 1, self.ys:self.yf + 1, self.zs:self.zf + 1]
+        # Rigid arrays are unpacked from bit flags to an 8-bit integer for each edge
+        fdata['/rigidE'] = unpack_rigid(G.rigidE[self.xs:self.xf + 1, self.ys:self.yf + 1, self.zs:self.zf + 1])
+        fdata['/rigidH'] = unpack_rigid(G.rigidH[self.xs:self.xf + 1, self.ys:self.yf + 1, self.zs:self.zf + 1])
         pbar.update(self.rigidsize)
-        fdata['/ID'] = G.ID[:, self.xs:self.xf + 1, self.ys:self.yf + 1, self.zs:self.zf + 1] - minmat
+        # ID array is written as 32-bit integers whatever the type of the ID
+        # array of the grid
+        fdata['/ID'] = G.ID[:, self.xs:self.xf + 1, self.ys:self.yf + 1, self.zs:self.zf + 1].astype(np.uint32) - minmat
         pbar.update(self.IDsize)
 
         # Write materials list to a text file
         # This includes all materials in range whether used in volume or not
         fmaterials = open(os.path.abspath(os.path.join(G.inputdirectory, self.materialsfilename)), 'w')
         for numID in range(minmat, maxmat + 1):
-            for material in G.materials:
-                if material.numID == numID:
-                    fmaterials.write('#material: {:g} {:g} {:g} {:g} {}\n'.format(material.er, material.se, material.mr, material.sm, material.ID))
-                    if material.poles > 0:
-                        if 'debye' in material.type:
-                            dispersionstr = '#add_dispersion_debye: {:g} '.format(material.poles)
-                            for pole in range(material.poles):
-                                dispersionstr += '{:g} {:g} '.format(material.deltaer[pole], material.tau[pole])
-                        elif 'lorenz' in material.type:
-                            dispersionstr = '#add_dispersion_lorenz: {:g} '.format(material.poles)
-                            for pole in range(material.poles):
-                                dispersionstr += '{:g} {:g} {:g} '.format(material.deltaer[pole], material.tau[pole], material.alpha[pole])
-                        elif 'drude' in material.type:
-                            dispersionstr = '#add_dispersion_drude: {:g} '.format(material.poles)
-                            for pole in range(material.poles):
-                                dispersionstr += '{:g} {:g} '.format(material.tau[pole], material.alpha[pole])
-                        dispersionstr += material.ID
-                        fmaterials.write(dispersionstr + '\n')
+            material = G.materials.get_by_numID(numID)
+            if material:
+                fmaterials.write('#material: {:g} {:g} {:g} {:g} {}\n'.format(material.er, material.se, material.mr, material.sm, material.ID))
+                if material.poles > 0:
+                    if 'debye' in material.type:
+                        dispersionstr = '#add_dispersion_debye: {:g} '.format(material.poles)
+                        for pole in range(material.poles):
+                            dispersionstr += '{:g} {:g} '.format(material.deltaer[pole], material.tau[pole])
+                    elif 'lorenz' in material.type:
+                        dispersionstr = '#add_dispersion_lorenz: {:g} '.format(material.poles)
+                        for pole in range(material.poles):
+                            dispersionstr += '{:g} {:g} {:g} '.format(material.deltaer[pole], material.tau[pole], material.alpha[pole])
+                    elif 'drude' in material.type:
+                        dispersionstr = '#add_dispersion_drude: {:g} '.format(material.poles)
+                        for pole in range(material.poles):
+                            dispersionstr += '{:g} {:g} '.format(material.tau[pole], material.alpha[pole])
+                    dispersionstr += material.ID
+                    fmaterials.write(dispersionstr + '\n')
@@ -0,0 +1,181 @@
+# Copyright (C) 2015-2018: The University of Edinburgh
+#                 Authors: Craig Warren and Antonis Giannopoulos
+#
+# This file is part of gprMax.
+#
+# gprMax is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gprMax is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gprMax.  If not, see <http://www.gnu.org/licenses/>.
+
+import h5py
+import numpy as np
+
+from gprMax.exceptions import CmdInputError
+from gprMax.geometry_primitives_ext import build_primitives
+from gprMax.utilities import round_values
+
+# Structured array of boxes, cylinders and spheres: x1, y1, z1 and x2, y2, z2
+# are the lower and upper coordinates of a box, or the centres of the faces of
+# a cylinder, or (x1, y1, z1) the centre of a sphere; r is the radius of a
+# cylinder or sphere; averaging is 'y', 'n' or '' (default for volume objects)
+primitive_dtype = np.dtype([('type', 'S8'),
+                            ('x1', np.float64), ('y1', np.float64), ('z1', np.float64),
+                            ('x2', np.float64), ('y2', np.float64), ('z2', np.float64),
+                            ('r', np.float64),
+                            ('material', 'S64'),
+                            ('averaging', 'S1')])
+
+primitivetypes = ['box', 'cylinder', 'sphere']
+
+
+def write_primitives(filename, primitives):
+    """Writes geometry primitives to a HDF5 file that can be read with the
+        #geometry_primitives_read command.
+
+    Args:
+        filename (str): Name of HDF5 file.
+        primitives (array): Structured array of geometry primitives (see primitive_dtype).
+    """
+
+    with h5py.File(filename, 'w') as f:
+        data = np.zeros(np.size(primitives), dtype=primitive_dtype)
+        for field in primitive_dtype.names:
+            data[field] = np.ravel(primitives[field])
+        f.create_dataset('primitives', data=data)
+
+
+def read_primitives(filename):
+    """Reads geometry primitives from a HDF5 file.
+
+    Args:
+        filename (str): Name of HDF5 file.
+
+    Returns:
+        primitives (array): Structured array of geometry primitives (see primitive_dtype).
+    """
+
+    with h5py.File(filename, 'r') as f:
+        if 'primitives' not in f:
+            raise CmdInputError('Geometry primitives file {} does not contain a primitives dataset'.format(filename))
+        primitives = f['primitives'][()]
+
+    return primitives
+
+
+def invalid(message, mask):
+    """Raises an error for geometry primitives that fail a check.
+
+    Args:
+        message (str): Description of the check that failed.
+        mask (array): True for primitives that failed the check.
+    """
+
+    if np.any(mask):
+        indices = np.flatnonzero(mask)
+        listed = ', '.join(str(index) for index in indices[:10])
+        if len(indices) > 10:
+            listed += ', ... ({} in total)'.format(len(indices))
+        raise CmdInputError('Geometry primitive(s) {} {}'.format(listed, message))
+
+
+def process_primitives(primitives, G):
+    """Checks the validity of geometry primitives (boxes, cylinders and
+        spheres), and builds them in one pass, setting the same values in the
+        solid, rigid and ID arrays as the equivalent #box, #cylinder and
+        #sphere commands in the same order.
+
+    Args:
+        primitives (array): Structured array of geometry primitives (see primitive_dtype).
+        G (class): Grid class instance - holds essential parameters describing the model.
+
+    Returns:
+        counts (dict): Number of each type of primitive built.
+    """
+
+    primitives = np.asarray(primitives)
+    missing = [field for field in primitive_dtype.names if field not in (primitives.dtype.names or ())]
+    if missing:
+        raise CmdInputError('Geometry primitives require the field(s) {}'.format(', '.join(missing)))
+    primitives = primitives.ravel()
+
+    # Types of primitives
+    names = np.char.lower(primitives['type'].astype(str))
+    types = np.full(len(primitives), -1, dtype=np.int32)
+    for index, primitivetype in enumerate(primitivetypes):
+        types[names == primitivetype] = index
+    invalid('must be either a box, cylinder or sphere', types < 0)
+    boxes = types == 0
+    cylinders = types == 1
+    spheres = types == 2
+
+    # Materials
+    materialnames, materialindices = np.unique(primitives['material'].astype(str), return_inverse=True)
+    notfound = [name for name in materialnames if name not in G.materials]
+    if notfound:
+        raise CmdInputError('Geometry primitives material(s) {} do not exist'.format(notfound))
+    materials = [G.materials.get(name) for name in materialnames]
+    numIDs = np.array([material.numID for material in materials], dtype=np.int32)[materialindices]
+    averagable = np.array([material.averagable for material in materials], dtype=bool)[materialindices]
+
+    # Averaging
+    flags = np.char.lower(primitives['averaging'].astype(str))
+    invalid('require averaging to be either y or n', ~np.isin(flags, ['y', 'n', '']))
+    averaging = np.where(flags == '', G.averagevolumeobjects, flags == 'y') & averagable
+
+    # Radii of cylinders and spheres
+    r = primitives['r']
+    invalid('require the radius to be a positive value', ~boxes & (r <= 0))
+
+    # Coordinates rounded to cells as for #box, #cylinder and #sphere commands
+    d = np.array([G.dx, G.dy, G.dz])
+    p1 = np.stack((primitives['x1'], primitives['y1'], primitives['z1']), axis=1)
+    p2 = np.stack((primitives['x2'], primitives['y2'], primitives['z2']), axis=1)
+    cells1 = round_values(p1 / d)
+    cells2 = round_values(p2 / d)
+    n = np.array([G.nx, G.ny, G.nz])
+
+    bounds = np.zeros((len(primitives), 6), dtype=np.int32)
+    coords = np.zeros((len(primitives), 6), dtype=np.float32)
+
+    # Boxes
+    invalid('(boxes) the lower coordinates are not within the model domain', boxes & np.any((cells1 < 0) | (cells1 > n), axis=1))
+    invalid('(boxes) the upper coordinates are not within the model domain', boxes & np.any((cells2 < 0) | (cells2 > n), axis=1))
+    invalid('(boxes) the lower coordinates should be less than the upper coordinates', boxes & np.any(cells1 >= cells2, axis=1))
+    bounds[boxes, 0::2] = cells1[boxes]
+    bounds[boxes, 1::2] = cells2[boxes]
+
+    # Cylinders - bounding boxes as in build_cylinder
+    coords[cylinders, :3] = cells1[cylinders] * d
+    coords[cylinders, 3:] = cells2[cylinders] * d
+    lower = np.minimum(coords[cylinders, :3], coords[cylinders, 3:])
+    upper = np.maximum(coords[cylinders, :3], coords[cylinders, 3:])
+    rcyl = r[cylinders].astype(np.float32)[:, np.newaxis]
+    bounds[cylinders, 0::2] = round_values((lower - rcyl) / d.astype(np.float32)) - 1
+    bounds[cylinders, 1::2] = round_values((upper + rcyl) / d.astype(np.float32)) + 1
+
+    # Spheres - centres in cells and bounding boxes as in build_sphere
+    coords[spheres, :3] = cells1[spheres]
+    centres = cells1[spheres].astype(np.float32) * d.astype(np.float32)
+    rsph = r[spheres].astype(np.float32)[:, np.newaxis]
+    bounds[spheres, 0::2] = round_values((centres - rsph) / d.astype(np.float32)) - 1
+    bounds[spheres, 1::2] = round_values((centres + rsph) / d.astype(np.float32)) + 1
+
+    # Set bounds of cylinders and spheres to domain if they are outside
+    volumes = ~boxes
+    bounds[volumes, 0::2] = np.maximum(bounds[volumes, 0::2], 0)
+    bounds[volumes, 1::2] = np.minimum(bounds[volumes, 1::2], G.solid.shape)
+
+    build_primitives(types, bounds, coords, r.astype(np.float32), numIDs, averaging.astype(np.int8), G.dx, G.dy, G.dz, G.nthreads, G.solid, G.rigidE, G.rigidH, G.ID)
+
+    counts = {primitivetype: int(np.count_nonzero(types == index)) for index, primitivetype in enumerate(primitivetypes)}
+
+    return counts
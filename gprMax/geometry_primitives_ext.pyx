@@ -18,8 +18,15 @@
 
 import numpy as np
 cimport numpy as np
+cimport cython
+from cython.parallel import prange
+from cython.parallel import parallel
+from libc.math cimport acos, ceil, cos, sin, sqrt, sqrtf, M_PI
+from libc.stdlib cimport free, malloc
 
 from gprMax.utilities import round_value
+from gprMax.yee_cell_setget_rigid_ext cimport rigidE_t
+from gprMax.yee_cell_setget_rigid_ext cimport rigidH_t
 from gprMax.yee_cell_setget_rigid_ext cimport set_rigid_Ex
 from gprMax.yee_cell_setget_rigid_ext cimport set_rigid_Ey
 from gprMax.yee_cell_setget_rigid_ext cimport set_rigid_Ez
@@ -39,7 +46,7 @@ cpdef bint are_clockwise(
                     float v1y,
                     float v2x,
                     float v2y
-            ):
+            ) noexcept nogil:
     """Find if vector 2 is clockwise relative to vector 1.
 
     Args:
@@ -56,7 +63,7 @@ cpdef bint is_within_radius(
                     float vx,
                     float vy,
                     float radius
-            ):
+            ) noexcept nogil:
     """Check if the point is within a given radius of the centre of the circle.
 
     Args:
@@ -78,7 +85,7 @@ cpdef bint is_inside_sector(
                     float sectorstartangle,
                     float sectorangle,
                     float radius
-            ):
+            ) noexcept nogil:
     """For a point to be inside a circular sector, it has to meet the following tests:
         It has to be positioned anti-clockwise from the start "arm" of the sector
         It has to be positioned clockwise from the end arm of the sector
@@ -99,10 +106,10 @@ cpdef bint is_inside_sector(
 
     cdef float sectorstart1, sectorstart2, sectorend1, sectorend2, relpoint1, relpoint2
 
-    sectorstart1 = radius * np.cos(sectorstartangle)
-    sectorstart2 = radius * np.sin(sectorstartangle)
-    sectorend1 = radius * np.cos(sectorstartangle + sectorangle)
-    sectorend2 = radius * np.sin(sectorstartangle + sectorangle)
+    sectorstart1 = radius * cos(sectorstartangle)
+    sectorstart2 = radius * sin(sectorstartangle)
+    sectorend1 = radius * cos(sectorstartangle + sectorangle)
+    sectorend2 = radius * sin(sectorstartangle + sectorangle)
     relpoint1 = px - ctrx
     relpoint2 = py - ctry
 
@@ -169,10 +176,10 @@ cpdef void build_edge_x(
                     int j,
                     int k,
                     int numIDx,
-                    np.int8_t[:, :, :, ::1] rigidE,
-                    np.int8_t[:, :, :, ::1] rigidH,
+                    rigidE_t[:, :, ::1] rigidE,
+                    rigidH_t[:, :, ::1] rigidH,
                     np.uint32_t[:, :, :, ::1] ID
-            ):
+            ) noexcept nogil:
     """Set x-orientated edges in the rigid and ID arrays for a Yee voxel.
 
     Args:
@@ -190,10 +197,10 @@ cpdef void build_edge_y(
                     int j,
                     int k,
                     int numIDy,
-                    np.int8_t[:, :, :, ::1] rigidE,
-                    np.int8_t[:, :, :, ::1] rigidH,
+                    rigidE_t[:, :, ::1] rigidE,
+                    rigidH_t[:, :, ::1] rigidH,
                     np.uint32_t[:, :, :, ::1] ID
-            ):
+            ) noexcept nogil:
     """Set y-orientated edges in the rigid and ID arrays for a Yee voxel.
 
     Args:
@@ -211,10 +218,10 @@ cpdef void build_edge_z(
                     int j,
                     int k,
                     int numIDz,
-                    np.int8_t[:, :, :, ::1] rigidE,
-                    np.int8_t[:, :, :, ::1] rigidH,
+                    rigidE_t[:, :, ::1] rigidE,
+                    rigidH_t[:, :, ::1] rigidH,
                     np.uint32_t[:, :, :, ::1] ID
-            ):
+            ) noexcept nogil:
     """Set z-orientated edges in the rigid and ID arrays for a Yee voxel.
 
     Args:
@@ -233,10 +240,10 @@ cpdef void build_face_yz(
                     int k,
                     int numIDy,
                     int numIDz,
-                    np.int8_t[:, :, :, ::1] rigidE,
-                    np.int8_t[:, :, :, ::1] rigidH,
+                    rigidE_t[:, :, ::1] rigidE,
+                    rigidH_t[:, :, ::1] rigidH,
                     np.uint32_t[:, :, :, ::1] ID
-            ):
+            ) noexcept nogil:
     """Set the edges of the yz-plane face of a Yell cell in the rigid and ID arrays.
 
     Args:
@@ -269,10 +276,10 @@ cpdef void build_face_xz(
                     int k,
                     int numIDx,
                     int numIDz,
-                    np.int8_t[:, :, :, ::1] rigidE,
-                    np.int8_t[:, :, :, ::1] rigidH,
+                    rigidE_t[:, :, ::1] rigidE,
+                    rigidH_t[:, :, ::1] rigidH,
                     np.uint32_t[:, :, :, ::1] ID
-            ):
+            ) noexcept nogil:
     """Set the edges of the xz-plane face of a Yell cell in the rigid and ID arrays.
 
     Args:
@@ -305,10 +312,10 @@ cpdef void build_face_xy(
                     int k,
                     int numIDx,
                     int numIDy,
-                    np.int8_t[:, :, :, ::1] rigidE,
-                    np.int8_t[:, :, :, ::1] rigidH,
+                    rigidE_t[:, :, ::1] rigidE,
+                    rigidH_t[:, :, ::1] rigidH,
                     np.uint32_t[:, :, :, ::1] ID
-            ):
+            ) noexcept nogil:
     """Set the edges of the xy-plane face of a Yell cell in the rigid and ID arrays.
 
     Args:
@@ -345,10 +352,10 @@ cpdef void build_voxel(
                     int numIDz,
                     bint averaging,
                     np.uint32_t[:, :, ::1] solid,
-                    np.int8_t[:, :, :, ::1] rigidE,
-                    np.int8_t[:, :, :, ::1] rigidH,
+                    rigidE_t[:, :, ::1] rigidE,
+                    rigidH_t[:, :, ::1] rigidH,
                     np.uint32_t[:, :, :, ::1] ID
-            ):
+            ) noexcept nogil:
     """Set values in the solid, rigid and ID arrays for a Yee voxel.
 
     Args:
@@ -399,6 +406,103 @@ cpdef void build_voxel(
         ID[5, i, j + 1, k] = numIDz
 
 
+cdef bint is_inside_triangle(
+                    int i,
+                    int j,
+                    int normalaxis,
+                    float x1,
+                    float y1,
+                    float z1,
+                    float x2,
+                    float y2,
+                    float z2,
+                    float x3,
+                    float y3,
+                    float z3,
+                    float dx,
+                    float dy,
+                    float dz,
+                    float area,
+                    int sign
+            ) noexcept nogil:
+    """Check if the centre of a cell is inside a triangle, i.e. the areas of
+        the 3 triangles defined by the 3 vertices of the triangle and the
+        point under test.
+
+    Args:
+        i, j (int): Cell coordinates in the plane of the triangle.
+        normalaxis (int): Normal direction to the plane of the triangle (0, 1, 2 for x, y, z).
+        x1, y1, z1, x2, y2, z2, x3, y3, z3 (float): Coordinates of the vertices of the triangle.
+        dx, dy, dz (float): Spatial discretisation.
+        area (float): Area of the triangle.
+        sign (int): Sign of the area of the triangle.
+
+    Returns:
+        (boolean)
+    """
+
+    cdef double ir, jr
+    cdef float s, t
+
+    if normalaxis == 0:
+        ir = (i + 0.5) * dy
+        jr = (j + 0.5) * dz
+        s = sign * (z1 * y3 - y1 * z3 + (z3 - z1) * ir + (y1 - y3) * jr)
+        t = sign * (y1 * z2 - z1 * y2 + (z1 - z2) * ir + (y2 - y1) * jr)
+    elif normalaxis == 1:
+        ir = (i + 0.5) * dx
+        jr = (j + 0.5) * dz
+        s = sign * (z1 * x3 - x1 * z3 + (z3 - z1) * ir + (x1 - x3) * jr)
+        t = sign * (x1 * z2 - z1 * x2 + (z1 - z2) * ir + (x2 - x1) * jr)
+    else:
+        ir = (i + 0.5) * dx
+        jr = (j + 0.5) * dy
+        s = sign * (y1 * x3 - x1 * y3 + (y3 - y1) * ir + (x1 - x3) * jr)
+        t = sign * (x1 * y2 - y1 * x2 + (y1 - y2) * ir + (x2 - x1) * jr)
+
+    return s > 0 and t > 0 and (s + t) < 2 * area * sign
+
+
+cdef void build_prism_voxels(
+                    int i,
+                    int j,
+                    int level,
+                    int thicknesscells,
+                    int normalaxis,
+                    int numID,
+                    int numIDx,
+                    int numIDy,
+                    int numIDz,
+                    bint averaging,
+                    np.uint32_t[:, :, ::1] solid,
+                    rigidE_t[:, :, ::1] rigidE,
+                    rigidH_t[:, :, ::1] rigidH,
+                    np.uint32_t[:, :, :, ::1] ID
+            ) noexcept nogil:
+    """Set values in the solid, rigid and ID arrays for the voxels through the
+        thickness of a prism, e.g. a triangular prism or cylindrical sector.
+
+    Args:
+        i, j (int): Cell coordinates in the plane of the prism.
+        level (int): Cell coordinate of the start of the prism in the normal direction.
+        thicknesscells (int): Thickness of the prism in cells.
+        normalaxis (int): Normal direction to the plane of the prism (0, 1, 2 for x, y, z).
+        numID, numIDx, numIDy, numIDz (int): Numeric ID of material.
+        averaging (bint): Whether material property averaging will occur for the object.
+        solid, rigidE, rigidH, ID (memoryviews): Access to solid, rigid and ID arrays.
+    """
+
+    cdef Py_ssize_t k
+
+    for k in range(level, level + thicknesscells):
+        if normalaxis == 0:
+            build_voxel(k, i, j, numID, numIDx, numIDy, numIDz, averaging, solid, rigidE, rigidH, ID)
+        elif normalaxis == 1:
+            build_voxel(i, k, j, numID, numIDx, numIDy, numIDz, averaging, solid, rigidE, rigidH, ID)
+        else:
+            build_voxel(i, j, k, numID, numIDx, numIDy, numIDz, averaging, solid, rigidE, rigidH, ID)
+
+
 cpdef void build_triangle(
                     float x1,
                     float y1,
@@ -419,9 +523,10 @@ cpdef void build_triangle(
                     int numIDy,
                     int numIDz,
                     bint averaging,
+                    int nthreads,
                     np.uint32_t[:, :, ::1] solid,
-                    np.int8_t[:, :, :, ::1] rigidE,
-                    np.int8_t[:, :, :, ::1] rigidH,
+                    rigidE_t[:, :, ::1] rigidE,
+                    rigidH_t[:, :, ::1] rigidH,
                     np.uint32_t[:, :, :, ::1] ID
             ):
     """
@@ -436,12 +541,13 @@ cpdef void build_triangle(
         dx, dy, dz (float): Spatial discretisation.
         numID, numIDx, numIDy, numIDz (int): Numeric ID of material.
         averaging (bint): Whether material property averaging will occur for the object.
+        nthreads (int): Number of threads to use.
         solid, rigidE, rigidH, ID (memoryviews): Access to solid, rigid and ID arrays.
     """
 
-    cdef Py_ssize_t i, j, k
-    cdef int i1, i2, j1, j2, sign, level, thicknesscells
-    cdef float area, s, t
+    cdef Py_ssize_t i, j
+    cdef int i1, i2, j1, j2, sign, level, thicknesscells, normalaxis
+    cdef float area
 
     # Calculate a bounding box for the triangle
     if normal == 'x':
@@ -470,44 +576,28 @@ cpdef void build_triangle(
         thicknesscells = round_value(thickness / dz)
 
     sign = np.sign(area)
-
-    for i in range(i1, i2):
-        for j in range(j1, j2):
-
-            # Calculate the areas of the 3 triangles defined by the 3 vertices of the main triangle and the point under test
-            if normal == 'x':
-                ir = (i + 0.5) * dy
-                jr = (j + 0.5) * dz
-                s = sign * (z1 * y3 - y1 * z3 + (z3 - z1) * ir + (y1 - y3) * jr);
-                t = sign * (y1 * z2 - z1 * y2 + (z1 - z2) * ir + (y2 - y1) * jr);
-            elif normal == 'y':
-                ir = (i + 0.5) * dx
-                jr = (j + 0.5) * dz
-                s = sign * (z1 * x3 - x1 * z3 + (z3 - z1) * ir + (x1 - x3) * jr);
-                t = sign * (x1 * z2 - z1 * x2 + (z1 - z2) * ir + (x2 - x1) * jr);
-            elif normal == 'z':
-                ir = (i + 0.5) * dx
-                jr = (j + 0.5) * dy
-                s = sign * (y1 * x3 - x1 * y3 + (y3 - y1) * ir + (x1 - x3) * jr);
-                t = sign * (x1 * y2 - y1 * x2 + (y1 - y2) * ir + (x2 - x1) * jr);
-
-            # If these conditions are true then point is inside triangle
-            if s > 0 and t > 0 and (s + t) < 2 * area * sign:
-                if thicknesscells == 0:
-                    if normal == 'x':
-                        build_face_yz(level, i, j, numIDy, numIDz, rigidE, rigidH, ID)
-                    elif normal == 'y':
-                        build_face_xz(i, level, j, numIDx, numIDz, rigidE, rigidH, ID)
-                    elif normal == 'z':
-                        build_face_xy(i, j, level, numIDx, numIDy, rigidE, rigidH, ID)
-                else:
-                    for k in range(level, level + thicknesscells):
-                        if normal == 'x':
-                            build_voxel(k, i, j, numID, numIDx, numIDy, numIDz, averaging, solid, rigidE, rigidH, ID)
-                        elif normal == 'y':
-                            build_voxel(i, k, j, numID, numIDx, numIDy, numIDz, averaging, solid, rigidE, rigidH, ID)
-                        elif normal == 'z':
-                            build_voxel(i, j, k, numID, numIDx, numIDy, numIDz, averaging, solid, rigidE, rigidH, ID)
+    normalaxis = 'xyz'.index(normal)
+
+    # Faces (zero thickness) set edges in the rigid arrays of neighbouring
+    # cells, so they are built by a single thread. Voxels only set the rigid
+    # arrays of their own cell (and the same ID values in neighbouring
+    # cells), so rows of voxels are built in parallel.
+    if thicknesscells == 0:
+        with nogil:
+            for i in range(i1, i2):
+                for j in range(j1, j2):
+                    if is_inside_triangle(i, j, normalaxis, x1, y1, z1, x2, y2, z2, x3, y3, z3, dx, dy, dz, area, sign):
+                        if normalaxis == 0:
+                            build_face_yz(level, i, j, numIDy, numIDz, rigidE, rigidH, ID)
+                        elif normalaxis == 1:
+                            build_face_xz(i, level, j, numIDx, numIDz, rigidE, rigidH, ID)
+                        elif normalaxis == 2:
+                            build_face_xy(i, j, level, numIDx, numIDy, rigidE, rigidH, ID)
+    else:
+        for i in prange(i1, i2, nogil=True, schedule='static', num_threads=nthreads):
+            for j in range(j1, j2):
+                if is_inside_triangle(i, j, normalaxis, x1, y1, z1, x2, y2, z2, x3, y3, z3, dx, dy, dz, area, sign):
+                    build_prism_voxels(i, j, level, thicknesscells, normalaxis, numID, numIDx, numIDy, numIDz, averaging, solid, rigidE, rigidH, ID)
 
 
 cpdef void build_cylindrical_sector(
@@ -527,9 +617,10 @@ cpdef void build_cylindrical_sector(
                     int numIDy,
                     int numIDz,
                     bint averaging,
+                    int nthreads,
                     np.uint32_t[:, :, ::1] solid,
-                    np.int8_t[:, :, :, ::1] rigidE,
-                    np.int8_t[:, :, :, ::1] rigidH,
+                    rigidE_t[:, :, ::1] rigidE,
+                    rigidH_t[:, :, ::1] rigidH,
                     np.uint32_t[:, :, :, ::1] ID
             ):
     """
@@ -551,62 +642,50 @@ cpdef void build_cylindrical_sector(
         dx, dy, dz (float): Spatial discretisation.
         numID, numIDx, numIDy, numIDz (int): Numeric ID of material.
         averaging (bint): Whether material property averaging will occur for the object.
+        nthreads (int): Number of threads to use.
         solid, rigidE, rigidH, ID (memoryviews): Access to solid, rigid and ID arrays.
     """
 
-    cdef Py_ssize_t x, y, z
-    cdef int x1, x2, y1, y2, z1, z2, thicknesscells
-
-    if normal == 'x':
-        # Angles are defined from zero degrees on the positive y-axis going towards positive z-axis
-        y1 = round_value((ctr1 - radius)/dy)
-        y2 = round_value((ctr1 + radius)/dy)
-        z1 = round_value((ctr2 - radius)/dz)
-        z2 = round_value((ctr2 + radius)/dz)
+    cdef Py_ssize_t i, j
+    cdef int i1, i2, j1, j2, thicknesscells, normalaxis
+    cdef float d1, d2
+
+    # Spatial discretisation in the plane of the sector. Angles are defined
+    # from zero degrees on the positive y-axis going towards the positive
+    # z-axis (x normal), or from zero degrees on the positive x-axis going
+    # towards the positive z-axis (y normal) or y-axis (z normal).
+    normalaxis = 'xyz'.index(normal)
+    if normalaxis == 0:
+        d1, d2 = dy, dz
         thicknesscells = round_value(thickness/dx)
-
-        for y in range(y1, y2):
-            for z in range(z1, z2):
-                if is_inside_sector(y * dy + 0.5 * dy, z * dz + 0.5 * dz, ctr1, ctr2, sectorstartangle, sectorangle, radius):
-                    if thicknesscells == 0:
-                        build_face_yz(level, y, z, numIDy, numIDz, rigidE, rigidH, ID)
-                    else:
-                        for x in range(level, level + thicknesscells):
-                            build_voxel(x, y, z, numID, numIDx, numIDy, numIDz, averaging, solid, rigidE, rigidH, ID)
-
-    elif normal == 'y':
-        # Angles are defined from zero degrees on the positive x-axis going towards positive z-axis
-        x1 = round_value((ctr1 - radius)/dx)
-        x2 = round_value((ctr1 + radius)/dx)
-        z1 = round_value((ctr2 - radius)/dz)
-        z2 = round_value((ctr2 + radius)/dz)
+    elif normalaxis == 1:
+        d1, d2 = dx, dz
         thicknesscells = round_value(thickness/dy)
-
-        for x in range(x1, x2):
-            for z in range(z1, z2):
-                if is_inside_sector(x * dx + 0.5 * dx, z * dz + 0.5 * dz, ctr1, ctr2, sectorstartangle, sectorangle, radius):
-                    if thicknesscells == 0:
-                        build_face_xz(x, level, z, numIDx, numIDz, rigidE, rigidH, ID)
-                    else:
-                        for y in range(level, level + thicknesscells):
-                            build_voxel(x, y, z, numID, numIDx, numIDy, numIDz, averaging, solid, rigidE, rigidH, ID)
-
-    elif normal == 'z':
-        # Angles are defined from zero degrees on the positive x-axis going towards positive y-axis
-        x1 = round_value((ctr1 - radius)/dx)
-        x2 = round_value((ctr1 + radius)/dx)
-        y1 = round_value((ctr2 - radius)/dy)
-        y2 = round_value((ctr2 + radius)/dy)
+    elif normalaxis == 2:
+        d1, d2 = dx, dy
         thicknesscells = round_value(thickness/dz)
-
-        for x in range(x1, x2):
-            for y in range(y1, y2):
-                if is_inside_sector(x * dx + 0.5 * dx, y * dy + 0.5 * dy, ctr1, ctr2, sectorstartangle, sectorangle, radius):
-                    if thicknesscells == 0:
-                        build_face_xy(x, y, level, numIDx, numIDy, rigidE, rigidH, ID)
-                    else:
-                        for z in range(level, level + thicknesscells):
-                            build_voxel(x, y, z, numID, numIDx, numIDy, numIDz, averaging, solid, rigidE, rigidH, ID)
+    i1 = round_value((ctr1 - radius)/d1)
+    i2 = round_value((ctr1 + radius)/d1)
+    j1 = round_value((ctr2 - radius)/d2)
+    j2 = round_value((ctr2 + radius)/d2)
+
+    # Faces are built by a single thread (see build_triangle)
+    if thicknesscells == 0:
+        with nogil:
+            for i in range(i1, i2):
+                for j in range(j1, j2):
+                    if is_inside_sector(i * d1 + 0.5 * d1, j * d2 + 0.5 * d2, ctr1, ctr2, sectorstartangle, sectorangle, radius):
+                        if normalaxis == 0:
+                            build_face_yz(level, i, j, numIDy, numIDz, rigidE, rigidH, ID)
+                        elif normalaxis == 1:
+                            build_face_xz(i, level, j, numIDx, numIDz, rigidE, rigidH, ID)
+                        elif normalaxis == 2:
+                            build_face_xy(i, j, level, numIDx, numIDy, rigidE, rigidH, ID)
+    else:
+        for i in prange(i1, i2, nogil=True, schedule='static', num_threads=nthreads):
+            for j in range(j1, j2):
+                if is_inside_sector(i * d1 + 0.5 * d1, j * d2 + 0.5 * d2, ctr1, ctr2, sectorstartangle, sectorangle, radius):
+                    build_prism_voxels(i, j, level, thicknesscells, normalaxis, numID, numIDx, numIDy, numIDz, averaging, solid, rigidE, rigidH, ID)
 
 
 cpdef void build_box(
@@ -622,8 +701,8 @@ cpdef void build_box(
                     int numIDz,
                     bint averaging,
                     np.uint32_t[:, :, ::1] solid,
-                    np.int8_t[:, :, :, ::1] rigidE,
-                    np.int8_t[:, :, :, ::1] rigidH,
+                    rigidE_t[:, :, ::1] rigidE,
+                    rigidH_t[:, :, ::1] rigidH,
                     np.uint32_t[:, :, :, ::1] ID
             ):
     """Builds #box commands which sets values in the solid, rigid and ID arrays.
@@ -683,6 +762,66 @@ cpdef void build_box(
                     ID[5, i, j, k] = numIDz
 
 
+@cython.cdivision(True)
+cdef bint is_inside_cylinder(
+                    double px,
+                    double py,
+                    double pz,
+                    float x1,
+                    float y1,
+                    float z1,
+                    float x2,
+                    float y2,
+                    float z2,
+                    float f1f2x,
+                    float f1f2y,
+                    float f1f2z,
+                    float f2f1x,
+                    float f2f1y,
+                    float f2f1z,
+                    float f1f2mag,
+                    float f2f1mag,
+                    float r
+            ) noexcept nogil:
+    """Check if a point is inside a cylinder, i.e. if the point is within the
+        radius of the axis of the cylinder, and between the cylinder faces.
+
+    Args:
+        px, py, pz (double): Coordinates of the point.
+        x1, y1, z1, x2, y2, z2 (float): Coordinates of the centres of cylinder faces.
+        f1f2x, f1f2y, f1f2z, f2f1x, f2f1y, f2f1z (float): Vectors between centres of cylinder faces.
+        f1f2mag, f2f1mag (float): Magnitudes of vectors between centres of cylinder faces.
+        r (float): Radius of the cylinder.
+
+    Returns:
+        (boolean)
+    """
+
+    cdef float f1ptx, f1pty, f1ptz, f2ptx, f2pty, f2ptz, f1ptmag, f2ptmag, dot1, dot2, theta1, theta2, distance1, distance2
+
+    # Vectors from centres of cylinder faces to the point, and their magnitudes
+    f1ptx, f1pty, f1ptz = px - x1, py - y1, pz - z1
+    f2ptx, f2pty, f2ptz = px - x2, py - y2, pz - z2
+    f1ptmag = sqrtf(f1ptx * f1ptx + f1pty * f1pty + f1ptz * f1ptz)
+    f2ptmag = sqrtf(f2ptx * f2ptx + f2pty * f2pty + f2ptz * f2ptz)
+
+    if f1ptmag == 0 or f2ptmag == 0:
+        return True
+
+    # Angles between the axis of the cylinder and the vectors to the point
+    # (not a number if rounding puts the cosine of an angle outside -1 to 1)
+    dot1 = f1f2x * f1ptx + f1f2y * f1pty + f1f2z * f1ptz
+    dot2 = f2f1x * f2ptx + f2f1y * f2pty + f2f1z * f2ptz
+    theta1 = acos(dot1 / (f1f2mag * f1ptmag))
+    theta2 = acos(dot2 / (f2f1mag * f2ptmag))
+
+    # Distances from the axis of the cylinder to the point
+    distance1 = f1ptmag * sin(theta1)
+    distance2 = f2ptmag * sin(theta2)
+
+    return (distance1 <= r or distance2 <= r) and theta1 <= M_PI / 2 and theta2 <= M_PI / 2
+
+
 cpdef void build_cylinder(
                     float x1,
                     float y1,
@@ -699,9 +838,10 @@ cpdef void build_cylinder(
                     int numIDy,
                     int numIDz,
                     bint averaging,
+                    int nthreads,
                     np.uint32_t[:, :, ::1] solid,
-                    np.int8_t[:, :, :, ::1] rigidE,
-                    np.int8_t[:, :, :, ::1] rigidH,
+                    rigidE_t[:, :, ::1] rigidE,
+                    rigidH_t[:, :, ::1] rigidH,
                     np.uint32_t[:, :, :, ::1] ID
             ):
     """Builds #cylinder commands which sets values in the solid, rigid and ID arrays for a Yee voxel.
@@ -712,14 +852,13 @@ cpdef void build_cylinder(
         dx, dy, dz (float): Spatial discretisation.
         numID, numIDx, numIDy, numIDz (int): Numeric ID of material.
         averaging (bint): Whether material property averaging will occur for the object.
+        nthreads (int): Number of threads to use.
         solid, rigidE, rigidH, ID (memoryviews): Access to solid, rigid and ID arrays.
     """
 
     cdef Py_ssize_t i, j, k
     cdef int xs, xf, ys, yf, zs, zf
-    cdef float f1f2mag, f2f1mag, f1ptmag, f2ptmag, dot1, dot2, factor1, factor2, theta1, theta2, distance1, distance2
-    cdef bint build
-    cdef np.ndarray f1f2, f2f1, f1pt, f2pt
+    cdef float f1f2x, f1f2y, f1f2z, f2f1x, f2f1y, f2f1z, f1f2mag, f2f1mag
 
     # Calculate a bounding box for the cylinder
     if x1 < x2:
@@ -755,53 +894,46 @@ cpdef void build_cylinder(
     if zf > solid.shape[2]:
         zf = solid.shape[2]
 
-    # Vectors between centres of cylinder faces
-    f1f2 = np.array([x2 - x1, y2 - y1, z2 - z1], dtype=np.float32)
-    f2f1 = np.array([x1 - x2, y1 - y2, z1 - z2], dtype=np.float32)
+    # Vectors between centres of cylinder faces, and their magnitudes
+    f1f2x, f1f2y, f1f2z = x2 - x1, y2 - y1, z2 - z1
+    f2f1x, f2f1y, f2f1z = x1 - x2, y1 - y2, z1 - z2
+    f1f2mag = sqrtf(f1f2x * f1f2x + f1f2y * f1f2y + f1f2z * f1f2z)
+    f2f1mag = sqrtf(f2f1x * f2f1x + f2f1y * f2f1y + f2f1z * f2f1z)
 
-    # Magnitudes
-    f1f2mag = np.sqrt((f1f2*f1f2).sum(axis=0))
-    f2f1mag = np.sqrt((f2f1*f2f1).sum(axis=0))
-
-    for i in range(xs, xf):
+    for i in prange(xs, xf, nogil=True, schedule='static', num_threads=nthreads):
         for j in range(ys, yf):
             for k in range(zs, zf):
-                # Build flag - default false, set to True if point is in cylinder
-                build = 0
-                # Vector from centre of first cylinder face to test point
-                f1pt = np.array([i * dx + 0.5 * dx - x1, j * dy + 0.5 * dy - y1, k * dz + 0.5 * dz - z1], dtype=np.float32)
-                # Vector from centre of second cylinder face to test point
-                f2pt = np.array([i * dx + 0.5 * dx - x2, j * dy + 0.5 * dy - y2, k * dz + 0.5 * dz - z2], dtype=np.float32)
-                # Magnitudes
-                f1ptmag = np.sqrt((f1pt*f1pt).sum(axis=0))
-                f2ptmag = np.sqrt((f2pt*f2pt).sum(axis=0))
-                # Dot products
-                dot1 = np.dot(f1f2, f1pt)
-                dot2 = np.dot(f2f1, f2pt)
-
-                if f1ptmag == 0 or f2ptmag == 0:
-                    build = 1
-                else:
-                    factor1 = dot1 / (f1f2mag * f1ptmag)
-                    factor2 = dot2 / (f2f1mag * f2ptmag)
-                    # Catch cases where either factor1 or factor2 are 1
-                    try:
-                        theta1 = np.arccos(factor1)
-                    except FloatingPointError:
-                        theta1 = 0
-                    try:
-                        theta2 = np.arccos(factor2)
-                    except FloatingPointError:
-                        theta2 = 0
-                    distance1 = f1ptmag * np.sin(theta1)
-                    distance2 = f2ptmag * np.sin(theta2)
-                    if (distance1 <= r or distance2 <= r) and theta1 <= np.pi/2 and theta2 <= np.pi/2:
-                        build = 1
-
-                if build:
+                if is_inside_cylinder(i * dx + 0.5 * dx, j * dy + 0.5 * dy, k * dz + 0.5 * dz, x1, y1, z1, x2, y2, z2, f1f2x, f1f2y, f1f2z, f2f1x, f2f1y, f2f1z, f1f2mag, f2f1mag, r):
                     build_voxel(i, j, k, numID, numIDx, numIDy, numIDz, averaging, solid, rigidE, rigidH, ID)
 
 
+cdef bint is_inside_sphere(
+                    Py_ssize_t i,
+                    Py_ssize_t j,
+                    Py_ssize_t k,
+                    int xc,
+                    int yc,
+                    int zc,
+                    float r,
+                    float dx,
+                    float dy,
+                    float dz
+            ) noexcept nogil:
+    """Check if the centre of a Yee cell is within the radius of a sphere.
+
+    Args:
+        i, j, k (int): Cell coordinates of the Yee cell.
+        xc, yc, zc (int): Cell coordinates of the centre of the sphere.
+        r (float): Radius of the sphere.
+        dx, dy, dz (float): Spatial discretisation.
+
+    Returns:
+        (boolean)
+    """
+
+    return sqrt((i - xc)**2 * dx**2 + (j - yc)**2 * dy**2 + (k - zc)**2 * dz**2) <= r
+
+
 cpdef void build_sphere(
                     int xc,
                     int yc,
@@ -815,9 +947,10 @@ cpdef void build_sphere(
                     int numIDy,
                     int numIDz,
                     bint averaging,
+                    int nthreads,
                     np.uint32_t[:, :, ::1] solid,
-                    np.int8_t[:, :, :, ::1] rigidE,
-                    np.int8_t[:, :, :, ::1] rigidH,
+                    rigidE_t[:, :, ::1] rigidE,
+                    rigidH_t[:, :, ::1] rigidH,
                     np.uint32_t[:, :, :, ::1] ID
             ):
     """Builds #sphere commands which sets values in the solid, rigid and ID arrays for a Yee voxel.
@@ -828,6 +961,7 @@ cpdef void build_sphere(
         dx, dy, dz (float): Spatial discretisation.
         numID, numIDx, numIDy, numIDz (int): Numeric ID of material.
         averaging (bint): Whether material property averaging will occur for the object.
+        nthreads (int): Number of threads to use.
         solid, rigidE, rigidH, ID (memoryviews): Access to solid, rigid and ID arrays.
     """
 
@@ -856,10 +990,10 @@ cpdef void build_sphere(
     if zf > solid.shape[2]:
         zf = solid.shape[2]
 
-    for i in range(xs, xf):
+    for i in prange(xs, xf, nogil=True, schedule='static', num_threads=nthreads):
         for j in range(ys, yf):
             for k in range(zs, zf):
-                if np.sqrt((i - xc)**2 * dx**2 + (j - yc)**2 * dy**2 + (k - zc)**2 * dz**2) <= r:
+                if is_inside_sphere(i, j, k, xc, yc, zc, r, dx, dy, dz):
                     build_voxel(i, j, k, numID, numIDx, numIDy, numIDz, averaging, solid, rigidE, rigidH, ID)
 
 
@@ -871,8 +1005,8 @@ cpdef void build_voxels_from_array(
                     bint averaging,
                     np.int16_t[:, :, ::1] data,
                     np.uint32_t[:, :, ::1] solid,
-                    np.int8_t[:, :, :, ::1] rigidE,
-                    np.int8_t[:, :, :, ::1] rigidH,
+                    rigidE_t[:, :, ::1] rigidE,
+                    rigidH_t[:, :, ::1] rigidH,
                     np.uint32_t[:, :, :, ::1] ID
             ):
     """Builds Yee voxels by reading integers from an array.
@@ -929,8 +1063,8 @@ cpdef void build_voxels_from_array_mask(
                     np.int8_t[:, :, ::1] mask,
                     np.int16_t[:, :, ::1] data,
                     np.uint32_t[:, :, ::1] solid,
-                    np.int8_t[:, :, :, ::1] rigidE,
-                    np.int8_t[:, :, :, ::1] rigidH,
+                    rigidE_t[:, :, ::1] rigidE,
+                    rigidH_t[:, :, ::1] rigidH,
                     np.uint32_t[:, :, :, ::1] ID
             ):
     """Builds Yee voxels by reading integers from an array.
@@ -964,3 +1098,403 @@ cpdef void build_voxels_from_array_mask(
                 elif mask[i - xs, j - ys, k - zs] == 3:
                     numID = numIDx = numIDy = numIDz = grassnumID
                     build_voxel(i, j, k, numID, numIDx, numIDy, numIDz, averaging, solid, rigidE, rigidH, ID)
+
+
+cdef void build_voxel_slabs(
+                    int i,
+                    int j,
+                    int k,
+                    int a0,
+                    int a1,
+                    int numID,
+                    int numIDx,
+                    int numIDy,
+                    int numIDz,
+                    bint averaging,
+                    np.uint32_t[:, :, ::1] solid,
+                    rigidE_t[:, :, ::1] rigidE,
+                    rigidH_t[:, :, ::1] rigidH,
+                    np.uint32_t[:, :, :, ::1] ID
+            ) noexcept nogil:
+    """Set the values that build_voxel sets for a Yee voxel, but only those
+        with an x cell coordinate from a0 to a1 - 1, i.e. in a chunk of
+        yz-plane slabs of the solid, rigid and ID arrays. The voxel must be
+        in the chunk or the slab before it.
+
+    Args:
+        i, j, k (int): Cell coordinates of voxel.
+        a0, a1 (int): x cell coordinates of first slab and after last slab of chunk.
+        numID, numIDx, numIDy, numIDz (int): Numeric ID of material.
+        averaging (bint): Whether material property averaging will occur for the object.
+        solid, rigidE, rigidH, ID (memoryviews): Access to solid, rigid and ID arrays.
+    """
+
+    if i >= a0:
+        solid[i, j, k] = numID
+        if averaging:
+            unset_rigid_E(i, j, k, rigidE)
+            unset_rigid_H(i, j, k, rigidH)
+        else:
+            set_rigid_E(i, j, k, rigidE)
+            set_rigid_H(i, j, k, rigidH)
+
+            ID[0, i, j, k] = numIDx
+            ID[0, i, j + 1, k + 1] = numIDx
+            ID[0, i, j + 1, k] = numIDx
+            ID[0, i, j, k + 1] = numIDx
+
+            ID[1, i, j, k] = numIDy
+            ID[1, i, j, k + 1] = numIDy
+
+            ID[2, i, j, k] = numIDz
+            ID[2, i, j + 1, k] = numIDz
+
+            ID[3, i, j, k] = numIDx
+            ID[3, i, j + 1, k + 1] = numIDx
+            ID[3, i, j + 1, k] = numIDx
+            ID[3, i, j, k + 1] = numIDx
+
+            ID[4, i, j, k] = numIDy
+            ID[4, i, j, k + 1] = numIDy
+
+            ID[5, i, j, k] = numIDz
+            ID[5, i, j + 1, k] = numIDz
+
+    if i + 1 < a1 and not averaging:
+        ID[1, i + 1, j, k + 1] = numIDy
+        ID[1, i + 1, j, k] = numIDy
+
+        ID[2, i + 1, j + 1, k] = numIDz
+        ID[2, i + 1, j, k] = numIDz
+
+        ID[4, i + 1, j, k + 1] = numIDy
+        ID[4, i + 1, j, k] = numIDy
+
+        ID[5, i + 1, j + 1, k] = numIDz
+        ID[5, i + 1, j, k] = numIDz
+
+
+cdef void build_box_slab(
+                    int a,
+                    int xs,
+                    int xf,
+                    int ys,
+                    int yf,
+                    int zs,
+                    int zf,
+                    int numID,
+                    int numIDx,
+                    int numIDy,
+                    int numIDz,
+                    bint averaging,
+                    np.uint32_t[:, :, ::1] solid,
+                    rigidE_t[:, :, ::1] rigidE,
+                    rigidH_t[:, :, ::1] rigidH,
+                    np.uint32_t[:, :, :, ::1] ID
+            ) noexcept nogil:
+    """Set the values that build_box sets for a box, but only those with an
+        x cell coordinate of a, i.e. in the yz-plane slab a of the solid,
+        rigid and ID arrays. The slab must be between xs and xf (inclusive).
+
+    Args:
+        a (int): x cell coordinate of slab.
+        xs, xf, ys, yf, zs, zf (int): Cell coordinates of entire box.
+        numID, numIDx, numIDy, numIDz (int): Numeric ID of material.
+        averaging (bint): Whether material property averaging will occur for the object.
+        solid, rigidE, rigidH, ID (memoryviews): Access to solid, rigid and ID arrays.
+    """
+
+    cdef Py_ssize_t j, k
+
+    if a < xf:
+        for j in range(ys, yf):
+            for k in range(zs, zf):
+                solid[a, j, k] = numID
+                if averaging:
+                    unset_rigid_E(a, j, k, rigidE)
+                    unset_rigid_H(a, j, k, rigidH)
+                else:
+                    set_rigid_E(a, j, k, rigidE)
+                    set_rigid_H(a, j, k, rigidH)
+
+    if averaging:
+        return
+
+    if a < xf:
+        for j in range(ys, yf + 1):
+            for k in range(zs, zf + 1):
+                ID[0, a, j, k] = numIDx
+        for j in range(ys, yf + 1):
+            for k in range(zs, zf):
+                ID[4, a, j, k] = numIDy
+        for j in range(ys, yf):
+            for k in range(zs, zf + 1):
+                ID[5, a, j, k] = numIDz
+
+    for j in range(ys, yf):
+        for k in range(zs, zf + 1):
+            ID[1, a, j, k] = numIDy
+    for j in range(ys, yf + 1):
+        for k in range(zs, zf):
+            ID[2, a, j, k] = numIDz
+    for j in range(ys, yf):
+        for k in range(zs, zf):
+            ID[3, a, j, k] = numIDx
+
+
+cpdef void build_primitives(
+                    int[::1] types,
+                    int[:, ::1] bounds,
+                    float[:, ::1] coords,
+                    float[::1] radii,
+                    int[::1] numIDs,
+                    np.int8_t[::1] averaging,
+                    float dx,
+                    float dy,
+                    float dz,
+                    int nthreads,
+                    np.uint32_t[:, :, ::1] solid,
+                    rigidE_t[:, :, ::1] rigidE,
+                    rigidH_t[:, :, ::1] rigidH,
+                    np.uint32_t[:, :, :, ::1] ID
+            ):
+    """Builds a number of boxes, cylinders and spheres in one pass, setting
+        the same values in the solid, rigid and ID arrays as building them one
+        after another with build_box, build_cylinder and build_sphere, i.e.
+        where primitives overlap the later one wins. The arrays are split into
+        a chunk of yz-plane slabs for each thread, and each thread builds the
+        part of every primitive in its chunk in order.
+
+    Args:
+        types (memoryview): Access to types of primitives (0 box, 1 cylinder, 2 sphere).
+        bounds (memoryview): Access to cell coordinates xs, xf, ys, yf, zs, zf
+                of entire boxes, and bounding boxes of cylinders and spheres.
+        coords (memoryview): Access to coordinates of the centres of the
+                faces of cylinders, and cell coordinates of the centres of spheres.
+        radii (memoryview): Access to radii of cylinders and spheres.
+        numIDs (memoryview): Access to numeric IDs of materials.
+        averaging (memoryview): Access to whether material property averaging will occur for each primitive.
+        dx, dy, dz (float): Spatial discretisation.
+        nthreads (int): Number of threads to use.
+        solid, rigidE, rigidH, ID (memoryviews): Access to solid, rigid and ID arrays.
+    """
+
+    cdef Py_ssize_t c, p, a, i, j, k
+    cdef int xs, xf, ys, yf, zs, zf, xmin, xmax, chunk, a0, a1
+    cdef float x1, y1, z1, x2, y2, z2, f1f2x, f1f2y, f1f2z, f2f1x, f2f1y, f2f1z, f1f2mag, f2f1mag
+
+    if types.shape[0] == 0:
+        return
+
+    # Voxels set ID values in the next slab, so the slabs go up to the upper bounds
+    xmin = np.amin(bounds[:, 0])
+    xmax = np.amax(bounds[:, 1]) + 1
+    chunk = (xmax - xmin + nthreads - 1) // nthreads
+
+    for c in prange(nthreads, nogil=True, schedule='static', num_threads=nthreads):
+        a0 = xmin + c * chunk
+        a1 = min(a0 + chunk, xmax)
+        for p in range(types.shape[0]):
+            xs = bounds[p, 0]
+            xf = bounds[p, 1]
+            if xf < a0 or xs >= a1:
+                continue
+            ys = bounds[p, 2]
+            yf = bounds[p, 3]
+            zs = bounds[p, 4]
+            zf = bounds[p, 5]
+
+            if types[p] == 0:
+                for a in range(max(xs, a0), min(xf + 1, a1)):
+                    build_box_slab(a, xs, xf, ys, yf, zs, zf, numIDs[p], numIDs[p], numIDs[p], numIDs[p], averaging[p], solid, rigidE, rigidH, ID)
+
+            elif types[p] == 1:
+                x1 = coords[p, 0]
+                y1 = coords[p, 1]
+                z1 = coords[p, 2]
+                x2 = coords[p, 3]
+                y2 = coords[p, 4]
+                z2 = coords[p, 5]
+                f1f2x = x2 - x1
+                f1f2y = y2 - y1
+                f1f2z = z2 - z1
+                f2f1x = x1 - x2
+                f2f1y = y1 - y2
+                f2f1z = z1 - z2
+                f1f2mag = sqrtf(f1f2x * f1f2x + f1f2y * f1f2y + f1f2z * f1f2z)
+                f2f1mag = sqrtf(f2f1x * f2f1x + f2f1y * f2f1y + f2f1z * f2f1z)
+                for i in range(max(xs, a0 - 1), min(xf, a1)):
+                    for j in range(ys, yf):
+                        for k in range(zs, zf):
+                            if is_inside_cylinder(i * dx + 0.5 * dx, j * dy + 0.5 * dy, k * dz + 0.5 * dz, x1, y1, z1, x2, y2, z2, f1f2x, f1f2y, f1f2z, f2f1x, f2f1y, f2f1z, f1f2mag, f2f1mag, radii[p]):
+                                build_voxel_slabs(i, j, k, a0, a1, numIDs[p], numIDs[p], numIDs[p], numIDs[p], averaging[p], solid, rigidE, rigidH, ID)
+
+            else:
+                for i in range(max(xs, a0 - 1), min(xf, a1)):
+                    for j in range(ys, yf):
+                        for k in range(zs, zf):
+                            if is_inside_sphere(i, j, k, <int>coords[p, 0], <int>coords[p, 1], <int>coords[p, 2], radii[p], dx, dy, dz):
+                                build_voxel_slabs(i, j, k, a0, a1, numIDs[p], numIDs[p], numIDs[p], numIDs[p], averaging[p], solid, rigidE, rigidH, ID)
+
+
+cdef double edge_function(
+                    double ax,
+                    double ay,
+                    double bx,
+                    double by,
+                    double px,
+                    double py
+            ) noexcept nogil:
+    """Edge function of the directed edge from vertex a to vertex b at point
+        p, i.e. twice the signed area of the triangle a, b, p, which is
+        positive if p is to the left of the edge. It is evaluated with the
+        vertices in a fixed order, so that for the edge from b to a it is
+        exactly the negative, and a point on an edge shared by two triangles
+        is found to be inside only one of them.
+
+    Args:
+        ax, ay, bx, by (double): Coordinates of the vertices of the edge.
+        px, py (double): Coordinates of the point.
+
+    Returns:
+        e (double): Value of the edge function.
+    """
+
+    if ax < bx or (ax == bx and ay < by):
+        return (bx - ax) * (py - ay) - (by - ay) * (px - ax)
+    else:
+        return -((ax - bx) * (py - by) - (ay - by) * (px - bx))
+
+
+cdef bint is_inside_edge(
+                    double e,
+                    double ax,
+                    double ay,
+                    double bx,
+                    double by
+            ) noexcept nogil:
+    """Check if a point is inside an edge of an anticlockwise triangle, using
+        the top-left rule for points on the edge, i.e. they are inside left
+        edges (going downwards) and top edges (horizontal and going left).
+
+    Args:
+        e (double): Value of the edge function at the point.
+        ax, ay, bx, by (double): Coordinates of the vertices of the edge.
+
+    Returns:
+        (boolean)
+    """
+
+    return e > 0 or (e == 0 and (by < ay or (by == ay and bx < ax)))
+
+
+cpdef void build_triangle_mesh(
+                    double[:, :, ::1] triangles,
+                    int[:, ::1] columns,
+                    int numID,
+                    int numIDx,
+                    int numIDy,
+                    int numIDz,
+                    bint averaging,
+                    int nthreads,
+                    np.uint32_t[:, :, ::1] solid,
+                    rigidE_t[:, :, ::1] rigidE,
+                    rigidH_t[:, :, ::1] rigidH,
+                    np.uint32_t[:, :, :, ::1] ID
+            ):
+    """Builds the Yee voxels inside a closed triangle mesh, which sets values
+        in the solid, rigid and ID arrays. A ray is cast in the z direction
+        through the centres of each column of cells, and the cells between
+        pairs of crossings of the mesh (odd parity) are inside. The triangles
+        that can be crossed by the ray of each column are indexed before
+        the columns are built in parallel.
+
+    Args:
+        triangles (memoryview): Access to coordinates of the vertices of the
+                triangles (anticlockwise in the xy-plane), in cells relative
+                to the centre of cell 0, 0, 0.
+        columns (memoryview): Access to ranges of columns i0, i1, j0, j1
+                (inclusive) with centres in the bounding box of each triangle.
+        numID, numIDx, numIDy, numIDz (int): Numeric ID of material.
+        averaging (bint): Whether material property averaging will occur for the object.
+        nthreads (int): Number of threads to use.
+        solid, rigidE, rigidH, ID (memoryviews): Access to solid, rigid and ID arrays.
+    """
+
+    cdef Py_ssize_t t, i, j, k, c, q, r
+    cdef int nx, ny, nz, ncrossings, maxcrossings, ks, kf
+    cdef double ax, ay, bx, by, cx, cy, e0, e1, e2, area, w
+    cdef double *crossings
+    cdef np.int64_t[::1] columnstart
+    cdef np.int32_t[::1] columntriangles
+
+    nx = solid.shape[0]
+    ny = solid.shape[1]
+    nz = solid.shape[2]
+
+    # Index of the triangles that can be crossed by the ray of each column
+    columnstart = np.zeros(nx * ny + 1, dtype=np.int64)
+    with nogil:
+        for t in range(triangles.shape[0]):
+            for i in range(columns[t, 0], columns[t, 1] + 1):
+                for j in range(columns[t, 2], columns[t, 3] + 1):
+                    columnstart[i * ny + j + 1] += 1
+        maxcrossings = 0
+        for c in range(nx * ny):
+            if columnstart[c + 1] > maxcrossings:
+                maxcrossings = columnstart[c + 1]
+            columnstart[c + 1] += columnstart[c]
+    columntriangles = np.zeros(columnstart[nx * ny], dtype=np.int32)
+    fill = np.array(columnstart[:nx * ny], dtype=np.int64)
+    cdef np.int64_t[::1] columnfill = fill
+    with nogil:
+        for t in range(triangles.shape[0]):
+            for i in range(columns[t, 0], columns[t, 1] + 1):
+                for j in range(columns[t, 2], columns[t, 3] + 1):
+                    columntriangles[columnfill[i * ny + j]] = t
+                    columnfill[i * ny + j] += 1
+
+    if maxcrossings == 0:
+        return
+
+    with nogil, parallel(num_threads=nthreads):
+        crossings = <double *> malloc(maxcrossings * sizeof(double))
+        for i in prange(nx, schedule='static'):
+            for j in range(ny):
+                # Heights (in cells) where the ray crosses the triangles
+                ncrossings = 0
+                for c in range(columnstart[i * ny + j], columnstart[i * ny + j + 1]):
+                    t = columntriangles[c]
+                    ax = triangles[t, 0, 0]
+                    ay = triangles[t, 0, 1]
+                    bx = triangles[t, 1, 0]
+                    by = triangles[t, 1, 1]
+                    cx = triangles[t, 2, 0]
+                    cy = triangles[t, 2, 1]
+                    e0 = edge_function(bx, by, cx, cy, i, j)
+                    e1 = edge_function(cx, cy, ax, ay, i, j)
+                    e2 = edge_function(ax, ay, bx, by, i, j)
+                    if is_inside_edge(e0, bx, by, cx, cy) and is_inside_edge(e1, cx, cy, ax, ay) and is_inside_edge(e2, ax, ay, bx, by):
+                        area = e0 + e1 + e2
+                        if area > 0:
+                            w = (e0 * triangles[t, 0, 2] + e1 * triangles[t, 1, 2] + e2 * triangles[t, 2, 2]) / area
+                            # Insertion sort of heights
+                            q = ncrossings
+                            while q > 0 and crossings[q - 1] > w:
+                                crossings[q] = crossings[q - 1]
+                                q = q - 1
+                            crossings[q] = w
+                            ncrossings = ncrossings + 1
+
+                # Cells with centres between pairs of crossings (an unpaired
+                # last crossing, from a mesh that is not closed, is ignored)
+                for r in range(0, ncrossings - 1, 2):
+                    ks = <int>ceil(crossings[r])
+                    kf = <int>ceil(crossings[r + 1])
+                    if ks < 0:
+                        ks = 0
+                    if kf > nz:
+                        kf = nz
+                    for k in range(ks, kf):
+                        build_voxel(i, j, k, numID, numIDx, numIDy, numIDz, averaging, solid, rigidE, rigidH, ID)
+        free(crossings)
@@ -19,7 +19,9 @@
 """gprMax.gprMax: provides entry point main()."""
 
 import argparse
+import concurrent.futures
 import datetime
+import multiprocessing
 import os
 import sys
 
@@ -28,6 +30,7 @@ from time import perf_counter
 
 import h5py
 import numpy as np
+import psutil
 
 from gprMax._version import __version__, codename
 from gprMax.constants import c
@@ -37,6 +40,7 @@ from gprMax.constants import z0
 from gprMax.exceptions import GeneralError
 from gprMax.model_build_run import run_model
 from gprMax.utilities import detect_gpus
+from gprMax.utilities import get_cpu_groups
 from gprMax.utilities import get_host_info
 from gprMax.utilities import get_terminal_width
 from gprMax.utilities import human_size
@@ -58,12 +62,21 @@ def main():
     parser.add_argument('-restart', type=int, help='model number to restart from, e.g. when creating B-scan')
     parser.add_argument('-mpi', type=int, help='number of MPI tasks, i.e. master + workers')
     parser.add_argument('--mpi-worker', action='store_true', default=False, help=argparse.SUPPRESS)
+    parser.add_argument('-pool', type=int, help='number of worker processes for a task farm of models on the local machine (without MPI), with the physical CPU cores split between the workers')
     parser.add_argument('-gpu', type=int, action='append', nargs='?', const=True, help='flag to use Nvidia GPU (option to give device ID)')
     parser.add_argument('-benchmark', action='store_true', default=False, help='flag to switch on benchmarking mode')
     parser.add_argument('--geometry-only', action='store_true', default=False, help='flag to only build model and produce geometry file(s)')
     parser.add_argument('--geometry-fixed', action='store_true', default=False, help='flag to not reprocess model geometry, e.g. for B-scans where the geometry is fixed')
     parser.add_argument('--write-processed', action='store_true', default=False, help='flag to write an input file after any Python code and include commands in the original input file have been processed')
     parser.add_argument('--opt-taguchi', action='store_true', default=False, help='flag to optimise parameters using the Taguchi optimisation method')
+    parser.add_argument('--pml-fused', action='store_true', default=False, help='flag to update all PML slabs in a single parallel region, which reduces overheads for small models')
+    parser.add_argument('--solver-compiled', action='store_true', default=False, help='flag to run the time-stepping loop (on CPU) in compiled code, returning to Python only to write snapshots and update the progress bar')
+    parser.add_argument('-tile-planes', default=0, type=int, help='number of x indices (planes) in each tile of the grid for cache-blocked (tiled) updates with the compiled time-stepping loop (0 for no tiling)')
+    parser.add_argument('-tile-steps', default=1, type=int, help='number of iterations to do for each tile with tiled updates (temporal blocking)')
+    parser.add_argument('--light-cone', action='store_true', default=False, help='flag to restrict the field, PML and dispersive updates of the compiled time-stepping loop to the region of the grid the fields from the sources can have reached')
+    parser.add_argument('-batch', type=int, nargs='?', const=0, help='flag to run models with a fixed geometry (--geometry-fixed), e.g. the traces of a B-scan, in batches that are advanced together (option to give the largest number of models in a batch, otherwise up to 4 models chosen from the available memory)')
+    parser.add_argument('-snapshot-queue', default=2, type=int, help='number of snapshots that can wait to be written to file on a background thread while the solver continues (0 to write snapshots without a background thread)')
+    parser.add_argument('-fractal-cache', help='path to a directory to store fractal volumes generated with a seed in, so they are read instead of generated again, e.g. for B-scans or optimisation')
     args = parser.parse_args()
 
     run_main(args)
@@ -75,12 +88,21 @@ def api(
     task=None,
     restart=None,
     mpi=False,
+    pool=None,
     gpu=None,
     benchmark=False,
     geometry_only=False,
     geometry_fixed=False,
     write_processed=False,
-    opt_taguchi=False
+    opt_taguchi=False,
+    pml_fused=False,
+    solver_compiled=False,
+    tile_planes=0,
+    tile_steps=1,
+    light_cone=False,
+    batch=None,
+    snapshot_queue=2,
+    fractal_cache=None
 ):
     """If installed as a module this is the entry point."""
 
@@ -97,12 +119,21 @@ def api(
     args.task = task
     args.restart = restart
     args.mpi = mpi
+    args.pool = pool
     args.gpu = gpu
     args.benchmark = benchmark
     args.geometry_only = geometry_only
     args.geometry_fixed = geometry_fixed
     args.write_processed = write_processed
     args.opt_taguchi = opt_taguchi
+    args.pml_fused = pml_fused
+    args.solver_compiled = solver_compiled
+    args.tile_planes = tile_planes
+    args.tile_steps = tile_steps
+    args.light_cone = light_cone
+    args.batch = batch
+    args.snapshot_queue = snapshot_queue
+    args.fractal_cache = fractal_cache
 
     run_main(args)
 
@@ -150,6 +181,24 @@ def run_main(args):
                 else:
                     args.gpu = next(gpu for gpu in gpus if gpu.deviceID == 0)
 
+        if args.snapshot_queue < 0:
+            raise GeneralError('The number of snapshots that can wait to be written to file must be zero or greater')
+
+        if args.fractal_cache is not None and os.path.exists(args.fractal_cache) and not os.path.isdir(args.fractal_cache):
+            raise GeneralError('The fractal cache {} is not a directory'.format(args.fractal_cache))
+
+        if args.batch is not None:
+            if args.batch < 0:
+                raise GeneralError('The largest number of models in a batch must be zero (to choose it from the available memory) or greater')
+            if not args.geometry_fixed or args.gpu is not None or args.mpi or args.pool or args.task or args.benchmark or args.opt_taguchi or args.geometry_only:
+                raise GeneralError('Batches of models can only be run on CPU with a fixed geometry (--geometry-fixed), and cannot be combined with MPI, task farm (-pool), job array, benchmarking, Taguchi optimisation, or geometry only modes')
+
+        if args.pool is not None:
+            if args.pool < 1:
+                raise GeneralError('The number of workers in a task farm must be one or greater')
+            if args.mpi or args.task or args.benchmark or args.gpu is not None:
+                raise GeneralError('A task farm (-pool) can only be run on CPU, and cannot be combined with MPI, job array, or benchmarking modes')
+
         # Create a separate namespace that users can access in any Python code blocks in the input file
         usernamespace = {'c': c, 'e0': e0, 'm0': m0, 'z0': z0, 'number_model_runs': args.n, 'inputfile': os.path.abspath(inputfile.name)}
 
@@ -183,6 +232,13 @@ def run_main(args):
                     raise GeneralError('MPI cannot be combined with job array mode')
                 run_mpi_sim(args, inputfile, usernamespace)
 
+            # Task farm of worker processes on the local machine for models with
+            # each model parallelised with OpenMP (CPU) on a share of the cores
+            elif args.pool:
+                if args.n == 1:
+                    raise GeneralError('A task farm is not beneficial when there is only one model to run')
+                run_pool_sim(args, inputfile, usernamespace)
+
             # Standard behaviour - models run serially with each model parallelised with OpenMP (CPU) or CUDA (GPU)
             else:
                 if args.task and args.restart:
@@ -218,17 +274,23 @@ def run_std_sim(args, inputfile, usernamespace, optparams=None):
     numbermodelruns = args.n
 
     tsimstart = perf_counter()
-    for currentmodelrun in range(modelstart, modelend):
-        # If Taguchi optimistaion, add specific value for each parameter to
-        # optimise for each experiment to user accessible namespace
-        if optparams:
-            tmp = {}
-            tmp.update((key, value[currentmodelrun - 1]) for key, value in optparams.items())
-            modelusernamespace = usernamespace.copy()
-            modelusernamespace.update({'optparams': tmp})
-        else:
-            modelusernamespace = usernamespace
-        run_model(args, currentmodelrun, modelend - 1, numbermodelruns, inputfile, modelusernamespace)
+
+    # Models with a fixed geometry can be run in batches, in which case all
+    # the models are run by run_model
+    if args.batch is not None:
+        run_model(args, modelstart, modelend - 1, numbermodelruns, inputfile, usernamespace)
+    else:
+        for currentmodelrun in range(modelstart, modelend):
+            # If Taguchi optimistaion, add specific value for each parameter to
+            # optimise for each experiment to user accessible namespace
+            if optparams:
+                tmp = {}
+                tmp.update((key, value[currentmodelrun - 1]) for key, value in optparams.items())
+                modelusernamespace = usernamespace.copy()
+                modelusernamespace.update({'optparams': tmp})
+            else:
+                modelusernamespace = usernamespace
+            run_model(args, currentmodelrun, modelend - 1, numbermodelruns, inputfile, modelusernamespace)
     tsimend = perf_counter()
     simcompletestr = '\n=== Simulation completed in [HH:MM:SS]: {}'.format(datetime.timedelta(seconds=tsimend - tsimstart))
     print('{} {}\n'.format(simcompletestr, '=' * (get_terminal_width() - 1 - len(simcompletestr))))
@@ -431,3 +493,114 @@ def run_mpi_sim(args, inputfile, usernamespace, optparams=None):
 
         # Shutdown
         comm.Disconnect()
+
+
+def run_pool_sim(args, inputfile, usernamespace, optparams=None):
+    """
+    Run task farm simulation on the local machine, i.e. without MPI - pool
+    of worker processes for models with each model parallelised using OpenMP
+    (CPU) on the physical CPU cores of its worker
+
+    Args:
+        args (dict): Namespace with command line arguments
+        inputfile (object): File object for the input file.
+        usernamespace (dict): Namespace that can be accessed by user in any
+                Python code blocks in input file.
+        optparams (dict): Optional argument. For Taguchi optimisation it
+                provides the parameters to optimise and their values.
+    """
+
+    # Set range for number of models to run
+    modelstart = args.restart if args.restart else 1
+    modelend = modelstart + args.n
+    numbermodelruns = args.n
+
+    tsimstart = perf_counter()
+
+    # Split the physical CPU cores between the workers
+    cpugroups = get_cpu_groups(args.pool)
+    print('Task farm (PID {}) using {} workers with {} CPU (OpenMP) threads'.format(os.getpid(), args.pool, ', '.join(str(threads) for cpus, threads in cpugroups)))
+
+    # Copy of command line arguments to send to workers (with the name of the input file rather than the file object)
+    workerargs = argparse.Namespace(**vars(args))
+    workerargs.inputfile = os.path.abspath(inputfile.name)
+
+    # Workers are started afresh rather than forked, so that they do not
+    # inherit the state of OpenMP (or any grid) from this process
+    context = multiprocessing.get_context('spawn')
+    workerqueue = context.Queue()
+    for worker, cpugroup in enumerate(cpugroups):
+        workerqueue.put((worker + 1, cpugroup))
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=args.pool, mp_context=context, initializer=pool_worker_init, initargs=(workerqueue,)) as executor:
+        futures = [executor.submit(run_pool_model, workerargs, currentmodelrun, modelend - 1, numbermodelruns, usernamespace, optparams) for currentmodelrun in range(modelstart, modelend)]
+        for future in concurrent.futures.as_completed(futures):
+            future.result()
+
+    tsimend = perf_counter()
+    print('\nTask farm completed {} models: {:.1f} models/hour'.format(numbermodelruns, 3600 * numbermodelruns / (tsimend - tsimstart)))
+    simcompletestr = '\n=== Simulation completed in [HH:MM:SS]: {}'.format(datetime.timedelta(seconds=tsimend - tsimstart))
+    print('{} {}\n'.format(simcompletestr, '=' * (get_terminal_width() - 1 - len(simcompletestr))))
+
+
+# ID, logical CPUs and number of CPU (OpenMP) threads of a task farm worker
+poolworker = None
+
+
+def pool_worker_init(workerqueue):
+    """
+    Initialise a task farm worker - takes a group of CPU cores, which the
+    worker is bound to, and uses a CPU (OpenMP) thread for each core.
+
+    Args:
+        workerqueue (object): Queue of worker IDs and groups of CPU cores (see get_cpu_groups).
+    """
+
+    global poolworker
+
+    worker, (cpus, threads) = workerqueue.get()
+    poolworker = (worker, cpus, threads)
+
+    os.environ['OMP_NUM_THREADS'] = str(threads)
+    try:
+        psutil.Process().cpu_affinity(cpus)
+    except AttributeError:
+        pass
+
+
+def run_pool_model(args, currentmodelrun, modelend, numbermodelruns, usernamespace, optparams=None):
+    """
+    Run a model on a task farm worker.
+
+    Args:
+        args (dict): Namespace with command line arguments
+        currentmodelrun (int): Current model run number.
+        modelend (int): Number of last model to run.
+        numbermodelruns (int): Total number of model runs.
+        usernamespace (dict): Namespace that can be accessed by user in any
+                Python code blocks in input file.
+        optparams (dict): Optional argument. For Taguchi optimisation it
+                provides the parameters to optimise and their values.
+
+    Returns:
+        tsolve (float): Length of time (seconds) of main FDTD calculations
+    """
+
+    worker, cpus, threads = poolworker
+    print('Task farm worker {} (PID {}) starting model {}/{} with {} CPU (OpenMP) threads'.format(worker, os.getpid(), currentmodelrun, numbermodelruns, threads))
+
+    # If Taguchi optimistaion, add specific value for each parameter to
+    # optimise for each experiment to user accessible namespace
+    if optparams:
+        tmp = {}
+        tmp.update((key, value[currentmodelrun - 1]) for key, value in optparams.items())
+        modelusernamespace = usernamespace.copy()
+        modelusernamespace.update({'optparams': tmp})
+    else:
+        modelusernamespace = usernamespace
+
+    # Run the model
+    with open_path_file(args.inputfile) as inputfile:
+        tsolve = run_model(args, currentmodelrun, modelend, numbermodelruns, inputfile, modelusernamespace)
+
+    return tsolve
@@ -17,11 +17,13 @@
 # along with gprMax.  If not, see <http://www.gnu.org/licenses/>.
 
 from collections import OrderedDict
+import tempfile
 
 from colorama import init
 from colorama import Fore
 from colorama import Style
 init()
+import h5py
 import numpy as np
 np.seterr(invalid='raise')
 
@@ -29,8 +31,10 @@ from gprMax.constants import c
 from gprMax.constants import floattype
 from gprMax.constants import complextype
 from gprMax.materials import Material
+from gprMax.materials import Materials
 from gprMax.pml import PML
 from gprMax.utilities import fft_power
+from gprMax.utilities import memory_usage
 from gprMax.utilities import round_value
 
 
@@ -119,6 +123,12 @@ class FDTDGrid(Grid):
         self.dimension = None
         self.iterations = 0
         self.timewindow = 0
+        # Decay (in decibels) of the fields at which to stop the model early
+        # (or None to run for the whole time window), number of iterations
+        # between checks of the decay, and number of iterations run
+        self.timewindowdecay = None
+        self.timewindowdecayinterval = 100
+        self.iterationsrun = 0
 
         # Ordered dictionary required so that PMLs are always updated in the
         # same order. The order itself does not matter, however, if must be the
@@ -127,13 +137,27 @@ class FDTDGrid(Grid):
         self.pmlthickness = OrderedDict((key, 10) for key in PML.boundaryIDs)
         self.cfs = []
         self.pmls = []
-
-        self.materials = []
+        self.pmlfused = False
+        # Cell coordinates of the edges of dispersive materials for each
+        # electric field component if the temporary dispersive arrays are only
+        # stored for these edges (see find_dispersive_edges)
+        self.dispersiveedges = None
+        self.solvercompiled = False
+        self.tileplanes = 0
+        self.tilesteps = 1
+        self.lightcone = False
+
+        self.materials = Materials()
         self.mixingmodels = []
         self.averagevolumeobjects = True
         self.fractalvolumes = []
+        # Directory to cache fractal volumes generated with a seed in
+        self.fractalcache = None
         self.geometryviews = []
         self.geometryobjectswrite = []
+        # Temporary HDF5 file that the solid and rigid arrays are spilled to
+        # (see release_geometry_arrays)
+        self.geometryarraysfile = None
         self.waveforms = []
         self.voltagesources = []
         self.hertziandipoles = []
@@ -143,21 +167,64 @@ class FDTDGrid(Grid):
         self.srcsteps = [0, 0, 0]
         self.rxsteps = [0, 0, 0]
         self.snapshots = []
+        self.snapshotwriter = None
 
     def initialise_geometry_arrays(self):
         """
         Initialise an array for volumetric material IDs (solid);
-            boolean arrays for specifying whether materials can have dielectric smoothing (rigid);
+            arrays of bit flags for specifying whether materials can have dielectric smoothing (rigid),
+            i.e. one bit for each of the 12 electric and 6 magnetic edges of a cell;
             and an array for cell edge IDs (ID).
         Solid and ID arrays are initialised to free_space (one);
             rigid arrays to allow dielectric smoothing (zero).
         """
         self.solid = np.ones((self.nx, self.ny, self.nz), dtype=np.uint32)
-        self.rigidE = np.zeros((12, self.nx, self.ny, self.nz), dtype=np.int8)
-        self.rigidH = np.zeros((6, self.nx, self.ny, self.nz), dtype=np.int8)
+        self.rigidE = np.zeros((self.nx, self.ny, self.nz), dtype=np.uint16)
+        self.rigidH = np.zeros((self.nx, self.ny, self.nz), dtype=np.uint8)
         self.ID = np.ones((6, self.nx + 1, self.ny + 1, self.nz + 1), dtype=np.uint32)
         self.IDlookup = {'Ex': 0, 'Ey': 1, 'Ez': 2, 'Hx': 3, 'Hy': 4, 'Hz': 5}
 
+    def compact_ID_array(self):
+        """
+        Store the array of cell edge IDs (ID) with the narrowest unsigned
+            integer type that can store the numeric IDs of all the materials,
+            i.e. 8-bit integers for up to 256 materials, and 16-bit integers
+            for up to 65536 materials. The ID array is read by every field
+            update, so this reduces memory usage and memory bandwidth. It must
+            only be called after all the materials have been created.
+        """
+        maxnumID = max(material.numID for material in self.materials)
+        for IDtype in (np.uint8, np.uint16, np.uint32):
+            if maxnumID <= np.iinfo(IDtype).max:
+                break
+        if self.ID.dtype != IDtype:
+            self.ID = self.ID.astype(IDtype)
+
+    def release_geometry_arrays(self, spill=False):
+        """
+        Release the arrays that are only required to build the model, i.e. the
+            volumetric material IDs (solid) and rigid arrays, once the ID array
+            has been built.
+
+        Args:
+            spill (bool): Keep the arrays in a temporary HDF5 file (deleted when
+                    the model is finished with) so they can be restored, e.g.
+                    to write geometry views and geometry objects.
+        """
+        if spill and self.geometryarraysfile is None:
+            self.geometryarraysfile = h5py.File(tempfile.TemporaryFile(), 'w')
+            for name in ('solid', 'rigidE', 'rigidH'):
+                self.geometryarraysfile[name] = getattr(self, name)
+        self.solid = None
+        self.rigidE = None
+        self.rigidH = None
+
+    def restore_geometry_arrays(self):
+        """Restore the solid and rigid arrays from the temporary HDF5 file they were spilled to."""
+        if self.solid is None and self.geometryarraysfile is not None:
+            for name in ('solid', 'rigidE', 'rigidH'):
+                setattr(self, name, self.geometryarraysfile[name][:])
+
     def initialise_field_arrays(self):
         """Initialise arrays for the electric and magnetic field components."""
         self.Ex = np.zeros((self.nx + 1, self.ny + 1, self.nz + 1), dtype=floattype)
@@ -172,11 +239,70 @@ class FDTDGrid(Grid):
         self.updatecoeffsE = np.zeros((len(self.materials), 5), dtype=floattype)
         self.updatecoeffsH = np.zeros((len(self.materials), 5), dtype=floattype)
 
+    def get_material_properties(self):
+        """
+        Get arrays of the constitutive parameters of the materials indexed by
+            numeric ID, e.g. to look up the parameters of the materials in
+            part of the solid array with numpy.take.
+
+        Returns:
+            er, se, mr, sm (array): Relative permittivity, electric conductivity,
+                    relative permeability and magnetic loss of the materials.
+        """
+
+        er = np.zeros(len(self.materials))
+        se = np.zeros(len(self.materials))
+        mr = np.zeros(len(self.materials))
+        sm = np.zeros(len(self.materials))
+        for material in self.materials:
+            er[material.numID] = material.er
+            se[material.numID] = material.se
+            mr[material.numID] = material.mr
+            sm[material.numID] = material.sm
+
+        return er, se, mr, sm
+
+    def find_dispersive_edges(self):
+        """
+        Find the edges of dispersive materials (materials with poles) that are
+            updated for each electric field component, so that the temporary
+            dispersive arrays (Tx, Ty, Tz) can be stored only for these edges
+            rather than for every edge of the grid. The edges are only kept if
+            this requires less memory, i.e. if dispersive materials fill a small
+            enough part of the model. It must only be called after the ID array
+            has been built.
+        """
+        dispersive = np.zeros(len(self.materials), dtype=bool)
+        for material in self.materials:
+            dispersive[material.numID] = material.poles > 0
+
+        # Edges updated for each component start at zero in the direction of
+        # the component and at one in the other directions
+        edges = []
+        for componentID, (xs, ys, zs) in enumerate(((0, 1, 1), (1, 0, 1), (1, 1, 0))):
+            i, j, k = np.nonzero(dispersive[self.ID[componentID, xs:self.nx, ys:self.ny, zs:self.nz]])
+            edges.append(np.column_stack((i + xs, j + ys, k + zs)).astype(np.int32))
+
+        self.dispersiveedges = edges
+        memsparse = memory_usage(self)
+        self.dispersiveedges = None
+        if memsparse < memory_usage(self):
+            self.dispersiveedges = edges
+
     def initialise_dispersive_arrays(self):
-        """Initialise arrays for storing coefficients when there are dispersive materials present."""
-        self.Tx = np.zeros((Material.maxpoles, self.nx + 1, self.ny + 1, self.nz + 1), dtype=complextype)
-        self.Ty = np.zeros((Material.maxpoles, self.nx + 1, self.ny + 1, self.nz + 1), dtype=complextype)
-        self.Tz = np.zeros((Material.maxpoles, self.nx + 1, self.ny + 1, self.nz + 1), dtype=complextype)
+        """
+        Initialise arrays for storing coefficients when there are dispersive materials present.
+            Temporary arrays are stored for every edge and pole, or, if there are edges of dispersive
+            materials (see find_dispersive_edges), for each of these edges and pole with arrays to
+            store the dispersive update of the electric field.
+        """
+        if self.dispersiveedges is None:
+            self.Tx = np.zeros((Material.maxpoles, self.nx + 1, self.ny + 1, self.nz + 1), dtype=complextype)
+            self.Ty = np.zeros((Material.maxpoles, self.nx + 1, self.ny + 1, self.nz + 1), dtype=complextype)
+            self.Tz = np.zeros((Material.maxpoles, self.nx + 1, self.ny + 1, self.nz + 1), dtype=complextype)
+        else:
+            self.Tx, self.Ty, self.Tz = (np.zeros((len(edges), Material.maxpoles), dtype=complextype) for edges in self.dispersiveedges)
+            self.Edispersive = [np.zeros(len(edges), dtype=floattype) for edges in self.dispersiveedges]
         self.updatecoeffsdispersive = np.zeros((len(self.materials), 3 * Material.maxpoles), dtype=complextype)
 
     def gpu_set_blocks_per_grid(self):
@@ -246,9 +372,7 @@ def dispersion_analysis(G):
                     if iterations > G.iterations:
                         iterations = G.iterations
 
-                waveformvalues = np.zeros(G.iterations)
-                for iteration in range(G.iterations):
-                    waveformvalues[iteration] = waveform.calculate_value(iteration * G.dt, G.dt)
+                waveformvalues = waveform.calculate_values(G.dt * np.arange(G.iterations, dtype=np.float64), G.dt)
 
                 # Ensure source waveform is not being overly truncated before attempting any FFT
                 if np.abs(waveformvalues[-1]) < np.abs(np.amax(waveformvalues)) / 100:
@@ -287,7 +411,7 @@ def dispersion_analysis(G):
                 if er > maxer:
                     maxer = er
                     matmaxer = x.ID
-        results['material'] = next(x for x in G.materials if x.ID == matmaxer)
+        results['material'] = G.materials.get(matmaxer)
 
         # Minimum velocity
         minvelocity = c / np.sqrt(maxer)
@@ -342,54 +466,104 @@ def get_other_directions(direction):
 
 
 def Ix(x, y, z, Hx, Hy, Hz, G):
-    """Calculates the x-component of current at a grid position.
+    """Calculates the x-component of current at grid positions.
 
     Args:
-        x, y, z (float): Coordinates of position in grid.
+        x, y, z (int/array): Coordinates of position(s) in grid.
         Hx, Hy, Hz (memory view): numpy array of magnetic field values.
         G (class): Grid class instance - holds essential parameters describing the model.
+
+    Returns:
+        Ix (float/array): Current at the position(s).
     """
 
-    if y == 0 or z == 0:
-        Ix = 0
+    # Differences of magnetic field values are taken at the field precision,
+    # and then scaled by the spatial discretisation at double precision.
+    # A single position (e.g. of a transmission line, every iteration) is
+    # calculated directly.
+    if isinstance(x, (int, np.integer)):
+        if y == 0 or z == 0:
+            return 0
+        return G.dy * float(Hy[x, y, z - 1] - Hy[x, y, z]) + G.dz * float(Hz[x, y, z] - Hz[x, y - 1, z])
 
-    else:
-        Ix = G.dy * (Hy[x, y, z - 1] - Hy[x, y, z]) + G.dz * (Hz[x, y, z] - Hz[x, y - 1, z])
+    # Positions on the lower boundaries use values from the other side of
+    # the grid, which are discarded.
+    Ix = G.dy * (Hy[x, y, z - 1] - Hy[x, y, z]).astype(np.float64) + G.dz * (Hz[x, y, z] - Hz[x, y - 1, z]).astype(np.float64)
 
-    return Ix
+    return np.where((np.asarray(y) == 0) | (np.asarray(z) == 0), 0, Ix)
 
 
 def Iy(x, y, z, Hx, Hy, Hz, G):
-    """Calculates the y-component of current at a grid position.
+    """Calculates the y-component of current at grid positions.
 
     Args:
-        x, y, z (float): Coordinates of position in grid.
+        x, y, z (int/array): Coordinates of position(s) in grid.
         Hx, Hy, Hz (memory view): numpy array of magnetic field values.
         G (class): Grid class instance - holds essential parameters describing the model.
+
+    Returns:
+        Iy (float/array): Current at the position(s).
     """
 
-    if x == 0 or z == 0:
-        Iy = 0
+    if isinstance(x, (int, np.integer)):
+        if x == 0 or z == 0:
+            return 0
+        return G.dx * float(Hx[x, y, z] - Hx[x, y, z - 1]) + G.dz * float(Hz[x - 1, y, z] - Hz[x, y, z])
 
-    else:
-        Iy = G.dx * (Hx[x, y, z] - Hx[x, y, z - 1]) + G.dz * (Hz[x - 1, y, z] - Hz[x, y, z])
+    Iy = G.dx * (Hx[x, y, z] - Hx[x, y, z - 1]).astype(np.float64) + G.dz * (Hz[x - 1, y, z] - Hz[x, y, z]).astype(np.float64)
 
-    return Iy
+    return np.where((np.asarray(x) == 0) | (np.asarray(z) == 0), 0, Iy)
 
 
 def Iz(x, y, z, Hx, Hy, Hz, G):
-    """Calculates the z-component of current at a grid position.
+    """Calculates the z-component of current at grid positions.
 
     Args:
-        x, y, z (float): Coordinates of position in grid.
+        x, y, z (int/array): Coordinates of position(s) in grid.
         Hx, Hy, Hz (memory view): numpy array of magnetic field values.
         G (class): Grid class instance - holds essential parameters describing the model.
+
+    Returns:
+        Iz (float/array): Current at the position(s).
     """
 
-    if x == 0 or y == 0:
-        Iz = 0
+    if isinstance(x, (int, np.integer)):
+        if x == 0 or y == 0:
+            return 0
+        return G.dx * float(Hx[x, y - 1, z] - Hx[x, y, z]) + G.dy * float(Hy[x, y, z] - Hy[x - 1, y, z])
 
-    else:
-        Iz = G.dx * (Hx[x, y - 1, z] - Hx[x, y, z]) + G.dy * (Hy[x, y, z] - Hy[x - 1, y, z])
+    Iz = G.dx * (Hx[x, y - 1, z] - Hx[x, y, z]).astype(np.float64) + G.dy * (Hy[x, y, z] - Hy[x - 1, y, z]).astype(np.float64)
+
+    return np.where((np.asarray(x) == 0) | (np.asarray(y) == 0), 0, Iz)
+
+
+def calculate_currents(i, j, k, Hx, Hy, Hz, G):
+    """Calculates the x, y and z components of current in a (strided)
+        sub-volume of the grid. Currents are zero on the lower boundaries
+        of the grid.
+
+    Args:
+        i, j, k (slice): Cells of the sub-volume (with positive steps).
+        Hx, Hy, Hz (memory view): numpy array of magnetic field values.
+        G (class): Grid class instance - holds essential parameters describing the model.
+
+    Returns:
+        Ix, Iy, Iz (array): Currents indexed [i, j, k].
+    """
+
+    shape = (len(range(i.start, i.stop, i.step)), len(range(j.start, j.stop, j.step)), len(range(k.start, k.stop, k.step)))
+    Ix = np.zeros(shape)
+    Iy = np.zeros(shape)
+    Iz = np.zeros(shape)
+
+    # Cells away from the lower boundaries, the same cells less one, and
+    # their offset into the sub-volume
+    io, jo, ko = (1 if s.start == 0 else 0 for s in (i, j, k))
+    ii, jj, kk = (slice(s.start + o * s.step, s.stop, s.step) for s, o in ((i, io), (j, jo), (k, ko)))
+    iim, jjm, kkm = (slice(s.start - 1, s.stop - 1, s.step) for s in (ii, jj, kk))
+
+    Ix[:, jo:, ko:] = G.dy * (Hy[i, jj, kkm] - Hy[i, jj, kk]).astype(np.float64) + G.dz * (Hz[i, jj, kk] - Hz[i, jjm, kk]).astype(np.float64)
+    Iy[io:, :, ko:] = G.dx * (Hx[ii, j, kk] - Hx[ii, j, kkm]).astype(np.float64) + G.dz * (Hz[iim, j, kk] - Hz[ii, j, kk]).astype(np.float64)
+    Iz[io:, jo:, :] = G.dx * (Hx[ii, jjm, k] - Hx[ii, jj, k]).astype(np.float64) + G.dy * (Hy[ii, jj, k] - Hy[iim, jj, k]).astype(np.float64)
 
-    return Iz
+    return Ix, Iy, Iz
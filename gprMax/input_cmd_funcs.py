@@ -437,6 +437,26 @@ def cylindrical_sector(axis, ctr1, ctr2, t1, t2, radius,
     command('cylindrical_sector', axis, ctr1, ctr2, t1, t2, radius, startingangle, sweptangle, material, averaging)
 
 
+def geometry_primitives(primitives, filename):
+    """Writes boxes, cylinders and spheres to a HDF5 file, and prints the
+        gprMax #geometry_primitives_read command to build them in one pass.
+
+    Args:
+        primitives (array): Structured array of geometry primitives
+                (see gprMax.geometry_primitives.primitive_dtype).
+        filename (str): Name of HDF5 file.
+
+    Returns:
+        s (str): the printed string
+    """
+
+    from gprMax.geometry_primitives import write_primitives
+
+    write_primitives(filename, primitives)
+
+    return command('geometry_primitives_read', filename)
+
+
 def excitation_file(file1):
     """Prints the #excitation_file: <file1> command.
 
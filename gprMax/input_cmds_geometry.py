@@ -30,6 +30,10 @@ from gprMax.exceptions import CmdInputError
 from gprMax.fractals import FractalSurface
 from gprMax.fractals import FractalVolume
 from gprMax.fractals import Grass
+from gprMax.geometry_mesh import process_mesh
+from gprMax.geometry_mesh import read_mesh
+from gprMax.geometry_primitives import process_primitives
+from gprMax.geometry_primitives import read_primitives
 from gprMax.geometry_primitives_ext import build_edge_x
 from gprMax.geometry_primitives_ext import build_edge_y
 from gprMax.geometry_primitives_ext import build_edge_z
@@ -46,6 +50,7 @@ from gprMax.geometry_primitives_ext import build_voxels_from_array_mask
 from gprMax.materials import Material
 from gprMax.utilities import round_value
 from gprMax.utilities import get_terminal_width
+from gprMax.yee_cell_setget_rigid_ext import pack_rigid
 
 
 def process_geometrycmds(geometry, G):
@@ -128,8 +133,8 @@ def process_geometrycmds(geometry, G):
                 rigidH = f['/rigidH'][:]
                 ID = f['/ID'][:]
                 G.solid[xs:xs + data.shape[0], ys:ys + data.shape[1], zs:zs + data.shape[2]] = data + numexistmaterials
-                G.rigidE[:, xs:xs + rigidE.shape[1], ys:ys + rigidE.shape[2], zs:zs + rigidE.shape[3]] = rigidE
-                G.rigidH[:, xs:xs + rigidH.shape[1], ys:ys + rigidH.shape[2], zs:zs + rigidH.shape[3]] = rigidH
+                G.rigidE[xs:xs + rigidE.shape[1], ys:ys + rigidE.shape[2], zs:zs + rigidE.shape[3]] = pack_rigid(rigidE)
+                G.rigidH[xs:xs + rigidH.shape[1], ys:ys + rigidH.shape[2], zs:zs + rigidH.shape[3]] = pack_rigid(rigidH)
                 G.ID[:, xs:xs + ID.shape[1], ys:ys + ID.shape[2], zs:zs + ID.shape[3]] = ID + numexistmaterials
                 if G.messages:
                     tqdm.write('Geometry objects from file {} inserted at {:g}m, {:g}m, {:g}m, with corresponding materials file {}.'.format(geofile, xs * G.dx, ys * G.dy, zs * G.dz, matfile))
@@ -139,6 +144,89 @@ def process_geometrycmds(geometry, G):
                 if G.messages:
                     tqdm.write('Geometry objects from file (voxels only) {} inserted at {:g}m, {:g}m, {:g}m, with corresponding materials file {}.'.format(geofile, xs * G.dx, ys * G.dy, zs * G.dz, matfile))
 
+        elif tmp[0] == '#geometry_primitives_read:':
+            if len(tmp) != 2:
+                raise CmdInputError("'" + ' '.join(tmp) + "'" + ' requires exactly one parameter')
+
+            primitivesfile = tmp[1]
+
+            # See if geometry primitives file exists at specified path and if not try input file directory
+            if not os.path.isfile(primitivesfile):
+                primitivesfile = os.path.abspath(os.path.join(G.inputdirectory, primitivesfile))
+
+            counts = process_primitives(read_primitives(primitivesfile), G)
+
+            if G.messages:
+                tqdm.write('Geometry primitives from file {} created: {} box(es), {} cylinder(s), {} sphere(s).'.format(primitivesfile, counts['box'], counts['cylinder'], counts['sphere']))
+
+        elif tmp[0] == '#geometry_mesh_read:':
+            if len(tmp) < 7:
+                raise CmdInputError("'" + ' '.join(tmp) + "'" + ' requires at least six parameters')
+
+            # Isotropic case with no user specified averaging
+            elif len(tmp) == 7:
+                materialsrequested = [tmp[6]]
+                averagemesh = G.averagevolumeobjects
+
+            # Isotropic case with user specified averaging
+            elif len(tmp) == 8:
+                materialsrequested = [tmp[6]]
+                if tmp[7].lower() == 'y':
+                    averagemesh = True
+                elif tmp[7].lower() == 'n':
+                    averagemesh = False
+                else:
+                    raise CmdInputError("'" + ' '.join(tmp) + "'" + ' requires averaging to be either y or n')
+
+            # Uniaxial anisotropic case
+            elif len(tmp) == 9:
+                materialsrequested = tmp[6:]
+
+            else:
+                raise CmdInputError("'" + ' '.join(tmp) + "'" + ' too many parameters have been given')
+
+            offset = np.array([float(tmp[1]), float(tmp[2]), float(tmp[3])])
+            scale = float(tmp[4])
+            meshfile = tmp[5]
+
+            if scale <= 0:
+                raise CmdInputError("'" + ' '.join(tmp) + "'" + ' requires the scale to be a positive value')
+
+            # See if mesh file exists at specified path and if not try input file directory
+            if not os.path.isfile(meshfile):
+                meshfile = os.path.abspath(os.path.join(G.inputdirectory, meshfile))
+
+            # Look up requested materials in existing list of material instances
+            materials = [G.materials.get(x) for x in materialsrequested if x in G.materials]
+
+            if len(materials) != len(materialsrequested):
+                notfound = [x for x in materialsrequested if x not in materials]
+                raise CmdInputError("'" + ' '.join(tmp) + "'" + ' material(s) {} do not exist'.format(notfound))
+
+            # Isotropic case
+            if len(materials) == 1:
+                averaging = materials[0].averagable and averagemesh
+                numID = numIDx = numIDy = numIDz = materials[0].numID
+
+            # Uniaxial anisotropic case
+            elif len(materials) == 3:
+                averaging = False
+                numIDx = materials[0].numID
+                numIDy = materials[1].numID
+                numIDz = materials[2].numID
+                # Dielectric-smoothed material from the three materials
+                numID = G.materials.get_or_create_averaged(materials).numID
+
+            triangles = read_mesh(meshfile)
+            extent = process_mesh(triangles, offset, scale, numID, numIDx, numIDy, numIDz, averaging, G)
+
+            if G.messages:
+                if averaging:
+                    dielectricsmoothing = 'on'
+                else:
+                    dielectricsmoothing = 'off'
+                tqdm.write('Triangle mesh from file {} with {} triangles, from {:g}m, {:g}m, {:g}m, to {:g}m, {:g}m, {:g}m, of material(s) {} created, dielectric smoothing is {}.'.format(meshfile, len(triangles), *extent.ravel(), ', '.join(materialsrequested), dielectricsmoothing))
+
         elif tmp[0] == '#edge:':
             if len(tmp) != 8:
                 raise CmdInputError("'" + ' '.join(tmp) + "'" + ' requires exactly seven parameters')
@@ -165,7 +253,7 @@ def process_geometrycmds(geometry, G):
             if xs > xf or ys > yf or zs > zf:
                 raise CmdInputError("'" + ' '.join(tmp) + "'" + ' the lower coordinates should be less than the upper coordinates')
 
-            material = next((x for x in G.materials if x.ID == tmp[7]), None)
+            material = G.materials.get(tmp[7])
 
             if not material:
                 raise CmdInputError('Material with ID {} does not exist'.format(tmp[7]))
@@ -252,7 +340,7 @@ def process_geometrycmds(geometry, G):
                 raise CmdInputError("'" + ' '.join(tmp) + "'" + ' the plate is not specified correctly')
 
             # Look up requested materials in existing list of material instances
-            materials = [y for x in materialsrequested for y in G.materials if y.ID == x]
+            materials = [G.materials.get(x) for x in materialsrequested if x in G.materials]
 
             if len(materials) != len(materialsrequested):
                 notfound = [x for x in materialsrequested if x not in materials]
@@ -366,7 +454,7 @@ def process_geometrycmds(geometry, G):
                 raise CmdInputError("'" + ' '.join(tmp) + "'" + ' the triangle is not specified correctly')
 
             # Look up requested materials in existing list of material instances
-            materials = [y for x in materialsrequested for y in G.materials if y.ID == x]
+            materials = [G.materials.get(x) for x in materialsrequested if x in G.materials]
 
             if len(materials) != len(materialsrequested):
                 notfound = [x for x in materialsrequested if x not in materials]
@@ -384,22 +472,8 @@ def process_geometrycmds(geometry, G):
                     numIDx = materials[0].numID
                     numIDy = materials[1].numID
                     numIDz = materials[2].numID
-                    requiredID = materials[0].ID + '+' + materials[1].ID + '+' + materials[2].ID
-                    averagedmaterial = [x for x in G.materials if x.ID == requiredID]
-                    if averagedmaterial:
-                        numID = averagedmaterial.numID
-                    else:
-                        numID = len(G.materials)
-                        m = Material(numID, requiredID)
-                        m.type = 'dielectric-smoothed'
-                        # Create dielectric-smoothed constituents for material
-                        m.er = np.mean((materials[0].er, materials[1].er, materials[2].er), axis=0)
-                        m.se = np.mean((materials[0].se, materials[1].se, materials[2].se), axis=0)
-                        m.mr = np.mean((materials[0].mr, materials[1].mr, materials[2].mr), axis=0)
-                        m.sm = np.mean((materials[0].mr, materials[1].mr, materials[2].mr), axis=0)
-
-                        # Append the new material object to the materials list
-                        G.materials.append(m)
+                    # Dielectric-smoothed material from the three materials
+                    numID = G.materials.get_or_create_averaged(materials).numID
             else:
                 averaging = False
                 # Isotropic case
@@ -414,7 +488,7 @@ def process_geometrycmds(geometry, G):
                     numIDy = materials[1].numID
                     numIDz = materials[2].numID
 
-            build_triangle(x1, y1, z1, x2, y2, z2, x3, y3, z3, normal, thickness, G.dx, G.dy, G.dz, numID, numIDx, numIDy, numIDz, averaging, G.solid, G.rigidE, G.rigidH, G.ID)
+            build_triangle(x1, y1, z1, x2, y2, z2, x3, y3, z3, normal, thickness, G.dx, G.dy, G.dz, numID, numIDx, numIDy, numIDz, averaging, G.nthreads, G.solid, G.rigidE, G.rigidH, G.ID)
 
             if G.messages:
                 if thickness > 0:
@@ -475,7 +549,7 @@ def process_geometrycmds(geometry, G):
                 raise CmdInputError("'" + ' '.join(tmp) + "'" + ' the lower coordinates should be less than the upper coordinates')
 
             # Look up requested materials in existing list of material instances
-            materials = [y for x in materialsrequested for y in G.materials if y.ID == x]
+            materials = [G.materials.get(x) for x in materialsrequested if x in G.materials]
 
             if len(materials) != len(materialsrequested):
                 notfound = [x for x in materialsrequested if x not in materials]
@@ -492,22 +566,8 @@ def process_geometrycmds(geometry, G):
                 numIDx = materials[0].numID
                 numIDy = materials[1].numID
                 numIDz = materials[2].numID
-                requiredID = materials[0].ID + '+' + materials[1].ID + '+' + materials[2].ID
-                averagedmaterial = [x for x in G.materials if x.ID == requiredID]
-                if averagedmaterial:
-                    numID = averagedmaterial.numID
-                else:
-                    numID = len(G.materials)
-                    m = Material(numID, requiredID)
-                    m.type = 'dielectric-smoothed'
-                    # Create dielectric-smoothed constituents for material
-                    m.er = np.mean((materials[0].er, materials[1].er, materials[2].er), axis=0)
-                    m.se = np.mean((materials[0].se, materials[1].se, materials[2].se), axis=0)
-                    m.mr = np.mean((materials[0].mr, materials[1].mr, materials[2].mr), axis=0)
-                    m.sm = np.mean((materials[0].mr, materials[1].mr, materials[2].mr), axis=0)
-
-                    # Append the new material object to the materials list
-                    G.materials.append(m)
+                # Dielectric-smoothed material from the three materials
+                numID = G.materials.get_or_create_averaged(materials).numID
 
             build_box(xs, xf, ys, yf, zs, zf, numID, numIDx, numIDy, numIDz, averaging, G.solid, G.rigidE, G.rigidH, G.ID)
 
@@ -556,7 +616,7 @@ def process_geometrycmds(geometry, G):
                 raise CmdInputError("'" + ' '.join(tmp) + "'" + ' the radius {:g} should be a positive value.'.format(r))
 
             # Look up requested materials in existing list of material instances
-            materials = [y for x in materialsrequested for y in G.materials if y.ID == x]
+            materials = [G.materials.get(x) for x in materialsrequested if x in G.materials]
 
             if len(materials) != len(materialsrequested):
                 notfound = [x for x in materialsrequested if x not in materials]
@@ -573,24 +633,10 @@ def process_geometrycmds(geometry, G):
                 numIDx = materials[0].numID
                 numIDy = materials[1].numID
                 numIDz = materials[2].numID
-                requiredID = materials[0].ID + '+' + materials[1].ID + '+' + materials[2].ID
-                averagedmaterial = [x for x in G.materials if x.ID == requiredID]
-                if averagedmaterial:
-                    numID = averagedmaterial.numID
-                else:
-                    numID = len(G.materials)
-                    m = Material(numID, requiredID)
-                    m.type = 'dielectric-smoothed'
-                    # Create dielectric-smoothed constituents for material
-                    m.er = np.mean((materials[0].er, materials[1].er, materials[2].er), axis=0)
-                    m.se = np.mean((materials[0].se, materials[1].se, materials[2].se), axis=0)
-                    m.mr = np.mean((materials[0].mr, materials[1].mr, materials[2].mr), axis=0)
-                    m.sm = np.mean((materials[0].mr, materials[1].mr, materials[2].mr), axis=0)
-
-                    # Append the new material object to the materials list
-                    G.materials.append(m)
+                # Dielectric-smoothed material from the three materials
+                numID = G.materials.get_or_create_averaged(materials).numID
 
-            build_cylinder(x1, y1, z1, x2, y2, z2, r, G.dx, G.dy, G.dz, numID, numIDx, numIDy, numIDz, averaging, G.solid, G.rigidE, G.rigidH, G.ID)
+            build_cylinder(x1, y1, z1, x2, y2, z2, r, G.dx, G.dy, G.dz, numID, numIDx, numIDy, numIDz, averaging, G.nthreads, G.solid, G.rigidE, G.rigidH, G.ID)
 
             if G.messages:
                 if averaging:
@@ -651,7 +697,7 @@ def process_geometrycmds(geometry, G):
                 raise CmdInputError("'" + ' '.join(tmp) + "'" + ' the starting angle and sector angle must be less than 360 degrees.')
 
             # Look up requested materials in existing list of material instances
-            materials = [y for x in materialsrequested for y in G.materials if y.ID == x]
+            materials = [G.materials.get(x) for x in materialsrequested if x in G.materials]
 
             if len(materials) != len(materialsrequested):
                 notfound = [x for x in materialsrequested if x not in materials]
@@ -669,22 +715,8 @@ def process_geometrycmds(geometry, G):
                     numIDx = materials[0].numID
                     numIDy = materials[1].numID
                     numIDz = materials[2].numID
-                    requiredID = materials[0].ID + '+' + materials[1].ID + '+' + materials[2].ID
-                    averagedmaterial = [x for x in G.materials if x.ID == requiredID]
-                    if averagedmaterial:
-                        numID = averagedmaterial.numID
-                    else:
-                        numID = len(G.materials)
-                        m = Material(numID, requiredID)
-                        m.type = 'dielectric-smoothed'
-                        # Create dielectric-smoothed constituents for material
-                        m.er = np.mean((materials[0].er, materials[1].er, materials[2].er), axis=0)
-                        m.se = np.mean((materials[0].se, materials[1].se, materials[2].se), axis=0)
-                        m.mr = np.mean((materials[0].mr, materials[1].mr, materials[2].mr), axis=0)
-                        m.sm = np.mean((materials[0].mr, materials[1].mr, materials[2].mr), axis=0)
-
-                        # Append the new material object to the materials list
-                        G.materials.append(m)
+                    # Dielectric-smoothed material from the three materials
+                    numID = G.materials.get_or_create_averaged(materials).numID
             else:
                 averaging = False
                 # Isotropic case
@@ -717,7 +749,7 @@ def process_geometrycmds(geometry, G):
                 ctr2 = round_value(ctr2 / G.dy) * G.dy
                 level = round_value(extent1 / G.dz)
 
-            build_cylindrical_sector(ctr1, ctr2, level, sectorstartangle, sectorangle, r, normal, thickness, G.dx, G.dy, G.dz, numID, numIDx, numIDy, numIDz, averaging, G.solid, G.rigidE, G.rigidH, G.ID)
+            build_cylindrical_sector(ctr1, ctr2, level, sectorstartangle, sectorangle, r, normal, thickness, G.dx, G.dy, G.dz, numID, numIDx, numIDy, numIDz, averaging, G.nthreads, G.solid, G.rigidE, G.rigidH, G.ID)
 
             if G.messages:
                 if thickness > 0:
@@ -762,7 +794,7 @@ def process_geometrycmds(geometry, G):
             r = float(tmp[4])
 
             # Look up requested materials in existing list of material instances
-            materials = [y for x in materialsrequested for y in G.materials if y.ID == x]
+            materials = [G.materials.get(x) for x in materialsrequested if x in G.materials]
 
             if len(materials) != len(materialsrequested):
                 notfound = [x for x in materialsrequested if x not in materials]
@@ -779,24 +811,10 @@ def process_geometrycmds(geometry, G):
                 numIDx = materials[0].numID
                 numIDy = materials[1].numID
                 numIDz = materials[2].numID
-                requiredID = materials[0].ID + '+' + materials[1].ID + '+' + materials[2].ID
-                averagedmaterial = [x for x in G.materials if x.ID == requiredID]
-                if averagedmaterial:
-                    numID = averagedmaterial.numID
-                else:
-                    numID = len(G.materials)
-                    m = Material(numID, requiredID)
-                    m.type = 'dielectric-smoothed'
-                    # Create dielectric-smoothed constituents for material
-                    m.er = np.mean((materials[0].er, materials[1].er, materials[2].er), axis=0)
-                    m.se = np.mean((materials[0].se, materials[1].se, materials[2].se), axis=0)
-                    m.mr = np.mean((materials[0].mr, materials[1].mr, materials[2].mr), axis=0)
-                    m.sm = np.mean((materials[0].mr, materials[1].mr, materials[2].mr), axis=0)
-
-                    # Append the new material object to the materials list
-                    G.materials.append(m)
+                # Dielectric-smoothed material from the three materials
+                numID = G.materials.get_or_create_averaged(materials).numID
 
-            build_sphere(xc, yc, zc, r, G.dx, G.dy, G.dz, numID, numIDx, numIDy, numIDz, averaging, G.solid, G.rigidE, G.rigidH, G.ID)
+            build_sphere(xc, yc, zc, r, G.dx, G.dy, G.dz, numID, numIDx, numIDy, numIDz, averaging, G.nthreads, G.solid, G.rigidE, G.rigidH, G.ID)
 
             if G.messages:
                 if averaging:
@@ -860,7 +878,7 @@ def process_geometrycmds(geometry, G):
 
             # Find materials to use to build fractal volume, either from mixing models or normal materials
             mixingmodel = next((x for x in G.mixingmodels if x.ID == tmp[12]), None)
-            material = next((x for x in G.materials if x.ID == tmp[12]), None)
+            material = G.materials.get(tmp[12])
             nbins = round_value(tmp[11])
 
             if mixingmodel:
@@ -1093,7 +1111,7 @@ def process_geometrycmds(geometry, G):
                             raise CmdInputError("'" + ' '.join(tmp) + "'" + ' requires a value for the depth of water that lies with the range of the requested surface roughness')
 
                         # Check to see if water has been already defined as a material
-                        if not any(x.ID == 'water' for x in G.materials):
+                        if 'water' not in G.materials:
                             m = Material(len(G.materials), 'water')
                             m.averagable = False
                             m.type = 'builtin, debye'
@@ -1105,7 +1123,7 @@ def process_geometrycmds(geometry, G):
                                 Material.maxpoles = 1
 
                         # Check if time step for model is suitable for using water
-                        water = next((x for x in G.materials if x.ID == 'water'))
+                        water = G.materials.get('water')
                         testwater = next((x for x in water.tau if x < G.dt), None)
                         if testwater:
                             raise CmdInputError("'" + ' '.join(tmp) + "'" + ' requires the time step for the model to be less than the relaxation time required to model water.')
@@ -1232,8 +1250,7 @@ def process_geometrycmds(geometry, G):
 
                         # Set the fractal surface using the pre-calculated spatial distribution and a random height
                         surface.fractalsurface = np.zeros((surface.fractalsurface.shape[0], surface.fractalsurface.shape[1]))
-                        for i in range(len(bladesindex[0])):
-                                surface.fractalsurface[bladesindex[0][i], bladesindex[1][i]] = R.randint(surface.fractalrange[0], surface.fractalrange[1], size=1)
+                        surface.fractalsurface[bladesindex] = R.randint(surface.fractalrange[0], surface.fractalrange[1], size=numblades)
 
                         # Create grass geometry parameters
                         g = Grass(numblades)
@@ -1241,7 +1258,7 @@ def process_geometrycmds(geometry, G):
                         surface.grass.append(g)
 
                         # Check to see if grass has been already defined as a material
-                        if not any(x.ID == 'grass' for x in G.materials):
+                        if 'grass' not in G.materials:
                             m = Material(len(G.materials), 'grass')
                             m.averagable = False
                             m.type = 'builtin, debye'
@@ -1253,7 +1270,7 @@ def process_geometrycmds(geometry, G):
                                 Material.maxpoles = 1
 
                         # Check if time step for model is suitable for using grass
-                        grass = next((x for x in G.materials if x.ID == 'grass'))
+                        grass = G.materials.get('grass')
                         testgrass = next((x for x in grass.tau if x < G.dt), None)
                         if testgrass:
                             raise CmdInputError("'" + ' '.join(tmp) + "'" + ' requires the time step for the model to be less than the relaxation time required to model grass.')
@@ -1302,7 +1319,7 @@ def process_geometrycmds(geometry, G):
                 # If there is only 1 bin then a normal material is being used, otherwise a mixing model
                 if volume.nbins == 1:
                     volume.fractalvolume = np.ones((volume.nx, volume.ny, volume.nz), dtype=floattype)
-                    materialnumID = next(x.numID for x in G.materials if x.ID == volume.operatingonID)
+                    materialnumID = G.materials.get(volume.operatingonID).numID
                     volume.fractalvolume *= materialnumID
                 else:
                     volume.generate_fractal_volume(G)
@@ -1313,206 +1330,58 @@ def process_geometrycmds(geometry, G):
                 # Apply any rough surfaces and add any surface water to the 3D mask array
                 for surface in volume.fractalsurfaces:
                     if surface.surfaceID == 'xminus':
-                        for i in range(surface.fractalrange[0], surface.fractalrange[1]):
-                            for j in range(surface.ys, surface.yf):
-                                for k in range(surface.zs, surface.zf):
-                                    if i > surface.fractalsurface[j - surface.ys, k - surface.zs]:
-                                        volume.mask[i - volume.xs, j - volume.ys, k - volume.zs] = 1
-                                    elif surface.filldepth > 0 and i > surface.filldepth:
-                                        volume.mask[i - volume.xs, j - volume.ys, k - volume.zs] = 2
-                                    else:
-                                        volume.mask[i - volume.xs, j - volume.ys, k - volume.zs] = 0
+                        i = np.arange(surface.fractalrange[0], surface.fractalrange[1])[:, np.newaxis, np.newaxis]
+                        fractalsurface = surface.fractalsurface[np.newaxis, :, :]
+                        volume.mask[surface.fractalrange[0] - volume.xs:surface.fractalrange[1] - volume.xs, surface.ys - volume.ys:surface.yf - volume.ys, surface.zs - volume.zs:surface.zf - volume.zs] = np.where(i > fractalsurface, 1, np.where((surface.filldepth > 0) & (i > surface.filldepth), 2, 0))
 
                     elif surface.surfaceID == 'xplus':
                         if not surface.ID:
-                            for i in range(surface.fractalrange[0], surface.fractalrange[1]):
-                                for j in range(surface.ys, surface.yf):
-                                    for k in range(surface.zs, surface.zf):
-                                        if i < surface.fractalsurface[j - surface.ys, k - surface.zs]:
-                                            volume.mask[i - volume.xs, j - volume.ys, k - volume.zs] = 1
-                                        elif surface.filldepth > 0 and i < surface.filldepth:
-                                            volume.mask[i - volume.xs, j - volume.ys, k - volume.zs] = 2
-                                        else:
-                                            volume.mask[i - volume.xs, j - volume.ys, k - volume.zs] = 0
+                            i = np.arange(surface.fractalrange[0], surface.fractalrange[1])[:, np.newaxis, np.newaxis]
+                            fractalsurface = surface.fractalsurface[np.newaxis, :, :]
+                            volume.mask[surface.fractalrange[0] - volume.xs:surface.fractalrange[1] - volume.xs, surface.ys - volume.ys:surface.yf - volume.ys, surface.zs - volume.zs:surface.zf - volume.zs] = np.where(i < fractalsurface, 1, np.where((surface.filldepth > 0) & (i < surface.filldepth), 2, 0))
                         elif surface.ID == 'grass':
                             g = surface.grass[0]
-                            # Build the blades of the grass
-                            blade = 0
-                            for j in range(surface.ys, surface.yf):
-                                for k in range(surface.zs, surface.zf):
-                                    if surface.fractalsurface[j - surface.ys, k - surface.zs] > 0:
-                                        height = 0
-                                        for i in range(volume.xs, surface.fractalrange[1]):
-                                            if i < surface.fractalsurface[j - surface.ys, k - surface.zs] and volume.mask[i - volume.xs, j - volume.ys, k - volume.zs] != 1:
-                                                y, z = g.calculate_blade_geometry(blade, height)
-                                                # Add y, z coordinates to existing location
-                                                yy = int(j - volume.ys + y)
-                                                zz = int(k - volume.zs + z)
-                                                # If these coordinates are outwith fractal volume stop building the blade, otherwise set the mask for grass
-                                                if yy < 0 or yy >= volume.mask.shape[1] or zz < 0 or zz >= volume.mask.shape[2]:
-                                                    break
-                                                else:
-                                                    volume.mask[i - volume.xs, yy, zz] = 3
-                                                    height += 1
-                                        blade += 1
-
-                            # Build the roots of the grass
-                            root = 0
-                            for j in range(surface.ys, surface.yf):
-                                for k in range(surface.zs, surface.zf):
-                                    if surface.fractalsurface[j - surface.ys, k - surface.zs] > 0:
-                                        depth = 0
-                                        i = volume.xf - 1
-                                        while i > volume.xs:
-                                            if i > volume.originalxf - (surface.fractalsurface[j - surface.ys, k - surface.zs] - volume.originalxf) and volume.mask[i - volume.xs, j - volume.ys, k - volume.zs] == 1:
-                                                y, z = g.calculate_root_geometry(root, depth)
-                                                # Add y, z coordinates to existing location
-                                                yy = int(j - volume.ys + y)
-                                                zz = int(k - volume.zs + z)
-                                                # If these coordinates are outwith the fractal volume stop building the root, otherwise set the mask for grass
-                                                if yy < 0 or yy >= volume.mask.shape[1] or zz < 0 or zz >= volume.mask.shape[2]:
-                                                    break
-                                                else:
-                                                    volume.mask[i - volume.xs, yy, zz] = 3
-                                                    depth += 1
-                                            i -= 1
-                                        root += 1
+                            # Build the blades and then the roots of the grass
+                            mask = np.transpose(volume.mask, (1, 2, 0))
+                            g.build_blades(mask, surface.fractalsurface, surface.ys - volume.ys, surface.zs - volume.zs, volume.xs, surface.fractalrange[1])
+                            g.build_roots(mask, surface.fractalsurface, surface.ys - volume.ys, surface.zs - volume.zs, volume.xs, volume.xf, volume.originalxf)
 
                     elif surface.surfaceID == 'yminus':
-                        for i in range(surface.xs, surface.xf):
-                            for j in range(surface.fractalrange[0], surface.fractalrange[1]):
-                                for k in range(surface.zs, surface.zf):
-                                    if j > surface.fractalsurface[i - surface.xs, k - surface.zs]:
-                                        volume.mask[i - volume.xs, j - volume.ys, k - volume.zs] = 1
-                                    elif surface.filldepth > 0 and j > surface.filldepth:
-                                        volume.mask[i - volume.xs, j - volume.ys, k - volume.zs] = 2
-                                    else:
-                                        volume.mask[i - volume.xs, j - volume.ys, k - volume.zs] = 0
+                        j = np.arange(surface.fractalrange[0], surface.fractalrange[1])[np.newaxis, :, np.newaxis]
+                        fractalsurface = surface.fractalsurface[:, np.newaxis, :]
+                        volume.mask[surface.xs - volume.xs:surface.xf - volume.xs, surface.fractalrange[0] - volume.ys:surface.fractalrange[1] - volume.ys, surface.zs - volume.zs:surface.zf - volume.zs] = np.where(j > fractalsurface, 1, np.where((surface.filldepth > 0) & (j > surface.filldepth), 2, 0))
 
                     elif surface.surfaceID == 'yplus':
                         if not surface.ID:
-                            for i in range(surface.xs, surface.xf):
-                                for j in range(surface.fractalrange[0], surface.fractalrange[1]):
-                                    for k in range(surface.zs, surface.zf):
-                                        if j < surface.fractalsurface[i - surface.xs, k - surface.zs]:
-                                            volume.mask[i - volume.xs, j - volume.ys, k - volume.zs] = 1
-                                        elif surface.filldepth > 0 and j < surface.filldepth:
-                                            volume.mask[i - volume.xs, j - volume.ys, k - volume.zs] = 2
-                                        else:
-                                            volume.mask[i - volume.xs, j - volume.ys, k - volume.zs] = 0
+                            j = np.arange(surface.fractalrange[0], surface.fractalrange[1])[np.newaxis, :, np.newaxis]
+                            fractalsurface = surface.fractalsurface[:, np.newaxis, :]
+                            volume.mask[surface.xs - volume.xs:surface.xf - volume.xs, surface.fractalrange[0] - volume.ys:surface.fractalrange[1] - volume.ys, surface.zs - volume.zs:surface.zf - volume.zs] = np.where(j < fractalsurface, 1, np.where((surface.filldepth > 0) & (j < surface.filldepth), 2, 0))
                         elif surface.ID == 'grass':
                             g = surface.grass[0]
-                            # Build the blades of the grass
-                            blade = 0
-                            for i in range(surface.xs, surface.xf):
-                                for k in range(surface.zs, surface.zf):
-                                    if surface.fractalsurface[i - surface.xs, k - surface.zs] > 0:
-                                        height = 0
-                                        for j in range(volume.ys, surface.fractalrange[1]):
-                                            if j < surface.fractalsurface[i - surface.xs, k - surface.zs] and volume.mask[i - volume.xs, j - volume.ys, k - volume.zs] != 1:
-                                                x, z = g.calculate_blade_geometry(blade, height)
-                                                # Add x, z coordinates to existing location
-                                                xx = int(i - volume.xs + x)
-                                                zz = int(k - volume.zs + z)
-                                                # If these coordinates are outwith fractal volume stop building the blade, otherwise set the mask for grass
-                                                if xx < 0 or xx >= volume.mask.shape[0] or zz < 0 or zz >= volume.mask.shape[2]:
-                                                    break
-                                                else:
-                                                    volume.mask[xx, j - volume.ys, zz] = 3
-                                                    height += 1
-                                        blade += 1
-
-                            # Build the roots of the grass
-                            root = 0
-                            for i in range(surface.xs, surface.xf):
-                                for k in range(surface.zs, surface.zf):
-                                    if surface.fractalsurface[i - surface.xs, k - surface.zs] > 0:
-                                        depth = 0
-                                        j = volume.yf - 1
-                                        while j > volume.ys:
-                                            if j > volume.originalyf - (surface.fractalsurface[i - surface.xs, k - surface.zs] - volume.originalyf) and volume.mask[i - volume.xs, j - volume.ys, k - volume.zs] == 1:
-                                                x, z = g.calculate_root_geometry(root, depth)
-                                                # Add x, z coordinates to existing location
-                                                xx = int(i - volume.xs + x)
-                                                zz = int(k - volume.zs + z)
-                                                # If these coordinates are outwith the fractal volume stop building the root, otherwise set the mask for grass
-                                                if xx < 0 or xx >= volume.mask.shape[0] or zz < 0 or zz >= volume.mask.shape[2]:
-                                                    break
-                                                else:
-                                                    volume.mask[xx, j - volume.ys, zz] = 3
-                                                    depth += 1
-                                            j -= 1
-                                        root += 1
+                            # Build the blades and then the roots of the grass
+                            mask = np.transpose(volume.mask, (0, 2, 1))
+                            g.build_blades(mask, surface.fractalsurface, surface.xs - volume.xs, surface.zs - volume.zs, volume.ys, surface.fractalrange[1])
+                            g.build_roots(mask, surface.fractalsurface, surface.xs - volume.xs, surface.zs - volume.zs, volume.ys, volume.yf, volume.originalyf)
 
                     elif surface.surfaceID == 'zminus':
-                        for i in range(surface.xs, surface.xf):
-                            for j in range(surface.ys, surface.yf):
-                                for k in range(surface.fractalrange[0], surface.fractalrange[1]):
-                                    if k > surface.fractalsurface[i - surface.xs, j - surface.ys]:
-                                        volume.mask[i - volume.xs, j - volume.ys, k - volume.zs] = 1
-                                    elif surface.filldepth > 0 and k > surface.filldepth:
-                                        volume.mask[i - volume.xs, j - volume.ys, k - volume.zs] = 2
-                                    else:
-                                        volume.mask[i - volume.xs, j - volume.ys, k - volume.zs] = 0
+                        k = np.arange(surface.fractalrange[0], surface.fractalrange[1])[np.newaxis, np.newaxis, :]
+                        fractalsurface = surface.fractalsurface[:, :, np.newaxis]
+                        volume.mask[surface.xs - volume.xs:surface.xf - volume.xs, surface.ys - volume.ys:surface.yf - volume.ys, surface.fractalrange[0] - volume.zs:surface.fractalrange[1] - volume.zs] = np.where(k > fractalsurface, 1, np.where((surface.filldepth > 0) & (k > surface.filldepth), 2, 0))
 
                     elif surface.surfaceID == 'zplus':
                         if not surface.ID:
-                            for i in range(surface.xs, surface.xf):
-                                for j in range(surface.ys, surface.yf):
-                                    for k in range(surface.fractalrange[0], surface.fractalrange[1]):
-                                        if k < surface.fractalsurface[i - surface.xs, j - surface.ys]:
-                                            volume.mask[i - volume.xs, j - volume.ys, k - volume.zs] = 1
-                                        elif surface.filldepth > 0 and k < surface.filldepth:
-                                            volume.mask[i - volume.xs, j - volume.ys, k - volume.zs] = 2
-                                        else:
-                                            volume.mask[i - volume.xs, j - volume.ys, k - volume.zs] = 0
+                            k = np.arange(surface.fractalrange[0], surface.fractalrange[1])[np.newaxis, np.newaxis, :]
+                            fractalsurface = surface.fractalsurface[:, :, np.newaxis]
+                            volume.mask[surface.xs - volume.xs:surface.xf - volume.xs, surface.ys - volume.ys:surface.yf - volume.ys, surface.fractalrange[0] - volume.zs:surface.fractalrange[1] - volume.zs] = np.where(k < fractalsurface, 1, np.where((surface.filldepth > 0) & (k < surface.filldepth), 2, 0))
                         elif surface.ID == 'grass':
                             g = surface.grass[0]
-                            # Build the blades of the grass
-                            blade = 0
-                            for i in range(surface.xs, surface.xf):
-                                for j in range(surface.ys, surface.yf):
-                                    if surface.fractalsurface[i - surface.xs, j - surface.ys] > 0:
-                                        height = 0
-                                        for k in range(volume.zs, surface.fractalrange[1]):
-                                            if k < surface.fractalsurface[i - surface.xs, j - surface.ys] and volume.mask[i - volume.xs, j - volume.ys, k - volume.zs] != 1:
-                                                x, y = g.calculate_blade_geometry(blade, height)
-                                                # Add x, y coordinates to existing location
-                                                xx = int(i - volume.xs + x)
-                                                yy = int(j - volume.ys + y)
-                                                # If these coordinates are outwith the fractal volume stop building the blade, otherwise set the mask for grass
-                                                if xx < 0 or xx >= volume.mask.shape[0] or yy < 0 or yy >= volume.mask.shape[1]:
-                                                    break
-                                                else:
-                                                    volume.mask[xx, yy, k - volume.zs] = 3
-                                                    height += 1
-                                        blade += 1
-
-                            # Build the roots of the grass
-                            root = 0
-                            for i in range(surface.xs, surface.xf):
-                                for j in range(surface.ys, surface.yf):
-                                    if surface.fractalsurface[i - surface.xs, j - surface.ys] > 0:
-                                        depth = 0
-                                        k = volume.zf - 1
-                                        while k > volume.zs:
-                                            if k > volume.originalzf - (surface.fractalsurface[i - surface.xs, j - surface.ys] - volume.originalzf) and volume.mask[i - volume.xs, j - volume.ys, k - volume.zs] == 1:
-                                                x, y = g.calculate_root_geometry(root, depth)
-                                                # Add x, y coordinates to existing location
-                                                xx = int(i - volume.xs + x)
-                                                yy = int(j - volume.ys + y)
-                                                # If these coordinates are outwith the fractal volume stop building the root, otherwise set the mask for grass
-                                                if xx < 0 or xx >= volume.mask.shape[0] or yy < 0 or yy >= volume.mask.shape[1]:
-                                                    break
-                                                else:
-                                                    volume.mask[xx, yy, k - volume.zs] = 3
-                                                    depth += 1
-                                            k -= 1
-                                        root += 1
+                            # Build the blades and then the roots of the grass
+                            g.build_blades(volume.mask, surface.fractalsurface, surface.xs - volume.xs, surface.ys - volume.ys, volume.zs, surface.fractalrange[1])
+                            g.build_roots(volume.mask, surface.fractalsurface, surface.xs - volume.xs, surface.ys - volume.ys, volume.zs, volume.zf, volume.originalzf)
 
                 # Build voxels from any true values of the 3D mask array
-                waternumID = next((x.numID for x in G.materials if x.ID == 'water'), 0)
-                grassnumID = next((x.numID for x in G.materials if x.ID == 'grass'), 0)
+                waternumID = G.materials.get('water').numID if 'water' in G.materials else 0
+                grassnumID = G.materials.get('grass').numID if 'grass' in G.materials else 0
                 data = volume.fractalvolume.astype('int16', order='C')
                 mask = volume.mask.copy(order='C')
                 build_voxels_from_array_mask(volume.xs, volume.ys, volume.zs, waternumID, grassnumID, volume.averaging, mask, data, G.solid, G.rigidE, G.rigidH, G.ID)
@@ -34,6 +34,7 @@ from gprMax.pml import CFSParameter
 from gprMax.pml import CFS
 from gprMax.receivers import Rx
 from gprMax.snapshots import Snapshot
+from gprMax.snapshots import SnapshotSeries
 from gprMax.sources import VoltageSource
 from gprMax.sources import HertzianDipole
 from gprMax.sources import MagneticDipole
@@ -525,6 +526,83 @@ def process_multicmds(multicmds, G):
 
             G.snapshots.append(s)
 
+    # Snapshot series
+    cmdname = '#snapshot_series'
+    if multicmds[cmdname] is not None:
+        for cmdinstance in multicmds[cmdname]:
+            tmp = cmdinstance.split()
+            if len(tmp) != 13 and len(tmp) != 14:
+                raise CmdInputError("'" + cmdname + ': ' + ' '.join(tmp) + "'" + ' requires at least thirteen parameters')
+
+            # Warn about using snapshots on GPU
+            if G.gpu is not None:
+                raise CmdInputError("'" + cmdname + ': ' + ' '.join(tmp) + "'" + ' The #snapshot_series command cannot currently be used with GPU solving.')
+
+            xs = G.calculate_coord('x', tmp[0])
+            ys = G.calculate_coord('y', tmp[1])
+            zs = G.calculate_coord('z', tmp[2])
+
+            xf = G.calculate_coord('x', tmp[3])
+            yf = G.calculate_coord('y', tmp[4])
+            zf = G.calculate_coord('z', tmp[5])
+
+            dx = G.calculate_coord('x', tmp[6])
+            dy = G.calculate_coord('y', tmp[7])
+            dz = G.calculate_coord('z', tmp[8])
+
+            # Times of first and last snapshots, either as numbers of
+            # iterations or as real floating point values
+            times = []
+            for time in tmp[9:11]:
+                try:
+                    time = int(time)
+                except ValueError:
+                    time = float(time)
+                    if time > 0:
+                        time = round_value((time / G.dt)) + 1
+                    else:
+                        raise CmdInputError("'" + cmdname + ': ' + ' '.join(tmp) + "'" + ' time value must be greater than zero')
+                times.append(time)
+            start, stop = times
+
+            # Interval between snapshots, either as number of iterations or as
+            # real floating point value
+            try:
+                step = int(tmp[11])
+            except ValueError:
+                step = round_value(float(tmp[11]) / G.dt)
+
+            # Compression of snapshot values
+            if len(tmp) == 14:
+                if tmp[13].lower() != 'y' and tmp[13].lower() != 'n':
+                    raise CmdInputError("'" + cmdname + ': ' + ' '.join(tmp) + "'" + ' requires compression to be specified as either y or n')
+                compression = tmp[13].lower() == 'y'
+            else:
+                compression = False
+
+            check_coordinates(xs, ys, zs, name='lower')
+            check_coordinates(xf, yf, zf, name='upper')
+
+            if xs >= xf or ys >= yf or zs >= zf:
+                raise CmdInputError("'" + cmdname + ': ' + ' '.join(tmp) + "'" + ' the lower coordinates should be less than the upper coordinates')
+            if dx < 0 or dy < 0 or dz < 0:
+                raise CmdInputError("'" + cmdname + ': ' + ' '.join(tmp) + "'" + ' the step size should not be less than zero')
+            if dx < 1 or dy < 1 or dz < 1:
+                raise CmdInputError("'" + cmdname + ': ' + ' '.join(tmp) + "'" + ' the step size should not be less than the spatial discretisation')
+            if start <= 0 or start > G.iterations or stop <= 0 or stop > G.iterations:
+                raise CmdInputError("'" + cmdname + ': ' + ' '.join(tmp) + "'" + ' time value is not valid')
+            if start > stop:
+                raise CmdInputError("'" + cmdname + ': ' + ' '.join(tmp) + "'" + ' the time of the first snapshot should not be greater than the time of the last snapshot')
+            if step < 1:
+                raise CmdInputError("'" + cmdname + ': ' + ' '.join(tmp) + "'" + ' the interval between snapshots should not be less than one iteration')
+
+            s = SnapshotSeries(xs, ys, zs, xf, yf, zf, dx, dy, dz, start, stop, step, tmp[12], compression)
+
+            if G.messages:
+                print('Snapshot series from {:g}m, {:g}m, {:g}m, to {:g}m, {:g}m, {:g}m, discretisation {:g}m, {:g}m, {:g}m, {} snapshots from {:g} secs to {:g} secs, every {} iterations, with filename {} created.'.format(xs * G.dx, ys * G.dy, zs * G.dz, xf * G.dx, yf * G.dy, zf * G.dz, dx * G.dx, dy * G.dy, dz * G.dz, len(s.iterations), (s.iterations[0] - 1) * G.dt, (s.iterations[-1] - 1) * G.dt, s.step, s.basefilename))
+
+            G.snapshots.append(s)
+
     # Materials
     cmdname = '#material'
     if multicmds[cmdname] is not None:
@@ -544,7 +622,7 @@ def process_multicmds(multicmds, G):
                 raise CmdInputError("'" + cmdname + ': ' + ' '.join(tmp) + "'" + ' requires a positive value of one or greater for permeability')
             if float(tmp[3]) < 0:
                 raise CmdInputError("'" + cmdname + ': ' + ' '.join(tmp) + "'" + ' requires a positive value for magnetic conductivity')
-            if any(x.ID == tmp[4] for x in G.materials):
+            if tmp[4] in G.materials:
                 raise CmdInputError("'" + cmdname + ': ' + ' '.join(tmp) + "'" + ' with ID {} already exists'.format(tmp[4]))
 
             # Create a new instance of the Material class material (start index after pec & free_space)
@@ -577,7 +655,7 @@ def process_multicmds(multicmds, G):
             materialsrequested = tmp[(2 * poles) + 1:len(tmp)]
 
             # Look up requested materials in existing list of material instances
-            materials = [y for x in materialsrequested for y in G.materials if y.ID == x]
+            materials = [G.materials.get(x) for x in materialsrequested if x in G.materials]
 
             if len(materials) != len(materialsrequested):
                 notfound = [x for x in materialsrequested if x not in materials]
@@ -613,7 +691,7 @@ def process_multicmds(multicmds, G):
             materialsrequested = tmp[(3 * poles) + 1:len(tmp)]
 
             # Look up requested materials in existing list of material instances
-            materials = [y for x in materialsrequested for y in G.materials if y.ID == x]
+            materials = [G.materials.get(x) for x in materialsrequested if x in G.materials]
 
             if len(materials) != len(materialsrequested):
                 notfound = [x for x in materialsrequested if x not in materials]
@@ -649,7 +727,7 @@ def process_multicmds(multicmds, G):
             materialsrequested = tmp[(3 * poles) + 1:len(tmp)]
 
             # Look up requested materials in existing list of material instances
-            materials = [y for x in materialsrequested for y in G.materials if y.ID == x]
+            materials = [G.materials.get(x) for x in materialsrequested if x in G.materials]
 
             if len(materials) != len(materialsrequested):
                 notfound = [x for x in materialsrequested if x not in materials]
@@ -213,6 +213,22 @@ def process_singlecmds(singlecmds, G):
     if G.messages:
         print('Time window: {:g} secs ({} iterations)'.format(G.timewindow, G.iterations))
 
+    # Stop the model early once the fields have decayed
+    cmd = '#time_window_decay'
+    if singlecmds[cmd] is not None:
+        tmp = singlecmds[cmd].split()
+        if len(tmp) != 1 and len(tmp) != 2:
+            raise CmdInputError(cmd + ' requires one or two parameters, i.e. the decay (in decibels) of the fields at which to stop the model, and optionally the number of iterations between checks of the decay')
+        if float(tmp[0]) <= 0:
+            raise CmdInputError(cmd + ' requires the decay to be greater than zero')
+        G.timewindowdecay = float(tmp[0])
+        if len(tmp) == 2:
+            if int(tmp[1]) < 1:
+                raise CmdInputError(cmd + ' requires the number of iterations between checks of the decay to be an integer not less than one')
+            G.timewindowdecayinterval = int(tmp[1])
+        if G.messages:
+            print('Time window stopped early once the fields have decayed by {:g} dB (checked every {} iterations)'.format(G.timewindowdecay, G.timewindowdecayinterval))
+
     # PML
     cmd = '#pml_cells'
     if singlecmds[cmd] is not None:
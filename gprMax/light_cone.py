@@ -0,0 +1,90 @@
+# Copyright (C) 2015-2018: The University of Edinburgh
+#                 Authors: Craig Warren and Antonis Giannopoulos
+#
+# This file is part of gprMax.
+#
+# gprMax is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gprMax is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gprMax.  If not, see <http://www.gnu.org/licenses/>.
+
+import numpy as np
+
+
+class LightCone(object):
+    """
+    Light cone of the sources, i.e. the box of cells in which the field
+        components can be non-zero, for restricting the field, PML and
+        dispersive updates of the compiled solver to the part of the grid the
+        wave can have reached (--light-cone). The fields are zero until the
+        sources are updated, and the update of a field component only depends
+        on field components in the same or an adjacent cell, so the box grows
+        by at most one cell in each direction on each iteration. Field
+        components outside the box stay zero, so restricting the updates gives
+        identical results.
+    """
+
+    def __init__(self, G):
+        """
+        Args:
+            G (class): Grid class instance - holds essential parameters describing the model.
+        """
+
+        self.n = np.array([G.nx, G.ny, G.nz], dtype=np.int32)
+
+        # Box of the cells of the sources (or the whole grid if there are none)
+        sources = G.hertziandipoles + G.magneticdipoles + G.voltagesources + G.transmissionlines
+        if sources:
+            coords = np.array([(source.xcoord, source.ycoord, source.zcoord) for source in sources], dtype=np.int32)
+            lo = coords.min(axis=0)
+            hi = coords.max(axis=0)
+        else:
+            lo = np.zeros(3, dtype=np.int32)
+            hi = self.n
+
+        # Region to update on each iteration, which is the light cone extended
+        # by two cells in each direction (within the grid), so that the cells
+        # the fields can reach on the iteration are not on the edges of the
+        # region, which the field updates treat as the edges of the grid. The
+        # regions stop at the first one that covers the whole grid, which is
+        # the region for every later iteration.
+        nregions = max(np.max(lo), np.max(self.n - hi)) - 1
+        steps = np.arange(max(nregions, 1), dtype=np.int32)[:, np.newaxis]
+        self.regions = np.empty((len(steps), 6), dtype=np.int32)
+        self.regions[:, 0::2] = np.maximum(lo - 2 - steps, 0)
+        self.regions[:, 1::2] = np.minimum(hi + 2 + steps, self.n)
+
+    def region(self, iteration):
+        """Region to update on an iteration.
+
+        Args:
+            iteration (int): Iteration.
+
+        Returns:
+            region (array): Extent of the region in cells (inclusive), i.e. xs, xf, ys, yf, zs, zf.
+        """
+
+        return self.regions[min(iteration, len(self.regions) - 1)]
+
+    def iterationssaved(self, iterations):
+        """Number of iterations of updates of the whole grid saved.
+
+        Args:
+            iterations (int): Number of iterations run.
+
+        Returns:
+            (float): Iterations saved.
+        """
+
+        regions = self.regions[np.minimum(np.arange(iterations), len(self.regions) - 1)]
+        cellsupdated = np.prod(regions[:, 1::2] - regions[:, 0::2] + 1, axis=1, dtype=np.float64).sum()
+
+        return iterations - cellsupdated / np.prod(self.n + 1, dtype=np.float64)
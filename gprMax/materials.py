@@ -174,6 +174,148 @@ class Material(object):
         return er
 
 
+class Materials(object):
+    """
+    Registry of the materials in a model. Materials are held in a list in
+    the order they are created (which is the order of their numeric IDs),
+    and are also indexed by name (ID), by numeric ID, and by a key made from
+    the sorted names of their constituents for averaged materials.
+    """
+
+    def __init__(self):
+        self.materials = []
+        self.IDs = {}
+        self.numIDs = {}
+        self.averaged = {}
+
+    def __len__(self):
+        return len(self.materials)
+
+    def __iter__(self):
+        return iter(self.materials)
+
+    def __getitem__(self, index):
+        return self.materials[index]
+
+    def __contains__(self, ID):
+        return ID in self.IDs
+
+    @staticmethod
+    def averaged_key(constituents):
+        """
+        Canonical key for an averaged material, which does not depend on
+        the order of its constituents.
+
+        Args:
+            constituents (list): Names (IDs) of the materials that are averaged.
+
+        Returns:
+            (tuple): Sorted names of the constituents.
+        """
+
+        return tuple(sorted(constituents))
+
+    def add_builtin_materials(self):
+        """
+        Adds the built-in materials, i.e. a perfect electric conductor (pec)
+        and free space, which are the first materials of every model.
+        """
+
+        m = Material(0, 'pec')
+        m.se = float('inf')
+        m.type = 'builtin'
+        m.averagable = False
+        self.append(m)
+        m = Material(1, 'free_space')
+        m.type = 'builtin'
+        self.append(m)
+
+    def append(self, material, constituents=None):
+        """
+        Adds a material to the registry.
+
+        Args:
+            material (Material): Material instance.
+            constituents (list): Names (IDs) of the materials that were averaged to create the material, if any.
+        """
+
+        self.materials.append(material)
+        # If there are materials with the same name look ups return the first
+        self.IDs.setdefault(material.ID, material)
+        self.numIDs.setdefault(material.numID, material)
+        if constituents is not None:
+            self.averaged.setdefault(self.averaged_key(constituents), material)
+
+    def get(self, ID, default=None):
+        """
+        Looks up a material by name.
+
+        Args:
+            ID (str): Name of the material.
+            default: Value to return if the material does not exist.
+
+        Returns:
+            (Material): Material instance.
+        """
+
+        return self.IDs.get(ID, default)
+
+    def get_by_numID(self, numID, default=None):
+        """
+        Looks up a material by numeric ID.
+
+        Args:
+            numID (int): Numeric ID of the material.
+            default: Value to return if the material does not exist.
+
+        Returns:
+            (Material): Material instance.
+        """
+
+        return self.numIDs.get(numID, default)
+
+    def get_averaged(self, constituents, default=None):
+        """
+        Looks up an averaged material by its constituents.
+
+        Args:
+            constituents (list): Names (IDs) of the materials that are averaged.
+            default: Value to return if the material does not exist.
+
+        Returns:
+            (Material): Material instance.
+        """
+
+        return self.averaged.get(self.averaged_key(constituents), default)
+
+    def get_or_create_averaged(self, constituents):
+        """
+        Looks up an averaged material by its constituents, or creates it
+        (with the mean of the constitutive parameters of its constituents)
+        and adds it to the registry if it does not exist.
+
+        Args:
+            constituents (list): Material instances that are averaged.
+
+        Returns:
+            (Material): Material instance.
+        """
+
+        IDs = [x.ID for x in constituents]
+        material = self.get_averaged(IDs)
+
+        if not material:
+            material = Material(len(self.materials), '+'.join(IDs))
+            material.type = 'dielectric-smoothed'
+            material.er = np.mean([x.er for x in constituents], axis=0)
+            material.se = np.mean([x.se for x in constituents], axis=0)
+            material.mr = np.mean([x.mr for x in constituents], axis=0)
+            material.sm = np.mean([x.sm for x in constituents], axis=0)
+            self.append(material, IDs)
+
+        return material
+
+
 def process_materials(G):
     """
     Process complete list of materials - calculate update coefficients,
@@ -313,7 +455,7 @@ class PeplinskiSoil(object):
 
             # Check to see if the material already exists before creating a new one
             requiredID = '|{:.4f}|'.format(float(muiter[0]))
-            material = next((x for x in G.materials if x.ID == requiredID), None)
+            material = G.materials.get(requiredID)
             if muiter.index == 0:
                 if material:
                     self.startmaterialnum = material.numID
@@ -31,19 +31,30 @@ import numpy as np
 from terminaltables import AsciiTable
 from tqdm import tqdm
 
+from gprMax.batch import Batch
+from gprMax.batch import BatchModel
+from gprMax.batch import batch_size
+from gprMax.constants import e0, m0
 from gprMax.constants import floattype, cudafloattype, cudacomplextype
 from gprMax.exceptions import GeneralError
 
+from gprMax.fields_outputs import FieldDecayMonitor
 from gprMax.fields_outputs import store_outputs
 from gprMax.fields_outputs import kernel_template_store_outputs
 from gprMax.fields_outputs import write_hdf5_outputfile
 
 from gprMax.fields_updates_ext import update_electric
 from gprMax.fields_updates_ext import update_magnetic
+from gprMax.fields_updates_ext import update_electric_batch
+from gprMax.fields_updates_ext import update_magnetic_batch
 from gprMax.fields_updates_ext import update_electric_dispersive_multipole_A
 from gprMax.fields_updates_ext import update_electric_dispersive_multipole_B
 from gprMax.fields_updates_ext import update_electric_dispersive_1pole_A
 from gprMax.fields_updates_ext import update_electric_dispersive_1pole_B
+from gprMax.fields_updates_ext import update_electric_dispersive_sparse_A
+from gprMax.fields_updates_ext import update_electric_dispersive_sparse_B
+from gprMax.fields_updates_ext import set_electric_dispersive_sparse
+from gprMax.fields_updates_ext import field_energy
 from gprMax.fields_updates_gpu import kernels_template_fields
 
 from gprMax.grid import FDTDGrid
@@ -57,9 +68,17 @@ from gprMax.input_cmds_singleuse import process_singlecmds
 from gprMax.materials import Material, process_materials
 from gprMax.pml import PML
 from gprMax.pml import build_pmls
+from gprMax.pml import get_fused_pml_slabs
+from gprMax.pml import update_pmls_electric
+from gprMax.pml import update_pmls_magnetic
 from gprMax.pml_updates_gpu import kernels_template_pml
+from gprMax.receivers import Rx
+from gprMax.receivers import initialise_rx_arrays
+from gprMax.receivers import get_rx_array
 from gprMax.receivers import gpu_initialise_rx_arrays
 from gprMax.receivers import gpu_get_rx_array
+from gprMax.snapshots import SnapshotWriter
+from gprMax.solver_ext import CompiledSolver
 from gprMax.sources import gpu_initialise_src_arrays
 from gprMax.source_updates_gpu import kernels_template_sources
 from gprMax.utilities import get_host_info
@@ -110,6 +129,24 @@ def run_model(args, currentmodelrun, modelend, numbermodelruns, inputfile, usern
         if args.gpu:
             G.gpu = args.gpu
 
+        # Update all PML slabs in a single parallel region
+        G.pmlfused = args.pml_fused
+
+        # Run the time-stepping loop in compiled code, optionally with
+        # cache-blocked (tiled) updates
+        if args.tile_planes < 0 or args.tile_steps < 1:
+            raise GeneralError('The number of planes in each tile must be zero or greater, and the number of iterations for each tile must be one or greater.')
+        G.solvercompiled = args.solver_compiled or args.tile_planes > 0 or args.light_cone
+        G.tileplanes = args.tile_planes
+        G.tilesteps = args.tile_steps
+
+        # Restrict the updates of the compiled time-stepping loop to the light
+        # cone of the sources
+        G.lightcone = args.light_cone
+
+        # Directory to cache fractal volumes generated with a seed in
+        G.fractalcache = args.fractal_cache
+
         G.inputfilename = os.path.split(inputfile.name)[1]
         G.inputdirectory = os.path.dirname(os.path.abspath(inputfile.name))
         inputfilestr = '\n--- Model {}/{}, input file: {}'.format(currentmodelrun, modelend, inputfile.name)
@@ -133,127 +170,327 @@ def run_model(args, currentmodelrun, modelend, numbermodelruns, inputfile, usern
         if args.write_processed:
             write_processed_file(processedlines, appendmodelnumber, G)
 
-        # Check validity of command names and that essential commands are present
-        singlecmds, multicmds, geometry = check_cmd_names(processedlines)
+        # Process the commands that set the parameters of the model, and build
+        # the model from them and the geometry commands
+        geometry = process_model_cmds(processedlines, G)
+        build_model(geometry, G)
 
-        # Create built-in materials
-        m = Material(0, 'pec')
-        m.se = float('inf')
-        m.type = 'builtin'
-        m.averagable = False
-        G.materials.append(m)
-        m = Material(1, 'free_space')
-        m.type = 'builtin'
-        G.materials.append(m)
+    # If geometry information to be reused between model runs
+    else:
+        inputfilestr = '\n--- Model {}/{}, input file (not re-processed, i.e. geometry fixed): {}'.format(currentmodelrun, modelend, inputfile.name)
+        print(Fore.GREEN + '{} {}\n'.format(inputfilestr, '-' * (get_terminal_width() - 1 - len(inputfilestr))) + Style.RESET_ALL)
 
-        # Process parameters for commands that can only occur once in the model
-        process_singlecmds(singlecmds, G)
+        # Clear arrays for field components
+        G.initialise_field_arrays()
 
-        # Process parameters for commands that can occur multiple times in the model
-        print()
-        process_multicmds(multicmds, G)
+        # Clear arrays for fields in PML
+        for pml in G.pmls:
+            pml.initialise_field_arrays()
 
-        # Initialise an array for volumetric material IDs (solid), boolean
-        # arrays for specifying materials not to be averaged (rigid),
-        # an array for cell edge IDs (ID)
-        G.initialise_geometry_arrays()
+        # Clear temporary arrays for dispersive materials
+        if Material.maxpoles != 0:
+            for T in (G.Tx, G.Ty, G.Tz):
+                T.fill(0)
 
-        # Initialise arrays for the field components
-        G.initialise_field_arrays()
+    # Run the models in batches (geometry fixed), which runs every model, so
+    # the FDTDGrid class instance is not needed after
+    if args.batch is not None:
+        tsolve = run_model_batches(args, currentmodelrun, modelend, numbermodelruns, G)
+        del G
+        return tsolve
 
-        # Process geometry commands in the order they were given
-        process_geometrycmds(geometry, G)
+    # Adjust position of simple sources and receivers if required
+    step_sources_receivers(currentmodelrun, modelend, G)
 
-        # Build the PMLs and calculate initial coefficients
-        print()
-        if all(value == 0 for value in G.pmlthickness.values()):
-            if G.messages:
-                print('PML boundaries: switched off')
-            pass  # If all the PMLs are switched off don't need to build anything
-        else:
-            if G.messages:
-                if all(value == G.pmlthickness['x0'] for value in G.pmlthickness.values()):
-                    pmlinfo = str(G.pmlthickness['x0']) + ' cells'
-                else:
-                    pmlinfo = ''
-                    for key, value in G.pmlthickness.items():
-                        pmlinfo += '{}: {} cells, '.format(key, value)
-                    pmlinfo = pmlinfo[:-2]
-                print('PML boundaries: {}'.format(pmlinfo))
-            pbar = tqdm(total=sum(1 for value in G.pmlthickness.values() if value > 0), desc='Building PML boundaries', ncols=get_terminal_width() - 1, file=sys.stdout, disable=G.tqdmdisable)
-            build_pmls(G, pbar)
-            pbar.close()
+    # Write files for any geometry views and geometry object outputs
+    if not (G.geometryviews or G.geometryobjectswrite) and args.geometry_only:
+        print(Fore.RED + '\nWARNING: No geometry views or geometry objects to output found.' + Style.RESET_ALL)
+    write_geometry_outputs(appendmodelnumber, G)
 
-        # Build the model, i.e. set the material properties (ID) for every edge
-        # of every Yee cell
-        print()
-        pbar = tqdm(total=2, desc='Building main grid', ncols=get_terminal_width() - 1, file=sys.stdout, disable=G.tqdmdisable)
-        build_electric_components(G.solid, G.rigidE, G.ID, G)
-        pbar.update()
-        build_magnetic_components(G.solid, G.rigidH, G.ID, G)
-        pbar.update()
-        pbar.close()
+    # If only writing geometry information
+    if args.geometry_only:
+        tsolve = 0
+
+    # Run simulation
+    else:
+        # Prepare any snapshot files, and a writer to write them (on a
+        # background thread) while the solver continues
+        for snapshot in G.snapshots:
+            snapshot.prepare(appendmodelnumber, G)
+        G.snapshotwriter = SnapshotWriter(args.snapshot_queue, G)
+
+        # Output filename
+        inputfileparts = os.path.splitext(os.path.join(G.inputdirectory, G.inputfilename))
+        outputfile = inputfileparts[0] + appendmodelnumber + '.out'
+        print('\nOutput file: {}\n'.format(outputfile))
 
-        # Process any voltage sources (that have resistance) to create a new
-        # material at the source location
-        for voltagesource in G.voltagesources:
-            voltagesource.create_material(G)
+        # Main FDTD solving functions for either CPU or GPU
+        try:
+            if G.gpu is None and G.solvercompiled:
+                tsolve = solve_cpu_compiled(currentmodelrun, modelend, G)
+            elif G.gpu is None:
+                tsolve = solve_cpu(currentmodelrun, modelend, G)
+            else:
+                tsolve = solve_gpu(currentmodelrun, modelend, G)
+        finally:
+            # Wait for any snapshots still to be written to file, and stop the
+            # writer's thread even if solving has failed
+            G.snapshotwriter.join()
+        G.snapshotwriter.check()
 
-        # Initialise arrays of update coefficients to pass to update functions
-        G.initialise_std_update_coeff_arrays()
+        # Write an output file in HDF5 format
+        write_hdf5_outputfile(outputfile, G.Ex, G.Ey, G.Ez, G.Hx, G.Hy, G.Hz, G)
 
-        # Initialise arrays of update coefficients and temporary values if
-        # there are any dispersive materials
-        if Material.maxpoles != 0:
-            # Update estimated memory (RAM) usage
-            memestimate = memory_usage(G)
-            # Check if model can be built and/or run on host
-            if memestimate > G.hostinfo['ram']:
-                raise GeneralError('Estimated memory (RAM) required ~{} exceeds {} detected!\n'.format(human_size(memestimate), human_size(G.hostinfo['ram'], a_kilobyte_is_1024_bytes=True)))
-
-            # Check if model can be run on specified GPU if required
-            if G.gpu is not None:
-                if memestimate > G.gpu.totalmem:
-                    raise GeneralError('Estimated memory (RAM) required ~{} exceeds {} detected on specified {} - {} GPU!\n'.format(human_size(memestimate), human_size(G.gpu.totalmem, a_kilobyte_is_1024_bytes=True), G.gpu.deviceID, G.gpu.name))
-            if G.messages:
-                print('Estimated memory (RAM) required: ~{}'.format(human_size(memestimate)))
-
-            G.initialise_dispersive_arrays()
-
-        # Process complete list of materials - calculate update coefficients,
-        # store in arrays, and build text list of materials/properties
-        materialsdata = process_materials(G)
         if G.messages:
-            print('\nMaterials:')
-            materialstable = AsciiTable(materialsdata)
-            materialstable.outer_border = False
-            materialstable.justify_columns[0] = 'right'
-            print(materialstable.table)
-
-        # Check to see if numerical dispersion might be a problem
-        results = dispersion_analysis(G)
-        if results['error']:
-            print(Fore.RED + "\nWARNING: Numerical dispersion analysis not carried out as {}".format(results['error']) + Style.RESET_ALL)
-        elif results['N'] < G.mingridsampling:
-            raise GeneralError("Non-physical wave propagation: Material '{}' has wavelength sampled by {} cells, less than required minimum for physical wave propagation. Maximum significant frequency estimated as {:g}Hz".format(results['material'].ID, results['N'], results['maxfreq']))
-        elif results['deltavp'] and np.abs(results['deltavp']) > G.maxnumericaldisp:
-            print(Fore.RED + "\nWARNING: Potentially significant numerical dispersion. Estimated largest physical phase-velocity error is {:.2f}% in material '{}' whose wavelength sampled by {} cells. Maximum significant frequency estimated as {:g}Hz".format(results['deltavp'], results['material'].ID, results['N'], results['maxfreq']) + Style.RESET_ALL)
-        elif results['deltavp'] and G.messages:
-            print("\nNumerical dispersion analysis: estimated largest physical phase-velocity error is {:.2f}% in material '{}' whose wavelength sampled by {} cells. Maximum significant frequency estimated as {:g}Hz".format(results['deltavp'], results['material'].ID, results['N'], results['maxfreq']))
+            if G.iterationsrun < G.iterations:
+                print('Fields decayed by {:g} dB, model stopped after {} of {} iterations'.format(G.timewindowdecay, G.iterationsrun, G.iterations))
+            print('Memory (RAM) used: ~{}'.format(human_size(p.memory_info().rss)))
+            print('Solving time [HH:MM:SS]: {}'.format(datetime.timedelta(seconds=tsolve)))
 
-    # If geometry information to be reused between model runs
+    # If geometry information to be reused between model runs then FDTDGrid
+    # class instance must be global so that it persists (until the last model,
+    # so that another simulation in the same process builds its own)
+    if not args.geometry_fixed or currentmodelrun == modelend:
+        del G
+
+    return tsolve
+
+
+def process_model_cmds(processedlines, G):
+    """Processes the commands that can only occur once and that can occur
+        multiple times in a model, and initialises the geometry arrays, i.e.
+        everything before the geometry commands are processed.
+
+    Args:
+        processedlines (list): Input commands after Python processing.
+        G (class): Grid class instance - holds essential parameters describing the model.
+
+    Returns:
+        geometry (list): Geometry commands in the model.
+    """
+
+    # Check validity of command names and that essential commands are present
+    singlecmds, multicmds, geometry = check_cmd_names(processedlines)
+
+    # Create built-in materials, and reset the number of poles of dispersive
+    # materials (a class attribute) for the new grid
+    Material.maxpoles = 0
+    G.materials.add_builtin_materials()
+
+    # Process parameters for commands that can only occur once in the model
+    process_singlecmds(singlecmds, G)
+
+    # Process parameters for commands that can occur multiple times in the model
+    print()
+    process_multicmds(multicmds, G)
+
+    # Initialise an array for volumetric material IDs (solid), boolean
+    # arrays for specifying materials not to be averaged (rigid),
+    # an array for cell edge IDs (ID)
+    G.initialise_geometry_arrays()
+
+    return geometry
+
+
+def build_model(geometry, G):
+    """Builds a model ready to be solved - processes the geometry commands;
+        builds the PMLs and the Yee cells; calculates update coefficients.
+
+    Args:
+        geometry (list): Geometry commands in the model.
+        G (class): Grid class instance - holds essential parameters describing the model.
+    """
+
+    # Initialise arrays for the field components
+    G.initialise_field_arrays()
+
+    # Process geometry commands in the order they were given
+    process_geometrycmds(geometry, G)
+
+    # Build the PMLs and calculate initial coefficients
+    print()
+    if all(value == 0 for value in G.pmlthickness.values()):
+        if G.messages:
+            print('PML boundaries: switched off')
+        pass  # If all the PMLs are switched off don't need to build anything
     else:
-        inputfilestr = '\n--- Model {}/{}, input file (not re-processed, i.e. geometry fixed): {}'.format(currentmodelrun, modelend, inputfile.name)
+        if G.messages:
+            if all(value == G.pmlthickness['x0'] for value in G.pmlthickness.values()):
+                pmlinfo = str(G.pmlthickness['x0']) + ' cells'
+            else:
+                pmlinfo = ''
+                for key, value in G.pmlthickness.items():
+                    pmlinfo += '{}: {} cells, '.format(key, value)
+                pmlinfo = pmlinfo[:-2]
+            print('PML boundaries: {}'.format(pmlinfo))
+        pbar = tqdm(total=sum(1 for value in G.pmlthickness.values() if value > 0), desc='Building PML boundaries', ncols=get_terminal_width() - 1, file=sys.stdout, disable=G.tqdmdisable)
+        build_pmls(G, pbar)
+        pbar.close()
+
+    # Build the model, i.e. set the material properties (ID) for every edge
+    # of every Yee cell
+    print()
+    pbar = tqdm(total=2, desc='Building main grid', ncols=get_terminal_width() - 1, file=sys.stdout, disable=G.tqdmdisable)
+    build_electric_components(G.solid, G.rigidE, G.ID, G)
+    pbar.update()
+    build_magnetic_components(G.solid, G.rigidH, G.ID, G)
+    pbar.update()
+    pbar.close()
+
+    # Build complete, i.e. the solid and rigid arrays are no longer
+    # required, unless to write geometry views or geometry objects, in
+    # which case they are spilled to a temporary file
+    memestimate = memory_usage(G)
+    G.release_geometry_arrays(spill=bool(G.geometryviews or G.geometryobjectswrite))
+    if G.messages:
+        print('\nArrays for building geometry released{}: estimated memory (RAM) required reduced by ~{} to ~{}'.format(' (stored in temporary file)' if G.geometryarraysfile is not None else '', human_size(memestimate - memory_usage(G)), human_size(memory_usage(G))))
+
+    # Process any voltage sources (that have resistance) to create a new
+    # material at the source location
+    for voltagesource in G.voltagesources:
+        voltagesource.create_material(G)
+
+    # Initialise arrays of update coefficients to pass to update functions
+    G.initialise_std_update_coeff_arrays()
+
+    # Initialise arrays of update coefficients and temporary values if
+    # there are any dispersive materials
+    if Material.maxpoles != 0:
+        # Find the edges of dispersive materials, so that temporary arrays
+        # can be stored only for them (the GPU kernels use arrays for every
+        # edge)
+        if G.gpu is None:
+            G.find_dispersive_edges()
+
+        # Update estimated memory (RAM) usage
+        memestimate = memory_usage(G)
+        # Check if model can be built and/or run on host
+        if memestimate > G.hostinfo['ram']:
+            raise GeneralError('Estimated memory (RAM) required ~{} exceeds {} detected!\n'.format(human_size(memestimate), human_size(G.hostinfo['ram'], a_kilobyte_is_1024_bytes=True)))
+
+        # Check if model can be run on specified GPU if required
+        if G.gpu is not None:
+            if memestimate > G.gpu.totalmem:
+                raise GeneralError('Estimated memory (RAM) required ~{} exceeds {} detected on specified {} - {} GPU!\n'.format(human_size(memestimate), human_size(G.gpu.totalmem, a_kilobyte_is_1024_bytes=True), G.gpu.deviceID, G.gpu.name))
+        if G.messages:
+            print('Estimated memory (RAM) required: ~{}'.format(human_size(memestimate)))
+            if G.dispersiveedges is not None:
+                print('Dispersive materials: temporary arrays stored only for the {} edges of dispersive materials'.format(sum(len(edges) for edges in G.dispersiveedges)))
+
+        G.initialise_dispersive_arrays()
+
+    # Process complete list of materials - calculate update coefficients,
+    # store in arrays, and build text list of materials/properties
+    materialsdata = process_materials(G)
+    if G.messages:
+        print('\nMaterials:')
+        materialstable = AsciiTable(materialsdata)
+        materialstable.outer_border = False
+        materialstable.justify_columns[0] = 'right'
+        print(materialstable.table)
+
+    # Store the cell edge IDs (ID) with the narrowest integer type for the
+    # number of materials (the GPU kernels use 32-bit integers)
+    if G.gpu is None:
+        memestimate = memory_usage(G)
+        G.compact_ID_array()
+        if G.messages and G.ID.dtype != np.uint32:
+            print('\nMaterial IDs stored as {}-bit integers: estimated memory (RAM) required reduced by ~{} to ~{}'.format(8 * G.ID.itemsize, human_size(memestimate - memory_usage(G)), human_size(memory_usage(G))))
+
+    # Check to see if numerical dispersion might be a problem
+    results = dispersion_analysis(G)
+    if results['error']:
+        print(Fore.RED + "\nWARNING: Numerical dispersion analysis not carried out as {}".format(results['error']) + Style.RESET_ALL)
+    elif results['N'] < G.mingridsampling:
+        raise GeneralError("Non-physical wave propagation: Material '{}' has wavelength sampled by {} cells, less than required minimum for physical wave propagation. Maximum significant frequency estimated as {:g}Hz".format(results['material'].ID, results['N'], results['maxfreq']))
+    elif results['deltavp'] and np.abs(results['deltavp']) > G.maxnumericaldisp:
+        print(Fore.RED + "\nWARNING: Potentially significant numerical dispersion. Estimated largest physical phase-velocity error is {:.2f}% in material '{}' whose wavelength sampled by {} cells. Maximum significant frequency estimated as {:g}Hz".format(results['deltavp'], results['material'].ID, results['N'], results['maxfreq']) + Style.RESET_ALL)
+    elif results['deltavp'] and G.messages:
+        print("\nNumerical dispersion analysis: estimated largest physical phase-velocity error is {:.2f}% in material '{}' whose wavelength sampled by {} cells. Maximum significant frequency estimated as {:g}Hz".format(results['deltavp'], results['material'].ID, results['N'], results['maxfreq']))
+
+
+def run_model_batches(args, modelstart, modelend, numbermodelruns, G):
+    """
+    Runs models with a fixed geometry (--geometry-fixed), e.g. the traces of
+    a B-scan, in batches of models that are advanced together (see Batch),
+    i.e. runs the models from the current model run to the last model.
+
+    Args:
+        args (dict): Namespace with command line arguments
+        modelstart (int): Model run number of the first model to run.
+        modelend (int): Number of last model to run.
+        numbermodelruns (int): Total number of model runs.
+        G (class): Grid class instance - holds essential parameters describing the model.
+
+    Returns:
+        tsolve (float): Length of time (seconds) of main FDTD calculations
+    """
+
+    # Monitor memory usage
+    p = psutil.Process()
+
+    if G.solvercompiled:
+        print(Fore.RED + '\nWARNING: Batches of models are run with their own time-stepping loop, so the compiled time-stepping loop (and any tiled updates or light cone) will not be used.' + Style.RESET_ALL)
+
+    nbatch = batch_size(modelend - modelstart + 1, args.batch, G)
+    nbatches = -(-(modelend - modelstart + 1) // nbatch)
+    if G.messages:
+        print('\nModels run in {} batch(es) of up to {} models: estimated memory (RAM) required for each model in a batch ~{}'.format(nbatches, nbatch, human_size(BatchModel.memory_usage(G))))
+
+    inputfileparts = os.path.splitext(os.path.join(G.inputdirectory, G.inputfilename))
+    tsolve = 0
+    for batchstart in range(modelstart, modelend + 1, nbatch):
+        modelruns = range(batchstart, min(batchstart + nbatch, modelend + 1))
+        inputfilestr = '\n--- Models {}-{}/{}, input file (not re-processed, i.e. geometry fixed): {}'.format(modelruns[0], modelruns[-1], modelend, G.inputfilename)
         print(Fore.GREEN + '{} {}\n'.format(inputfilestr, '-' * (get_terminal_width() - 1 - len(inputfilestr))) + Style.RESET_ALL)
 
-        # Clear arrays for field components
-        G.initialise_field_arrays()
+        # Add the models to the batch, with the sources and receivers stepped
+        # to their positions for each model, and prepare any snapshot files
+        batch = Batch(len(modelruns), G)
+        for currentmodelrun in modelruns:
+            appendmodelnumber = '' if numbermodelruns == 1 and not args.restart else str(currentmodelrun)
+            step_sources_receivers(currentmodelrun, modelend, G)
+            write_geometry_outputs(appendmodelnumber, G)
+            model = batch.add_model(currentmodelrun, appendmodelnumber, G)
+            model.activate(G)
+            for snapshot in G.snapshots:
+                snapshot.prepare(appendmodelnumber, G)
+            batch.restore(G)
+        G.snapshotwriter = SnapshotWriter(args.snapshot_queue, G)
+
+        print('\nOutput files: {}\n'.format(', '.join(os.path.split(inputfileparts[0] + model.appendmodelnumber + '.out')[1] for model in batch.models)))
+        try:
+            tsolve += solve_cpu_batch(batch, modelend, G)
+        finally:
+            # Wait for any snapshots still to be written to file, and stop the
+            # writer's thread even if solving has failed
+            G.snapshotwriter.join()
+        G.snapshotwriter.check()
+
+        # Write an output file in HDF5 format for each model
+        for model in batch.models:
+            model.activate(G)
+            write_hdf5_outputfile(inputfileparts[0] + model.appendmodelnumber + '.out', G.Ex, G.Ey, G.Ez, G.Hx, G.Hy, G.Hz, G)
+            if G.messages and G.iterationsrun < G.iterations:
+                print('Model {}: fields decayed by {:g} dB, model stopped after {} of {} iterations'.format(model.modelrun, G.timewindowdecay, G.iterationsrun, G.iterations))
+        batch.restore(G)
 
-        # Clear arrays for fields in PML
-        for pml in G.pmls:
-            pml.initialise_field_arrays()
+        if G.messages:
+            print('Memory (RAM) used: ~{}'.format(human_size(p.memory_info().rss)))
+            print('Solving time [HH:MM:SS]: {}'.format(datetime.timedelta(seconds=tsolve)))
+
+    return tsolve
+
+
+def step_sources_receivers(currentmodelrun, modelend, G):
+    """Adjusts the positions of simple sources and receivers for a model run if they are stepped (#src_steps and #rx_steps).
+
+    Args:
+        currentmodelrun (int): Current model run number.
+        modelend (int): Number of last model to run.
+        G (class): Grid class instance - holds essential parameters describing the model.
+    """
 
-    # Adjust position of simple sources and receivers if required
     if G.srcsteps[0] != 0 or G.srcsteps[1] != 0 or G.srcsteps[2] != 0:
         for source in itertools.chain(G.hertziandipoles, G.magneticdipoles):
             if currentmodelrun == 1:
@@ -271,9 +508,16 @@ def run_model(args, currentmodelrun, modelend, numbermodelruns, inputfile, usern
             receiver.ycoord = receiver.ycoordorigin + (currentmodelrun - 1) * G.rxsteps[1]
             receiver.zcoord = receiver.zcoordorigin + (currentmodelrun - 1) * G.rxsteps[2]
 
-    # Write files for any geometry views and geometry object outputs
-    if not (G.geometryviews or G.geometryobjectswrite) and args.geometry_only:
-        print(Fore.RED + '\nWARNING: No geometry views or geometry objects to output found.' + Style.RESET_ALL)
+
+def write_geometry_outputs(appendmodelnumber, G):
+    """Writes files for any geometry views and geometry object outputs.
+
+    Args:
+        appendmodelnumber (str): Text to append to filenames.
+        G (class): Grid class instance - holds essential parameters describing the model.
+    """
+
+    G.restore_geometry_arrays()
     if G.geometryviews:
         print()
         for i, geometryview in enumerate(G.geometryviews):
@@ -286,41 +530,7 @@ def run_model(args, currentmodelrun, modelend, numbermodelruns, inputfile, usern
             pbar = tqdm(total=geometryobject.datawritesize, unit='byte', unit_scale=True, desc='Writing geometry object file {}/{}, {}'.format(i + 1, len(G.geometryobjectswrite), os.path.split(geometryobject.filename)[1]), ncols=get_terminal_width() - 1, file=sys.stdout, disable=G.tqdmdisable)
             geometryobject.write_hdf5(G, pbar)
             pbar.close()
-
-    # If only writing geometry information
-    if args.geometry_only:
-        tsolve = 0
-
-    # Run simulation
-    else:
-        # Prepare any snapshot files
-        for snapshot in G.snapshots:
-            snapshot.prepare_vtk_imagedata(appendmodelnumber, G)
-
-        # Output filename
-        inputfileparts = os.path.splitext(os.path.join(G.inputdirectory, G.inputfilename))
-        outputfile = inputfileparts[0] + appendmodelnumber + '.out'
-        print('\nOutput file: {}\n'.format(outputfile))
-
-        # Main FDTD solving functions for either CPU or GPU
-        if G.gpu is None:
-            tsolve = solve_cpu(currentmodelrun, modelend, G)
-        else:
-            tsolve = solve_gpu(currentmodelrun, modelend, G)
-
-        # Write an output file in HDF5 format
-        write_hdf5_outputfile(outputfile, G.Ex, G.Ey, G.Ez, G.Hx, G.Hy, G.Hz, G)
-
-        if G.messages:
-            print('Memory (RAM) used: ~{}'.format(human_size(p.memory_info().rss)))
-            print('Solving time [HH:MM:SS]: {}'.format(datetime.timedelta(seconds=tsolve)))
-
-    # If geometry information to be reused between model runs then FDTDGrid
-    # class instance must be global so that it persists
-    if not args.geometry_fixed:
-        del G
-
-    return tsolve
+    G.release_geometry_arrays()
 
 
 def solve_cpu(currentmodelrun, modelend, G):
@@ -337,26 +547,43 @@ def solve_cpu(currentmodelrun, modelend, G):
         tsolve (float): Time taken to execute solving
     """
 
+    # Arrays of receiver coordinates and to store field components for receivers
+    rxcoords, rxs = initialise_rx_arrays(G)
+
+    # PML slabs for updating all slabs in a single parallel region
+    if G.pmlfused and G.pmls:
+        pmlslabs = get_fused_pml_slabs(G)
+
+    # Monitor of the decay of the fields for stopping the model early
+    G.iterationsrun = G.iterations
+    if G.timewindowdecay:
+        monitor = FieldDecayMonitor(G)
+
     tsolvestart = perf_counter()
 
     for iteration in tqdm(range(G.iterations), desc='Running simulation, model ' + str(currentmodelrun) + '/' + str(modelend), ncols=get_terminal_width() - 1, file=sys.stdout, disable=G.tqdmdisable):
+        # Stop the model if the fields have decayed
+        if G.timewindowdecay and monitor.due(iteration) and monitor.decayed(iteration, field_energy(G.nx, G.ny, G.nz, G.nthreads, G.Ex, G.Ey, G.Ez, G.Hx, G.Hy, G.Hz)):
+            G.iterationsrun = iteration
+            break
+
         # Store field component values for every receiver and transmission line
-        store_outputs(iteration, G.Ex, G.Ey, G.Ez, G.Hx, G.Hy, G.Hz, G)
+        store_outputs(iteration, G.Ex, G.Ey, G.Ez, G.Hx, G.Hy, G.Hz, rxcoords, rxs, G)
 
         # Write any snapshots to file
         for i, snap in enumerate(G.snapshots):
-            if snap.time == iteration + 1:
-                snapiters = 36 * (((snap.xf - snap.xs) / snap.dx) * ((snap.yf - snap.ys) / snap.dy) * ((snap.zf - snap.zs) / snap.dz))
-                pbar = tqdm(total=snapiters, leave=False, unit='byte', unit_scale=True, desc='  Writing snapshot file {} of {}, {}'.format(i + 1, len(G.snapshots), os.path.split(snap.filename)[1]), ncols=get_terminal_width() - 1, file=sys.stdout, disable=G.tqdmdisable)
-                snap.write_vtk_imagedata(G.Ex, G.Ey, G.Ez, G.Hx, G.Hy, G.Hz, G, pbar)
-                pbar.close()
+            if snap.due(iteration):
+                G.snapshotwriter.put(i, snap, iteration)
 
         # Update magnetic field components
         update_magnetic(G.nx, G.ny, G.nz, G.nthreads, G.updatecoeffsH, G.ID, G.Ex, G.Ey, G.Ez, G.Hx, G.Hy, G.Hz)
 
         # Update magnetic field components with the PML correction
-        for pml in G.pmls:
-            pml.update_magnetic(G)
+        if G.pmlfused and G.pmls:
+            update_pmls_magnetic(pmlslabs, G)
+        else:
+            for pml in G.pmls:
+                pml.update_magnetic(G)
 
         # Update magnetic field components from sources
         for source in G.transmissionlines + G.magneticdipoles:
@@ -368,14 +595,21 @@ def solve_cpu(currentmodelrun, modelend, G):
             update_electric(G.nx, G.ny, G.nz, G.nthreads, G.updatecoeffsE, G.ID, G.Ex, G.Ey, G.Ez, G.Hx, G.Hy, G.Hz)
         # If there are any dispersive materials do 1st part of dispersive update
         # (it is split into two parts as it requires present and updated electric field values).
+        elif G.dispersiveedges is not None:
+            update_electric_dispersive_sparse_A(G.nthreads, Material.maxpoles, G.updatecoeffsE, G.updatecoeffsdispersive, G.ID, *G.dispersiveedges, G.Tx, G.Ty, G.Tz, *G.Edispersive, G.Ex, G.Ey, G.Ez, G.Hx, G.Hy, G.Hz)
+            update_electric(G.nx, G.ny, G.nz, G.nthreads, G.updatecoeffsE, G.ID, G.Ex, G.Ey, G.Ez, G.Hx, G.Hy, G.Hz)
+            set_electric_dispersive_sparse(G.nthreads, *G.dispersiveedges, *G.Edispersive, G.Ex, G.Ey, G.Ez)
         elif Material.maxpoles == 1:
             update_electric_dispersive_1pole_A(G.nx, G.ny, G.nz, G.nthreads, G.updatecoeffsE, G.updatecoeffsdispersive, G.ID, G.Tx, G.Ty, G.Tz, G.Ex, G.Ey, G.Ez, G.Hx, G.Hy, G.Hz)
         elif Material.maxpoles > 1:
             update_electric_dispersive_multipole_A(G.nx, G.ny, G.nz, G.nthreads, Material.maxpoles, G.updatecoeffsE, G.updatecoeffsdispersive, G.ID, G.Tx, G.Ty, G.Tz, G.Ex, G.Ey, G.Ez, G.Hx, G.Hy, G.Hz)
 
         # Update electric field components with the PML correction
-        for pml in G.pmls:
-            pml.update_electric(G)
+        if G.pmlfused and G.pmls:
+            update_pmls_electric(pmlslabs, G)
+        else:
+            for pml in G.pmls:
+                pml.update_electric(G)
 
         # Update electric field components from sources (update any Hertzian dipole sources last)
         for source in G.voltagesources + G.transmissionlines + G.hertziandipoles:
@@ -385,11 +619,203 @@ def solve_cpu(currentmodelrun, modelend, G):
         # (it is split into two parts as it requires present and updated electric
         # field values). Therefore it can only be completely updated after the
         # electric field has been updated by the PML and source updates.
-        if Material.maxpoles == 1:
+        if G.dispersiveedges is not None:
+            update_electric_dispersive_sparse_B(G.nthreads, Material.maxpoles, G.updatecoeffsdispersive, G.ID, *G.dispersiveedges, G.Tx, G.Ty, G.Tz, G.Ex, G.Ey, G.Ez)
+        elif Material.maxpoles == 1:
             update_electric_dispersive_1pole_B(G.nx, G.ny, G.nz, G.nthreads, G.updatecoeffsdispersive, G.ID, G.Tx, G.Ty, G.Tz, G.Ex, G.Ey, G.Ez)
         elif Material.maxpoles > 1:
             update_electric_dispersive_multipole_B(G.nx, G.ny, G.nz, G.nthreads, Material.maxpoles, G.updatecoeffsdispersive, G.ID, G.Tx, G.Ty, G.Tz, G.Ex, G.Ey, G.Ez)
 
+    # Copy output from receivers array back to correct receiver objects
+    get_rx_array(rxs, rxcoords, G)
+
+    tsolve = perf_counter() - tsolvestart
+
+    return tsolve
+
+
+def solve_cpu_compiled(currentmodelrun, modelend, G):
+    """
+    Solving using FDTD method on CPU, with the time-stepping loop in compiled
+    code (see CompiledSolver). The model is time-stepped in blocks of
+    iterations between checkpoints, i.e. iterations on which snapshots are
+    taken, on which the decay of the fields is checked, or on which the
+    progress bar is updated.
+
+    Args:
+        currentmodelrun (int): Current model run number.
+        modelend (int): Number of last model to run.
+        G (class): Grid class instance - holds essential parameters describing the model.
+
+    Returns:
+        tsolve (float): Time taken to execute solving
+    """
+
+    # Arrays of receiver coordinates and to store field components for receivers
+    rxcoords, rxs = initialise_rx_arrays(G)
+
+    solver = CompiledSolver(rxcoords, rxs, G)
+    if G.tileplanes and not solver.tiled:
+        print(Fore.RED + 'WARNING: Tiled updates are only available for 3D models of non-dispersive materials without transmission lines, so the updates will not be tiled.\n' + Style.RESET_ALL)
+    if G.lightcone and solver.tiled:
+        print(Fore.RED + 'WARNING: The updates are not restricted to the light cone of the sources with tiled updates.\n' + Style.RESET_ALL)
+
+    # Monitor of the decay of the fields for stopping the model early
+    G.iterationsrun = G.iterations
+    if G.timewindowdecay:
+        monitor = FieldDecayMonitor(G)
+
+    # Iterations at the start of each block - snapshots are taken and the
+    # decay of the fields is checked before an iteration is run, and the
+    # progress bar is updated around 100 times
+    checkpoints = set(range(0, G.iterations, max(G.iterations // 100, 1)))
+    checkpoints.update(iteration for iteration in range(G.iterations) for snap in G.snapshots if snap.due(iteration))
+    if G.timewindowdecay:
+        checkpoints.update(range(0, G.iterations, monitor.interval))
+    checkpoints = sorted(checkpoints) + [G.iterations]
+
+    tsolvestart = perf_counter()
+
+    pbar = tqdm(total=G.iterations, desc='Running simulation, model ' + str(currentmodelrun) + '/' + str(modelend), ncols=get_terminal_width() - 1, file=sys.stdout, disable=G.tqdmdisable)
+    for start, stop in zip(checkpoints[:-1], checkpoints[1:]):
+        # Stop the model if the fields have decayed
+        if G.timewindowdecay and monitor.due(start) and monitor.decayed(start, field_energy(G.nx, G.ny, G.nz, G.nthreads, G.Ex, G.Ey, G.Ez, G.Hx, G.Hy, G.Hz)):
+            G.iterationsrun = start
+            break
+
+        # Write any snapshots to file
+        for i, snap in enumerate(G.snapshots):
+            if snap.due(start):
+                G.snapshotwriter.put(i, snap, start)
+
+        solver.run(start, stop)
+        pbar.update(stop - start)
+    pbar.close()
+
+    # Copy output from receivers array back to correct receiver objects
+    get_rx_array(rxs, rxcoords, G)
+
+    tsolve = perf_counter() - tsolvestart
+
+    return tsolve
+
+
+def solve_cpu_batch(batch, modelend, G):
+    """
+    Solving using FDTD method on CPU for a batch of models with the same
+    geometry (see Batch). The electric and magnetic field components of all
+    the models are updated together, and the PML, source and dispersive
+    updates, and outputs, are done for each model in turn.
+
+    Args:
+        batch (class): Batch class instance.
+        modelend (int): Number of last model to run.
+        G (class): Grid class instance - holds essential parameters describing the model.
+
+    Returns:
+        tsolve (float): Time taken to execute solving
+    """
+
+    for model in batch.models:
+        model.activate(G)
+
+        # Arrays of receiver coordinates and to store field components for receivers
+        model.rxcoords, model.rxs = initialise_rx_arrays(G)
+
+        # PML slabs for updating all slabs in a single parallel region
+        if G.pmlfused and G.pmls:
+            model.pmlslabs = get_fused_pml_slabs(G)
+
+        # Monitor of the decay of the fields for stopping the model early
+        if G.timewindowdecay:
+            model.monitor = FieldDecayMonitor(G)
+
+    tsolvestart = perf_counter()
+
+    for iteration in tqdm(range(G.iterations), desc='Running simulation, models ' + str(batch.models[0].modelrun) + '-' + str(batch.models[-1].modelrun) + '/' + str(modelend), ncols=get_terminal_width() - 1, file=sys.stdout, disable=G.tqdmdisable):
+        for model in batch.models:
+            model.activate(G)
+
+            # Stop the model if the fields have decayed (it is still updated
+            # with the rest of the batch, but there are no more outputs)
+            if model.running and G.timewindowdecay and model.monitor.due(iteration) and model.monitor.decayed(iteration, field_energy(G.nx, G.ny, G.nz, G.nthreads, G.Ex, G.Ey, G.Ez, G.Hx, G.Hy, G.Hz)):
+                model.iterationsrun = iteration
+                model.running = False
+
+            if model.running:
+                # Store field component values for every receiver and transmission line
+                store_outputs(iteration, G.Ex, G.Ey, G.Ez, G.Hx, G.Hy, G.Hz, model.rxcoords, model.rxs, G)
+
+                # Write any snapshots to file
+                for i, snap in enumerate(G.snapshots):
+                    if snap.due(iteration):
+                        G.snapshotwriter.put(i, snap, iteration)
+
+        # Stop once all the models have been stopped
+        if not any(model.running for model in batch.models):
+            break
+
+        # Update magnetic field components
+        update_magnetic_batch(G.nx, G.ny, G.nz, G.nthreads, G.updatecoeffsH, G.ID, *batch.fields)
+
+        for model in batch.models:
+            model.activate(G)
+
+            # Update magnetic field components with the PML correction
+            if G.pmlfused and G.pmls:
+                update_pmls_magnetic(model.pmlslabs, G)
+            else:
+                for pml in G.pmls:
+                    pml.update_magnetic(G)
+
+            # Update magnetic field components from sources
+            for source in G.transmissionlines + G.magneticdipoles:
+                source.update_magnetic(iteration, G.updatecoeffsH, G.ID, G.Hx, G.Hy, G.Hz, G)
+
+            # If there are any dispersive materials do 1st part of dispersive
+            # update, which, with temporary arrays for every edge, also does
+            # the standard update
+            if G.dispersiveedges is not None:
+                update_electric_dispersive_sparse_A(G.nthreads, Material.maxpoles, G.updatecoeffsE, G.updatecoeffsdispersive, G.ID, *G.dispersiveedges, G.Tx, G.Ty, G.Tz, *G.Edispersive, G.Ex, G.Ey, G.Ez, G.Hx, G.Hy, G.Hz)
+            elif Material.maxpoles == 1:
+                update_electric_dispersive_1pole_A(G.nx, G.ny, G.nz, G.nthreads, G.updatecoeffsE, G.updatecoeffsdispersive, G.ID, G.Tx, G.Ty, G.Tz, G.Ex, G.Ey, G.Ez, G.Hx, G.Hy, G.Hz)
+            elif Material.maxpoles > 1:
+                update_electric_dispersive_multipole_A(G.nx, G.ny, G.nz, G.nthreads, Material.maxpoles, G.updatecoeffsE, G.updatecoeffsdispersive, G.ID, G.Tx, G.Ty, G.Tz, G.Ex, G.Ey, G.Ez, G.Hx, G.Hy, G.Hz)
+
+        # Update electric field components
+        if Material.maxpoles == 0 or G.dispersiveedges is not None:
+            update_electric_batch(G.nx, G.ny, G.nz, G.nthreads, G.updatecoeffsE, G.ID, *batch.fields)
+
+        for model in batch.models:
+            model.activate(G)
+
+            if G.dispersiveedges is not None:
+                set_electric_dispersive_sparse(G.nthreads, *G.dispersiveedges, *G.Edispersive, G.Ex, G.Ey, G.Ez)
+
+            # Update electric field components with the PML correction
+            if G.pmlfused and G.pmls:
+                update_pmls_electric(model.pmlslabs, G)
+            else:
+                for pml in G.pmls:
+                    pml.update_electric(G)
+
+            # Update electric field components from sources (update any Hertzian dipole sources last)
+            for source in G.voltagesources + G.transmissionlines + G.hertziandipoles:
+                source.update_electric(iteration, G.updatecoeffsE, G.ID, G.Ex, G.Ey, G.Ez, G)
+
+            # If there are any dispersive materials do 2nd part of dispersive update
+            if G.dispersiveedges is not None:
+                update_electric_dispersive_sparse_B(G.nthreads, Material.maxpoles, G.updatecoeffsdispersive, G.ID, *G.dispersiveedges, G.Tx, G.Ty, G.Tz, G.Ex, G.Ey, G.Ez)
+            elif Material.maxpoles == 1:
+                update_electric_dispersive_1pole_B(G.nx, G.ny, G.nz, G.nthreads, G.updatecoeffsdispersive, G.ID, G.Tx, G.Ty, G.Tz, G.Ex, G.Ey, G.Ez)
+            elif Material.maxpoles > 1:
+                update_electric_dispersive_multipole_B(G.nx, G.ny, G.nz, G.nthreads, Material.maxpoles, G.updatecoeffsdispersive, G.ID, G.Tx, G.Ty, G.Tz, G.Ex, G.Ey, G.Ez)
+
+    # Copy output from receivers arrays back to correct receiver objects
+    for model in batch.models:
+        model.activate(G)
+        get_rx_array(model.rxs, model.rxcoords, G)
+
     tsolve = perf_counter() - tsolvestart
 
     return tsolve
@@ -408,6 +834,7 @@ def solve_gpu(currentmodelrun, modelend, G):
     """
 
     import pycuda.driver as drv
+    import pycuda.gpuarray as gpuarray
     from pycuda.compiler import SourceModule
     drv.init()
 
@@ -462,7 +889,7 @@ def solve_gpu(currentmodelrun, modelend, G):
         # Initialise arrays on GPU
         rxcoords_gpu, rxs_gpu = gpu_initialise_rx_arrays(G)
         # Prepare kernel and get kernel function
-        kernel_store_outputs = SourceModule(kernel_template_store_outputs.substitute(REAL=cudafloattype, NY_RXCOORDS=3, NX_RXS=6, NY_RXS=G.iterations, NZ_RXS=len(G.rxs), NX_FIELDS=G.Ex.shape[0], NY_FIELDS=G.Ex.shape[1], NZ_FIELDS=G.Ex.shape[2]))
+        kernel_store_outputs = SourceModule(kernel_template_store_outputs.substitute(REAL=cudafloattype, NY_RXCOORDS=3, NX_RXS=len(Rx.gpu_allowableoutputs), NY_RXS=G.iterations, NZ_RXS=len(G.rxs), NX_FIELDS=G.Ex.shape[0], NY_FIELDS=G.Ex.shape[1], NZ_FIELDS=G.Ex.shape[2]))
         store_outputs_gpu = kernel_store_outputs.get_function("store_outputs")
 
     # Sources - initialise arrays on GPU, prepare kernel and get kernel functions
@@ -483,6 +910,11 @@ def solve_gpu(currentmodelrun, modelend, G):
             srcinfo1_voltage_gpu, srcinfo2_voltage_gpu, srcwaves_voltage_gpu = gpu_initialise_src_arrays(G.voltagesources, G)
             update_voltage_source_gpu = kernels_sources.get_function("update_voltage_source")
 
+    # Monitor of the decay of the fields for stopping the model early
+    G.iterationsrun = G.iterations
+    if G.timewindowdecay:
+        monitor = FieldDecayMonitor(G)
+
     # Iteration loop timer
     iterstart = drv.Event()
     iterend = drv.Event()
@@ -490,9 +922,16 @@ def solve_gpu(currentmodelrun, modelend, G):
 
     for iteration in tqdm(range(G.iterations), desc='Running simulation, model ' + str(currentmodelrun) + '/' + str(modelend), ncols=get_terminal_width() - 1, file=sys.stdout, disable=G.tqdmdisable):
 
+        # Stop the model if the fields have decayed
+        if G.timewindowdecay and monitor.due(iteration):
+            energy = e0 * sum(gpuarray.dot(E, E).get() for E in (G.Ex_gpu, G.Ey_gpu, G.Ez_gpu)) + m0 * sum(gpuarray.dot(H, H).get() for H in (G.Hx_gpu, G.Hy_gpu, G.Hz_gpu))
+            if monitor.decayed(iteration, float(energy)):
+                G.iterationsrun = iteration
+                break
+
         # Store field component values for every receiver
         if G.rxs:
-            store_outputs_gpu(np.int32(len(G.rxs)), np.int32(iteration), rxcoords_gpu.gpudata, rxs_gpu.gpudata, G.Ex_gpu.gpudata, G.Ey_gpu.gpudata, G.Ez_gpu.gpudata, G.Hx_gpu.gpudata, G.Hy_gpu.gpudata, G.Hz_gpu.gpudata, block=(1, 1, 1), grid=(round32(len(G.rxs)), 1, 1))
+            store_outputs_gpu(np.int32(len(G.rxs)), np.int32(iteration), floattype(G.dx), floattype(G.dy), floattype(G.dz), rxcoords_gpu.gpudata, rxs_gpu.gpudata, G.Ex_gpu.gpudata, G.Ey_gpu.gpudata, G.Ez_gpu.gpudata, G.Hx_gpu.gpudata, G.Hy_gpu.gpudata, G.Hz_gpu.gpudata, block=(1, 1, 1), grid=(round32(len(G.rxs)), 1, 1))
 
         # Update magnetic field components
         update_h_gpu(np.int32(G.nx), np.int32(G.ny), np.int32(G.nz), G.ID_gpu.gpudata, G.Hx_gpu.gpudata, G.Hy_gpu.gpudata, G.Hz_gpu.gpudata, G.Ex_gpu.gpudata, G.Ey_gpu.gpudata, G.Ez_gpu.gpudata, block=G.tpb, grid=G.bpg)
@@ -32,6 +32,7 @@ from gprMax.constants import floattype
 from gprMax.exceptions import CmdInputError
 from gprMax.gprMax import run_std_sim
 from gprMax.gprMax import run_mpi_sim
+from gprMax.gprMax import run_pool_sim
 from gprMax.utilities import get_terminal_width
 from gprMax.utilities import open_path_file
 
@@ -117,6 +118,10 @@ def run_opt_sim(args, inputfile, usernamespace):
         # each model parallelised with OpenMP (CPU) or CUDA (GPU)
         if args.mpi:
             run_mpi_sim(args, inputfile, usernamespace, optparams)
+        # Task farm of worker processes on the local machine for models with
+        # each model parallelised with OpenMP (CPU) on a share of the cores
+        elif args.pool:
+            run_pool_sim(args, inputfile, usernamespace, optparams)
         # Standard behaviour - models run serially with each model parallelised
         # with OpenMP (CPU) or CUDA (GPU)
         else:
@@ -146,6 +151,10 @@ def run_opt_sim(args, inputfile, usernamespace):
         # each model parallelised with OpenMP (CPU) or CUDA (GPU)
         if args.mpi:
             run_mpi_sim(args, inputfile, usernamespace, optparams)
+        # Task farm of worker processes on the local machine for models with
+        # each model parallelised with OpenMP (CPU) on a share of the cores
+        elif args.pool:
+            run_pool_sim(args, inputfile, usernamespace, optparams)
         # Standard behaviour - models run serially with each model parallelised
         # with OpenMP (CPU) or CUDA (GPU)
         else:
@@ -24,6 +24,9 @@ from tqdm import tqdm
 from gprMax.constants import e0
 from gprMax.constants import z0
 from gprMax.constants import floattype
+from gprMax.pml_updates_ext import PMLSlab
+from gprMax.pml_updates_ext import update_pml_electric
+from gprMax.pml_updates_ext import update_pml_magnetic
 
 
 class CFSParameter(object):
@@ -187,6 +190,7 @@ class PML(object):
             self.CFS = [CFS()]
 
         self.initialise_field_arrays()
+        self.get_update_funcs()
 
     def initialise_field_arrays(self):
         """Initialise arrays to store fields in PML."""
@@ -207,6 +211,13 @@ class PML(object):
             self.HPhi1 = np.zeros((len(self.CFS), self.nx + 1, self.ny, self.nz), dtype=floattype)
             self.HPhi2 = np.zeros((len(self.CFS), self.nx, self.ny + 1, self.nz), dtype=floattype)
 
+    def get_update_funcs(self):
+        """Get update functions from PML Cython extension, once rather than on every update."""
+
+        pml_updates_ext = import_module('gprMax.pml_updates_ext')
+        self.update_electric_cpu = getattr(pml_updates_ext, 'update_pml_' + str(len(self.CFS)) + 'order_electric_' + self.direction)
+        self.update_magnetic_cpu = getattr(pml_updates_ext, 'update_pml_' + str(len(self.CFS)) + 'order_magnetic_' + self.direction)
+
     def calculate_update_coeffs(self, er, mr, G):
         """Calculates electric and magnetic update coefficients for the PML.
 
@@ -253,8 +264,7 @@ class PML(object):
             G (class): Grid class instance - holds essential parameters describing the model.
         """
 
-        func = getattr(import_module('gprMax.pml_updates_ext'), 'update_pml_' + str(len(self.CFS)) + 'order_electric_' + self.direction)
-        func(self.xs, self.xf, self.ys, self.yf, self.zs, self.zf, G.nthreads, G.updatecoeffsE, G.ID, G.Ex, G.Ey, G.Ez, G.Hx, G.Hy, G.Hz, self.EPhi1, self.EPhi2, self.ERA, self.ERB, self.ERE, self.ERF, self.d)
+        self.update_electric_cpu(self.xs, self.xf, self.ys, self.yf, self.zs, self.zf, G.nthreads, G.updatecoeffsE, G.ID, G.Ex, G.Ey, G.Ez, G.Hx, G.Hy, G.Hz, self.EPhi1, self.EPhi2, self.ERA, self.ERB, self.ERE, self.ERF, self.d)
 
     def update_magnetic(self, G):
         """This functions updates magnetic field components with the PML correction.
@@ -263,8 +273,7 @@ class PML(object):
             G (class): Grid class instance - holds essential parameters describing the model.
         """
 
-        func = getattr(import_module('gprMax.pml_updates_ext'), 'update_pml_' + str(len(self.CFS)) + 'order_magnetic_' + self.direction)
-        func(self.xs, self.xf, self.ys, self.yf, self.zs, self.zf, G.nthreads, G.updatecoeffsH, G.ID, G.Ex, G.Ey, G.Ez, G.Hx, G.Hy, G.Hz, self.HPhi1, self.HPhi2, self.HRA, self.HRB, self.HRE, self.HRF, self.d)
+        self.update_magnetic_cpu(self.xs, self.xf, self.ys, self.yf, self.zs, self.zf, G.nthreads, G.updatecoeffsH, G.ID, G.Ex, G.Ey, G.Ez, G.Hx, G.Hy, G.Hz, self.HPhi1, self.HPhi2, self.HRA, self.HRB, self.HRE, self.HRF, self.d)
 
     def gpu_set_blocks_per_grid(self, G):
         """Set the blocks per grid size used for updating the PML field arrays on a GPU.
@@ -324,6 +333,46 @@ class PML(object):
         self.update_magnetic_gpu(np.int32(self.xs), np.int32(self.xf), np.int32(self.ys), np.int32(self.yf), np.int32(self.zs), np.int32(self.zf), np.int32(self.HPhi1.shape[1]), np.int32(self.HPhi1.shape[2]), np.int32(self.HPhi1.shape[3]), np.int32(self.HPhi2.shape[1]), np.int32(self.HPhi2.shape[2]), np.int32(self.HPhi2.shape[3]), G.ID_gpu.gpudata, G.Ex_gpu.gpudata, G.Ey_gpu.gpudata, G.Ez_gpu.gpudata, G.Hx_gpu.gpudata, G.Hy_gpu.gpudata, G.Hz_gpu.gpudata, self.HPhi1_gpu.gpudata, self.HPhi2_gpu.gpudata, self.HRA_gpu.gpudata, self.HRB_gpu.gpudata, self.HRE_gpu.gpudata, self.HRF_gpu.gpudata, floattype(self.d), block=G.tpb, grid=self.bpg)
 
 
+def get_fused_pml_slabs(G):
+    """Gets the PML slabs for updating all PML slabs in a single parallel region.
+
+    Args:
+        G (class): Grid class instance - holds essential parameters describing the model.
+
+    Returns:
+        slabs (list): PMLSlab class instances (or None if there is no slab)
+                for the xminus, yminus, zminus, xplus, yplus and zplus slabs.
+    """
+
+    slabs = [None] * len(PML.directions)
+    for pml in G.pmls:
+        slabs[PML.directions.index(pml.direction)] = PMLSlab(pml)
+
+    return slabs
+
+
+def update_pmls_electric(slabs, G):
+    """Updates electric field components with the PML correction for all PML slabs in a single parallel region.
+
+    Args:
+        slabs (list): PMLSlab class instances for the fused update.
+        G (class): Grid class instance - holds essential parameters describing the model.
+    """
+
+    update_pml_electric(G.nthreads, *slabs, G.updatecoeffsE, G.ID, G.Ex, G.Ey, G.Ez, G.Hx, G.Hy, G.Hz)
+
+
+def update_pmls_magnetic(slabs, G):
+    """Updates magnetic field components with the PML correction for all PML slabs in a single parallel region.
+
+    Args:
+        slabs (list): PMLSlab class instances for the fused update.
+        G (class): Grid class instance - holds essential parameters describing the model.
+    """
+
+    update_pml_magnetic(G.nthreads, *slabs, G.updatecoeffsH, G.ID, G.Ex, G.Ey, G.Ez, G.Hx, G.Hy, G.Hz)
+
+
 def build_pmls(G, pbar):
     """
     This function builds instances of the PML and calculates the initial
@@ -335,25 +384,18 @@ def build_pmls(G, pbar):
         pbar (class): Progress bar class instance.
     """
 
+    # Constitutive parameters of materials indexed by numeric ID
+    er, se, mr, sm = G.get_material_properties()
+
     for key, value in G.pmlthickness.items():
         if value > 0:
-            sumer = 0  # Sum of relative permittivities in PML slab
-            summr = 0  # Sum of relative permeabilities in PML slab
-
             if key[0] == 'x':
                 if key == 'x0':
                     pml = PML(G, ID=key, direction='xminus', xf=value, yf=G.ny, zf=G.nz)
                 elif key == 'xmax':
                     pml = PML(G, ID=key, direction='xplus', xs=G.nx - value, xf=G.nx, yf=G.ny, zf=G.nz)
                 G.pmls.append(pml)
-                for j in range(G.ny):
-                    for k in range(G.nz):
-                        numID = G.solid[pml.xs, j, k]
-                        material = next(x for x in G.materials if x.numID == numID)
-                        sumer += material.er
-                        summr += material.mr
-                averageer = sumer / (G.ny * G.nz)
-                averagemr = summr / (G.ny * G.nz)
+                numIDs = G.solid[pml.xs, :, :]
 
             elif key[0] == 'y':
                 if key == 'y0':
@@ -361,14 +403,7 @@ def build_pmls(G, pbar):
                 elif key == 'ymax':
                     pml = PML(G, ID=key, direction='yplus', ys=G.ny - value, xf=G.nx, yf=G.ny, zf=G.nz)
                 G.pmls.append(pml)
-                for i in range(G.nx):
-                    for k in range(G.nz):
-                        numID = G.solid[i, pml.ys, k]
-                        material = next(x for x in G.materials if x.numID == numID)
-                        sumer += material.er
-                        summr += material.mr
-                averageer = sumer / (G.nx * G.nz)
-                averagemr = summr / (G.nx * G.nz)
+                numIDs = G.solid[:, pml.ys, :]
 
             elif key[0] == 'z':
                 if key == 'z0':
@@ -376,14 +411,14 @@ def build_pmls(G, pbar):
                 elif key == 'zmax':
                     pml = PML(G, ID=key, direction='zplus', zs=G.nz - value, xf=G.nx, yf=G.ny, zf=G.nz)
                 G.pmls.append(pml)
-                for i in range(G.nx):
-                    for j in range(G.ny):
-                        numID = G.solid[i, j, pml.zs]
-                        material = next(x for x in G.materials if x.numID == numID)
-                        sumer += material.er
-                        summr += material.mr
-                averageer = sumer / (G.nx * G.ny)
-                averagemr = summr / (G.nx * G.ny)
+                numIDs = G.solid[:, :, pml.zs]
+
+            # Average relative permittivity and permeability of the materials
+            # on the face of the PML slab. Values are summed sequentially (a
+            # cumulative sum, rather than pairwise) so averages do not change
+            # from summing cell by cell.
+            averageer = np.cumsum(np.take(er, numIDs))[-1] / numIDs.size
+            averagemr = np.cumsum(np.take(mr, numIDs))[-1] / numIDs.size
 
             pml.calculate_update_coeffs(averageer, averagemr, G)
             pbar.update()
@@ -0,0 +1,42 @@
+# Copyright (C) 2015-2018: The University of Edinburgh
+#                 Authors: Craig Warren and Antonis Giannopoulos
+#
+# This file is part of gprMax.
+#
+# gprMax is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gprMax is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gprMax.  If not, see <http://www.gnu.org/licenses/>.
+
+import numpy as np
+cimport numpy as np
+
+from gprMax.constants cimport floattype_t
+from gprMax.constants cimport idtype_t
+
+# Extent, arrays and (numbers of the) row functions of a PML slab, for the
+# fused PML updates
+cdef class PMLSlab:
+    cdef int xs, xf, ys, yf, zs, zf, nx, ny, nz
+    cdef float d
+    cdef floattype_t[:, :, :, ::1] EPhi1, EPhi2, HPhi1, HPhi2
+    cdef floattype_t[:, ::1] ERA, ERB, ERE, ERF, HRA, HRB, HRE, HRF
+    cdef int electricrow, magneticrow
+    cdef bint xreversed
+
+# Fused PML updates of all slabs, which can also be called without the GIL
+# (e.g. from the compiled solver)
+cpdef void update_pml_electric(int nthreads, PMLSlab xminus, PMLSlab yminus, PMLSlab zminus, PMLSlab xplus, PMLSlab yplus, PMLSlab zplus, floattype_t[:, ::1] updatecoeffsE, idtype_t[:, :, :, ::1] ID, floattype_t[:, :, ::1] Ex, floattype_t[:, :, ::1] Ey, floattype_t[:, :, ::1] Ez, floattype_t[:, :, ::1] Hx, floattype_t[:, :, ::1] Hy, floattype_t[:, :, ::1] Hz) noexcept nogil
+cpdef void update_pml_magnetic(int nthreads, PMLSlab xminus, PMLSlab yminus, PMLSlab zminus, PMLSlab xplus, PMLSlab yplus, PMLSlab zplus, floattype_t[:, ::1] updatecoeffsH, idtype_t[:, :, :, ::1] ID, floattype_t[:, :, ::1] Ex, floattype_t[:, :, ::1] Ey, floattype_t[:, :, ::1] Ez, floattype_t[:, :, ::1] Hx, floattype_t[:, :, ::1] Hy, floattype_t[:, :, ::1] Hz) noexcept nogil
+
+# PML update of the part of a slab in a tile of the grid (for the tiled
+# updates of the compiled solver)
+cdef void update_pml_tile_chunk(PMLSlab slab, bint electric, Py_ssize_t xs, Py_ssize_t xf, Py_ssize_t chunk, Py_ssize_t nchunks, floattype_t[:, ::1] updatecoeffs, idtype_t[:, :, :, ::1] ID, floattype_t[:, :, ::1] Ex, floattype_t[:, :, ::1] Ey, floattype_t[:, :, ::1] Ez, floattype_t[:, :, ::1] Hx, floattype_t[:, :, ::1] Hy, floattype_t[:, :, ::1] Hz) noexcept nogil
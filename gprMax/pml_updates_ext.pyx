@@ -18,14 +18,179 @@
 
 import numpy as np
 cimport numpy as np
+cimport cython
 from cython.parallel import prange
+from cython.parallel import parallel
+
+from gprMax.constants cimport floattype_t, complextype_t, idtype_t
+
+
+# Row functions of the slabs (see update_pml_row)
+cdef enum:
+    PML_1ORDER_ELECTRIC_XMINUS
+    PML_1ORDER_ELECTRIC_XPLUS
+    PML_1ORDER_ELECTRIC_YMINUS
+    PML_1ORDER_ELECTRIC_YPLUS
+    PML_1ORDER_ELECTRIC_ZMINUS
+    PML_1ORDER_ELECTRIC_ZPLUS
+    PML_1ORDER_MAGNETIC_XMINUS
+    PML_1ORDER_MAGNETIC_XPLUS
+    PML_1ORDER_MAGNETIC_YMINUS
+    PML_1ORDER_MAGNETIC_YPLUS
+    PML_1ORDER_MAGNETIC_ZMINUS
+    PML_1ORDER_MAGNETIC_ZPLUS
+    PML_2ORDER_ELECTRIC_XMINUS
+    PML_2ORDER_ELECTRIC_XPLUS
+    PML_2ORDER_ELECTRIC_YMINUS
+    PML_2ORDER_ELECTRIC_YPLUS
+    PML_2ORDER_ELECTRIC_ZMINUS
+    PML_2ORDER_ELECTRIC_ZPLUS
+    PML_2ORDER_MAGNETIC_XMINUS
+    PML_2ORDER_MAGNETIC_XPLUS
+    PML_2ORDER_MAGNETIC_YMINUS
+    PML_2ORDER_MAGNETIC_YPLUS
+    PML_2ORDER_MAGNETIC_ZMINUS
+    PML_2ORDER_MAGNETIC_ZPLUS
+
+
+##########################################################
+# PML updates of slabs that are a single cell thick (2D) #
+##########################################################
+@cython.cdivision(True)
+cdef void update_pml_2D_chunk(
+                        int row,
+                        Py_ssize_t chunk,
+                        Py_ssize_t nchunks,
+                        int xs,
+                        int xf,
+                        int ys,
+                        int yf,
+                        int zs,
+                        int zf,
+                        floattype_t[:, ::1] updatecoeffs,
+                        idtype_t[:, :, :, ::1] ID,
+                        floattype_t[:, :, ::1] Ex,
+                        floattype_t[:, :, ::1] Ey,
+                        floattype_t[:, :, ::1] Ez,
+                        floattype_t[:, :, ::1] Hx,
+                        floattype_t[:, :, ::1] Hy,
+                        floattype_t[:, :, ::1] Hz,
+                        floattype_t[:, :, :, ::1] Phi1,
+                        floattype_t[:, :, :, ::1] Phi2,
+                        floattype_t[:, ::1] RA,
+                        floattype_t[:, ::1] RB,
+                        floattype_t[:, ::1] RE,
+                        floattype_t[:, ::1] RF,
+                        float d
+                ) noexcept nogil:
+    """Updates a chunk of a slab which is a single cell thick in one dimension,
+        i.e. a slab of a 2D model, using the row function of the slab. The
+        two other (active) dimensions are collapsed into a single index which
+        is split into nchunks chunks of equal size, so that the work is
+        shared evenly between threads however few cells the first active
+        dimension has.
+
+    Args:
+        row (int): Number of the row function of the slab (see update_pml_row)
+        chunk, nchunks (int): Chunk to update and number of chunks
+        xs, xf, ys, yf, zs, zf (int): Cell coordinates of entire box
+        updatecoeffs, ID, E, H (memoryviews): Access to update coeffients, ID and field component arrays
+        Phi, RA, RB, RE, RF (memoryviews): Access to PML coefficient arrays
+        d (float): Spatial discretisation, e.g. dx, dy or dz
+    """
+
+    cdef Py_ssize_t nx, ny, nz, na, nb, start, stop, a, b0, b1
+    nx = xf - xs
+    ny = yf - ys
+    nz = zf - zs
 
-from gprMax.constants cimport floattype_t, complextype_t
+    # Active dimensions a (outer) and b (inner) of the slab
+    if nx == 1:
+        na = ny
+        nb = nz
+    elif ny == 1:
+        na = nx
+        nb = nz
+    else:
+        na = nx
+        nb = ny
+    if na * nb == 0:
+        return
+
+    start = chunk * na * nb // nchunks
+    stop = (chunk + 1) * na * nb // nchunks
+    while start < stop:
+        a = start // nb
+        b0 = start - a * nb
+        b1 = min(nb, b0 + stop - start)
+        if nx == 1:
+            update_pml_row(row, 0, a, a + 1, b0, b1, xs, xf, ys, yf, zs, zf, updatecoeffs, ID, Ex, Ey, Ez, Hx, Hy, Hz, Phi1, Phi2, RA, RB, RE, RF, d)
+        elif ny == 1:
+            update_pml_row(row, a, 0, 1, b0, b1, xs, xf, ys, yf, zs, zf, updatecoeffs, ID, Ex, Ey, Ez, Hx, Hy, Hz, Phi1, Phi2, RA, RB, RE, RF, d)
+        else:
+            update_pml_row(row, a, b0, b1, 0, 1, xs, xf, ys, yf, zs, zf, updatecoeffs, ID, Ex, Ey, Ez, Hx, Hy, Hz, Phi1, Phi2, RA, RB, RE, RF, d)
+        start += b1 - b0
 
 
 ########################################################
 # Electric field PML updates - 1st order - xminus slab #
 ########################################################
+cdef inline void update_pml_1order_electric_xminus_row(
+                        Py_ssize_t i,
+                        Py_ssize_t j0,
+                        Py_ssize_t j1,
+                        Py_ssize_t k0,
+                        Py_ssize_t k1,
+                        int xs,
+                        int xf,
+                        int ys,
+                        int yf,
+                        int zs,
+                        int zf,
+                        floattype_t[:, ::1] updatecoeffsE,
+                        idtype_t[:, :, :, ::1] ID,
+                        floattype_t[:, :, ::1] Ex,
+                        floattype_t[:, :, ::1] Ey,
+                        floattype_t[:, :, ::1] Ez,
+                        floattype_t[:, :, ::1] Hx,
+                        floattype_t[:, :, ::1] Hy,
+                        floattype_t[:, :, ::1] Hz,
+                        floattype_t[:, :, :, ::1] EPhi1,
+                        floattype_t[:, :, :, ::1] EPhi2,
+                        floattype_t[:, ::1] ERA,
+                        floattype_t[:, ::1] ERB,
+                        floattype_t[:, ::1] ERE,
+                        floattype_t[:, ::1] ERF,
+                        float d
+                ) noexcept nogil:
+    """Updates the y indices j0 to j1 and z indices k0 to k1 at a single x index (row) of the slab for update_pml_1order_electric_xminus."""
+
+    cdef Py_ssize_t j, k, ii, jj, kk
+    cdef int materialEy, materialEz
+    cdef float dx, dHy, dHz, RA0, RB0, RE0, RF0
+    dx = d
+
+    RA0 = (ERA[0, i] - 1)
+    RB0 = ERB[0, i]
+    RE0 = ERE[0, i]
+    RF0 = ERF[0, i]
+    ii = xf - i
+    for j in range(j0, j1):
+        jj = j + ys
+        for k in range(k0, k1):
+            kk = k + zs
+            # Ey
+            materialEy = ID[1, ii, jj, kk]
+            dHz = (Hz[ii, jj, kk] - Hz[ii - 1, jj, kk]) / dx
+            Ey[ii, jj, kk] = Ey[ii, jj, kk] - updatecoeffsE[materialEy, 4] * (RA0 * dHz + RB0 * EPhi1[0, i, j, k])
+            EPhi1[0, i, j, k] = RE0 * EPhi1[0, i, j, k] - RF0 * dHz
+            # Ez
+            materialEz = ID[2, ii, jj, kk]
+            dHy = (Hy[ii, jj, kk] - Hy[ii - 1, jj, kk]) / dx
+            Ez[ii, jj, kk] = Ez[ii, jj, kk] + updatecoeffsE[materialEz, 4] * (RA0 * dHy + RB0 * EPhi2[0, i, j, k])
+            EPhi2[0, i, j, k] = RE0 * EPhi2[0, i, j, k] - RF0 * dHy
+
+
 cpdef void update_pml_1order_electric_xminus(
                         int xs,
                         int xf,
@@ -35,7 +200,7 @@ cpdef void update_pml_1order_electric_xminus(
                         int zf,
                         int nthreads,
                         floattype_t[:, ::1] updatecoeffsE,
-                        np.uint32_t[:, :, :, ::1] ID,
+                        idtype_t[:, :, :, ::1] ID,
                         floattype_t[:, :, ::1] Ex,
                         floattype_t[:, :, ::1] Ey,
                         floattype_t[:, :, ::1] Ez,
@@ -60,39 +225,79 @@ cpdef void update_pml_1order_electric_xminus(
         d (float): Spatial discretisation, e.g. dx, dy or dz
     """
 
-    cdef Py_ssize_t i, j, k, ii, jj, kk
-    cdef int nx, ny, nz, materialEy, materialEz
-    cdef float dx, dHy, dHz, RA0, RB0, RE0, RF0
-    dx = d
+    cdef Py_ssize_t i, chunk
+    cdef int nx, ny, nz
     nx = xf - xs
     ny = yf - ys
     nz = zf - zs
 
-    for i in prange(0, nx, nogil=True, schedule='static', num_threads=nthreads):
-        RA0 = (ERA[0, i] - 1)
-        RB0 = ERB[0, i]
-        RE0 = ERE[0, i]
-        RF0 = ERF[0, i]
-        ii = xf - i
-        for j in range(0, ny):
-            jj = j + ys
-            for k in range(0, nz):
-                kk = k + zs
-                # Ey
-                materialEy = ID[1, ii, jj, kk]
-                dHz = (Hz[ii, jj, kk] - Hz[ii - 1, jj, kk]) / dx
-                Ey[ii, jj, kk] = Ey[ii, jj, kk] - updatecoeffsE[materialEy, 4] * (RA0 * dHz + RB0 * EPhi1[0, i, j, k])
-                EPhi1[0, i, j, k] = RE0 * EPhi1[0, i, j, k] - RF0 * dHz
-                # Ez
-                materialEz = ID[2, ii, jj, kk]
-                dHy = (Hy[ii, jj, kk] - Hy[ii - 1, jj, kk]) / dx
-                Ez[ii, jj, kk] = Ez[ii, jj, kk] + updatecoeffsE[materialEz, 4] * (RA0 * dHy + RB0 * EPhi2[0, i, j, k])
-                EPhi2[0, i, j, k] = RE0 * EPhi2[0, i, j, k] - RF0 * dHy
+    if nx == 1 or ny == 1 or nz == 1:
+        for chunk in prange(0, nthreads, nogil=True, schedule='static', num_threads=nthreads):
+            update_pml_2D_chunk(PML_1ORDER_ELECTRIC_XMINUS, chunk, nthreads, xs, xf, ys, yf, zs, zf, updatecoeffsE, ID, Ex, Ey, Ez, Hx, Hy, Hz, EPhi1, EPhi2, ERA, ERB, ERE, ERF, d)
+    else:
+        for i in prange(0, nx, nogil=True, schedule='static', num_threads=nthreads):
+            update_pml_1order_electric_xminus_row(i, 0, ny, 0, nz, xs, xf, ys, yf, zs, zf, updatecoeffsE, ID, Ex, Ey, Ez, Hx, Hy, Hz, EPhi1, EPhi2, ERA, ERB, ERE, ERF, d)
 
 
 #######################################################
 # Electric field PML updates - 1st order - xplus slab #
 #######################################################
+cdef inline void update_pml_1order_electric_xplus_row(
+                        Py_ssize_t i,
+                        Py_ssize_t j0,
+                        Py_ssize_t j1,
+                        Py_ssize_t k0,
+                        Py_ssize_t k1,
+                        int xs,
+                        int xf,
+                        int ys,
+                        int yf,
+                        int zs,
+                        int zf,
+                        floattype_t[:, ::1] updatecoeffsE,
+                        idtype_t[:, :, :, ::1] ID,
+                        floattype_t[:, :, ::1] Ex,
+                        floattype_t[:, :, ::1] Ey,
+                        floattype_t[:, :, ::1] Ez,
+                        floattype_t[:, :, ::1] Hx,
+                        floattype_t[:, :, ::1] Hy,
+                        floattype_t[:, :, ::1] Hz,
+                        floattype_t[:, :, :, ::1] EPhi1,
+                        floattype_t[:, :, :, ::1] EPhi2,
+                        floattype_t[:, ::1] ERA,
+                        floattype_t[:, ::1] ERB,
+                        floattype_t[:, ::1] ERE,
+                        floattype_t[:, ::1] ERF,
+                        float d
+                ) noexcept nogil:
+    """Updates the y indices j0 to j1 and z indices k0 to k1 at a single x index (row) of the slab for update_pml_1order_electric_xplus."""
+
+    cdef Py_ssize_t j, k, ii, jj, kk
+    cdef int materialEy, materialEz
+    cdef float dx, dHy, dHz, RA0, RB0, RE0, RF0
+    dx = d
+
+    RA0 = (ERA[0, i] - 1)
+    RB0 = ERB[0, i]
+    RE0 = ERE[0, i]
+    RF0 = ERF[0, i]
+    ii = i + xs
+    for j in range(j0, j1):
+        jj = j + ys
+        for k in range(k0, k1):
+            kk = k + zs
+            # Ey
+            materialEy = ID[1, ii, jj, kk]
+            dHz = (Hz[ii, jj, kk] - Hz[ii - 1, jj, kk]) / dx
+            Ey[ii, jj, kk] = Ey[ii, jj, kk] - updatecoeffsE[materialEy, 4] * (RA0 * dHz + RB0 * EPhi1[0, i, j, k])
+            EPhi1[0, i, j, k] = RE0 * EPhi1[0, i, j, k] - RF0 * dHz
+            # Ez
+            materialEz = ID[2, ii, jj, kk]
+            dHy = (Hy[ii, jj, kk] - Hy[ii - 1, jj, kk]) / dx
+            Ez[ii, jj, kk] = Ez[ii, jj, kk] + updatecoeffsE[materialEz, 4] * (RA0 * dHy + RB0 * EPhi2[0, i, j, k])
+            EPhi2[0, i, j, k] = RE0 * EPhi2[0, i, j, k] - RF0 * dHy
+
+
 cpdef void update_pml_1order_electric_xplus(
                         int xs,
                         int xf,
@@ -102,7 +307,7 @@ cpdef void update_pml_1order_electric_xplus(
                         int zf,
                         int nthreads,
                         floattype_t[:, ::1] updatecoeffsE,
-                        np.uint32_t[:, :, :, ::1] ID,
+                        idtype_t[:, :, :, ::1] ID,
                         floattype_t[:, :, ::1] Ex,
                         floattype_t[:, :, ::1] Ey,
                         floattype_t[:, :, ::1] Ez,
@@ -127,39 +332,79 @@ cpdef void update_pml_1order_electric_xplus(
         d (float): Spatial discretisation, e.g. dx, dy or dz
     """
 
-    cdef Py_ssize_t i, j, k, ii, jj, kk
-    cdef int nx, ny, nz, materialEy, materialEz
-    cdef float dx, dHy, dHz, RA0, RB0, RE0, RF0
-    dx = d
+    cdef Py_ssize_t i, chunk
+    cdef int nx, ny, nz
     nx = xf - xs
     ny = yf - ys
     nz = zf - zs
 
-    for i in prange(0, nx, nogil=True, schedule='static', num_threads=nthreads):
-        RA0 = (ERA[0, i] - 1)
-        RB0 = ERB[0, i]
-        RE0 = ERE[0, i]
-        RF0 = ERF[0, i]
-        ii = i + xs
-        for j in range(0, ny):
-            jj = j + ys
-            for k in range(0, nz):
-                kk = k + zs
-                # Ey
-                materialEy = ID[1, ii, jj, kk]
-                dHz = (Hz[ii, jj, kk] - Hz[ii - 1, jj, kk]) / dx
-                Ey[ii, jj, kk] = Ey[ii, jj, kk] - updatecoeffsE[materialEy, 4] * (RA0 * dHz + RB0 * EPhi1[0, i, j, k])
-                EPhi1[0, i, j, k] = RE0 * EPhi1[0, i, j, k] - RF0 * dHz
-                # Ez
-                materialEz = ID[2, ii, jj, kk]
-                dHy = (Hy[ii, jj, kk] - Hy[ii - 1, jj, kk]) / dx
-                Ez[ii, jj, kk] = Ez[ii, jj, kk] + updatecoeffsE[materialEz, 4] * (RA0 * dHy + RB0 * EPhi2[0, i, j, k])
-                EPhi2[0, i, j, k] = RE0 * EPhi2[0, i, j, k] - RF0 * dHy
+    if nx == 1 or ny == 1 or nz == 1:
+        for chunk in prange(0, nthreads, nogil=True, schedule='static', num_threads=nthreads):
+            update_pml_2D_chunk(PML_1ORDER_ELECTRIC_XPLUS, chunk, nthreads, xs, xf, ys, yf, zs, zf, updatecoeffsE, ID, Ex, Ey, Ez, Hx, Hy, Hz, EPhi1, EPhi2, ERA, ERB, ERE, ERF, d)
+    else:
+        for i in prange(0, nx, nogil=True, schedule='static', num_threads=nthreads):
+            update_pml_1order_electric_xplus_row(i, 0, ny, 0, nz, xs, xf, ys, yf, zs, zf, updatecoeffsE, ID, Ex, Ey, Ez, Hx, Hy, Hz, EPhi1, EPhi2, ERA, ERB, ERE, ERF, d)
 
 
 ########################################################
 # Electric field PML updates - 1st order - yminus slab #
 ########################################################
+cdef inline void update_pml_1order_electric_yminus_row(
+                        Py_ssize_t i,
+                        Py_ssize_t j0,
+                        Py_ssize_t j1,
+                        Py_ssize_t k0,
+                        Py_ssize_t k1,
+                        int xs,
+                        int xf,
+                        int ys,
+                        int yf,
+                        int zs,
+                        int zf,
+                        floattype_t[:, ::1] updatecoeffsE,
+                        idtype_t[:, :, :, ::1] ID,
+                        floattype_t[:, :, ::1] Ex,
+                        floattype_t[:, :, ::1] Ey,
+                        floattype_t[:, :, ::1] Ez,
+                        floattype_t[:, :, ::1] Hx,
+                        floattype_t[:, :, ::1] Hy,
+                        floattype_t[:, :, ::1] Hz,
+                        floattype_t[:, :, :, ::1] EPhi1,
+                        floattype_t[:, :, :, ::1] EPhi2,
+                        floattype_t[:, ::1] ERA,
+                        floattype_t[:, ::1] ERB,
+                        floattype_t[:, ::1] ERE,
+                        floattype_t[:, ::1] ERF,
+                        float d
+                ) noexcept nogil:
+    """Updates the y indices j0 to j1 and z indices k0 to k1 at a single x index (row) of the slab for update_pml_1order_electric_yminus."""
+
+    cdef Py_ssize_t j, k, ii, jj, kk
+    cdef int materialEx, materialEz
+    cdef float dy, dHx, dHz, RA0, RB0, RE0, RF0
+    dy = d
+
+    ii = i + xs
+    for j in range(j0, j1):
+        jj = yf - j
+        RA0 = (ERA[0, j] - 1)
+        RB0 = ERB[0, j]
+        RE0 = ERE[0, j]
+        RF0 = ERF[0, j]
+        for k in range(k0, k1):
+            kk = k + zs
+            # Ex
+            materialEx = ID[0, ii, jj, kk]
+            dHz = (Hz[ii, jj, kk] - Hz[ii, jj - 1, kk]) / dy
+            Ex[ii, jj, kk] = Ex[ii, jj, kk] + updatecoeffsE[materialEx, 4] * (RA0 * dHz + RB0 * EPhi1[0, i, j, k])
+            EPhi1[0, i, j, k] = RE0 * EPhi1[0, i, j, k] - RF0 * dHz
+            # Ez
+            materialEz = ID[2, ii, jj, kk]
+            dHx = (Hx[ii, jj, kk] - Hx[ii, jj - 1, kk]) / dy
+            Ez[ii, jj, kk] = Ez[ii, jj, kk] - updatecoeffsE[materialEz, 4] * (RA0 * dHx + RB0 * EPhi2[0, i, j, k])
+            EPhi2[0, i, j, k] = RE0 * EPhi2[0, i, j, k] - RF0 * dHx
+
+
 cpdef void update_pml_1order_electric_yminus(
                         int xs,
                         int xf,
@@ -169,7 +414,7 @@ cpdef void update_pml_1order_electric_yminus(
                         int zf,
                         int nthreads,
                         floattype_t[:, ::1] updatecoeffsE,
-                        np.uint32_t[:, :, :, ::1] ID,
+                        idtype_t[:, :, :, ::1] ID,
                         floattype_t[:, :, ::1] Ex,
                         floattype_t[:, :, ::1] Ey,
                         floattype_t[:, :, ::1] Ez,
@@ -194,39 +439,79 @@ cpdef void update_pml_1order_electric_yminus(
         d (float): Spatial discretisation, e.g. dx, dy or dz
     """
 
-    cdef Py_ssize_t i, j, k, ii, jj, kk
-    cdef int nx, ny, nz, materialEx, materialEz
-    cdef float dy, dHx, dHz, RA0, RB0, RE0, RF0
-    dy = d
+    cdef Py_ssize_t i, chunk
+    cdef int nx, ny, nz
     nx = xf - xs
     ny = yf - ys
     nz = zf - zs
 
-    for i in prange(0, nx, nogil=True, schedule='static', num_threads=nthreads):
-        ii = i + xs
-        for j in range(0, ny):
-            jj = yf - j
-            RA0 = (ERA[0, j] - 1)
-            RB0 = ERB[0, j]
-            RE0 = ERE[0, j]
-            RF0 = ERF[0, j]
-            for k in range(0, nz):
-                kk = k + zs
-                # Ex
-                materialEx = ID[0, ii, jj, kk]
-                dHz = (Hz[ii, jj, kk] - Hz[ii, jj - 1, kk]) / dy
-                Ex[ii, jj, kk] = Ex[ii, jj, kk] + updatecoeffsE[materialEx, 4] * (RA0 * dHz + RB0 * EPhi1[0, i, j, k])
-                EPhi1[0, i, j, k] = RE0 * EPhi1[0, i, j, k] - RF0 * dHz
-                # Ez
-                materialEz = ID[2, ii, jj, kk]
-                dHx = (Hx[ii, jj, kk] - Hx[ii, jj - 1, kk]) / dy
-                Ez[ii, jj, kk] = Ez[ii, jj, kk] - updatecoeffsE[materialEz, 4] * (RA0 * dHx + RB0 * EPhi2[0, i, j, k])
-                EPhi2[0, i, j, k] = RE0 * EPhi2[0, i, j, k] - RF0 * dHx
+    if nx == 1 or ny == 1 or nz == 1:
+        for chunk in prange(0, nthreads, nogil=True, schedule='static', num_threads=nthreads):
+            update_pml_2D_chunk(PML_1ORDER_ELECTRIC_YMINUS, chunk, nthreads, xs, xf, ys, yf, zs, zf, updatecoeffsE, ID, Ex, Ey, Ez, Hx, Hy, Hz, EPhi1, EPhi2, ERA, ERB, ERE, ERF, d)
+    else:
+        for i in prange(0, nx, nogil=True, schedule='static', num_threads=nthreads):
+            update_pml_1order_electric_yminus_row(i, 0, ny, 0, nz, xs, xf, ys, yf, zs, zf, updatecoeffsE, ID, Ex, Ey, Ez, Hx, Hy, Hz, EPhi1, EPhi2, ERA, ERB, ERE, ERF, d)
 
 
 #######################################################
 # Electric field PML updates - 1st order - yplus slab #
 #######################################################
+cdef inline void update_pml_1order_electric_yplus_row(
+                        Py_ssize_t i,
+                        Py_ssize_t j0,
+                        Py_ssize_t j1,
+                        Py_ssize_t k0,
+                        Py_ssize_t k1,
+                        int xs,
+                        int xf,
+                        int ys,
+                        int yf,
+                        int zs,
+                        int zf,
+                        floattype_t[:, ::1] updatecoeffsE,
+                        idtype_t[:, :, :, ::1] ID,
+                        floattype_t[:, :, ::1] Ex,
+                        floattype_t[:, :, ::1] Ey,
+                        floattype_t[:, :, ::1] Ez,
+                        floattype_t[:, :, ::1] Hx,
+                        floattype_t[:, :, ::1] Hy,
+                        floattype_t[:, :, ::1] Hz,
+                        floattype_t[:, :, :, ::1] EPhi1,
+                        floattype_t[:, :, :, ::1] EPhi2,
+                        floattype_t[:, ::1] ERA,
+                        floattype_t[:, ::1] ERB,
+                        floattype_t[:, ::1] ERE,
+                        floattype_t[:, ::1] ERF,
+                        float d
+                ) noexcept nogil:
+    """Updates the y indices j0 to j1 and z indices k0 to k1 at a single x index (row) of the slab for update_pml_1order_electric_yplus."""
+
+    cdef Py_ssize_t j, k, ii, jj, kk
+    cdef int materialEx, materialEz
+    cdef float dy, dHx, dHz, RA0, RB0, RE0, RF0
+    dy = d
+
+    ii = i + xs
+    for j in range(j0, j1):
+        jj = j + ys
+        RA0 = (ERA[0, j] - 1)
+        RB0 = ERB[0, j]
+        RE0 = ERE[0, j]
+        RF0 = ERF[0, j]
+        for k in range(k0, k1):
+            kk = k + zs
+            # Ex
+            materialEx = ID[0, ii, jj, kk]
+            dHz = (Hz[ii, jj, kk] - Hz[ii, jj - 1, kk]) / dy
+            Ex[ii, jj, kk] = Ex[ii, jj, kk] + updatecoeffsE[materialEx, 4] * (RA0 * dHz + RB0 * EPhi1[0, i, j, k])
+            EPhi1[0, i, j, k] = RE0 * EPhi1[0, i, j, k] - RF0 * dHz
+            # Ez
+            materialEz = ID[2, ii, jj, kk]
+            dHx = (Hx[ii, jj, kk] - Hx[ii, jj - 1, kk]) / dy
+            Ez[ii, jj, kk] = Ez[ii, jj, kk] - updatecoeffsE[materialEz, 4] * (RA0 * dHx + RB0 * EPhi2[0, i, j, k])
+            EPhi2[0, i, j, k] = RE0 * EPhi2[0, i, j, k] - RF0 * dHx
+
+
 cpdef void update_pml_1order_electric_yplus(
                         int xs,
                         int xf,
@@ -236,7 +521,7 @@ cpdef void update_pml_1order_electric_yplus(
                         int zf,
                         int nthreads,
                         floattype_t[:, ::1] updatecoeffsE,
-                        np.uint32_t[:, :, :, ::1] ID,
+                        idtype_t[:, :, :, ::1] ID,
                         floattype_t[:, :, ::1] Ex,
                         floattype_t[:, :, ::1] Ey,
                         floattype_t[:, :, ::1] Ez,
@@ -261,39 +546,79 @@ cpdef void update_pml_1order_electric_yplus(
         d (float): Spatial discretisation, e.g. dx, dy or dz
     """
 
-    cdef Py_ssize_t i, j, k, ii, jj, kk
-    cdef int nx, ny, nz, materialEx, materialEz
-    cdef float dy, dHx, dHz, RA0, RB0, RE0, RF0
-    dy = d
+    cdef Py_ssize_t i, chunk
+    cdef int nx, ny, nz
     nx = xf - xs
     ny = yf - ys
     nz = zf - zs
 
-    for i in prange(0, nx, nogil=True, schedule='static', num_threads=nthreads):
-        ii = i + xs
-        for j in range(0, ny):
-            jj = j + ys
-            RA0 = (ERA[0, j] - 1)
-            RB0 = ERB[0, j]
-            RE0 = ERE[0, j]
-            RF0 = ERF[0, j]
-            for k in range(0, nz):
-                kk = k + zs
-                # Ex
-                materialEx = ID[0, ii, jj, kk]
-                dHz = (Hz[ii, jj, kk] - Hz[ii, jj - 1, kk]) / dy
-                Ex[ii, jj, kk] = Ex[ii, jj, kk] + updatecoeffsE[materialEx, 4] * (RA0 * dHz + RB0 * EPhi1[0, i, j, k])
-                EPhi1[0, i, j, k] = RE0 * EPhi1[0, i, j, k] - RF0 * dHz
-                # Ez
-                materialEz = ID[2, ii, jj, kk]
-                dHx = (Hx[ii, jj, kk] - Hx[ii, jj - 1, kk]) / dy
-                Ez[ii, jj, kk] = Ez[ii, jj, kk] - updatecoeffsE[materialEz, 4] * (RA0 * dHx + RB0 * EPhi2[0, i, j, k])
-                EPhi2[0, i, j, k] = RE0 * EPhi2[0, i, j, k] - RF0 * dHx
+    if nx == 1 or ny == 1 or nz == 1:
+        for chunk in prange(0, nthreads, nogil=True, schedule='static', num_threads=nthreads):
+            update_pml_2D_chunk(PML_1ORDER_ELECTRIC_YPLUS, chunk, nthreads, xs, xf, ys, yf, zs, zf, updatecoeffsE, ID, Ex, Ey, Ez, Hx, Hy, Hz, EPhi1, EPhi2, ERA, ERB, ERE, ERF, d)
+    else:
+        for i in prange(0, nx, nogil=True, schedule='static', num_threads=nthreads):
+            update_pml_1order_electric_yplus_row(i, 0, ny, 0, nz, xs, xf, ys, yf, zs, zf, updatecoeffsE, ID, Ex, Ey, Ez, Hx, Hy, Hz, EPhi1, EPhi2, ERA, ERB, ERE, ERF, d)
 
 
 ########################################################
 # Electric field PML updates - 1st order - zminus slab #
 ########################################################
+cdef inline void update_pml_1order_electric_zminus_row(
+                        Py_ssize_t i,
+                        Py_ssize_t j0,
+                        Py_ssize_t j1,
+                        Py_ssize_t k0,
+                        Py_ssize_t k1,
+                        int xs,
+                        int xf,
+                        int ys,
+                        int yf,
+                        int zs,
+                        int zf,
+                        floattype_t[:, ::1] updatecoeffsE,
+                        idtype_t[:, :, :, ::1] ID,
+                        floattype_t[:, :, ::1] Ex,
+                        floattype_t[:, :, ::1] Ey,
+                        floattype_t[:, :, ::1] Ez,
+                        floattype_t[:, :, ::1] Hx,
+                        floattype_t[:, :, ::1] Hy,
+                        floattype_t[:, :, ::1] Hz,
+                        floattype_t[:, :, :, ::1] EPhi1,
+                        floattype_t[:, :, :, ::1] EPhi2,
+                        floattype_t[:, ::1] ERA,
+                        floattype_t[:, ::1] ERB,
+                        floattype_t[:, ::1] ERE,
+                        floattype_t[:, ::1] ERF,
+                        float d
+                ) noexcept nogil:
+    """Updates the y indices j0 to j1 and z indices k0 to k1 at a single x index (row) of the slab for update_pml_1order_electric_zminus."""
+
+    cdef Py_ssize_t j, k, ii, jj, kk
+    cdef int materialEx, materialEy
+    cdef float dz, dHx, dHy, RA0, RB0, RE0, RF0
+    dz = d
+
+    ii = i + xs
+    for j in range(j0, j1):
+        jj = j + ys
+        for k in range(k0, k1):
+            kk = zf - k
+            RA0 = (ERA[0, k] - 1)
+            RB0 = ERB[0, k]
+            RE0 = ERE[0, k]
+            RF0 = ERF[0, k]
+            # Ex
+            materialEx = ID[0, ii, jj, kk]
+            dHy = (Hy[ii, jj, kk] - Hy[ii, jj, kk - 1]) / dz
+            Ex[ii, jj, kk] = Ex[ii, jj, kk] - updatecoeffsE[materialEx, 4] * (RA0 * dHy + RB0 * EPhi1[0, i, j, k])
+            EPhi1[0, i, j, k] = RE0 * EPhi1[0, i, j, k] - RF0 * dHy
+            # Ey
+            materialEy = ID[1, ii, jj, kk]
+            dHx = (Hx[ii, jj, kk] - Hx[ii, jj, kk - 1]) / dz
+            Ey[ii, jj, kk] = Ey[ii, jj, kk] + updatecoeffsE[materialEy, 4] * (RA0 * dHx + RB0 * EPhi2[0, i, j, k])
+            EPhi2[0, i, j, k] = RE0 * EPhi2[0, i, j, k] - RF0 * dHx
+
+
 cpdef void update_pml_1order_electric_zminus(
                         int xs,
                         int xf,
@@ -303,7 +628,7 @@ cpdef void update_pml_1order_electric_zminus(
                         int zf,
                         int nthreads,
                         floattype_t[:, ::1] updatecoeffsE,
-                        np.uint32_t[:, :, :, ::1] ID,
+                        idtype_t[:, :, :, ::1] ID,
                         floattype_t[:, :, ::1] Ex,
                         floattype_t[:, :, ::1] Ey,
                         floattype_t[:, :, ::1] Ez,
@@ -328,39 +653,79 @@ cpdef void update_pml_1order_electric_zminus(
         d (float): Spatial discretisation, e.g. dx, dy or dz
         """
 
-    cdef Py_ssize_t i, j, k, ii, jj, kk
-    cdef int nx, ny, nz, materialEx, materialEy
-    cdef float dz, dHx, dHy, RA0, RB0, RE0, RF0
-    dz = d
+    cdef Py_ssize_t i, chunk
+    cdef int nx, ny, nz
     nx = xf - xs
     ny = yf - ys
     nz = zf - zs
 
-    for i in prange(0, nx, nogil=True, schedule='static', num_threads=nthreads):
-        ii = i + xs
-        for j in range(0, ny):
-            jj = j + ys
-            for k in range(0, nz):
-                kk = zf - k
-                RA0 = (ERA[0, k] - 1)
-                RB0 = ERB[0, k]
-                RE0 = ERE[0, k]
-                RF0 = ERF[0, k]
-                # Ex
-                materialEx = ID[0, ii, jj, kk]
-                dHy = (Hy[ii, jj, kk] - Hy[ii, jj, kk - 1]) / dz
-                Ex[ii, jj, kk] = Ex[ii, jj, kk] - updatecoeffsE[materialEx, 4] * (RA0 * dHy + RB0 * EPhi1[0, i, j, k])
-                EPhi1[0, i, j, k] = RE0 * EPhi1[0, i, j, k] - RF0 * dHy
-                # Ey
-                materialEy = ID[1, ii, jj, kk]
-                dHx = (Hx[ii, jj, kk] - Hx[ii, jj, kk - 1]) / dz
-                Ey[ii, jj, kk] = Ey[ii, jj, kk] + updatecoeffsE[materialEy, 4] * (RA0 * dHx + RB0 * EPhi2[0, i, j, k])
-                EPhi2[0, i, j, k] = RE0 * EPhi2[0, i, j, k] - RF0 * dHx
+    if nx == 1 or ny == 1 or nz == 1:
+        for chunk in prange(0, nthreads, nogil=True, schedule='static', num_threads=nthreads):
+            update_pml_2D_chunk(PML_1ORDER_ELECTRIC_ZMINUS, chunk, nthreads, xs, xf, ys, yf, zs, zf, updatecoeffsE, ID, Ex, Ey, Ez, Hx, Hy, Hz, EPhi1, EPhi2, ERA, ERB, ERE, ERF, d)
+    else:
+        for i in prange(0, nx, nogil=True, schedule='static', num_threads=nthreads):
+            update_pml_1order_electric_zminus_row(i, 0, ny, 0, nz, xs, xf, ys, yf, zs, zf, updatecoeffsE, ID, Ex, Ey, Ez, Hx, Hy, Hz, EPhi1, EPhi2, ERA, ERB, ERE, ERF, d)
 
 
 #######################################################
 # Electric field PML updates - 1st order - zplus slab #
 #######################################################
+cdef inline void update_pml_1order_electric_zplus_row(
+                        Py_ssize_t i,
+                        Py_ssize_t j0,
+                        Py_ssize_t j1,
+                        Py_ssize_t k0,
+                        Py_ssize_t k1,
+                        int xs,
+                        int xf,
+                        int ys,
+                        int yf,
+                        int zs,
+                        int zf,
+                        floattype_t[:, ::1] updatecoeffsE,
+                        idtype_t[:, :, :, ::1] ID,
+                        floattype_t[:, :, ::1] Ex,
+                        floattype_t[:, :, ::1] Ey,
+                        floattype_t[:, :, ::1] Ez,
+                        floattype_t[:, :, ::1] Hx,
+                        floattype_t[:, :, ::1] Hy,
+                        floattype_t[:, :, ::1] Hz,
+                        floattype_t[:, :, :, ::1] EPhi1,
+                        floattype_t[:, :, :, ::1] EPhi2,
+                        floattype_t[:, ::1] ERA,
+                        floattype_t[:, ::1] ERB,
+                        floattype_t[:, ::1] ERE,
+                        floattype_t[:, ::1] ERF,
+                        float d
+                ) noexcept nogil:
+    """Updates the y indices j0 to j1 and z indices k0 to k1 at a single x index (row) of the slab for update_pml_1order_electric_zplus."""
+
+    cdef Py_ssize_t j, k, ii, jj, kk
+    cdef int materialEx, materialEy
+    cdef float dz, dHx, dHy, RA0, RB0, RE0, RF0
+    dz = d
+
+    ii = i + xs
+    for j in range(j0, j1):
+        jj = j + ys
+        for k in range(k0, k1):
+            kk = k + zs
+            RA0 = (ERA[0, k] - 1)
+            RB0 = ERB[0, k]
+            RE0 = ERE[0, k]
+            RF0 = ERF[0, k]
+            # Ex
+            materialEx = ID[0, ii, jj, kk]
+            dHy = (Hy[ii, jj, kk] - Hy[ii, jj, kk - 1]) / dz
+            Ex[ii, jj, kk] = Ex[ii, jj, kk] - updatecoeffsE[materialEx, 4] * (RA0 * dHy + RB0 * EPhi1[0, i, j, k])
+            EPhi1[0, i, j, k] = RE0 * EPhi1[0, i, j, k] - RF0 * dHy
+            # Ey
+            materialEy = ID[1, ii, jj, kk]
+            dHx = (Hx[ii, jj, kk] - Hx[ii, jj, kk - 1]) / dz
+            Ey[ii, jj, kk] = Ey[ii, jj, kk] + updatecoeffsE[materialEy, 4] * (RA0 * dHx + RB0 * EPhi2[0, i, j, k])
+            EPhi2[0, i, j, k] = RE0 * EPhi2[0, i, j, k] - RF0 * dHx
+
+
 cpdef void update_pml_1order_electric_zplus(
                         int xs,
                         int xf,
@@ -370,7 +735,7 @@ cpdef void update_pml_1order_electric_zplus(
                         int zf,
                         int nthreads,
                         floattype_t[:, ::1] updatecoeffsE,
-                        np.uint32_t[:, :, :, ::1] ID,
+                        idtype_t[:, :, :, ::1] ID,
                         floattype_t[:, :, ::1] Ex,
                         floattype_t[:, :, ::1] Ey,
                         floattype_t[:, :, ::1] Ez,
@@ -395,49 +760,37 @@ cpdef void update_pml_1order_electric_zplus(
         d (float): Spatial discretisation, e.g. dx, dy or dz
     """
 
-    cdef Py_ssize_t i, j, k, ii, jj, kk
-    cdef int nx, ny, nz, materialEx, materialEy
-    cdef float dz, dHx, dHy, RA0, RB0, RE0, RF0
-    dz = d
+    cdef Py_ssize_t i, chunk
+    cdef int nx, ny, nz
     nx = xf - xs
     ny = yf - ys
     nz = zf - zs
 
-    for i in prange(0, nx, nogil=True, schedule='static', num_threads=nthreads):
-        ii = i + xs
-        for j in range(0, ny):
-            jj = j + ys
-            for k in range(0, nz):
-                kk = k + zs
-                RA0 = (ERA[0, k] - 1)
-                RB0 = ERB[0, k]
-                RE0 = ERE[0, k]
-                RF0 = ERF[0, k]
-                # Ex
-                materialEx = ID[0, ii, jj, kk]
-                dHy = (Hy[ii, jj, kk] - Hy[ii, jj, kk - 1]) / dz
-                Ex[ii, jj, kk] = Ex[ii, jj, kk] - updatecoeffsE[materialEx, 4] * (RA0 * dHy + RB0 * EPhi1[0, i, j, k])
-                EPhi1[0, i, j, k] = RE0 * EPhi1[0, i, j, k] - RF0 * dHy
-                # Ey
-                materialEy = ID[1, ii, jj, kk]
-                dHx = (Hx[ii, jj, kk] - Hx[ii, jj, kk - 1]) / dz
-                Ey[ii, jj, kk] = Ey[ii, jj, kk] + updatecoeffsE[materialEy, 4] * (RA0 * dHx + RB0 * EPhi2[0, i, j, k])
-                EPhi2[0, i, j, k] = RE0 * EPhi2[0, i, j, k] - RF0 * dHx
+    if nx == 1 or ny == 1 or nz == 1:
+        for chunk in prange(0, nthreads, nogil=True, schedule='static', num_threads=nthreads):
+            update_pml_2D_chunk(PML_1ORDER_ELECTRIC_ZPLUS, chunk, nthreads, xs, xf, ys, yf, zs, zf, updatecoeffsE, ID, Ex, Ey, Ez, Hx, Hy, Hz, EPhi1, EPhi2, ERA, ERB, ERE, ERF, d)
+    else:
+        for i in prange(0, nx, nogil=True, schedule='static', num_threads=nthreads):
+            update_pml_1order_electric_zplus_row(i, 0, ny, 0, nz, xs, xf, ys, yf, zs, zf, updatecoeffsE, ID, Ex, Ey, Ez, Hx, Hy, Hz, EPhi1, EPhi2, ERA, ERB, ERE, ERF, d)
 
 
 ########################################################
 # Magnetic field PML updates - 1st order - xminus slab #
 ########################################################
-cpdef void update_pml_1order_magnetic_xminus(
+cdef inline void update_pml_1order_magnetic_xminus_row(
+                        Py_ssize_t i,
+                        Py_ssize_t j0,
+                        Py_ssize_t j1,
+                        Py_ssize_t k0,
+                        Py_ssize_t k1,
                         int xs,
                         int xf,
                         int ys,
                         int yf,
                         int zs,
                         int zf,
-                        int nthreads,
                         floattype_t[:, ::1] updatecoeffsH,
-                        np.uint32_t[:, :, :, ::1] ID,
+                        idtype_t[:, :, :, ::1] ID,
                         floattype_t[:, :, ::1] Ex,
                         floattype_t[:, :, ::1] Ey,
                         floattype_t[:, :, ::1] Ez,
@@ -451,51 +804,36 @@ cpdef void update_pml_1order_magnetic_xminus(
                         floattype_t[:, ::1] HRE,
                         floattype_t[:, ::1] HRF,
                         float d
-                ):
-    """This function updates the Hy and Hz field components for the xminus slab.
-
-    Args:
-        xs, xf, ys, yf, zs, zf (int): Cell coordinates of entire box
-        nthreads (int): Number of threads to use
-        updatecoeffs, ID, E, H (memoryviews): Access to update coeffients, ID and field component arrays
-        EPhi, HPhi, HRA, HRB, ERE, HRF (memoryviews): Access to PML coefficient arrays
-        d (float): Spatial discretisation, e.g. dx, dy or dz
-    """
+                ) noexcept nogil:
+    """Updates the y indices j0 to j1 and z indices k0 to k1 at a single x index (row) of the slab for update_pml_1order_magnetic_xminus."""
 
-    cdef Py_ssize_t i, j, k, ii, jj, kk
-    cdef int nx, ny, nz, materialHy, materialHz
+    cdef Py_ssize_t j, k, ii, jj, kk
+    cdef int materialHy, materialHz
     cdef float dx, dEy, dEz, RA0, RB0, RE0, RF0
     dx = d
-    nx = xf - xs
-    ny = yf - ys
-    nz = zf - zs
 
-    for i in prange(0, nx, nogil=True, schedule='static', num_threads=nthreads):
-        ii = xf - (i + 1)
-        RA0 = (HRA[0, i] - 1)
-        RB0 = HRB[0, i]
-        RE0 = HRE[0, i]
-        RF0 = HRF[0, i]
-        for j in range(0, ny):
-            jj = j + ys
-            for k in range(0, nz):
-                kk = k + zs
-                # Hy
-                materialHy = ID[4, ii, jj, kk]
-                dEz = (Ez[ii + 1, jj, kk] - Ez[ii, jj, kk]) / dx
-                Hy[ii, jj, kk] = Hy[ii, jj, kk] + updatecoeffsH[materialHy, 4] * (RA0 * dEz + RB0 * HPhi1[0, i, j, k])
-                HPhi1[0, i, j, k] = RE0 * HPhi1[0, i, j, k] - RF0 * dEz
-                # Hz
-                materialHz = ID[5, ii, jj, kk]
-                dEy = (Ey[ii + 1, jj, kk] - Ey[ii, jj, kk]) / dx
-                Hz[ii, jj, kk] = Hz[ii, jj, kk] - updatecoeffsH[materialHz, 4] * (RA0 * dEy + RB0 * HPhi2[0, i, j, k])
-                HPhi2[0, i, j, k] = RE0 * HPhi2[0, i, j, k] - RF0 * dEy
+    ii = xf - (i + 1)
+    RA0 = (HRA[0, i] - 1)
+    RB0 = HRB[0, i]
+    RE0 = HRE[0, i]
+    RF0 = HRF[0, i]
+    for j in range(j0, j1):
+        jj = j + ys
+        for k in range(k0, k1):
+            kk = k + zs
+            # Hy
+            materialHy = ID[4, ii, jj, kk]
+            dEz = (Ez[ii + 1, jj, kk] - Ez[ii, jj, kk]) / dx
+            Hy[ii, jj, kk] = Hy[ii, jj, kk] + updatecoeffsH[materialHy, 4] * (RA0 * dEz + RB0 * HPhi1[0, i, j, k])
+            HPhi1[0, i, j, k] = RE0 * HPhi1[0, i, j, k] - RF0 * dEz
+            # Hz
+            materialHz = ID[5, ii, jj, kk]
+            dEy = (Ey[ii + 1, jj, kk] - Ey[ii, jj, kk]) / dx
+            Hz[ii, jj, kk] = Hz[ii, jj, kk] - updatecoeffsH[materialHz, 4] * (RA0 * dEy + RB0 * HPhi2[0, i, j, k])
+            HPhi2[0, i, j, k] = RE0 * HPhi2[0, i, j, k] - RF0 * dEy
 
 
-#######################################################
-# Magnetic field PML updates - 1st order - xplus slab #
-#######################################################
-cpdef void update_pml_1order_magnetic_xplus(
+cpdef void update_pml_1order_magnetic_xminus(
                         int xs,
                         int xf,
                         int ys,
@@ -504,7 +842,7 @@ cpdef void update_pml_1order_magnetic_xplus(
                         int zf,
                         int nthreads,
                         floattype_t[:, ::1] updatecoeffsH,
-                        np.uint32_t[:, :, :, ::1] ID,
+                        idtype_t[:, :, :, ::1] ID,
                         floattype_t[:, :, ::1] Ex,
                         floattype_t[:, :, ::1] Ey,
                         floattype_t[:, :, ::1] Ez,
@@ -519,59 +857,47 @@ cpdef void update_pml_1order_magnetic_xplus(
                         floattype_t[:, ::1] HRF,
                         float d
                 ):
-    """This function updates the Hy and Hz field components for the xplus slab.
+    """This function updates the Hy and Hz field components for the xminus slab.
 
     Args:
         xs, xf, ys, yf, zs, zf (int): Cell coordinates of entire box
         nthreads (int): Number of threads to use
         updatecoeffs, ID, E, H (memoryviews): Access to update coeffients, ID and field component arrays
-        EPhi, HPhi, HRA, HRB, HRE, HRF (memoryviews): Access to PML coefficient arrays
+        EPhi, HPhi, HRA, HRB, ERE, HRF (memoryviews): Access to PML coefficient arrays
         d (float): Spatial discretisation, e.g. dx, dy or dz
     """
 
-    cdef Py_ssize_t i, j, k, ii, jj, kk
-    cdef int nx, ny, nz, materialHy, materialHz
-    cdef float dx, dEy, dEz, RA0, RB0, RE0, RF0
-    dx = d
+    cdef Py_ssize_t i, chunk
+    cdef int nx, ny, nz
     nx = xf - xs
     ny = yf - ys
     nz = zf - zs
 
-    for i in prange(0, nx, nogil=True, schedule='static', num_threads=nthreads):
-        ii = i + xs
-        RA0 = (HRA[0, i] - 1)
-        RB0 = HRB[0, i]
-        RE0 = HRE[0, i]
-        RF0 = HRF[0, i]
-        for j in range(0, ny):
-            jj = j + ys
-            for k in range(0, nz):
-                kk = k + zs
-                # Hy
-                materialHy = ID[4, ii, jj, kk]
-                dEz = (Ez[ii + 1, jj, kk] - Ez[ii, jj, kk]) / dx
-                Hy[ii, jj, kk] = Hy[ii, jj, kk] + updatecoeffsH[materialHy, 4] * (RA0 * dEz + RB0 * HPhi1[0, i, j, k])
-                HPhi1[0, i, j, k] = RE0 * HPhi1[0, i, j, k] - RF0 * dEz
-                # Hz
-                materialHz = ID[5, ii, jj, kk]
-                dEy = (Ey[ii + 1, jj, kk] - Ey[ii, jj, kk]) / dx
-                Hz[ii, jj, kk] = Hz[ii, jj, kk] - updatecoeffsH[materialHz, 4] * (RA0 * dEy + RB0 * HPhi2[0, i, j, k])
-                HPhi2[0, i, j, k] = RE0 * HPhi2[0, i, j, k] - RF0 * dEy
+    if nx == 1 or ny == 1 or nz == 1:
+        for chunk in prange(0, nthreads, nogil=True, schedule='static', num_threads=nthreads):
+            update_pml_2D_chunk(PML_1ORDER_MAGNETIC_XMINUS, chunk, nthreads, xs, xf, ys, yf, zs, zf, updatecoeffsH, ID, Ex, Ey, Ez, Hx, Hy, Hz, HPhi1, HPhi2, HRA, HRB, HRE, HRF, d)
+    else:
+        for i in prange(0, nx, nogil=True, schedule='static', num_threads=nthreads):
+            update_pml_1order_magnetic_xminus_row(i, 0, ny, 0, nz, xs, xf, ys, yf, zs, zf, updatecoeffsH, ID, Ex, Ey, Ez, Hx, Hy, Hz, HPhi1, HPhi2, HRA, HRB, HRE, HRF, d)
 
 
-########################################################
-# Magnetic field PML updates - 1st order - yminus slab #
-########################################################
-cpdef void update_pml_1order_magnetic_yminus(
+#######################################################
+# Magnetic field PML updates - 1st order - xplus slab #
+#######################################################
+cdef inline void update_pml_1order_magnetic_xplus_row(
+                        Py_ssize_t i,
+                        Py_ssize_t j0,
+                        Py_ssize_t j1,
+                        Py_ssize_t k0,
+                        Py_ssize_t k1,
                         int xs,
                         int xf,
                         int ys,
                         int yf,
                         int zs,
                         int zf,
-                        int nthreads,
                         floattype_t[:, ::1] updatecoeffsH,
-                        np.uint32_t[:, :, :, ::1] ID,
+                        idtype_t[:, :, :, ::1] ID,
                         floattype_t[:, :, ::1] Ex,
                         floattype_t[:, :, ::1] Ey,
                         floattype_t[:, :, ::1] Ez,
@@ -585,51 +911,36 @@ cpdef void update_pml_1order_magnetic_yminus(
                         floattype_t[:, ::1] HRE,
                         floattype_t[:, ::1] HRF,
                         float d
-                ):
-    """This function updates the Hx and Hz field components for the yminus slab.
-
-    Args:
-        xs, xf, ys, yf, zs, zf (int): Cell coordinates of entire box
-        nthreads (int): Number of threads to use
-        updatecoeffs, ID, E, H (memoryviews): Access to update coeffients, ID and field component arrays
-        EPhi, HPhi, HRA, HRB, HRE, HRF (memoryviews): Access to PML coefficient arrays
-        d (float): Spatial discretisation, e.g. dx, dy or dz
-    """
+                ) noexcept nogil:
+    """Updates the y indices j0 to j1 and z indices k0 to k1 at a single x index (row) of the slab for update_pml_1order_magnetic_xplus."""
 
-    cdef Py_ssize_t i, j, k, ii, jj, kk
-    cdef int nx, ny, nz, materialHx, materialHz
-    cdef float dy, dEx, dEz, RA0, RB0, RE0, RF0
-    dy = d
-    nx = xf - xs
-    ny = yf - ys
-    nz = zf - zs
+    cdef Py_ssize_t j, k, ii, jj, kk
+    cdef int materialHy, materialHz
+    cdef float dx, dEy, dEz, RA0, RB0, RE0, RF0
+    dx = d
 
-    for i in prange(0, nx, nogil=True, schedule='static', num_threads=nthreads):
-        ii = i + xs
-        for j in range(0, ny):
-            jj = yf - (j + 1)
-            RA0 = (HRA[0, j] - 1)
-            RB0 = HRB[0, j]
-            RE0 = HRE[0, j]
-            RF0 = HRF[0, j]
-            for k in range(0, nz):
-                kk = k + zs
-                # Hx
-                materialHx = ID[3, ii, jj, kk]
-                dEz = (Ez[ii, jj + 1, kk] - Ez[ii, jj, kk]) / dy
-                Hx[ii, jj, kk] = Hx[ii, jj, kk] - updatecoeffsH[materialHx, 4] * (RA0 * dEz + RB0 * HPhi1[0, i, j, k])
-                HPhi1[0, i, j, k] = RE0 * HPhi1[0, i, j, k] - RF0 * dEz
-                # Hz
-                materialHz = ID[5, ii, jj, kk]
-                dEx = (Ex[ii, jj + 1, kk] - Ex[ii, jj, kk]) / dy
-                Hz[ii, jj, kk] = Hz[ii, jj, kk] + updatecoeffsH[materialHz, 4] * (RA0 * dEx + RB0 * HPhi2[0, i, j, k])
-                HPhi2[0, i, j, k] = RE0 * HPhi2[0, i, j, k] - RF0 * dEx
+    ii = i + xs
+    RA0 = (HRA[0, i] - 1)
+    RB0 = HRB[0, i]
+    RE0 = HRE[0, i]
+    RF0 = HRF[0, i]
+    for j in range(j0, j1):
+        jj = j + ys
+        for k in range(k0, k1):
+            kk = k + zs
+            # Hy
+            materialHy = ID[4, ii, jj, kk]
+            dEz = (Ez[ii + 1, jj, kk] - Ez[ii, jj, kk]) / dx
+            Hy[ii, jj, kk] = Hy[ii, jj, kk] + updatecoeffsH[materialHy, 4] * (RA0 * dEz + RB0 * HPhi1[0, i, j, k])
+            HPhi1[0, i, j, k] = RE0 * HPhi1[0, i, j, k] - RF0 * dEz
+            # Hz
+            materialHz = ID[5, ii, jj, kk]
+            dEy = (Ey[ii + 1, jj, kk] - Ey[ii, jj, kk]) / dx
+            Hz[ii, jj, kk] = Hz[ii, jj, kk] - updatecoeffsH[materialHz, 4] * (RA0 * dEy + RB0 * HPhi2[0, i, j, k])
+            HPhi2[0, i, j, k] = RE0 * HPhi2[0, i, j, k] - RF0 * dEy
 
 
-#######################################################
-# Magnetic field PML updates - 1st order - yplus slab #
-#######################################################
-cpdef void update_pml_1order_magnetic_yplus(
+cpdef void update_pml_1order_magnetic_xplus(
                         int xs,
                         int xf,
                         int ys,
@@ -638,7 +949,7 @@ cpdef void update_pml_1order_magnetic_yplus(
                         int zf,
                         int nthreads,
                         floattype_t[:, ::1] updatecoeffsH,
-                        np.uint32_t[:, :, :, ::1] ID,
+                        idtype_t[:, :, :, ::1] ID,
                         floattype_t[:, :, ::1] Ex,
                         floattype_t[:, :, ::1] Ey,
                         floattype_t[:, :, ::1] Ez,
@@ -653,7 +964,7 @@ cpdef void update_pml_1order_magnetic_yplus(
                         floattype_t[:, ::1] HRF,
                         float d
                 ):
-    """This function updates the Hx and Hz field components for the yplus slab.
+    """This function updates the Hy and Hz field components for the xplus slab.
 
     Args:
         xs, xf, ys, yf, zs, zf (int): Cell coordinates of entire box
@@ -663,49 +974,37 @@ cpdef void update_pml_1order_magnetic_yplus(
         d (float): Spatial discretisation, e.g. dx, dy or dz
     """
 
-    cdef Py_ssize_t i, j, k, ii, jj, kk
-    cdef int nx, ny, nz, materialHx, materialHz
-    cdef float dy, dEx, dEz, RA0, RB0, RE0, RF0
-    dy = d
+    cdef Py_ssize_t i, chunk
+    cdef int nx, ny, nz
     nx = xf - xs
     ny = yf - ys
     nz = zf - zs
 
-    for i in prange(0, nx, nogil=True, schedule='static', num_threads=nthreads):
-        ii = i + xs
-        for j in range(0, ny):
-            jj = j + ys
-            RA0 = (HRA[0, j] - 1)
-            RB0 = HRB[0, j]
-            RE0 = HRE[0, j]
-            RF0 = HRF[0, j]
-            for k in range(0, nz):
-                kk = k + zs
-                # Hx
-                materialHx = ID[3, ii, jj, kk]
-                dEz = (Ez[ii, jj + 1, kk] - Ez[ii, jj, kk]) / dy
-                Hx[ii, jj, kk] = Hx[ii, jj, kk] - updatecoeffsH[materialHx, 4] * (RA0 * dEz + RB0 * HPhi1[0, i, j, k])
-                HPhi1[0, i, j, k] = RE0 * HPhi1[0, i, j, k] - RF0 * dEz
-                # Hz
-                materialHz = ID[5, ii, jj, kk]
-                dEx = (Ex[ii, jj + 1, kk] - Ex[ii, jj, kk]) / dy
-                Hz[ii, jj, kk] = Hz[ii, jj, kk] + updatecoeffsH[materialHz, 4] * (RA0 * dEx + RB0 * HPhi2[0, i, j, k])
-                HPhi2[0, i, j, k] = RE0 * HPhi2[0, i, j, k] - RF0 * dEx
+    if nx == 1 or ny == 1 or nz == 1:
+        for chunk in prange(0, nthreads, nogil=True, schedule='static', num_threads=nthreads):
+            update_pml_2D_chunk(PML_1ORDER_MAGNETIC_XPLUS, chunk, nthreads, xs, xf, ys, yf, zs, zf, updatecoeffsH, ID, Ex, Ey, Ez, Hx, Hy, Hz, HPhi1, HPhi2, HRA, HRB, HRE, HRF, d)
+    else:
+        for i in prange(0, nx, nogil=True, schedule='static', num_threads=nthreads):
+            update_pml_1order_magnetic_xplus_row(i, 0, ny, 0, nz, xs, xf, ys, yf, zs, zf, updatecoeffsH, ID, Ex, Ey, Ez, Hx, Hy, Hz, HPhi1, HPhi2, HRA, HRB, HRE, HRF, d)
 
 
 ########################################################
-# Magnetic field PML updates - 1st order - zminus slab #
+# Magnetic field PML updates - 1st order - yminus slab #
 ########################################################
-cpdef void update_pml_1order_magnetic_zminus(
+cdef inline void update_pml_1order_magnetic_yminus_row(
+                        Py_ssize_t i,
+                        Py_ssize_t j0,
+                        Py_ssize_t j1,
+                        Py_ssize_t k0,
+                        Py_ssize_t k1,
                         int xs,
                         int xf,
                         int ys,
                         int yf,
                         int zs,
                         int zf,
-                        int nthreads,
                         floattype_t[:, ::1] updatecoeffsH,
-                        np.uint32_t[:, :, :, ::1] ID,
+                        idtype_t[:, :, :, ::1] ID,
                         floattype_t[:, :, ::1] Ex,
                         floattype_t[:, :, ::1] Ey,
                         floattype_t[:, :, ::1] Ez,
@@ -719,8 +1018,167 @@ cpdef void update_pml_1order_magnetic_zminus(
                         floattype_t[:, ::1] HRE,
                         floattype_t[:, ::1] HRF,
                         float d
-                ):
-    """This function updates the Hx and Hy field components for the zminus slab.
+                ) noexcept nogil:
+    """Updates the y indices j0 to j1 and z indices k0 to k1 at a single x index (row) of the slab for update_pml_1order_magnetic_yminus."""
+
+    cdef Py_ssize_t j, k, ii, jj, kk
+    cdef int materialHx, materialHz
+    cdef float dy, dEx, dEz, RA0, RB0, RE0, RF0
+    dy = d
+
+    ii = i + xs
+    for j in range(j0, j1):
+        jj = yf - (j + 1)
+        RA0 = (HRA[0, j] - 1)
+        RB0 = HRB[0, j]
+        RE0 = HRE[0, j]
+        RF0 = HRF[0, j]
+        for k in range(k0, k1):
+            kk = k + zs
+            # Hx
+            materialHx = ID[3, ii, jj, kk]
+            dEz = (Ez[ii, jj + 1, kk] - Ez[ii, jj, kk]) / dy
+            Hx[ii, jj, kk] = Hx[ii, jj, kk] - updatecoeffsH[materialHx, 4] * (RA0 * dEz + RB0 * HPhi1[0, i, j, k])
+            HPhi1[0, i, j, k] = RE0 * HPhi1[0, i, j, k] - RF0 * dEz
+            # Hz
+            materialHz = ID[5, ii, jj, kk]
+            dEx = (Ex[ii, jj + 1, kk] - Ex[ii, jj, kk]) / dy
+            Hz[ii, jj, kk] = Hz[ii, jj, kk] + updatecoeffsH[materialHz, 4] * (RA0 * dEx + RB0 * HPhi2[0, i, j, k])
+            HPhi2[0, i, j, k] = RE0 * HPhi2[0, i, j, k] - RF0 * dEx
+
+
+cpdef void update_pml_1order_magnetic_yminus(
+                        int xs,
+                        int xf,
+                        int ys,
+                        int yf,
+                        int zs,
+                        int zf,
+                        int nthreads,
+                        floattype_t[:, ::1] updatecoeffsH,
+                        idtype_t[:, :, :, ::1] ID,
+                        floattype_t[:, :, ::1] Ex,
+                        floattype_t[:, :, ::1] Ey,
+                        floattype_t[:, :, ::1] Ez,
+                        floattype_t[:, :, ::1] Hx,
+                        floattype_t[:, :, ::1] Hy,
+                        floattype_t[:, :, ::1] Hz,
+                        floattype_t[:, :, :, ::1] HPhi1,
+                        floattype_t[:, :, :, ::1] HPhi2,
+                        floattype_t[:, ::1] HRA,
+                        floattype_t[:, ::1] HRB,
+                        floattype_t[:, ::1] HRE,
+                        floattype_t[:, ::1] HRF,
+                        float d
+                ):
+    """This function updates the Hx and Hz field components for the yminus slab.
+
+    Args:
+        xs, xf, ys, yf, zs, zf (int): Cell coordinates of entire box
+        nthreads (int): Number of threads to use
+        updatecoeffs, ID, E, H (memoryviews): Access to update coeffients, ID and field component arrays
+        EPhi, HPhi, HRA, HRB, HRE, HRF (memoryviews): Access to PML coefficient arrays
+        d (float): Spatial discretisation, e.g. dx, dy or dz
+    """
+
+    cdef Py_ssize_t i, chunk
+    cdef int nx, ny, nz
+    nx = xf - xs
+    ny = yf - ys
+    nz = zf - zs
+
+    if nx == 1 or ny == 1 or nz == 1:
+        for chunk in prange(0, nthreads, nogil=True, schedule='static', num_threads=nthreads):
+            update_pml_2D_chunk(PML_1ORDER_MAGNETIC_YMINUS, chunk, nthreads, xs, xf, ys, yf, zs, zf, updatecoeffsH, ID, Ex, Ey, Ez, Hx, Hy, Hz, HPhi1, HPhi2, HRA, HRB, HRE, HRF, d)
+    else:
+        for i in prange(0, nx, nogil=True, schedule='static', num_threads=nthreads):
+            update_pml_1order_magnetic_yminus_row(i, 0, ny, 0, nz, xs, xf, ys, yf, zs, zf, updatecoeffsH, ID, Ex, Ey, Ez, Hx, Hy, Hz, HPhi1, HPhi2, HRA, HRB, HRE, HRF, d)
+
+
+#######################################################
+# Magnetic field PML updates - 1st order - yplus slab #
+#######################################################
+cdef inline void update_pml_1order_magnetic_yplus_row(
+                        Py_ssize_t i,
+                        Py_ssize_t j0,
+                        Py_ssize_t j1,
+                        Py_ssize_t k0,
+                        Py_ssize_t k1,
+                        int xs,
+                        int xf,
+                        int ys,
+                        int yf,
+                        int zs,
+                        int zf,
+                        floattype_t[:, ::1] updatecoeffsH,
+                        idtype_t[:, :, :, ::1] ID,
+                        floattype_t[:, :, ::1] Ex,
+                        floattype_t[:, :, ::1] Ey,
+                        floattype_t[:, :, ::1] Ez,
+                        floattype_t[:, :, ::1] Hx,
+                        floattype_t[:, :, ::1] Hy,
+                        floattype_t[:, :, ::1] Hz,
+                        floattype_t[:, :, :, ::1] HPhi1,
+                        floattype_t[:, :, :, ::1] HPhi2,
+                        floattype_t[:, ::1] HRA,
+                        floattype_t[:, ::1] HRB,
+                        floattype_t[:, ::1] HRE,
+                        floattype_t[:, ::1] HRF,
+                        float d
+                ) noexcept nogil:
+    """Updates the y indices j0 to j1 and z indices k0 to k1 at a single x index (row) of the slab for update_pml_1order_magnetic_yplus."""
+
+    cdef Py_ssize_t j, k, ii, jj, kk
+    cdef int materialHx, materialHz
+    cdef float dy, dEx, dEz, RA0, RB0, RE0, RF0
+    dy = d
+
+    ii = i + xs
+    for j in range(j0, j1):
+        jj = j + ys
+        RA0 = (HRA[0, j] - 1)
+        RB0 = HRB[0, j]
+        RE0 = HRE[0, j]
+        RF0 = HRF[0, j]
+        for k in range(k0, k1):
+            kk = k + zs
+            # Hx
+            materialHx = ID[3, ii, jj, kk]
+            dEz = (Ez[ii, jj + 1, kk] - Ez[ii, jj, kk]) / dy
+            Hx[ii, jj, kk] = Hx[ii, jj, kk] - updatecoeffsH[materialHx, 4] * (RA0 * dEz + RB0 * HPhi1[0, i, j, k])
+            HPhi1[0, i, j, k] = RE0 * HPhi1[0, i, j, k] - RF0 * dEz
+            # Hz
+            materialHz = ID[5, ii, jj, kk]
+            dEx = (Ex[ii, jj + 1, kk] - Ex[ii, jj, kk]) / dy
+            Hz[ii, jj, kk] = Hz[ii, jj, kk] + updatecoeffsH[materialHz, 4] * (RA0 * dEx + RB0 * HPhi2[0, i, j, k])
+            HPhi2[0, i, j, k] = RE0 * HPhi2[0, i, j, k] - RF0 * dEx
+
+
+cpdef void update_pml_1order_magnetic_yplus(
+                        int xs,
+                        int xf,
+                        int ys,
+                        int yf,
+                        int zs,
+                        int zf,
+                        int nthreads,
+                        floattype_t[:, ::1] updatecoeffsH,
+                        idtype_t[:, :, :, ::1] ID,
+                        floattype_t[:, :, ::1] Ex,
+                        floattype_t[:, :, ::1] Ey,
+                        floattype_t[:, :, ::1] Ez,
+                        floattype_t[:, :, ::1] Hx,
+                        floattype_t[:, :, ::1] Hy,
+                        floattype_t[:, :, ::1] Hz,
+                        floattype_t[:, :, :, ::1] HPhi1,
+                        floattype_t[:, :, :, ::1] HPhi2,
+                        floattype_t[:, ::1] HRA,
+                        floattype_t[:, ::1] HRB,
+                        floattype_t[:, ::1] HRE,
+                        floattype_t[:, ::1] HRF,
+                        float d
+                ):
+    """This function updates the Hx and Hz field components for the yplus slab.
 
     Args:
         xs, xf, ys, yf, zs, zf (int): Cell coordinates of entire box
@@ -730,39 +1188,186 @@ cpdef void update_pml_1order_magnetic_zminus(
         d (float): Spatial discretisation, e.g. dx, dy or dz
     """
 
-    cdef Py_ssize_t i, j, k, ii, jj, kk
-    cdef int nx, ny, nz, materialHx, materialHy
+    cdef Py_ssize_t i, chunk
+    cdef int nx, ny, nz
+    nx = xf - xs
+    ny = yf - ys
+    nz = zf - zs
+
+    if nx == 1 or ny == 1 or nz == 1:
+        for chunk in prange(0, nthreads, nogil=True, schedule='static', num_threads=nthreads):
+            update_pml_2D_chunk(PML_1ORDER_MAGNETIC_YPLUS, chunk, nthreads, xs, xf, ys, yf, zs, zf, updatecoeffsH, ID, Ex, Ey, Ez, Hx, Hy, Hz, HPhi1, HPhi2, HRA, HRB, HRE, HRF, d)
+    else:
+        for i in prange(0, nx, nogil=True, schedule='static', num_threads=nthreads):
+            update_pml_1order_magnetic_yplus_row(i, 0, ny, 0, nz, xs, xf, ys, yf, zs, zf, updatecoeffsH, ID, Ex, Ey, Ez, Hx, Hy, Hz, HPhi1, HPhi2, HRA, HRB, HRE, HRF, d)
+
+
+########################################################
+# Magnetic field PML updates - 1st order - zminus slab #
+########################################################
+cdef inline void update_pml_1order_magnetic_zminus_row(
+                        Py_ssize_t i,
+                        Py_ssize_t j0,
+                        Py_ssize_t j1,
+                        Py_ssize_t k0,
+                        Py_ssize_t k1,
+                        int xs,
+                        int xf,
+                        int ys,
+                        int yf,
+                        int zs,
+                        int zf,
+                        floattype_t[:, ::1] updatecoeffsH,
+                        idtype_t[:, :, :, ::1] ID,
+                        floattype_t[:, :, ::1] Ex,
+                        floattype_t[:, :, ::1] Ey,
+                        floattype_t[:, :, ::1] Ez,
+                        floattype_t[:, :, ::1] Hx,
+                        floattype_t[:, :, ::1] Hy,
+                        floattype_t[:, :, ::1] Hz,
+                        floattype_t[:, :, :, ::1] HPhi1,
+                        floattype_t[:, :, :, ::1] HPhi2,
+                        floattype_t[:, ::1] HRA,
+                        floattype_t[:, ::1] HRB,
+                        floattype_t[:, ::1] HRE,
+                        floattype_t[:, ::1] HRF,
+                        float d
+                ) noexcept nogil:
+    """Updates the y indices j0 to j1 and z indices k0 to k1 at a single x index (row) of the slab for update_pml_1order_magnetic_zminus."""
+
+    cdef Py_ssize_t j, k, ii, jj, kk
+    cdef int materialHx, materialHy
     cdef float dz, dEx, dEy, RA0, RB0, RE0, RF0
     dz = d
+
+    ii = i + xs
+    for j in range(j0, j1):
+        jj = j + ys
+        for k in range(k0, k1):
+            kk = zf - (k + 1)
+            RA0 = (HRA[0, k] - 1)
+            RB0 = HRB[0, k]
+            RE0 = HRE[0, k]
+            RF0 = HRF[0, k]
+            # Hx
+            materialHx = ID[3, ii, jj, kk]
+            dEy = (Ey[ii, jj, kk + 1] - Ey[ii, jj, kk]) / dz
+            Hx[ii, jj, kk] = Hx[ii, jj, kk] + updatecoeffsH[materialHx, 4] * (RA0 * dEy + RB0 * HPhi1[0, i, j, k])
+            HPhi1[0, i, j, k] = RE0 * HPhi1[0, i, j, k] - RF0 * dEy
+            # Hy
+            materialHy = ID[4, ii, jj, kk]
+            dEx = (Ex[ii, jj, kk + 1] - Ex[ii, jj, kk]) / dz
+            Hy[ii, jj, kk] = Hy[ii, jj, kk] - updatecoeffsH[materialHy, 4] * (RA0 * dEx + RB0 * HPhi2[0, i, j, k])
+            HPhi2[0, i, j, k] = RE0 * HPhi2[0, i, j, k] - RF0 * dEx
+
+
+cpdef void update_pml_1order_magnetic_zminus(
+                        int xs,
+                        int xf,
+                        int ys,
+                        int yf,
+                        int zs,
+                        int zf,
+                        int nthreads,
+                        floattype_t[:, ::1] updatecoeffsH,
+                        idtype_t[:, :, :, ::1] ID,
+                        floattype_t[:, :, ::1] Ex,
+                        floattype_t[:, :, ::1] Ey,
+                        floattype_t[:, :, ::1] Ez,
+                        floattype_t[:, :, ::1] Hx,
+                        floattype_t[:, :, ::1] Hy,
+                        floattype_t[:, :, ::1] Hz,
+                        floattype_t[:, :, :, ::1] HPhi1,
+                        floattype_t[:, :, :, ::1] HPhi2,
+                        floattype_t[:, ::1] HRA,
+                        floattype_t[:, ::1] HRB,
+                        floattype_t[:, ::1] HRE,
+                        floattype_t[:, ::1] HRF,
+                        float d
+                ):
+    """This function updates the Hx and Hy field components for the zminus slab.
+
+    Args:
+        xs, xf, ys, yf, zs, zf (int): Cell coordinates of entire box
+        nthreads (int): Number of threads to use
+        updatecoeffs, ID, E, H (memoryviews): Access to update coeffients, ID and field component arrays
+        EPhi, HPhi, HRA, HRB, HRE, HRF (memoryviews): Access to PML coefficient arrays
+        d (float): Spatial discretisation, e.g. dx, dy or dz
+    """
+
+    cdef Py_ssize_t i, chunk
+    cdef int nx, ny, nz
     nx = xf - xs
     ny = yf - ys
     nz = zf - zs
 
-    for i in prange(0, nx, nogil=True, schedule='static', num_threads=nthreads):
-        ii = i + xs
-        for j in range(0, ny):
-            jj = j + ys
-            for k in range(0, nz):
-                kk = zf - (k + 1)
-                RA0 = (HRA[0, k] - 1)
-                RB0 = HRB[0, k]
-                RE0 = HRE[0, k]
-                RF0 = HRF[0, k]
-                # Hx
-                materialHx = ID[3, ii, jj, kk]
-                dEy = (Ey[ii, jj, kk + 1] - Ey[ii, jj, kk]) / dz
-                Hx[ii, jj, kk] = Hx[ii, jj, kk] + updatecoeffsH[materialHx, 4] * (RA0 * dEy + RB0 * HPhi1[0, i, j, k])
-                HPhi1[0, i, j, k] = RE0 * HPhi1[0, i, j, k] - RF0 * dEy
-                # Hy
-                materialHy = ID[4, ii, jj, kk]
-                dEx = (Ex[ii, jj, kk + 1] - Ex[ii, jj, kk]) / dz
-                Hy[ii, jj, kk] = Hy[ii, jj, kk] - updatecoeffsH[materialHy, 4] * (RA0 * dEx + RB0 * HPhi2[0, i, j, k])
-                HPhi2[0, i, j, k] = RE0 * HPhi2[0, i, j, k] - RF0 * dEx
+    if nx == 1 or ny == 1 or nz == 1:
+        for chunk in prange(0, nthreads, nogil=True, schedule='static', num_threads=nthreads):
+            update_pml_2D_chunk(PML_1ORDER_MAGNETIC_ZMINUS, chunk, nthreads, xs, xf, ys, yf, zs, zf, updatecoeffsH, ID, Ex, Ey, Ez, Hx, Hy, Hz, HPhi1, HPhi2, HRA, HRB, HRE, HRF, d)
+    else:
+        for i in prange(0, nx, nogil=True, schedule='static', num_threads=nthreads):
+            update_pml_1order_magnetic_zminus_row(i, 0, ny, 0, nz, xs, xf, ys, yf, zs, zf, updatecoeffsH, ID, Ex, Ey, Ez, Hx, Hy, Hz, HPhi1, HPhi2, HRA, HRB, HRE, HRF, d)
 
 
 #######################################################
 # Magnetic field PML updates - 1st order - zplus slab #
 #######################################################
+cdef inline void update_pml_1order_magnetic_zplus_row(
+                        Py_ssize_t i,
+                        Py_ssize_t j0,
+                        Py_ssize_t j1,
+                        Py_ssize_t k0,
+                        Py_ssize_t k1,
+                        int xs,
+                        int xf,
+                        int ys,
+                        int yf,
+                        int zs,
+                        int zf,
+                        floattype_t[:, ::1] updatecoeffsH,
+                        idtype_t[:, :, :, ::1] ID,
+                        floattype_t[:, :, ::1] Ex,
+                        floattype_t[:, :, ::1] Ey,
+                        floattype_t[:, :, ::1] Ez,
+                        floattype_t[:, :, ::1] Hx,
+                        floattype_t[:, :, ::1] Hy,
+                        floattype_t[:, :, ::1] Hz,
+                        floattype_t[:, :, :, ::1] HPhi1,
+                        floattype_t[:, :, :, ::1] HPhi2,
+                        floattype_t[:, ::1] HRA,
+                        floattype_t[:, ::1] HRB,
+                        floattype_t[:, ::1] HRE,
+                        floattype_t[:, ::1] HRF,
+                        float d
+                ) noexcept nogil:
+    """Updates the y indices j0 to j1 and z indices k0 to k1 at a single x index (row) of the slab for update_pml_1order_magnetic_zplus."""
+
+    cdef Py_ssize_t j, k, ii, jj, kk
+    cdef int materialHx, materialHy
+    cdef float dz, dEx, dEy, RA0, RB0, RE0, RF0
+    dz = d
+
+    ii = i + xs
+    for j in range(j0, j1):
+        jj = j + ys
+        for k in range(k0, k1):
+            kk = k + zs
+            RA0 = (HRA[0, k] - 1)
+            RB0 = HRB[0, k]
+            RE0 = HRE[0, k]
+            RF0 = HRF[0, k]
+            # Hx
+            materialHx = ID[3, ii, jj, kk]
+            dEy = (Ey[ii, jj, kk + 1] - Ey[ii, jj, kk]) / dz
+            Hx[ii, jj, kk] = Hx[ii, jj, kk] + updatecoeffsH[materialHx, 4] * (RA0 * dEy + RB0 * HPhi1[0, i, j, k])
+            HPhi1[0, i, j, k] = RE0 * HPhi1[0, i, j, k] - RF0 * dEy
+            # Hy
+            materialHy = ID[4, ii, jj, kk]
+            dEx = (Ex[ii, jj, kk + 1] - Ex[ii, jj, kk]) / dz
+            Hy[ii, jj, kk] = Hy[ii, jj, kk] - updatecoeffsH[materialHy, 4] * (RA0 * dEx + RB0 * HPhi2[0, i, j, k])
+            HPhi2[0, i, j, k] = RE0 * HPhi2[0, i, j, k] - RF0 * dEx
+
+
 cpdef void update_pml_1order_magnetic_zplus(
                         int xs,
                         int xf,
@@ -772,7 +1377,7 @@ cpdef void update_pml_1order_magnetic_zplus(
                         int zf,
                         int nthreads,
                         floattype_t[:, ::1] updatecoeffsH,
-                        np.uint32_t[:, :, :, ::1] ID,
+                        idtype_t[:, :, :, ::1] ID,
                         floattype_t[:, :, ::1] Ex,
                         floattype_t[:, :, ::1] Ey,
                         floattype_t[:, :, ::1] Ez,
@@ -797,39 +1402,86 @@ cpdef void update_pml_1order_magnetic_zplus(
         d (float): Spatial discretisation, e.g. dx, dy or dz
     """
 
-    cdef Py_ssize_t i, j, k, ii, jj, kk
-    cdef int nx, ny, nz, materialHx, materialHy
-    cdef float dz, dEx, dEy, RA0, RB0, RE0, RF0
-    dz = d
+    cdef Py_ssize_t i, chunk
+    cdef int nx, ny, nz
     nx = xf - xs
     ny = yf - ys
     nz = zf - zs
 
-    for i in prange(0, nx, nogil=True, schedule='static', num_threads=nthreads):
-        ii = i + xs
-        for j in range(0, ny):
-            jj = j + ys
-            for k in range(0, nz):
-                kk = k + zs
-                RA0 = (HRA[0, k] - 1)
-                RB0 = HRB[0, k]
-                RE0 = HRE[0, k]
-                RF0 = HRF[0, k]
-                # Hx
-                materialHx = ID[3, ii, jj, kk]
-                dEy = (Ey[ii, jj, kk + 1] - Ey[ii, jj, kk]) / dz
-                Hx[ii, jj, kk] = Hx[ii, jj, kk] + updatecoeffsH[materialHx, 4] * (RA0 * dEy + RB0 * HPhi1[0, i, j, k])
-                HPhi1[0, i, j, k] = RE0 * HPhi1[0, i, j, k] - RF0 * dEy
-                # Hy
-                materialHy = ID[4, ii, jj, kk]
-                dEx = (Ex[ii, jj, kk + 1] - Ex[ii, jj, kk]) / dz
-                Hy[ii, jj, kk] = Hy[ii, jj, kk] - updatecoeffsH[materialHy, 4] * (RA0 * dEx + RB0 * HPhi2[0, i, j, k])
-                HPhi2[0, i, j, k] = RE0 * HPhi2[0, i, j, k] - RF0 * dEx
+    if nx == 1 or ny == 1 or nz == 1:
+        for chunk in prange(0, nthreads, nogil=True, schedule='static', num_threads=nthreads):
+            update_pml_2D_chunk(PML_1ORDER_MAGNETIC_ZPLUS, chunk, nthreads, xs, xf, ys, yf, zs, zf, updatecoeffsH, ID, Ex, Ey, Ez, Hx, Hy, Hz, HPhi1, HPhi2, HRA, HRB, HRE, HRF, d)
+    else:
+        for i in prange(0, nx, nogil=True, schedule='static', num_threads=nthreads):
+            update_pml_1order_magnetic_zplus_row(i, 0, ny, 0, nz, xs, xf, ys, yf, zs, zf, updatecoeffsH, ID, Ex, Ey, Ez, Hx, Hy, Hz, HPhi1, HPhi2, HRA, HRB, HRE, HRF, d)
 
 
 ########################################################
 # Electric field PML updates - 2nd order - xminus slab #
 ########################################################
+cdef inline void update_pml_2order_electric_xminus_row(
+                        Py_ssize_t i,
+                        Py_ssize_t j0,
+                        Py_ssize_t j1,
+                        Py_ssize_t k0,
+                        Py_ssize_t k1,
+                        int xs,
+                        int xf,
+                        int ys,
+                        int yf,
+                        int zs,
+                        int zf,
+                        floattype_t[:, ::1] updatecoeffsE,
+                        idtype_t[:, :, :, ::1] ID,
+                        floattype_t[:, :, ::1] Ex,
+                        floattype_t[:, :, ::1] Ey,
+                        floattype_t[:, :, ::1] Ez,
+                        floattype_t[:, :, ::1] Hx,
+                        floattype_t[:, :, ::1] Hy,
+                        floattype_t[:, :, ::1] Hz,
+                        floattype_t[:, :, :, ::1] EPhi1,
+                        floattype_t[:, :, :, ::1] EPhi2,
+                        floattype_t[:, ::1] ERA,
+                        floattype_t[:, ::1] ERB,
+                        floattype_t[:, ::1] ERE,
+                        floattype_t[:, ::1] ERF,
+                        float d
+                ) noexcept nogil:
+    """Updates the y indices j0 to j1 and z indices k0 to k1 at a single x index (row) of the slab for update_pml_2order_electric_xminus."""
+
+    cdef Py_ssize_t j, k, ii, jj, kk
+    cdef int materialEy, materialEz
+    cdef float dx, dHy, dHz, RA0, RB0, RE0, RF0, RA1, RB1, RE1, RF1, RA01
+    dx = d
+
+    RA0 = ERA[0, i]
+    RB0 = ERB[0, i]
+    RE0 = ERE[0, i]
+    RF0 = ERF[0, i]
+    RA1 = ERA[1, i]
+    RB1 = ERB[1, i]
+    RE1 = ERE[1, i]
+    RF1 = ERF[1, i]
+    RA01 = ERA[0, i] * ERA[1, i] - 1
+    ii = xf - i
+    for j in range(j0, j1):
+        jj = j + ys
+        for k in range(k0, k1):
+            kk = k + zs
+            # Ey
+            materialEy = ID[1, ii, jj, kk]
+            dHz = (Hz[ii, jj, kk] - Hz[ii - 1, jj, kk]) / dx
+            Ey[ii, jj, kk] = Ey[ii, jj, kk] - updatecoeffsE[materialEy, 4] * (RA01 * dHz + RA1 * RB0 * EPhi1[0, i, j, k] + RB1 * EPhi1[1, i, j, k])
+            EPhi1[1, i, j, k] = RE1 * EPhi1[1, i, j, k] - RF1 * (RA0 * dHz + RB0 * EPhi1[0, i, j, k])
+            EPhi1[0, i, j, k] = RE0 * EPhi1[0, i, j, k] - RF0 * dHz
+            # Ez
+            materialEz = ID[2, ii, jj, kk]
+            dHy = (Hy[ii, jj, kk] - Hy[ii - 1, jj, kk]) / dx
+            Ez[ii, jj, kk] = Ez[ii, jj, kk] + updatecoeffsE[materialEz, 4] * (RA01 * dHy + RA1 * RB0 * EPhi2[0, i, j, k] + RB1 * EPhi2[1, i, j, k])
+            EPhi2[1, i, j, k] = RE1 * EPhi2[1, i, j, k] - RF1 * (RA0 * dHy + RB0 * EPhi2[0, i, j, k])
+            EPhi2[0, i, j, k] = RE0 * EPhi2[0, i, j, k] - RF0 * dHy
+
+
 cpdef void update_pml_2order_electric_xminus(
                         int xs,
                         int xf,
@@ -839,7 +1491,7 @@ cpdef void update_pml_2order_electric_xminus(
                         int zf,
                         int nthreads,
                         floattype_t[:, ::1] updatecoeffsE,
-                        np.uint32_t[:, :, :, ::1] ID,
+                        idtype_t[:, :, :, ::1] ID,
                         floattype_t[:, :, ::1] Ex,
                         floattype_t[:, :, ::1] Ey,
                         floattype_t[:, :, ::1] Ez,
@@ -864,46 +1516,86 @@ cpdef void update_pml_2order_electric_xminus(
         d (float): Spatial discretisation, e.g. dx, dy or dz
     """
 
-    cdef Py_ssize_t i, j, k, ii, jj, kk
-    cdef int nx, ny, nz, materialEy, materialEz
-    cdef float dx, dHy, dHz, RA0, RB0, RE0, RF0, RA1, RB1, RE1, RF1, RA01
-    dx = d
+    cdef Py_ssize_t i, chunk
+    cdef int nx, ny, nz
     nx = xf - xs
     ny = yf - ys
     nz = zf - zs
 
-    for i in prange(0, nx, nogil=True, schedule='static', num_threads=nthreads):
-        RA0 = ERA[0, i]
-        RB0 = ERB[0, i]
-        RE0 = ERE[0, i]
-        RF0 = ERF[0, i]
-        RA1 = ERA[1, i]
-        RB1 = ERB[1, i]
-        RE1 = ERE[1, i]
-        RF1 = ERF[1, i]
-        RA01 = ERA[0, i] * ERA[1, i] - 1
-        ii = xf - i
-        for j in range(0, ny):
-            jj = j + ys
-            for k in range(0, nz):
-                kk = k + zs
-                # Ey
-                materialEy = ID[1, ii, jj, kk]
-                dHz = (Hz[ii, jj, kk] - Hz[ii - 1, jj, kk]) / dx
-                Ey[ii, jj, kk] = Ey[ii, jj, kk] - updatecoeffsE[materialEy, 4] * (RA01 * dHz + RA1 * RB0 * EPhi1[0, i, j, k] + RB1 * EPhi1[1, i, j, k])
-                EPhi1[1, i, j, k] = RE1 * EPhi1[1, i, j, k] - RF1 * (RA0 * dHz + RB0 * EPhi1[0, i, j, k])
-                EPhi1[0, i, j, k] = RE0 * EPhi1[0, i, j, k] - RF0 * dHz
-                # Ez
-                materialEz = ID[2, ii, jj, kk]
-                dHy = (Hy[ii, jj, kk] - Hy[ii - 1, jj, kk]) / dx
-                Ez[ii, jj, kk] = Ez[ii, jj, kk] + updatecoeffsE[materialEz, 4] * (RA01 * dHy + RA1 * RB0 * EPhi2[0, i, j, k] + RB1 * EPhi2[1, i, j, k])
-                EPhi2[1, i, j, k] = RE1 * EPhi2[1, i, j, k] - RF1 * (RA0 * dHy + RB0 * EPhi2[0, i, j, k])
-                EPhi2[0, i, j, k] = RE0 * EPhi2[0, i, j, k] - RF0 * dHy
+    if nx == 1 or ny == 1 or nz == 1:
+        for chunk in prange(0, nthreads, nogil=True, schedule='static', num_threads=nthreads):
+            update_pml_2D_chunk(PML_2ORDER_ELECTRIC_XMINUS, chunk, nthreads, xs, xf, ys, yf, zs, zf, updatecoeffsE, ID, Ex, Ey, Ez, Hx, Hy, Hz, EPhi1, EPhi2, ERA, ERB, ERE, ERF, d)
+    else:
+        for i in prange(0, nx, nogil=True, schedule='static', num_threads=nthreads):
+            update_pml_2order_electric_xminus_row(i, 0, ny, 0, nz, xs, xf, ys, yf, zs, zf, updatecoeffsE, ID, Ex, Ey, Ez, Hx, Hy, Hz, EPhi1, EPhi2, ERA, ERB, ERE, ERF, d)
 
 
 #######################################################
 # Electric field PML updates - 2nd order - xplus slab #
 #######################################################
+cdef inline void update_pml_2order_electric_xplus_row(
+                        Py_ssize_t i,
+                        Py_ssize_t j0,
+                        Py_ssize_t j1,
+                        Py_ssize_t k0,
+                        Py_ssize_t k1,
+                        int xs,
+                        int xf,
+                        int ys,
+                        int yf,
+                        int zs,
+                        int zf,
+                        floattype_t[:, ::1] updatecoeffsE,
+                        idtype_t[:, :, :, ::1] ID,
+                        floattype_t[:, :, ::1] Ex,
+                        floattype_t[:, :, ::1] Ey,
+                        floattype_t[:, :, ::1] Ez,
+                        floattype_t[:, :, ::1] Hx,
+                        floattype_t[:, :, ::1] Hy,
+                        floattype_t[:, :, ::1] Hz,
+                        floattype_t[:, :, :, ::1] EPhi1,
+                        floattype_t[:, :, :, ::1] EPhi2,
+                        floattype_t[:, ::1] ERA,
+                        floattype_t[:, ::1] ERB,
+                        floattype_t[:, ::1] ERE,
+                        floattype_t[:, ::1] ERF,
+                        float d
+                ) noexcept nogil:
+    """Updates the y indices j0 to j1 and z indices k0 to k1 at a single x index (row) of the slab for update_pml_2order_electric_xplus."""
+
+    cdef Py_ssize_t j, k, ii, jj, kk
+    cdef int materialEy, materialEz
+    cdef float dx, dHy, dHz, RA0, RB0, RE0, RF0, RA1, RB1, RE1, RF1, RA01
+    dx = d
+
+    RA0 = ERA[0, i]
+    RB0 = ERB[0, i]
+    RE0 = ERE[0, i]
+    RF0 = ERF[0, i]
+    RA1 = ERA[1, i]
+    RB1 = ERB[1, i]
+    RE1 = ERE[1, i]
+    RF1 = ERF[1, i]
+    RA01 = ERA[0, i] * ERA[1, i] - 1
+    ii = i + xs
+    for j in range(j0, j1):
+        jj = j + ys
+        for k in range(k0, k1):
+            kk = k + zs
+            # Ey
+            materialEy = ID[1, ii, jj, kk]
+            dHz = (Hz[ii, jj, kk] - Hz[ii - 1, jj, kk]) / dx
+            Ey[ii, jj, kk] = Ey[ii, jj, kk] - updatecoeffsE[materialEy, 4] * (RA01 * dHz + RA1 * RB0 * EPhi1[0, i, j, k] + RB1 * EPhi1[1, i, j, k])
+            EPhi1[1, i, j, k] = RE1 * EPhi1[1, i, j, k] - RF1 * (RA0 * dHz + RB0 * EPhi1[0, i, j, k])
+            EPhi1[0, i, j, k] = RE0 * EPhi1[0, i, j, k] - RF0 * dHz
+            # Ez
+            materialEz = ID[2, ii, jj, kk]
+            dHy = (Hy[ii, jj, kk] - Hy[ii - 1, jj, kk]) / dx
+            Ez[ii, jj, kk] = Ez[ii, jj, kk] + updatecoeffsE[materialEz, 4] * (RA01 * dHy + RA1 * RB0 * EPhi2[0, i, j, k] + RB1 * EPhi2[1, i, j, k])
+            EPhi2[1, i, j, k] = RE1 * EPhi2[1, i, j, k] - RF1 * (RA0 * dHy + RB0 * EPhi2[0, i, j, k])
+            EPhi2[0, i, j, k] = RE0 * EPhi2[0, i, j, k] - RF0 * dHy
+
+
 cpdef void update_pml_2order_electric_xplus(
                         int xs,
                         int xf,
@@ -913,7 +1605,7 @@ cpdef void update_pml_2order_electric_xplus(
                         int zf,
                         int nthreads,
                         floattype_t[:, ::1] updatecoeffsE,
-                        np.uint32_t[:, :, :, ::1] ID,
+                        idtype_t[:, :, :, ::1] ID,
                         floattype_t[:, :, ::1] Ex,
                         floattype_t[:, :, ::1] Ey,
                         floattype_t[:, :, ::1] Ez,
@@ -938,46 +1630,86 @@ cpdef void update_pml_2order_electric_xplus(
         d (float): Spatial discretisation, e.g. dx, dy or dz
     """
 
-    cdef Py_ssize_t i, j, k, ii, jj, kk
-    cdef int nx, ny, nz, materialEy, materialEz
-    cdef float dx, dHy, dHz, RA0, RB0, RE0, RF0, RA1, RB1, RE1, RF1, RA01
-    dx = d
+    cdef Py_ssize_t i, chunk
+    cdef int nx, ny, nz
     nx = xf - xs
     ny = yf - ys
     nz = zf - zs
 
-    for i in prange(0, nx, nogil=True, schedule='static', num_threads=nthreads):
-        RA0 = ERA[0, i]
-        RB0 = ERB[0, i]
-        RE0 = ERE[0, i]
-        RF0 = ERF[0, i]
-        RA1 = ERA[1, i]
-        RB1 = ERB[1, i]
-        RE1 = ERE[1, i]
-        RF1 = ERF[1, i]
-        RA01 = ERA[0, i] * ERA[1, i] - 1
-        ii = i + xs
-        for j in range(0, ny):
-            jj = j + ys
-            for k in range(0, nz):
-                kk = k + zs
-                # Ey
-                materialEy = ID[1, ii, jj, kk]
-                dHz = (Hz[ii, jj, kk] - Hz[ii - 1, jj, kk]) / dx
-                Ey[ii, jj, kk] = Ey[ii, jj, kk] - updatecoeffsE[materialEy, 4] * (RA01 * dHz + RA1 * RB0 * EPhi1[0, i, j, k] + RB1 * EPhi1[1, i, j, k])
-                EPhi1[1, i, j, k] = RE1 * EPhi1[1, i, j, k] - RF1 * (RA0 * dHz + RB0 * EPhi1[0, i, j, k])
-                EPhi1[0, i, j, k] = RE0 * EPhi1[0, i, j, k] - RF0 * dHz
-                # Ez
-                materialEz = ID[2, ii, jj, kk]
-                dHy = (Hy[ii, jj, kk] - Hy[ii - 1, jj, kk]) / dx
-                Ez[ii, jj, kk] = Ez[ii, jj, kk] + updatecoeffsE[materialEz, 4] * (RA01 * dHy + RA1 * RB0 * EPhi2[0, i, j, k] + RB1 * EPhi2[1, i, j, k])
-                EPhi2[1, i, j, k] = RE1 * EPhi2[1, i, j, k] - RF1 * (RA0 * dHy + RB0 * EPhi2[0, i, j, k])
-                EPhi2[0, i, j, k] = RE0 * EPhi2[0, i, j, k] - RF0 * dHy
+    if nx == 1 or ny == 1 or nz == 1:
+        for chunk in prange(0, nthreads, nogil=True, schedule='static', num_threads=nthreads):
+            update_pml_2D_chunk(PML_2ORDER_ELECTRIC_XPLUS, chunk, nthreads, xs, xf, ys, yf, zs, zf, updatecoeffsE, ID, Ex, Ey, Ez, Hx, Hy, Hz, EPhi1, EPhi2, ERA, ERB, ERE, ERF, d)
+    else:
+        for i in prange(0, nx, nogil=True, schedule='static', num_threads=nthreads):
+            update_pml_2order_electric_xplus_row(i, 0, ny, 0, nz, xs, xf, ys, yf, zs, zf, updatecoeffsE, ID, Ex, Ey, Ez, Hx, Hy, Hz, EPhi1, EPhi2, ERA, ERB, ERE, ERF, d)
 
 
 ########################################################
 # Electric field PML updates - 2nd order - yminus slab #
 ########################################################
+cdef inline void update_pml_2order_electric_yminus_row(
+                        Py_ssize_t i,
+                        Py_ssize_t j0,
+                        Py_ssize_t j1,
+                        Py_ssize_t k0,
+                        Py_ssize_t k1,
+                        int xs,
+                        int xf,
+                        int ys,
+                        int yf,
+                        int zs,
+                        int zf,
+                        floattype_t[:, ::1] updatecoeffsE,
+                        idtype_t[:, :, :, ::1] ID,
+                        floattype_t[:, :, ::1] Ex,
+                        floattype_t[:, :, ::1] Ey,
+                        floattype_t[:, :, ::1] Ez,
+                        floattype_t[:, :, ::1] Hx,
+                        floattype_t[:, :, ::1] Hy,
+                        floattype_t[:, :, ::1] Hz,
+                        floattype_t[:, :, :, ::1] EPhi1,
+                        floattype_t[:, :, :, ::1] EPhi2,
+                        floattype_t[:, ::1] ERA,
+                        floattype_t[:, ::1] ERB,
+                        floattype_t[:, ::1] ERE,
+                        floattype_t[:, ::1] ERF,
+                        float d
+                ) noexcept nogil:
+    """Updates the y indices j0 to j1 and z indices k0 to k1 at a single x index (row) of the slab for update_pml_2order_electric_yminus."""
+
+    cdef Py_ssize_t j, k, ii, jj, kk
+    cdef int materialEx, materialEz
+    cdef float dy, dHx, dHz, RA0, RB0, RE0, RF0, RA1, RB1, RE1, RF1, RA01
+    dy = d
+
+    ii = i + xs
+    for j in range(j0, j1):
+        jj = yf - j
+        RA0 = ERA[0, j]
+        RB0 = ERB[0, j]
+        RE0 = ERE[0, j]
+        RF0 = ERF[0, j]
+        RA1 = ERA[1, j]
+        RB1 = ERB[1, j]
+        RE1 = ERE[1, j]
+        RF1 = ERF[1, j]
+        RA01 = ERA[0, j] * ERA[1, j] - 1
+        for k in range(k0, k1):
+            kk = k + zs
+            # Ex
+            materialEx = ID[0, ii, jj, kk]
+            dHz = (Hz[ii, jj, kk] - Hz[ii, jj - 1, kk]) / dy
+            Ex[ii, jj, kk] = Ex[ii, jj, kk] + updatecoeffsE[materialEx, 4] * (RA01 * dHz + RA1 * RB0 * EPhi1[0, i, j, k] + RB1 * EPhi1[1, i, j, k])
+            EPhi1[1, i, j, k] = RE1 * EPhi1[1, i, j, k] - RF1 * (RA0 * dHz + RB0 * EPhi1[0, i, j, k])
+            EPhi1[0, i, j, k] = RE0 * EPhi1[0, i, j, k] - RF0 * dHz
+            # Ez
+            materialEz = ID[2, ii, jj, kk]
+            dHx = (Hx[ii, jj, kk] - Hx[ii, jj - 1, kk]) / dy
+            Ez[ii, jj, kk] = Ez[ii, jj, kk] - updatecoeffsE[materialEz, 4] * (RA01 * dHx + RA1 * RB0 * EPhi2[0, i, j, k] + RB1 * EPhi2[1, i, j, k])
+            EPhi2[1, i, j, k] = RE1 * EPhi2[1, i, j, k] - RF1 * (RA0 * dHx + RB0 * EPhi2[0, i, j, k])
+            EPhi2[0, i, j, k] = RE0 * EPhi2[0, i, j, k] - RF0 * dHx
+
+
 cpdef void update_pml_2order_electric_yminus(
                         int xs,
                         int xf,
@@ -987,7 +1719,7 @@ cpdef void update_pml_2order_electric_yminus(
                         int zf,
                         int nthreads,
                         floattype_t[:, ::1] updatecoeffsE,
-                        np.uint32_t[:, :, :, ::1] ID,
+                        idtype_t[:, :, :, ::1] ID,
                         floattype_t[:, :, ::1] Ex,
                         floattype_t[:, :, ::1] Ey,
                         floattype_t[:, :, ::1] Ez,
@@ -1012,46 +1744,86 @@ cpdef void update_pml_2order_electric_yminus(
         d (float): Spatial discretisation, e.g. dx, dy or dz
     """
 
-    cdef Py_ssize_t i, j, k, ii, jj, kk
-    cdef int nx, ny, nz, materialEx, materialEz
-    cdef float dy, dHx, dHz, RA0, RB0, RE0, RF0, RA1, RB1, RE1, RF1, RA01
-    dy = d
+    cdef Py_ssize_t i, chunk
+    cdef int nx, ny, nz
     nx = xf - xs
     ny = yf - ys
     nz = zf - zs
 
-    for i in prange(0, nx, nogil=True, schedule='static', num_threads=nthreads):
-        ii = i + xs
-        for j in range(0, ny):
-            jj = yf - j
-            RA0 = ERA[0, j]
-            RB0 = ERB[0, j]
-            RE0 = ERE[0, j]
-            RF0 = ERF[0, j]
-            RA1 = ERA[1, j]
-            RB1 = ERB[1, j]
-            RE1 = ERE[1, j]
-            RF1 = ERF[1, j]
-            RA01 = ERA[0, j] * ERA[1, j] - 1
-            for k in range(0, nz):
-                kk = k + zs
-                # Ex
-                materialEx = ID[0, ii, jj, kk]
-                dHz = (Hz[ii, jj, kk] - Hz[ii, jj - 1, kk]) / dy
-                Ex[ii, jj, kk] = Ex[ii, jj, kk] + updatecoeffsE[materialEx, 4] * (RA01 * dHz + RA1 * RB0 * EPhi1[0, i, j, k] + RB1 * EPhi1[1, i, j, k])
-                EPhi1[1, i, j, k] = RE1 * EPhi1[1, i, j, k] - RF1 * (RA0 * dHz + RB0 * EPhi1[0, i, j, k])
-                EPhi1[0, i, j, k] = RE0 * EPhi1[0, i, j, k] - RF0 * dHz
-                # Ez
-                materialEz = ID[2, ii, jj, kk]
-                dHx = (Hx[ii, jj, kk] - Hx[ii, jj - 1, kk]) / dy
-                Ez[ii, jj, kk] = Ez[ii, jj, kk] - updatecoeffsE[materialEz, 4] * (RA01 * dHx + RA1 * RB0 * EPhi2[0, i, j, k] + RB1 * EPhi2[1, i, j, k])
-                EPhi2[1, i, j, k] = RE1 * EPhi2[1, i, j, k] - RF1 * (RA0 * dHx + RB0 * EPhi2[0, i, j, k])
-                EPhi2[0, i, j, k] = RE0 * EPhi2[0, i, j, k] - RF0 * dHx
+    if nx == 1 or ny == 1 or nz == 1:
+        for chunk in prange(0, nthreads, nogil=True, schedule='static', num_threads=nthreads):
+            update_pml_2D_chunk(PML_2ORDER_ELECTRIC_YMINUS, chunk, nthreads, xs, xf, ys, yf, zs, zf, updatecoeffsE, ID, Ex, Ey, Ez, Hx, Hy, Hz, EPhi1, EPhi2, ERA, ERB, ERE, ERF, d)
+    else:
+        for i in prange(0, nx, nogil=True, schedule='static', num_threads=nthreads):
+            update_pml_2order_electric_yminus_row(i, 0, ny, 0, nz, xs, xf, ys, yf, zs, zf, updatecoeffsE, ID, Ex, Ey, Ez, Hx, Hy, Hz, EPhi1, EPhi2, ERA, ERB, ERE, ERF, d)
 
 
 #######################################################
 # Electric field PML updates - 2nd order - yplus slab #
 #######################################################
+cdef inline void update_pml_2order_electric_yplus_row(
+                        Py_ssize_t i,
+                        Py_ssize_t j0,
+                        Py_ssize_t j1,
+                        Py_ssize_t k0,
+                        Py_ssize_t k1,
+                        int xs,
+                        int xf,
+                        int ys,
+                        int yf,
+                        int zs,
+                        int zf,
+                        floattype_t[:, ::1] updatecoeffsE,
+                        idtype_t[:, :, :, ::1] ID,
+                        floattype_t[:, :, ::1] Ex,
+                        floattype_t[:, :, ::1] Ey,
+                        floattype_t[:, :, ::1] Ez,
+                        floattype_t[:, :, ::1] Hx,
+                        floattype_t[:, :, ::1] Hy,
+                        floattype_t[:, :, ::1] Hz,
+                        floattype_t[:, :, :, ::1] EPhi1,
+                        floattype_t[:, :, :, ::1] EPhi2,
+                        floattype_t[:, ::1] ERA,
+                        floattype_t[:, ::1] ERB,
+                        floattype_t[:, ::1] ERE,
+                        floattype_t[:, ::1] ERF,
+                        float d
+                ) noexcept nogil:
+    """Updates the y indices j0 to j1 and z indices k0 to k1 at a single x index (row) of the slab for update_pml_2order_electric_yplus."""
+
+    cdef Py_ssize_t j, k, ii, jj, kk
+    cdef int materialEx, materialEz
+    cdef float dy, dHx, dHz, RA0, RB0, RE0, RF0, RA1, RB1, RE1, RF1, RA01
+    dy = d
+
+    ii = i + xs
+    for j in range(j0, j1):
+        jj = j + ys
+        RA0 = ERA[0, j]
+        RB0 = ERB[0, j]
+        RE0 = ERE[0, j]
+        RF0 = ERF[0, j]
+        RA1 = ERA[1, j]
+        RB1 = ERB[1, j]
+        RE1 = ERE[1, j]
+        RF1 = ERF[1, j]
+        RA01 = ERA[0, j] * ERA[1, j] - 1
+        for k in range(k0, k1):
+            kk = k + zs
+            # Ex
+            materialEx = ID[0, ii, jj, kk]
+            dHz = (Hz[ii, jj, kk] - Hz[ii, jj - 1, kk]) / dy
+            Ex[ii, jj, kk] = Ex[ii, jj, kk] + updatecoeffsE[materialEx, 4] * (RA01 * dHz + RA1 * RB0 * EPhi1[0, i, j, k] + RB1 * EPhi1[1, i, j, k])
+            EPhi1[1, i, j, k] = RE1 * EPhi1[1, i, j, k] - RF1 * (RA0 * dHz + RB0 * EPhi1[0, i, j, k])
+            EPhi1[0, i, j, k] = RE0 * EPhi1[0, i, j, k] - RF0 * dHz
+            # Ez
+            materialEz = ID[2, ii, jj, kk]
+            dHx = (Hx[ii, jj, kk] - Hx[ii, jj - 1, kk]) / dy
+            Ez[ii, jj, kk] = Ez[ii, jj, kk] - updatecoeffsE[materialEz, 4] * (RA01 * dHx + RA1 * RB0 * EPhi2[0, i, j, k] + RB1 * EPhi2[1, i, j, k])
+            EPhi2[1, i, j, k] = RE1 * EPhi2[1, i, j, k] - RF1 * (RA0 * dHx + RB0 * EPhi2[0, i, j, k])
+            EPhi2[0, i, j, k] = RE0 * EPhi2[0, i, j, k] - RF0 * dHx
+
+
 cpdef void update_pml_2order_electric_yplus(
                         int xs,
                         int xf,
@@ -1061,7 +1833,7 @@ cpdef void update_pml_2order_electric_yplus(
                         int zf,
                         int nthreads,
                         floattype_t[:, ::1] updatecoeffsE,
-                        np.uint32_t[:, :, :, ::1] ID,
+                        idtype_t[:, :, :, ::1] ID,
                         floattype_t[:, :, ::1] Ex,
                         floattype_t[:, :, ::1] Ey,
                         floattype_t[:, :, ::1] Ez,
@@ -1086,46 +1858,86 @@ cpdef void update_pml_2order_electric_yplus(
         d (float): Spatial discretisation, e.g. dx, dy or dz
     """
 
-    cdef Py_ssize_t i, j, k, ii, jj, kk
-    cdef int nx, ny, nz, materialEx, materialEz
-    cdef float dy, dHx, dHz, RA0, RB0, RE0, RF0, RA1, RB1, RE1, RF1, RA01
-    dy = d
+    cdef Py_ssize_t i, chunk
+    cdef int nx, ny, nz
     nx = xf - xs
     ny = yf - ys
     nz = zf - zs
 
-    for i in prange(0, nx, nogil=True, schedule='static', num_threads=nthreads):
-        ii = i + xs
-        for j in range(0, ny):
-            jj = j + ys
-            RA0 = ERA[0, j]
-            RB0 = ERB[0, j]
-            RE0 = ERE[0, j]
-            RF0 = ERF[0, j]
-            RA1 = ERA[1, j]
-            RB1 = ERB[1, j]
-            RE1 = ERE[1, j]
-            RF1 = ERF[1, j]
-            RA01 = ERA[0, j] * ERA[1, j] - 1
-            for k in range(0, nz):
-                kk = k + zs
-                # Ex
-                materialEx = ID[0, ii, jj, kk]
-                dHz = (Hz[ii, jj, kk] - Hz[ii, jj - 1, kk]) / dy
-                Ex[ii, jj, kk] = Ex[ii, jj, kk] + updatecoeffsE[materialEx, 4] * (RA01 * dHz + RA1 * RB0 * EPhi1[0, i, j, k] + RB1 * EPhi1[1, i, j, k])
-                EPhi1[1, i, j, k] = RE1 * EPhi1[1, i, j, k] - RF1 * (RA0 * dHz + RB0 * EPhi1[0, i, j, k])
-                EPhi1[0, i, j, k] = RE0 * EPhi1[0, i, j, k] - RF0 * dHz
-                # Ez
-                materialEz = ID[2, ii, jj, kk]
-                dHx = (Hx[ii, jj, kk] - Hx[ii, jj - 1, kk]) / dy
-                Ez[ii, jj, kk] = Ez[ii, jj, kk] - updatecoeffsE[materialEz, 4] * (RA01 * dHx + RA1 * RB0 * EPhi2[0, i, j, k] + RB1 * EPhi2[1, i, j, k])
-                EPhi2[1, i, j, k] = RE1 * EPhi2[1, i, j, k] - RF1 * (RA0 * dHx + RB0 * EPhi2[0, i, j, k])
-                EPhi2[0, i, j, k] = RE0 * EPhi2[0, i, j, k] - RF0 * dHx
+    if nx == 1 or ny == 1 or nz == 1:
+        for chunk in prange(0, nthreads, nogil=True, schedule='static', num_threads=nthreads):
+            update_pml_2D_chunk(PML_2ORDER_ELECTRIC_YPLUS, chunk, nthreads, xs, xf, ys, yf, zs, zf, updatecoeffsE, ID, Ex, Ey, Ez, Hx, Hy, Hz, EPhi1, EPhi2, ERA, ERB, ERE, ERF, d)
+    else:
+        for i in prange(0, nx, nogil=True, schedule='static', num_threads=nthreads):
+            update_pml_2order_electric_yplus_row(i, 0, ny, 0, nz, xs, xf, ys, yf, zs, zf, updatecoeffsE, ID, Ex, Ey, Ez, Hx, Hy, Hz, EPhi1, EPhi2, ERA, ERB, ERE, ERF, d)
 
 
 ########################################################
 # Electric field PML updates - 2nd order - zminus slab #
 ########################################################
+cdef inline void update_pml_2order_electric_zminus_row(
+                        Py_ssize_t i,
+                        Py_ssize_t j0,
+                        Py_ssize_t j1,
+                        Py_ssize_t k0,
+                        Py_ssize_t k1,
+                        int xs,
+                        int xf,
+                        int ys,
+                        int yf,
+                        int zs,
+                        int zf,
+                        floattype_t[:, ::1] updatecoeffsE,
+                        idtype_t[:, :, :, ::1] ID,
+                        floattype_t[:, :, ::1] Ex,
+                        floattype_t[:, :, ::1] Ey,
+                        floattype_t[:, :, ::1] Ez,
+                        floattype_t[:, :, ::1] Hx,
+                        floattype_t[:, :, ::1] Hy,
+                        floattype_t[:, :, ::1] Hz,
+                        floattype_t[:, :, :, ::1] EPhi1,
+                        floattype_t[:, :, :, ::1] EPhi2,
+                        floattype_t[:, ::1] ERA,
+                        floattype_t[:, ::1] ERB,
+                        floattype_t[:, ::1] ERE,
+                        floattype_t[:, ::1] ERF,
+                        float d
+                ) noexcept nogil:
+    """Updates the y indices j0 to j1 and z indices k0 to k1 at a single x index (row) of the slab for update_pml_2order_electric_zminus."""
+
+    cdef Py_ssize_t j, k, ii, jj, kk
+    cdef int materialEx, materialEy
+    cdef float dz, dHx, dHy, RA0, RB0, RE0, RF0, RA1, RB1, RE1, RF1, RA01
+    dz = d
+
+    ii = i + xs
+    for j in range(j0, j1):
+        jj = j + ys
+        for k in range(k0, k1):
+            kk = zf - k
+            RA0 = ERA[0, k]
+            RB0 = ERB[0, k]
+            RE0 = ERE[0, k]
+            RF0 = ERF[0, k]
+            RA1 = ERA[1, k]
+            RB1 = ERB[1, k]
+            RE1 = ERE[1, k]
+            RF1 = ERF[1, k]
+            RA01 = ERA[0, k] * ERA[1, k] - 1
+            # Ex
+            materialEx = ID[0, ii, jj, kk]
+            dHy = (Hy[ii, jj, kk] - Hy[ii, jj, kk - 1]) / dz
+            Ex[ii, jj, kk] = Ex[ii, jj, kk] - updatecoeffsE[materialEx, 4] * (RA01 * dHy + RA1 * RB0 * EPhi1[0, i, j, k] + RB1 * EPhi1[1, i, j, k])
+            EPhi1[1, i, j, k] = RE1 * EPhi1[1, i, j, k] - RF1 * (RA0 * dHy + RB0 * EPhi1[0, i, j, k])
+            EPhi1[0, i, j, k] = RE0 * EPhi1[0, i, j, k] - RF0 * dHy
+            # Ey
+            materialEy = ID[1, ii, jj, kk]
+            dHx = (Hx[ii, jj, kk] - Hx[ii, jj, kk - 1]) / dz
+            Ey[ii, jj, kk] = Ey[ii, jj, kk] + updatecoeffsE[materialEy, 4] * (RA01 * dHx + RA1 * RB0 * EPhi2[0, i, j, k] + RB1 * EPhi2[1, i, j, k])
+            EPhi2[1, i, j, k] = RE1 * EPhi2[1, i, j, k] - RF1 * (RA0 * dHx + RB0 * EPhi2[0, i, j, k])
+            EPhi2[0, i, j, k] = RE0 * EPhi2[0, i, j, k] - RF0 * dHx
+
+
 cpdef void update_pml_2order_electric_zminus(
                         int xs,
                         int xf,
@@ -1135,7 +1947,7 @@ cpdef void update_pml_2order_electric_zminus(
                         int zf,
                         int nthreads,
                         floattype_t[:, ::1] updatecoeffsE,
-                        np.uint32_t[:, :, :, ::1] ID,
+                        idtype_t[:, :, :, ::1] ID,
                         floattype_t[:, :, ::1] Ex,
                         floattype_t[:, :, ::1] Ey,
                         floattype_t[:, :, ::1] Ez,
@@ -1160,46 +1972,86 @@ cpdef void update_pml_2order_electric_zminus(
         d (float): Spatial discretisation, e.g. dx, dy or dz
         """
 
-    cdef Py_ssize_t i, j, k, ii, jj, kk
-    cdef int nx, ny, nz, materialEx, materialEy
-    cdef float dz, dHx, dHy, RA0, RB0, RE0, RF0, RA1, RB1, RE1, RF1, RA01
-    dz = d
+    cdef Py_ssize_t i, chunk
+    cdef int nx, ny, nz
     nx = xf - xs
     ny = yf - ys
     nz = zf - zs
 
-    for i in prange(0, nx, nogil=True, schedule='static', num_threads=nthreads):
-        ii = i + xs
-        for j in range(0, ny):
-            jj = j + ys
-            for k in range(0, nz):
-                kk = zf - k
-                RA0 = ERA[0, k]
-                RB0 = ERB[0, k]
-                RE0 = ERE[0, k]
-                RF0 = ERF[0, k]
-                RA1 = ERA[1, k]
-                RB1 = ERB[1, k]
-                RE1 = ERE[1, k]
-                RF1 = ERF[1, k]
-                RA01 = ERA[0, k] * ERA[1, k] - 1
-                # Ex
-                materialEx = ID[0, ii, jj, kk]
-                dHy = (Hy[ii, jj, kk] - Hy[ii, jj, kk - 1]) / dz
-                Ex[ii, jj, kk] = Ex[ii, jj, kk] - updatecoeffsE[materialEx, 4] * (RA01 * dHy + RA1 * RB0 * EPhi1[0, i, j, k] + RB1 * EPhi1[1, i, j, k])
-                EPhi1[1, i, j, k] = RE1 * EPhi1[1, i, j, k] - RF1 * (RA0 * dHy + RB0 * EPhi1[0, i, j, k])
-                EPhi1[0, i, j, k] = RE0 * EPhi1[0, i, j, k] - RF0 * dHy
-                # Ey
-                materialEy = ID[1, ii, jj, kk]
-                dHx = (Hx[ii, jj, kk] - Hx[ii, jj, kk - 1]) / dz
-                Ey[ii, jj, kk] = Ey[ii, jj, kk] + updatecoeffsE[materialEy, 4] * (RA01 * dHx + RA1 * RB0 * EPhi2[0, i, j, k] + RB1 * EPhi2[1, i, j, k])
-                EPhi2[1, i, j, k] = RE1 * EPhi2[1, i, j, k] - RF1 * (RA0 * dHx + RB0 * EPhi2[0, i, j, k])
-                EPhi2[0, i, j, k] = RE0 * EPhi2[0, i, j, k] - RF0 * dHx
+    if nx == 1 or ny == 1 or nz == 1:
+        for chunk in prange(0, nthreads, nogil=True, schedule='static', num_threads=nthreads):
+            update_pml_2D_chunk(PML_2ORDER_ELECTRIC_ZMINUS, chunk, nthreads, xs, xf, ys, yf, zs, zf, updatecoeffsE, ID, Ex, Ey, Ez, Hx, Hy, Hz, EPhi1, EPhi2, ERA, ERB, ERE, ERF, d)
+    else:
+        for i in prange(0, nx, nogil=True, schedule='static', num_threads=nthreads):
+            update_pml_2order_electric_zminus_row(i, 0, ny, 0, nz, xs, xf, ys, yf, zs, zf, updatecoeffsE, ID, Ex, Ey, Ez, Hx, Hy, Hz, EPhi1, EPhi2, ERA, ERB, ERE, ERF, d)
+
+
+#######################################################
+# Electric field PML updates - 2nd order - zplus slab #
+#######################################################
+cdef inline void update_pml_2order_electric_zplus_row(
+                        Py_ssize_t i,
+                        Py_ssize_t j0,
+                        Py_ssize_t j1,
+                        Py_ssize_t k0,
+                        Py_ssize_t k1,
+                        int xs,
+                        int xf,
+                        int ys,
+                        int yf,
+                        int zs,
+                        int zf,
+                        floattype_t[:, ::1] updatecoeffsE,
+                        idtype_t[:, :, :, ::1] ID,
+                        floattype_t[:, :, ::1] Ex,
+                        floattype_t[:, :, ::1] Ey,
+                        floattype_t[:, :, ::1] Ez,
+                        floattype_t[:, :, ::1] Hx,
+                        floattype_t[:, :, ::1] Hy,
+                        floattype_t[:, :, ::1] Hz,
+                        floattype_t[:, :, :, ::1] EPhi1,
+                        floattype_t[:, :, :, ::1] EPhi2,
+                        floattype_t[:, ::1] ERA,
+                        floattype_t[:, ::1] ERB,
+                        floattype_t[:, ::1] ERE,
+                        floattype_t[:, ::1] ERF,
+                        float d
+                ) noexcept nogil:
+    """Updates the y indices j0 to j1 and z indices k0 to k1 at a single x index (row) of the slab for update_pml_2order_electric_zplus."""
+
+    cdef Py_ssize_t j, k, ii, jj, kk
+    cdef int materialEx, materialEy
+    cdef float dz, dHx, dHy, RA0, RB0, RE0, RF0, RA1, RB1, RE1, RF1, RA01
+    dz = d
+
+    ii = i + xs
+    for j in range(j0, j1):
+        jj = j + ys
+        for k in range(k0, k1):
+            kk = k + zs
+            RA0 = ERA[0, k]
+            RB0 = ERB[0, k]
+            RE0 = ERE[0, k]
+            RF0 = ERF[0, k]
+            RA1 = ERA[1, k]
+            RB1 = ERB[1, k]
+            RE1 = ERE[1, k]
+            RF1 = ERF[1, k]
+            RA01 = ERA[0, k] * ERA[1, k] - 1
+            # Ex
+            materialEx = ID[0, ii, jj, kk]
+            dHy = (Hy[ii, jj, kk] - Hy[ii, jj, kk - 1]) / dz
+            Ex[ii, jj, kk] = Ex[ii, jj, kk] - updatecoeffsE[materialEx, 4] * (RA01 * dHy + RA1 * RB0 * EPhi1[0, i, j, k] + RB1 * EPhi1[1, i, j, k])
+            EPhi1[1, i, j, k] = RE1 * EPhi1[1, i, j, k] - RF1 * (RA0 * dHy + RB0 * EPhi1[0, i, j, k])
+            EPhi1[0, i, j, k] = RE0 * EPhi1[0, i, j, k] - RF0 * dHy
+            # Ey
+            materialEy = ID[1, ii, jj, kk]
+            dHx = (Hx[ii, jj, kk] - Hx[ii, jj, kk - 1]) / dz
+            Ey[ii, jj, kk] = Ey[ii, jj, kk] + updatecoeffsE[materialEy, 4] * (RA01 * dHx + RA1 * RB0 * EPhi2[0, i, j, k] + RB1 * EPhi2[1, i, j, k])
+            EPhi2[1, i, j, k] = RE1 * EPhi2[1, i, j, k] - RF1 * (RA0 * dHx + RB0 * EPhi2[0, i, j, k])
+            EPhi2[0, i, j, k] = RE0 * EPhi2[0, i, j, k] - RF0 * dHx
 
 
-#######################################################
-# Electric field PML updates - 2nd order - zplus slab #
-#######################################################
 cpdef void update_pml_2order_electric_zplus(
                         int xs,
                         int xf,
@@ -1209,7 +2061,7 @@ cpdef void update_pml_2order_electric_zplus(
                         int zf,
                         int nthreads,
                         floattype_t[:, ::1] updatecoeffsE,
-                        np.uint32_t[:, :, :, ::1] ID,
+                        idtype_t[:, :, :, ::1] ID,
                         floattype_t[:, :, ::1] Ex,
                         floattype_t[:, :, ::1] Ey,
                         floattype_t[:, :, ::1] Ez,
@@ -1234,46 +2086,86 @@ cpdef void update_pml_2order_electric_zplus(
         d (float): Spatial discretisation, e.g. dx, dy or dz
     """
 
-    cdef Py_ssize_t i, j, k, ii, jj, kk
-    cdef int nx, ny, nz, materialEx, materialEy
-    cdef float dz, dHx, dHy, RA0, RB0, RE0, RF0, RA1, RB1, RE1, RF1, RA01
-    dz = d
+    cdef Py_ssize_t i, chunk
+    cdef int nx, ny, nz
     nx = xf - xs
     ny = yf - ys
     nz = zf - zs
 
-    for i in prange(0, nx, nogil=True, schedule='static', num_threads=nthreads):
-        ii = i + xs
-        for j in range(0, ny):
-            jj = j + ys
-            for k in range(0, nz):
-                kk = k + zs
-                RA0 = ERA[0, k]
-                RB0 = ERB[0, k]
-                RE0 = ERE[0, k]
-                RF0 = ERF[0, k]
-                RA1 = ERA[1, k]
-                RB1 = ERB[1, k]
-                RE1 = ERE[1, k]
-                RF1 = ERF[1, k]
-                RA01 = ERA[0, k] * ERA[1, k] - 1
-                # Ex
-                materialEx = ID[0, ii, jj, kk]
-                dHy = (Hy[ii, jj, kk] - Hy[ii, jj, kk - 1]) / dz
-                Ex[ii, jj, kk] = Ex[ii, jj, kk] - updatecoeffsE[materialEx, 4] * (RA01 * dHy + RA1 * RB0 * EPhi1[0, i, j, k] + RB1 * EPhi1[1, i, j, k])
-                EPhi1[1, i, j, k] = RE1 * EPhi1[1, i, j, k] - RF1 * (RA0 * dHy + RB0 * EPhi1[0, i, j, k])
-                EPhi1[0, i, j, k] = RE0 * EPhi1[0, i, j, k] - RF0 * dHy
-                # Ey
-                materialEy = ID[1, ii, jj, kk]
-                dHx = (Hx[ii, jj, kk] - Hx[ii, jj, kk - 1]) / dz
-                Ey[ii, jj, kk] = Ey[ii, jj, kk] + updatecoeffsE[materialEy, 4] * (RA01 * dHx + RA1 * RB0 * EPhi2[0, i, j, k] + RB1 * EPhi2[1, i, j, k])
-                EPhi2[1, i, j, k] = RE1 * EPhi2[1, i, j, k] - RF1 * (RA0 * dHx + RB0 * EPhi2[0, i, j, k])
-                EPhi2[0, i, j, k] = RE0 * EPhi2[0, i, j, k] - RF0 * dHx
+    if nx == 1 or ny == 1 or nz == 1:
+        for chunk in prange(0, nthreads, nogil=True, schedule='static', num_threads=nthreads):
+            update_pml_2D_chunk(PML_2ORDER_ELECTRIC_ZPLUS, chunk, nthreads, xs, xf, ys, yf, zs, zf, updatecoeffsE, ID, Ex, Ey, Ez, Hx, Hy, Hz, EPhi1, EPhi2, ERA, ERB, ERE, ERF, d)
+    else:
+        for i in prange(0, nx, nogil=True, schedule='static', num_threads=nthreads):
+            update_pml_2order_electric_zplus_row(i, 0, ny, 0, nz, xs, xf, ys, yf, zs, zf, updatecoeffsE, ID, Ex, Ey, Ez, Hx, Hy, Hz, EPhi1, EPhi2, ERA, ERB, ERE, ERF, d)
 
 
 ########################################################
 # Magnetic field PML updates - 2nd order - xminus slab #
 ########################################################
+cdef inline void update_pml_2order_magnetic_xminus_row(
+                        Py_ssize_t i,
+                        Py_ssize_t j0,
+                        Py_ssize_t j1,
+                        Py_ssize_t k0,
+                        Py_ssize_t k1,
+                        int xs,
+                        int xf,
+                        int ys,
+                        int yf,
+                        int zs,
+                        int zf,
+                        floattype_t[:, ::1] updatecoeffsH,
+                        idtype_t[:, :, :, ::1] ID,
+                        floattype_t[:, :, ::1] Ex,
+                        floattype_t[:, :, ::1] Ey,
+                        floattype_t[:, :, ::1] Ez,
+                        floattype_t[:, :, ::1] Hx,
+                        floattype_t[:, :, ::1] Hy,
+                        floattype_t[:, :, ::1] Hz,
+                        floattype_t[:, :, :, ::1] HPhi1,
+                        floattype_t[:, :, :, ::1] HPhi2,
+                        floattype_t[:, ::1] HRA,
+                        floattype_t[:, ::1] HRB,
+                        floattype_t[:, ::1] HRE,
+                        floattype_t[:, ::1] HRF,
+                        float d
+                ) noexcept nogil:
+    """Updates the y indices j0 to j1 and z indices k0 to k1 at a single x index (row) of the slab for update_pml_2order_magnetic_xminus."""
+
+    cdef Py_ssize_t j, k, ii, jj, kk
+    cdef int materialHy, materialHz
+    cdef float dx, dEy, dEz, RA0, RB0, RE0, RF0, RA1, RB1, RE1, RF1, RA01
+    dx = d
+
+    ii = xf - (i + 1)
+    RA0 = HRA[0, i]
+    RB0 = HRB[0, i]
+    RE0 = HRE[0, i]
+    RF0 = HRF[0, i]
+    RA1 = HRA[1, i]
+    RB1 = HRB[1, i]
+    RE1 = HRE[1, i]
+    RF1 = HRF[1, i]
+    RA01 = HRA[0, i] * HRA[1, i] - 1
+    for j in range(j0, j1):
+        jj = j + ys
+        for k in range(k0, k1):
+            kk = k + zs
+            # Hy
+            materialHy = ID[4, ii, jj, kk]
+            dEz = (Ez[ii + 1, jj, kk] - Ez[ii, jj, kk]) / dx
+            Hy[ii, jj, kk] = Hy[ii, jj, kk] + updatecoeffsH[materialHy, 4] * (RA01 * dEz + RA1 * RB0 * HPhi1[0, i, j, k] + RB1 * HPhi1[1, i, j, k])
+            HPhi1[1, i, j, k] = RE1 * HPhi1[1, i, j, k] - RF1 * (RA0 * dEz + RB0 * HPhi1[0, i, j, k])
+            HPhi1[0, i, j, k] = RE0 * HPhi1[0, i, j, k] - RF0 * dEz
+            # Hz
+            materialHz = ID[5, ii, jj, kk]
+            dEy = (Ey[ii + 1, jj, kk] - Ey[ii, jj, kk]) / dx
+            Hz[ii, jj, kk] = Hz[ii, jj, kk] - updatecoeffsH[materialHz, 4] * (RA01 * dEy + RA1 * RB0 * HPhi2[0, i, j, k] + RB1 * HPhi2[1, i, j, k])
+            HPhi2[1, i, j, k] = RE1 * HPhi2[1, i, j, k] - RF1 * (RA0 * dEy + RB0 * HPhi2[0, i, j, k])
+            HPhi2[0, i, j, k] = RE0 * HPhi2[0, i, j, k] - RF0 * dEy
+
+
 cpdef void update_pml_2order_magnetic_xminus(
                         int xs,
                         int xf,
@@ -1283,7 +2175,7 @@ cpdef void update_pml_2order_magnetic_xminus(
                         int zf,
                         int nthreads,
                         floattype_t[:, ::1] updatecoeffsH,
-                        np.uint32_t[:, :, :, ::1] ID,
+                        idtype_t[:, :, :, ::1] ID,
                         floattype_t[:, :, ::1] Ex,
                         floattype_t[:, :, ::1] Ey,
                         floattype_t[:, :, ::1] Ez,
@@ -1308,46 +2200,86 @@ cpdef void update_pml_2order_magnetic_xminus(
         d (float): Spatial discretisation, e.g. dx, dy or dz
     """
 
-    cdef Py_ssize_t i, j, k, ii, jj, kk
-    cdef int nx, ny, nz, materialHy, materialHz
-    cdef float dx, dEy, dEz, RA0, RB0, RE0, RF0, RA1, RB1, RE1, RF1, RA01
-    dx = d
+    cdef Py_ssize_t i, chunk
+    cdef int nx, ny, nz
     nx = xf - xs
     ny = yf - ys
     nz = zf - zs
 
-    for i in prange(0, nx, nogil=True, schedule='static', num_threads=nthreads):
-        ii = xf - (i + 1)
-        RA0 = HRA[0, i]
-        RB0 = HRB[0, i]
-        RE0 = HRE[0, i]
-        RF0 = HRF[0, i]
-        RA1 = HRA[1, i]
-        RB1 = HRB[1, i]
-        RE1 = HRE[1, i]
-        RF1 = HRF[1, i]
-        RA01 = HRA[0, i] * HRA[1, i] - 1
-        for j in range(0, ny):
-            jj = j + ys
-            for k in range(0, nz):
-                kk = k + zs
-                # Hy
-                materialHy = ID[4, ii, jj, kk]
-                dEz = (Ez[ii + 1, jj, kk] - Ez[ii, jj, kk]) / dx
-                Hy[ii, jj, kk] = Hy[ii, jj, kk] + updatecoeffsH[materialHy, 4] * (RA01 * dEz + RA1 * RB0 * HPhi1[0, i, j, k] + RB1 * HPhi1[1, i, j, k])
-                HPhi1[1, i, j, k] = RE1 * HPhi1[1, i, j, k] - RF1 * (RA0 * dEz + RB0 * HPhi1[0, i, j, k])
-                HPhi1[0, i, j, k] = RE0 * HPhi1[0, i, j, k] - RF0 * dEz
-                # Hz
-                materialHz = ID[5, ii, jj, kk]
-                dEy = (Ey[ii + 1, jj, kk] - Ey[ii, jj, kk]) / dx
-                Hz[ii, jj, kk] = Hz[ii, jj, kk] - updatecoeffsH[materialHz, 4] * (RA01 * dEy + RA1 * RB0 * HPhi2[0, i, j, k] + RB1 * HPhi2[1, i, j, k])
-                HPhi2[1, i, j, k] = RE1 * HPhi2[1, i, j, k] - RF1 * (RA0 * dEy + RB0 * HPhi2[0, i, j, k])
-                HPhi2[0, i, j, k] = RE0 * HPhi2[0, i, j, k] - RF0 * dEy
+    if nx == 1 or ny == 1 or nz == 1:
+        for chunk in prange(0, nthreads, nogil=True, schedule='static', num_threads=nthreads):
+            update_pml_2D_chunk(PML_2ORDER_MAGNETIC_XMINUS, chunk, nthreads, xs, xf, ys, yf, zs, zf, updatecoeffsH, ID, Ex, Ey, Ez, Hx, Hy, Hz, HPhi1, HPhi2, HRA, HRB, HRE, HRF, d)
+    else:
+        for i in prange(0, nx, nogil=True, schedule='static', num_threads=nthreads):
+            update_pml_2order_magnetic_xminus_row(i, 0, ny, 0, nz, xs, xf, ys, yf, zs, zf, updatecoeffsH, ID, Ex, Ey, Ez, Hx, Hy, Hz, HPhi1, HPhi2, HRA, HRB, HRE, HRF, d)
 
 
 #######################################################
 # Magnetic field PML updates - 2nd order - xplus slab #
 #######################################################
+cdef inline void update_pml_2order_magnetic_xplus_row(
+                        Py_ssize_t i,
+                        Py_ssize_t j0,
+                        Py_ssize_t j1,
+                        Py_ssize_t k0,
+                        Py_ssize_t k1,
+                        int xs,
+                        int xf,
+                        int ys,
+                        int yf,
+                        int zs,
+                        int zf,
+                        floattype_t[:, ::1] updatecoeffsH,
+                        idtype_t[:, :, :, ::1] ID,
+                        floattype_t[:, :, ::1] Ex,
+                        floattype_t[:, :, ::1] Ey,
+                        floattype_t[:, :, ::1] Ez,
+                        floattype_t[:, :, ::1] Hx,
+                        floattype_t[:, :, ::1] Hy,
+                        floattype_t[:, :, ::1] Hz,
+                        floattype_t[:, :, :, ::1] HPhi1,
+                        floattype_t[:, :, :, ::1] HPhi2,
+                        floattype_t[:, ::1] HRA,
+                        floattype_t[:, ::1] HRB,
+                        floattype_t[:, ::1] HRE,
+                        floattype_t[:, ::1] HRF,
+                        float d
+                ) noexcept nogil:
+    """Updates the y indices j0 to j1 and z indices k0 to k1 at a single x index (row) of the slab for update_pml_2order_magnetic_xplus."""
+
+    cdef Py_ssize_t j, k, ii, jj, kk
+    cdef int materialHy, materialHz
+    cdef float dx, dEy, dEz, RA0, RB0, RE0, RF0, RA1, RB1, RE1, RF1, RA01
+    dx = d
+
+    ii = i + xs
+    RA0 = HRA[0, i]
+    RB0 = HRB[0, i]
+    RE0 = HRE[0, i]
+    RF0 = HRF[0, i]
+    RA1 = HRA[1, i]
+    RB1 = HRB[1, i]
+    RE1 = HRE[1, i]
+    RF1 = HRF[1, i]
+    RA01 = HRA[0, i] * HRA[1, i] - 1
+    for j in range(j0, j1):
+        jj = j + ys
+        for k in range(k0, k1):
+            kk = k + zs
+            # Hy
+            materialHy = ID[4, ii, jj, kk]
+            dEz = (Ez[ii + 1, jj, kk] - Ez[ii, jj, kk]) / dx
+            Hy[ii, jj, kk] = Hy[ii, jj, kk] + updatecoeffsH[materialHy, 4] * (RA01 * dEz + RA1 * RB0 * HPhi1[0, i, j, k] + RB1 * HPhi1[1, i, j, k])
+            HPhi1[1, i, j, k] = RE1 * HPhi1[1, i, j, k] - RF1 * (RA0 * dEz + RB0 * HPhi1[0, i, j, k])
+            HPhi1[0, i, j, k] = RE0 * HPhi1[0, i, j, k] - RF0 * dEz
+            # Hz
+            materialHz = ID[5, ii, jj, kk]
+            dEy = (Ey[ii + 1, jj, kk] - Ey[ii, jj, kk]) / dx
+            Hz[ii, jj, kk] = Hz[ii, jj, kk] - updatecoeffsH[materialHz, 4] * (RA01 * dEy + RA1 * RB0 * HPhi2[0, i, j, k] + RB1 * HPhi2[1, i, j, k])
+            HPhi2[1, i, j, k] = RE1 * HPhi2[1, i, j, k] - RF1 * (RA0 * dEy + RB0 * HPhi2[0, i, j, k])
+            HPhi2[0, i, j, k] = RE0 * HPhi2[0, i, j, k] - RF0 * dEy
+
+
 cpdef void update_pml_2order_magnetic_xplus(
                         int xs,
                         int xf,
@@ -1357,7 +2289,7 @@ cpdef void update_pml_2order_magnetic_xplus(
                         int zf,
                         int nthreads,
                         floattype_t[:, ::1] updatecoeffsH,
-                        np.uint32_t[:, :, :, ::1] ID,
+                        idtype_t[:, :, :, ::1] ID,
                         floattype_t[:, :, ::1] Ex,
                         floattype_t[:, :, ::1] Ey,
                         floattype_t[:, :, ::1] Ez,
@@ -1382,46 +2314,86 @@ cpdef void update_pml_2order_magnetic_xplus(
         d (float): Spatial discretisation, e.g. dx, dy or dz
     """
 
-    cdef Py_ssize_t i, j, k, ii, jj, kk
-    cdef int nx, ny, nz, materialHy, materialHz
-    cdef float dx, dEy, dEz, RA0, RB0, RE0, RF0, RA1, RB1, RE1, RF1, RA01
-    dx = d
+    cdef Py_ssize_t i, chunk
+    cdef int nx, ny, nz
     nx = xf - xs
     ny = yf - ys
     nz = zf - zs
 
-    for i in prange(0, nx, nogil=True, schedule='static', num_threads=nthreads):
-        ii = i + xs
-        RA0 = HRA[0, i]
-        RB0 = HRB[0, i]
-        RE0 = HRE[0, i]
-        RF0 = HRF[0, i]
-        RA1 = HRA[1, i]
-        RB1 = HRB[1, i]
-        RE1 = HRE[1, i]
-        RF1 = HRF[1, i]
-        RA01 = HRA[0, i] * HRA[1, i] - 1
-        for j in range(0, ny):
-            jj = j + ys
-            for k in range(0, nz):
-                kk = k + zs
-                # Hy
-                materialHy = ID[4, ii, jj, kk]
-                dEz = (Ez[ii + 1, jj, kk] - Ez[ii, jj, kk]) / dx
-                Hy[ii, jj, kk] = Hy[ii, jj, kk] + updatecoeffsH[materialHy, 4] * (RA01 * dEz + RA1 * RB0 * HPhi1[0, i, j, k] + RB1 * HPhi1[1, i, j, k])
-                HPhi1[1, i, j, k] = RE1 * HPhi1[1, i, j, k] - RF1 * (RA0 * dEz + RB0 * HPhi1[0, i, j, k])
-                HPhi1[0, i, j, k] = RE0 * HPhi1[0, i, j, k] - RF0 * dEz
-                # Hz
-                materialHz = ID[5, ii, jj, kk]
-                dEy = (Ey[ii + 1, jj, kk] - Ey[ii, jj, kk]) / dx
-                Hz[ii, jj, kk] = Hz[ii, jj, kk] - updatecoeffsH[materialHz, 4] * (RA01 * dEy + RA1 * RB0 * HPhi2[0, i, j, k] + RB1 * HPhi2[1, i, j, k])
-                HPhi2[1, i, j, k] = RE1 * HPhi2[1, i, j, k] - RF1 * (RA0 * dEy + RB0 * HPhi2[0, i, j, k])
-                HPhi2[0, i, j, k] = RE0 * HPhi2[0, i, j, k] - RF0 * dEy
+    if nx == 1 or ny == 1 or nz == 1:
+        for chunk in prange(0, nthreads, nogil=True, schedule='static', num_threads=nthreads):
+            update_pml_2D_chunk(PML_2ORDER_MAGNETIC_XPLUS, chunk, nthreads, xs, xf, ys, yf, zs, zf, updatecoeffsH, ID, Ex, Ey, Ez, Hx, Hy, Hz, HPhi1, HPhi2, HRA, HRB, HRE, HRF, d)
+    else:
+        for i in prange(0, nx, nogil=True, schedule='static', num_threads=nthreads):
+            update_pml_2order_magnetic_xplus_row(i, 0, ny, 0, nz, xs, xf, ys, yf, zs, zf, updatecoeffsH, ID, Ex, Ey, Ez, Hx, Hy, Hz, HPhi1, HPhi2, HRA, HRB, HRE, HRF, d)
 
 
 ########################################################
 # Magnetic field PML updates - 2nd order - yminus slab #
 ########################################################
+cdef inline void update_pml_2order_magnetic_yminus_row(
+                        Py_ssize_t i,
+                        Py_ssize_t j0,
+                        Py_ssize_t j1,
+                        Py_ssize_t k0,
+                        Py_ssize_t k1,
+                        int xs,
+                        int xf,
+                        int ys,
+                        int yf,
+                        int zs,
+                        int zf,
+                        floattype_t[:, ::1] updatecoeffsH,
+                        idtype_t[:, :, :, ::1] ID,
+                        floattype_t[:, :, ::1] Ex,
+                        floattype_t[:, :, ::1] Ey,
+                        floattype_t[:, :, ::1] Ez,
+                        floattype_t[:, :, ::1] Hx,
+                        floattype_t[:, :, ::1] Hy,
+                        floattype_t[:, :, ::1] Hz,
+                        floattype_t[:, :, :, ::1] HPhi1,
+                        floattype_t[:, :, :, ::1] HPhi2,
+                        floattype_t[:, ::1] HRA,
+                        floattype_t[:, ::1] HRB,
+                        floattype_t[:, ::1] HRE,
+                        floattype_t[:, ::1] HRF,
+                        float d
+                ) noexcept nogil:
+    """Updates the y indices j0 to j1 and z indices k0 to k1 at a single x index (row) of the slab for update_pml_2order_magnetic_yminus."""
+
+    cdef Py_ssize_t j, k, ii, jj, kk
+    cdef int materialHx, materialHz
+    cdef float dy, dEx, dEz, RA0, RB0, RE0, RF0, RA1, RB1, RE1, RF1, RA01
+    dy = d
+
+    ii = i + xs
+    for j in range(j0, j1):
+        jj = yf - (j + 1)
+        RA0 = HRA[0, j]
+        RB0 = HRB[0, j]
+        RE0 = HRE[0, j]
+        RF0 = HRF[0, j]
+        RA1 = HRA[1, j]
+        RB1 = HRB[1, j]
+        RE1 = HRE[1, j]
+        RF1 = HRF[1, j]
+        RA01 = HRA[0, j] * HRA[1, j] - 1
+        for k in range(k0, k1):
+            kk = k + zs
+            # Hx
+            materialHx = ID[3, ii, jj, kk]
+            dEz = (Ez[ii, jj + 1, kk] - Ez[ii, jj, kk]) / dy
+            Hx[ii, jj, kk] = Hx[ii, jj, kk] - updatecoeffsH[materialHx, 4] * (RA01 * dEz + RA1 * RB0 * HPhi1[0, i, j, k] + RB1 * HPhi1[1, i, j, k])
+            HPhi1[1, i, j, k] = RE1 * HPhi1[1, i, j, k] - RF1 * (RA0 * dEz + RB0 * HPhi1[0, i, j, k])
+            HPhi1[0, i, j, k] = RE0 * HPhi1[0, i, j, k] - RF0 * dEz
+            # Hz
+            materialHz = ID[5, ii, jj, kk]
+            dEx = (Ex[ii, jj + 1, kk] - Ex[ii, jj, kk]) / dy
+            Hz[ii, jj, kk] = Hz[ii, jj, kk] + updatecoeffsH[materialHz, 4] * (RA01 * dEx + RA1 * RB0 * HPhi2[0, i, j, k] + RB1 * HPhi2[1, i, j, k])
+            HPhi2[1, i, j, k] = RE1 * HPhi2[1, i, j, k] - RF1 * (RA0 * dEx + RB0 * HPhi2[0, i, j, k])
+            HPhi2[0, i, j, k] = RE0 * HPhi2[0, i, j, k] - RF0 * dEx
+
+
 cpdef void update_pml_2order_magnetic_yminus(
                         int xs,
                         int xf,
@@ -1431,7 +2403,7 @@ cpdef void update_pml_2order_magnetic_yminus(
                         int zf,
                         int nthreads,
                         floattype_t[:, ::1] updatecoeffsH,
-                        np.uint32_t[:, :, :, ::1] ID,
+                        idtype_t[:, :, :, ::1] ID,
                         floattype_t[:, :, ::1] Ex,
                         floattype_t[:, :, ::1] Ey,
                         floattype_t[:, :, ::1] Ez,
@@ -1456,46 +2428,86 @@ cpdef void update_pml_2order_magnetic_yminus(
         d (float): Spatial discretisation, e.g. dx, dy or dz
     """
 
-    cdef Py_ssize_t i, j, k, ii, jj, kk
-    cdef int nx, ny, nz, materialHx, materialHz
-    cdef float dy, dEx, dEz, RA0, RB0, RE0, RF0, RA1, RB1, RE1, RF1, RA01
-    dy = d
+    cdef Py_ssize_t i, chunk
+    cdef int nx, ny, nz
     nx = xf - xs
     ny = yf - ys
     nz = zf - zs
 
-    for i in prange(0, nx, nogil=True, schedule='static', num_threads=nthreads):
-        ii = i + xs
-        for j in range(0, ny):
-            jj = yf - (j + 1)
-            RA0 = HRA[0, j]
-            RB0 = HRB[0, j]
-            RE0 = HRE[0, j]
-            RF0 = HRF[0, j]
-            RA1 = HRA[1, j]
-            RB1 = HRB[1, j]
-            RE1 = HRE[1, j]
-            RF1 = HRF[1, j]
-            RA01 = HRA[0, j] * HRA[1, j] - 1
-            for k in range(0, nz):
-                kk = k + zs
-                # Hx
-                materialHx = ID[3, ii, jj, kk]
-                dEz = (Ez[ii, jj + 1, kk] - Ez[ii, jj, kk]) / dy
-                Hx[ii, jj, kk] = Hx[ii, jj, kk] - updatecoeffsH[materialHx, 4] * (RA01 * dEz + RA1 * RB0 * HPhi1[0, i, j, k] + RB1 * HPhi1[1, i, j, k])
-                HPhi1[1, i, j, k] = RE1 * HPhi1[1, i, j, k] - RF1 * (RA0 * dEz + RB0 * HPhi1[0, i, j, k])
-                HPhi1[0, i, j, k] = RE0 * HPhi1[0, i, j, k] - RF0 * dEz
-                # Hz
-                materialHz = ID[5, ii, jj, kk]
-                dEx = (Ex[ii, jj + 1, kk] - Ex[ii, jj, kk]) / dy
-                Hz[ii, jj, kk] = Hz[ii, jj, kk] + updatecoeffsH[materialHz, 4] * (RA01 * dEx + RA1 * RB0 * HPhi2[0, i, j, k] + RB1 * HPhi2[1, i, j, k])
-                HPhi2[1, i, j, k] = RE1 * HPhi2[1, i, j, k] - RF1 * (RA0 * dEx + RB0 * HPhi2[0, i, j, k])
-                HPhi2[0, i, j, k] = RE0 * HPhi2[0, i, j, k] - RF0 * dEx
+    if nx == 1 or ny == 1 or nz == 1:
+        for chunk in prange(0, nthreads, nogil=True, schedule='static', num_threads=nthreads):
+            update_pml_2D_chunk(PML_2ORDER_MAGNETIC_YMINUS, chunk, nthreads, xs, xf, ys, yf, zs, zf, updatecoeffsH, ID, Ex, Ey, Ez, Hx, Hy, Hz, HPhi1, HPhi2, HRA, HRB, HRE, HRF, d)
+    else:
+        for i in prange(0, nx, nogil=True, schedule='static', num_threads=nthreads):
+            update_pml_2order_magnetic_yminus_row(i, 0, ny, 0, nz, xs, xf, ys, yf, zs, zf, updatecoeffsH, ID, Ex, Ey, Ez, Hx, Hy, Hz, HPhi1, HPhi2, HRA, HRB, HRE, HRF, d)
 
 
 #######################################################
 # Magnetic field PML updates - 2nd order - yplus slab #
 #######################################################
+cdef inline void update_pml_2order_magnetic_yplus_row(
+                        Py_ssize_t i,
+                        Py_ssize_t j0,
+                        Py_ssize_t j1,
+                        Py_ssize_t k0,
+                        Py_ssize_t k1,
+                        int xs,
+                        int xf,
+                        int ys,
+                        int yf,
+                        int zs,
+                        int zf,
+                        floattype_t[:, ::1] updatecoeffsH,
+                        idtype_t[:, :, :, ::1] ID,
+                        floattype_t[:, :, ::1] Ex,
+                        floattype_t[:, :, ::1] Ey,
+                        floattype_t[:, :, ::1] Ez,
+                        floattype_t[:, :, ::1] Hx,
+                        floattype_t[:, :, ::1] Hy,
+                        floattype_t[:, :, ::1] Hz,
+                        floattype_t[:, :, :, ::1] HPhi1,
+                        floattype_t[:, :, :, ::1] HPhi2,
+                        floattype_t[:, ::1] HRA,
+                        floattype_t[:, ::1] HRB,
+                        floattype_t[:, ::1] HRE,
+                        floattype_t[:, ::1] HRF,
+                        float d
+                ) noexcept nogil:
+    """Updates the y indices j0 to j1 and z indices k0 to k1 at a single x index (row) of the slab for update_pml_2order_magnetic_yplus."""
+
+    cdef Py_ssize_t j, k, ii, jj, kk
+    cdef int materialHx, materialHz
+    cdef float dy, dEx, dEz, RA0, RB0, RE0, RF0, RA1, RB1, RE1, RF1, RA01
+    dy = d
+
+    ii = i + xs
+    for j in range(j0, j1):
+        jj = j + ys
+        RA0 = HRA[0, j]
+        RB0 = HRB[0, j]
+        RE0 = HRE[0, j]
+        RF0 = HRF[0, j]
+        RA1 = HRA[1, j]
+        RB1 = HRB[1, j]
+        RE1 = HRE[1, j]
+        RF1 = HRF[1, j]
+        RA01 = HRA[0, j] * HRA[1, j] - 1
+        for k in range(k0, k1):
+            kk = k + zs
+            # Hx
+            materialHx = ID[3, ii, jj, kk]
+            dEz = (Ez[ii, jj + 1, kk] - Ez[ii, jj, kk]) / dy
+            Hx[ii, jj, kk] = Hx[ii, jj, kk] - updatecoeffsH[materialHx, 4] * (RA01 * dEz + RA1 * RB0 * HPhi1[0, i, j, k] + RB1 * HPhi1[1, i, j, k])
+            HPhi1[1, i, j, k] = RE1 * HPhi1[1, i, j, k] - RF1 * (RA0 * dEz + RB0 * HPhi1[0, i, j, k])
+            HPhi1[0, i, j, k] = RE0 * HPhi1[0, i, j, k] - RF0 * dEz
+            # Hz
+            materialHz = ID[5, ii, jj, kk]
+            dEx = (Ex[ii, jj + 1, kk] - Ex[ii, jj, kk]) / dy
+            Hz[ii, jj, kk] = Hz[ii, jj, kk] + updatecoeffsH[materialHz, 4] * (RA01 * dEx + RA1 * RB0 * HPhi2[0, i, j, k] + RB1 * HPhi2[1, i, j, k])
+            HPhi2[1, i, j, k] = RE1 * HPhi2[1, i, j, k] - RF1 * (RA0 * dEx + RB0 * HPhi2[0, i, j, k])
+            HPhi2[0, i, j, k] = RE0 * HPhi2[0, i, j, k] - RF0 * dEx
+
+
 cpdef void update_pml_2order_magnetic_yplus(
                         int xs,
                         int xf,
@@ -1505,7 +2517,7 @@ cpdef void update_pml_2order_magnetic_yplus(
                         int zf,
                         int nthreads,
                         floattype_t[:, ::1] updatecoeffsH,
-                        np.uint32_t[:, :, :, ::1] ID,
+                        idtype_t[:, :, :, ::1] ID,
                         floattype_t[:, :, ::1] Ex,
                         floattype_t[:, :, ::1] Ey,
                         floattype_t[:, :, ::1] Ez,
@@ -1530,46 +2542,86 @@ cpdef void update_pml_2order_magnetic_yplus(
         d (float): Spatial discretisation, e.g. dx, dy or dz
     """
 
-    cdef Py_ssize_t i, j, k, ii, jj, kk
-    cdef int nx, ny, nz, materialHx, materialHz
-    cdef float dy, dEx, dEz, RA0, RB0, RE0, RF0, RA1, RB1, RE1, RF1, RA01
-    dy = d
+    cdef Py_ssize_t i, chunk
+    cdef int nx, ny, nz
     nx = xf - xs
     ny = yf - ys
     nz = zf - zs
 
-    for i in prange(0, nx, nogil=True, schedule='static', num_threads=nthreads):
-        ii = i + xs
-        for j in range(0, ny):
-            jj = j + ys
-            RA0 = HRA[0, j]
-            RB0 = HRB[0, j]
-            RE0 = HRE[0, j]
-            RF0 = HRF[0, j]
-            RA1 = HRA[1, j]
-            RB1 = HRB[1, j]
-            RE1 = HRE[1, j]
-            RF1 = HRF[1, j]
-            RA01 = HRA[0, j] * HRA[1, j] - 1
-            for k in range(0, nz):
-                kk = k + zs
-                # Hx
-                materialHx = ID[3, ii, jj, kk]
-                dEz = (Ez[ii, jj + 1, kk] - Ez[ii, jj, kk]) / dy
-                Hx[ii, jj, kk] = Hx[ii, jj, kk] - updatecoeffsH[materialHx, 4] * (RA01 * dEz + RA1 * RB0 * HPhi1[0, i, j, k] + RB1 * HPhi1[1, i, j, k])
-                HPhi1[1, i, j, k] = RE1 * HPhi1[1, i, j, k] - RF1 * (RA0 * dEz + RB0 * HPhi1[0, i, j, k])
-                HPhi1[0, i, j, k] = RE0 * HPhi1[0, i, j, k] - RF0 * dEz
-                # Hz
-                materialHz = ID[5, ii, jj, kk]
-                dEx = (Ex[ii, jj + 1, kk] - Ex[ii, jj, kk]) / dy
-                Hz[ii, jj, kk] = Hz[ii, jj, kk] + updatecoeffsH[materialHz, 4] * (RA01 * dEx + RA1 * RB0 * HPhi2[0, i, j, k] + RB1 * HPhi2[1, i, j, k])
-                HPhi2[1, i, j, k] = RE1 * HPhi2[1, i, j, k] - RF1 * (RA0 * dEx + RB0 * HPhi2[0, i, j, k])
-                HPhi2[0, i, j, k] = RE0 * HPhi2[0, i, j, k] - RF0 * dEx
+    if nx == 1 or ny == 1 or nz == 1:
+        for chunk in prange(0, nthreads, nogil=True, schedule='static', num_threads=nthreads):
+            update_pml_2D_chunk(PML_2ORDER_MAGNETIC_YPLUS, chunk, nthreads, xs, xf, ys, yf, zs, zf, updatecoeffsH, ID, Ex, Ey, Ez, Hx, Hy, Hz, HPhi1, HPhi2, HRA, HRB, HRE, HRF, d)
+    else:
+        for i in prange(0, nx, nogil=True, schedule='static', num_threads=nthreads):
+            update_pml_2order_magnetic_yplus_row(i, 0, ny, 0, nz, xs, xf, ys, yf, zs, zf, updatecoeffsH, ID, Ex, Ey, Ez, Hx, Hy, Hz, HPhi1, HPhi2, HRA, HRB, HRE, HRF, d)
 
 
 ########################################################
 # Magnetic field PML updates - 2nd order - zminus slab #
 ########################################################
+cdef inline void update_pml_2order_magnetic_zminus_row(
+                        Py_ssize_t i,
+                        Py_ssize_t j0,
+                        Py_ssize_t j1,
+                        Py_ssize_t k0,
+                        Py_ssize_t k1,
+                        int xs,
+                        int xf,
+                        int ys,
+                        int yf,
+                        int zs,
+                        int zf,
+                        floattype_t[:, ::1] updatecoeffsH,
+                        idtype_t[:, :, :, ::1] ID,
+                        floattype_t[:, :, ::1] Ex,
+                        floattype_t[:, :, ::1] Ey,
+                        floattype_t[:, :, ::1] Ez,
+                        floattype_t[:, :, ::1] Hx,
+                        floattype_t[:, :, ::1] Hy,
+                        floattype_t[:, :, ::1] Hz,
+                        floattype_t[:, :, :, ::1] HPhi1,
+                        floattype_t[:, :, :, ::1] HPhi2,
+                        floattype_t[:, ::1] HRA,
+                        floattype_t[:, ::1] HRB,
+                        floattype_t[:, ::1] HRE,
+                        floattype_t[:, ::1] HRF,
+                        float d
+                ) noexcept nogil:
+    """Updates the y indices j0 to j1 and z indices k0 to k1 at a single x index (row) of the slab for update_pml_2order_magnetic_zminus."""
+
+    cdef Py_ssize_t j, k, ii, jj, kk
+    cdef int materialHx, materialHy
+    cdef float dz, dEx, dEy, RA0, RB0, RE0, RF0, RA1, RB1, RE1, RF1, RA01
+    dz = d
+
+    ii = i + xs
+    for j in range(j0, j1):
+        jj = j + ys
+        for k in range(k0, k1):
+            kk = zf - (k + 1)
+            RA0 = HRA[0, k]
+            RB0 = HRB[0, k]
+            RE0 = HRE[0, k]
+            RF0 = HRF[0, k]
+            RA1 = HRA[1, k]
+            RB1 = HRB[1, k]
+            RE1 = HRE[1, k]
+            RF1 = HRF[1, k]
+            RA01 = HRA[0, k] * HRA[1, k] - 1
+            # Hx
+            materialHx = ID[3, ii, jj, kk]
+            dEy = (Ey[ii, jj, kk + 1] - Ey[ii, jj, kk]) / dz
+            Hx[ii, jj, kk] = Hx[ii, jj, kk] + updatecoeffsH[materialHx, 4] * (RA01 * dEy + RA1 * RB0 * HPhi1[0, i, j, k] + RB1 * HPhi1[1, i, j, k])
+            HPhi1[1, i, j, k] = RE1 * HPhi1[1, i, j, k] - RF1 * (RA0 * dEy + RB0 * HPhi1[0, i, j, k])
+            HPhi1[0, i, j, k] = RE0 * HPhi1[0, i, j, k] - RF0 * dEy
+            # Hy
+            materialHy = ID[4, ii, jj, kk]
+            dEx = (Ex[ii, jj, kk + 1] - Ex[ii, jj, kk]) / dz
+            Hy[ii, jj, kk] = Hy[ii, jj, kk] - updatecoeffsH[materialHy, 4] * (RA01 * dEx + RA1 * RB0 * HPhi2[0, i, j, k] + RB1 * HPhi2[1, i, j, k])
+            HPhi2[1, i, j, k] = RE1 * HPhi2[1, i, j, k] - RF1 * (RA0 * dEx + RB0 * HPhi2[0, i, j, k])
+            HPhi2[0, i, j, k] = RE0 * HPhi2[0, i, j, k] - RF0 * dEx
+
+
 cpdef void update_pml_2order_magnetic_zminus(
                         int xs,
                         int xf,
@@ -1579,7 +2631,7 @@ cpdef void update_pml_2order_magnetic_zminus(
                         int zf,
                         int nthreads,
                         floattype_t[:, ::1] updatecoeffsH,
-                        np.uint32_t[:, :, :, ::1] ID,
+                        idtype_t[:, :, :, ::1] ID,
                         floattype_t[:, :, ::1] Ex,
                         floattype_t[:, :, ::1] Ey,
                         floattype_t[:, :, ::1] Ez,
@@ -1604,46 +2656,86 @@ cpdef void update_pml_2order_magnetic_zminus(
         d (float): Spatial discretisation, e.g. dx, dy or dz
     """
 
-    cdef Py_ssize_t i, j, k, ii, jj, kk
-    cdef int nx, ny, nz, materialHx, materialHy
-    cdef float dz, dEx, dEy, RA0, RB0, RE0, RF0, RA1, RB1, RE1, RF1, RA01
-    dz = d
+    cdef Py_ssize_t i, chunk
+    cdef int nx, ny, nz
     nx = xf - xs
     ny = yf - ys
     nz = zf - zs
 
-    for i in prange(0, nx, nogil=True, schedule='static', num_threads=nthreads):
-        ii = i + xs
-        for j in range(0, ny):
-            jj = j + ys
-            for k in range(0, nz):
-                kk = zf - (k + 1)
-                RA0 = HRA[0, k]
-                RB0 = HRB[0, k]
-                RE0 = HRE[0, k]
-                RF0 = HRF[0, k]
-                RA1 = HRA[1, k]
-                RB1 = HRB[1, k]
-                RE1 = HRE[1, k]
-                RF1 = HRF[1, k]
-                RA01 = HRA[0, k] * HRA[1, k] - 1
-                # Hx
-                materialHx = ID[3, ii, jj, kk]
-                dEy = (Ey[ii, jj, kk + 1] - Ey[ii, jj, kk]) / dz
-                Hx[ii, jj, kk] = Hx[ii, jj, kk] + updatecoeffsH[materialHx, 4] * (RA01 * dEy + RA1 * RB0 * HPhi1[0, i, j, k] + RB1 * HPhi1[1, i, j, k])
-                HPhi1[1, i, j, k] = RE1 * HPhi1[1, i, j, k] - RF1 * (RA0 * dEy + RB0 * HPhi1[0, i, j, k])
-                HPhi1[0, i, j, k] = RE0 * HPhi1[0, i, j, k] - RF0 * dEy
-                # Hy
-                materialHy = ID[4, ii, jj, kk]
-                dEx = (Ex[ii, jj, kk + 1] - Ex[ii, jj, kk]) / dz
-                Hy[ii, jj, kk] = Hy[ii, jj, kk] - updatecoeffsH[materialHy, 4] * (RA01 * dEx + RA1 * RB0 * HPhi2[0, i, j, k] + RB1 * HPhi2[1, i, j, k])
-                HPhi2[1, i, j, k] = RE1 * HPhi2[1, i, j, k] - RF1 * (RA0 * dEx + RB0 * HPhi2[0, i, j, k])
-                HPhi2[0, i, j, k] = RE0 * HPhi2[0, i, j, k] - RF0 * dEx
+    if nx == 1 or ny == 1 or nz == 1:
+        for chunk in prange(0, nthreads, nogil=True, schedule='static', num_threads=nthreads):
+            update_pml_2D_chunk(PML_2ORDER_MAGNETIC_ZMINUS, chunk, nthreads, xs, xf, ys, yf, zs, zf, updatecoeffsH, ID, Ex, Ey, Ez, Hx, Hy, Hz, HPhi1, HPhi2, HRA, HRB, HRE, HRF, d)
+    else:
+        for i in prange(0, nx, nogil=True, schedule='static', num_threads=nthreads):
+            update_pml_2order_magnetic_zminus_row(i, 0, ny, 0, nz, xs, xf, ys, yf, zs, zf, updatecoeffsH, ID, Ex, Ey, Ez, Hx, Hy, Hz, HPhi1, HPhi2, HRA, HRB, HRE, HRF, d)
 
 
 #######################################################
 # Magnetic field PML updates - 2nd order - zplus slab #
 #######################################################
+cdef inline void update_pml_2order_magnetic_zplus_row(
+                        Py_ssize_t i,
+                        Py_ssize_t j0,
+                        Py_ssize_t j1,
+                        Py_ssize_t k0,
+                        Py_ssize_t k1,
+                        int xs,
+                        int xf,
+                        int ys,
+                        int yf,
+                        int zs,
+                        int zf,
+                        floattype_t[:, ::1] updatecoeffsH,
+                        idtype_t[:, :, :, ::1] ID,
+                        floattype_t[:, :, ::1] Ex,
+                        floattype_t[:, :, ::1] Ey,
+                        floattype_t[:, :, ::1] Ez,
+                        floattype_t[:, :, ::1] Hx,
+                        floattype_t[:, :, ::1] Hy,
+                        floattype_t[:, :, ::1] Hz,
+                        floattype_t[:, :, :, ::1] HPhi1,
+                        floattype_t[:, :, :, ::1] HPhi2,
+                        floattype_t[:, ::1] HRA,
+                        floattype_t[:, ::1] HRB,
+                        floattype_t[:, ::1] HRE,
+                        floattype_t[:, ::1] HRF,
+                        float d
+                ) noexcept nogil:
+    """Updates the y indices j0 to j1 and z indices k0 to k1 at a single x index (row) of the slab for update_pml_2order_magnetic_zplus."""
+
+    cdef Py_ssize_t j, k, ii, jj, kk
+    cdef int materialHx, materialHy
+    cdef float dz, dEx, dEy, RA0, RB0, RE0, RF0, RA1, RB1, RE1, RF1, RA01
+    dz = d
+
+    ii = i + xs
+    for j in range(j0, j1):
+        jj = j + ys
+        for k in range(k0, k1):
+            kk = k + zs
+            RA0 = HRA[0, k]
+            RB0 = HRB[0, k]
+            RE0 = HRE[0, k]
+            RF0 = HRF[0, k]
+            RA1 = HRA[1, k]
+            RB1 = HRB[1, k]
+            RE1 = HRE[1, k]
+            RF1 = HRF[1, k]
+            RA01 = HRA[0, k] * HRA[1, k] - 1
+            # Hx
+            materialHx = ID[3, ii, jj, kk]
+            dEy = (Ey[ii, jj, kk + 1] - Ey[ii, jj, kk]) / dz
+            Hx[ii, jj, kk] = Hx[ii, jj, kk] + updatecoeffsH[materialHx, 4] * (RA01 * dEy + RA1 * RB0 * HPhi1[0, i, j, k] + RB1 * HPhi1[1, i, j, k])
+            HPhi1[1, i, j, k] = RE1 * HPhi1[1, i, j, k] - RF1 * (RA0 * dEy + RB0 * HPhi1[0, i, j, k])
+            HPhi1[0, i, j, k] = RE0 * HPhi1[0, i, j, k] - RF0 * dEy
+            # Hy
+            materialHy = ID[4, ii, jj, kk]
+            dEx = (Ex[ii, jj, kk + 1] - Ex[ii, jj, kk]) / dz
+            Hy[ii, jj, kk] = Hy[ii, jj, kk] - updatecoeffsH[materialHy, 4] * (RA01 * dEx + RA1 * RB0 * HPhi2[0, i, j, k] + RB1 * HPhi2[1, i, j, k])
+            HPhi2[1, i, j, k] = RE1 * HPhi2[1, i, j, k] - RF1 * (RA0 * dEx + RB0 * HPhi2[0, i, j, k])
+            HPhi2[0, i, j, k] = RE0 * HPhi2[0, i, j, k] - RF0 * dEx
+
+
 cpdef void update_pml_2order_magnetic_zplus(
                         int xs,
                         int xf,
@@ -1653,7 +2745,7 @@ cpdef void update_pml_2order_magnetic_zplus(
                         int zf,
                         int nthreads,
                         floattype_t[:, ::1] updatecoeffsH,
-                        np.uint32_t[:, :, :, ::1] ID,
+                        idtype_t[:, :, :, ::1] ID,
                         floattype_t[:, :, ::1] Ex,
                         floattype_t[:, :, ::1] Ey,
                         floattype_t[:, :, ::1] Ez,
@@ -1678,38 +2770,382 @@ cpdef void update_pml_2order_magnetic_zplus(
         d (float): Spatial discretisation, e.g. dx, dy or dz
     """
 
-    cdef Py_ssize_t i, j, k, ii, jj, kk
-    cdef int nx, ny, nz, materialHx, materialHy
-    cdef float dz, dEx, dEy, RA0, RB0, RE0, RF0, RA1, RB1, RE1, RF1, RA01
-    dz = d
+    cdef Py_ssize_t i, chunk
+    cdef int nx, ny, nz
     nx = xf - xs
     ny = yf - ys
     nz = zf - zs
 
-    for i in prange(0, nx, nogil=True, schedule='static', num_threads=nthreads):
-        ii = i + xs
-        for j in range(0, ny):
-            jj = j + ys
-            for k in range(0, nz):
-                kk = k + zs
-                RA0 = HRA[0, k]
-                RB0 = HRB[0, k]
-                RE0 = HRE[0, k]
-                RF0 = HRF[0, k]
-                RA1 = HRA[1, k]
-                RB1 = HRB[1, k]
-                RE1 = HRE[1, k]
-                RF1 = HRF[1, k]
-                RA01 = HRA[0, k] * HRA[1, k] - 1
-                # Hx
-                materialHx = ID[3, ii, jj, kk]
-                dEy = (Ey[ii, jj, kk + 1] - Ey[ii, jj, kk]) / dz
-                Hx[ii, jj, kk] = Hx[ii, jj, kk] + updatecoeffsH[materialHx, 4] * (RA01 * dEy + RA1 * RB0 * HPhi1[0, i, j, k] + RB1 * HPhi1[1, i, j, k])
-                HPhi1[1, i, j, k] = RE1 * HPhi1[1, i, j, k] - RF1 * (RA0 * dEy + RB0 * HPhi1[0, i, j, k])
-                HPhi1[0, i, j, k] = RE0 * HPhi1[0, i, j, k] - RF0 * dEy
-                # Hy
-                materialHy = ID[4, ii, jj, kk]
-                dEx = (Ex[ii, jj, kk + 1] - Ex[ii, jj, kk]) / dz
-                Hy[ii, jj, kk] = Hy[ii, jj, kk] - updatecoeffsH[materialHy, 4] * (RA01 * dEx + RA1 * RB0 * HPhi2[0, i, j, k] + RB1 * HPhi2[1, i, j, k])
-                HPhi2[1, i, j, k] = RE1 * HPhi2[1, i, j, k] - RF1 * (RA0 * dEx + RB0 * HPhi2[0, i, j, k])
-                HPhi2[0, i, j, k] = RE0 * HPhi2[0, i, j, k] - RF0 * dEx
+    if nx == 1 or ny == 1 or nz == 1:
+        for chunk in prange(0, nthreads, nogil=True, schedule='static', num_threads=nthreads):
+            update_pml_2D_chunk(PML_2ORDER_MAGNETIC_ZPLUS, chunk, nthreads, xs, xf, ys, yf, zs, zf, updatecoeffsH, ID, Ex, Ey, Ez, Hx, Hy, Hz, HPhi1, HPhi2, HRA, HRB, HRE, HRF, d)
+    else:
+        for i in prange(0, nx, nogil=True, schedule='static', num_threads=nthreads):
+            update_pml_2order_magnetic_zplus_row(i, 0, ny, 0, nz, xs, xf, ys, yf, zs, zf, updatecoeffsH, ID, Ex, Ey, Ez, Hx, Hy, Hz, HPhi1, HPhi2, HRA, HRB, HRE, HRF, d)
+
+
+##############################################
+# Row functions of the slabs by their number #
+##############################################
+cdef inline void update_pml_row(
+                        int row,
+                        Py_ssize_t i,
+                        Py_ssize_t j0,
+                        Py_ssize_t j1,
+                        Py_ssize_t k0,
+                        Py_ssize_t k1,
+                        int xs,
+                        int xf,
+                        int ys,
+                        int yf,
+                        int zs,
+                        int zf,
+                        floattype_t[:, ::1] updatecoeffs,
+                        idtype_t[:, :, :, ::1] ID,
+                        floattype_t[:, :, ::1] Ex,
+                        floattype_t[:, :, ::1] Ey,
+                        floattype_t[:, :, ::1] Ez,
+                        floattype_t[:, :, ::1] Hx,
+                        floattype_t[:, :, ::1] Hy,
+                        floattype_t[:, :, ::1] Hz,
+                        floattype_t[:, :, :, ::1] Phi1,
+                        floattype_t[:, :, :, ::1] Phi2,
+                        floattype_t[:, ::1] RA,
+                        floattype_t[:, ::1] RB,
+                        floattype_t[:, ::1] RE,
+                        floattype_t[:, ::1] RF,
+                        float d
+                ) noexcept nogil:
+    """Updates the y indices j0 to j1 and z indices k0 to k1 at a single x
+        index (row) of a slab with one of the row functions, given by its
+        number (e.g. PML_1ORDER_ELECTRIC_XMINUS). Row functions are selected
+        by number rather than by function pointer, as they are compiled for
+        each type of the ID array.
+    """
+
+    if row == PML_1ORDER_ELECTRIC_XMINUS:
+        update_pml_1order_electric_xminus_row(i, j0, j1, k0, k1, xs, xf, ys, yf, zs, zf, updatecoeffs, ID, Ex, Ey, Ez, Hx, Hy, Hz, Phi1, Phi2, RA, RB, RE, RF, d)
+    elif row == PML_1ORDER_ELECTRIC_XPLUS:
+        update_pml_1order_electric_xplus_row(i, j0, j1, k0, k1, xs, xf, ys, yf, zs, zf, updatecoeffs, ID, Ex, Ey, Ez, Hx, Hy, Hz, Phi1, Phi2, RA, RB, RE, RF, d)
+    elif row == PML_1ORDER_ELECTRIC_YMINUS:
+        update_pml_1order_electric_yminus_row(i, j0, j1, k0, k1, xs, xf, ys, yf, zs, zf, updatecoeffs, ID, Ex, Ey, Ez, Hx, Hy, Hz, Phi1, Phi2, RA, RB, RE, RF, d)
+    elif row == PML_1ORDER_ELECTRIC_YPLUS:
+        update_pml_1order_electric_yplus_row(i, j0, j1, k0, k1, xs, xf, ys, yf, zs, zf, updatecoeffs, ID, Ex, Ey, Ez, Hx, Hy, Hz, Phi1, Phi2, RA, RB, RE, RF, d)
+    elif row == PML_1ORDER_ELECTRIC_ZMINUS:
+        update_pml_1order_electric_zminus_row(i, j0, j1, k0, k1, xs, xf, ys, yf, zs, zf, updatecoeffs, ID, Ex, Ey, Ez, Hx, Hy, Hz, Phi1, Phi2, RA, RB, RE, RF, d)
+    elif row == PML_1ORDER_ELECTRIC_ZPLUS:
+        update_pml_1order_electric_zplus_row(i, j0, j1, k0, k1, xs, xf, ys, yf, zs, zf, updatecoeffs, ID, Ex, Ey, Ez, Hx, Hy, Hz, Phi1, Phi2, RA, RB, RE, RF, d)
+    elif row == PML_1ORDER_MAGNETIC_XMINUS:
+        update_pml_1order_magnetic_xminus_row(i, j0, j1, k0, k1, xs, xf, ys, yf, zs, zf, updatecoeffs, ID, Ex, Ey, Ez, Hx, Hy, Hz, Phi1, Phi2, RA, RB, RE, RF, d)
+    elif row == PML_1ORDER_MAGNETIC_XPLUS:
+        update_pml_1order_magnetic_xplus_row(i, j0, j1, k0, k1, xs, xf, ys, yf, zs, zf, updatecoeffs, ID, Ex, Ey, Ez, Hx, Hy, Hz, Phi1, Phi2, RA, RB, RE, RF, d)
+    elif row == PML_1ORDER_MAGNETIC_YMINUS:
+        update_pml_1order_magnetic_yminus_row(i, j0, j1, k0, k1, xs, xf, ys, yf, zs, zf, updatecoeffs, ID, Ex, Ey, Ez, Hx, Hy, Hz, Phi1, Phi2, RA, RB, RE, RF, d)
+    elif row == PML_1ORDER_MAGNETIC_YPLUS:
+        update_pml_1order_magnetic_yplus_row(i, j0, j1, k0, k1, xs, xf, ys, yf, zs, zf, updatecoeffs, ID, Ex, Ey, Ez, Hx, Hy, Hz, Phi1, Phi2, RA, RB, RE, RF, d)
+    elif row == PML_1ORDER_MAGNETIC_ZMINUS:
+        update_pml_1order_magnetic_zminus_row(i, j0, j1, k0, k1, xs, xf, ys, yf, zs, zf, updatecoeffs, ID, Ex, Ey, Ez, Hx, Hy, Hz, Phi1, Phi2, RA, RB, RE, RF, d)
+    elif row == PML_1ORDER_MAGNETIC_ZPLUS:
+        update_pml_1order_magnetic_zplus_row(i, j0, j1, k0, k1, xs, xf, ys, yf, zs, zf, updatecoeffs, ID, Ex, Ey, Ez, Hx, Hy, Hz, Phi1, Phi2, RA, RB, RE, RF, d)
+    elif row == PML_2ORDER_ELECTRIC_XMINUS:
+        update_pml_2order_electric_xminus_row(i, j0, j1, k0, k1, xs, xf, ys, yf, zs, zf, updatecoeffs, ID, Ex, Ey, Ez, Hx, Hy, Hz, Phi1, Phi2, RA, RB, RE, RF, d)
+    elif row == PML_2ORDER_ELECTRIC_XPLUS:
+        update_pml_2order_electric_xplus_row(i, j0, j1, k0, k1, xs, xf, ys, yf, zs, zf, updatecoeffs, ID, Ex, Ey, Ez, Hx, Hy, Hz, Phi1, Phi2, RA, RB, RE, RF, d)
+    elif row == PML_2ORDER_ELECTRIC_YMINUS:
+        update_pml_2order_electric_yminus_row(i, j0, j1, k0, k1, xs, xf, ys, yf, zs, zf, updatecoeffs, ID, Ex, Ey, Ez, Hx, Hy, Hz, Phi1, Phi2, RA, RB, RE, RF, d)
+    elif row == PML_2ORDER_ELECTRIC_YPLUS:
+        update_pml_2order_electric_yplus_row(i, j0, j1, k0, k1, xs, xf, ys, yf, zs, zf, updatecoeffs, ID, Ex, Ey, Ez, Hx, Hy, Hz, Phi1, Phi2, RA, RB, RE, RF, d)
+    elif row == PML_2ORDER_ELECTRIC_ZMINUS:
+        update_pml_2order_electric_zminus_row(i, j0, j1, k0, k1, xs, xf, ys, yf, zs, zf, updatecoeffs, ID, Ex, Ey, Ez, Hx, Hy, Hz, Phi1, Phi2, RA, RB, RE, RF, d)
+    elif row == PML_2ORDER_ELECTRIC_ZPLUS:
+        update_pml_2order_electric_zplus_row(i, j0, j1, k0, k1, xs, xf, ys, yf, zs, zf, updatecoeffs, ID, Ex, Ey, Ez, Hx, Hy, Hz, Phi1, Phi2, RA, RB, RE, RF, d)
+    elif row == PML_2ORDER_MAGNETIC_XMINUS:
+        update_pml_2order_magnetic_xminus_row(i, j0, j1, k0, k1, xs, xf, ys, yf, zs, zf, updatecoeffs, ID, Ex, Ey, Ez, Hx, Hy, Hz, Phi1, Phi2, RA, RB, RE, RF, d)
+    elif row == PML_2ORDER_MAGNETIC_XPLUS:
+        update_pml_2order_magnetic_xplus_row(i, j0, j1, k0, k1, xs, xf, ys, yf, zs, zf, updatecoeffs, ID, Ex, Ey, Ez, Hx, Hy, Hz, Phi1, Phi2, RA, RB, RE, RF, d)
+    elif row == PML_2ORDER_MAGNETIC_YMINUS:
+        update_pml_2order_magnetic_yminus_row(i, j0, j1, k0, k1, xs, xf, ys, yf, zs, zf, updatecoeffs, ID, Ex, Ey, Ez, Hx, Hy, Hz, Phi1, Phi2, RA, RB, RE, RF, d)
+    elif row == PML_2ORDER_MAGNETIC_YPLUS:
+        update_pml_2order_magnetic_yplus_row(i, j0, j1, k0, k1, xs, xf, ys, yf, zs, zf, updatecoeffs, ID, Ex, Ey, Ez, Hx, Hy, Hz, Phi1, Phi2, RA, RB, RE, RF, d)
+    elif row == PML_2ORDER_MAGNETIC_ZMINUS:
+        update_pml_2order_magnetic_zminus_row(i, j0, j1, k0, k1, xs, xf, ys, yf, zs, zf, updatecoeffs, ID, Ex, Ey, Ez, Hx, Hy, Hz, Phi1, Phi2, RA, RB, RE, RF, d)
+    elif row == PML_2ORDER_MAGNETIC_ZPLUS:
+        update_pml_2order_magnetic_zplus_row(i, j0, j1, k0, k1, xs, xf, ys, yf, zs, zf, updatecoeffs, ID, Ex, Ey, Ez, Hx, Hy, Hz, Phi1, Phi2, RA, RB, RE, RF, d)
+
+
+#############################################################
+# Fused PML updates - all slabs in a single parallel region #
+#############################################################
+cdef class PMLSlab:
+    """Extent and arrays of a PML slab, for the fused PML updates."""
+
+    def __init__(self, pml):
+        """
+        Args:
+            pml (class): PML class instance.
+        """
+
+        self.xs = pml.xs
+        self.xf = pml.xf
+        self.ys = pml.ys
+        self.yf = pml.yf
+        self.zs = pml.zs
+        self.zf = pml.zf
+        self.nx = pml.xf - pml.xs
+        self.ny = pml.yf - pml.ys
+        self.nz = pml.zf - pml.zs
+        self.d = pml.d
+        self.EPhi1 = pml.EPhi1
+        self.EPhi2 = pml.EPhi2
+        self.HPhi1 = pml.HPhi1
+        self.HPhi2 = pml.HPhi2
+        self.ERA = pml.ERA
+        self.ERB = pml.ERB
+        self.ERE = pml.ERE
+        self.ERF = pml.ERF
+        self.HRA = pml.HRA
+        self.HRB = pml.HRB
+        self.HRE = pml.HRE
+        self.HRF = pml.HRF
+
+        # Row functions of the slab, and whether rows are numbered from the
+        # end (rather than the start) of the slab in the x direction
+        order = len(pml.CFS)
+        if pml.direction == 'xminus':
+            self.electricrow = PML_1ORDER_ELECTRIC_XMINUS if order == 1 else PML_2ORDER_ELECTRIC_XMINUS
+            self.magneticrow = PML_1ORDER_MAGNETIC_XMINUS if order == 1 else PML_2ORDER_MAGNETIC_XMINUS
+        elif pml.direction == 'yminus':
+            self.electricrow = PML_1ORDER_ELECTRIC_YMINUS if order == 1 else PML_2ORDER_ELECTRIC_YMINUS
+            self.magneticrow = PML_1ORDER_MAGNETIC_YMINUS if order == 1 else PML_2ORDER_MAGNETIC_YMINUS
+        elif pml.direction == 'zminus':
+            self.electricrow = PML_1ORDER_ELECTRIC_ZMINUS if order == 1 else PML_2ORDER_ELECTRIC_ZMINUS
+            self.magneticrow = PML_1ORDER_MAGNETIC_ZMINUS if order == 1 else PML_2ORDER_MAGNETIC_ZMINUS
+        elif pml.direction == 'xplus':
+            self.electricrow = PML_1ORDER_ELECTRIC_XPLUS if order == 1 else PML_2ORDER_ELECTRIC_XPLUS
+            self.magneticrow = PML_1ORDER_MAGNETIC_XPLUS if order == 1 else PML_2ORDER_MAGNETIC_XPLUS
+        elif pml.direction == 'yplus':
+            self.electricrow = PML_1ORDER_ELECTRIC_YPLUS if order == 1 else PML_2ORDER_ELECTRIC_YPLUS
+            self.magneticrow = PML_1ORDER_MAGNETIC_YPLUS if order == 1 else PML_2ORDER_MAGNETIC_YPLUS
+        elif pml.direction == 'zplus':
+            self.electricrow = PML_1ORDER_ELECTRIC_ZPLUS if order == 1 else PML_2ORDER_ELECTRIC_ZPLUS
+            self.magneticrow = PML_1ORDER_MAGNETIC_ZPLUS if order == 1 else PML_2ORDER_MAGNETIC_ZPLUS
+        self.xreversed = pml.direction == 'xminus'
+
+
+@cython.cdivision(True)
+cdef void update_pml_slab_chunk(
+                        PMLSlab slab,
+                        bint electric,
+                        Py_ssize_t row0,
+                        Py_ssize_t row1,
+                        Py_ssize_t chunk,
+                        Py_ssize_t nchunks,
+                        floattype_t[:, ::1] updatecoeffs,
+                        idtype_t[:, :, :, ::1] ID,
+                        floattype_t[:, :, ::1] Ex,
+                        floattype_t[:, :, ::1] Ey,
+                        floattype_t[:, :, ::1] Ez,
+                        floattype_t[:, :, ::1] Hx,
+                        floattype_t[:, :, ::1] Hy,
+                        floattype_t[:, :, ::1] Hz
+                ) noexcept nogil:
+    """Updates a chunk of the rows row0 to row1 of a slab, using the row
+        function of the slab for its own order. The rows and the y indices
+        of the slab are collapsed into a single index which is split into
+        nchunks chunks of equal size, except for all the rows of a slab
+        which is a single cell thick in one dimension (see
+        update_pml_2D_chunk).
+
+    Args:
+        slab (PMLSlab): PML slab
+        electric (bint): Whether to do the electric (or magnetic) field update
+        row0, row1 (int): Rows of the slab to update
+        chunk, nchunks (int): Chunk to update and number of chunks
+        updatecoeffs, ID, E, H (memoryviews): Access to update coeffients, ID and field component arrays
+    """
+
+    cdef int row
+    cdef Py_ssize_t nrows, start, stop, a, j0, j1
+
+    row0 = max(row0, 0)
+    row1 = min(row1, slab.nx)
+    nrows = row1 - row0
+    if nrows <= 0 or slab.ny == 0:
+        return
+    row = slab.electricrow if electric else slab.magneticrow
+
+    if nrows == slab.nx and (slab.nx == 1 or slab.ny == 1 or slab.nz == 1):
+        if electric:
+            update_pml_2D_chunk(row, chunk, nchunks, slab.xs, slab.xf, slab.ys, slab.yf, slab.zs, slab.zf, updatecoeffs, ID, Ex, Ey, Ez, Hx, Hy, Hz, slab.EPhi1, slab.EPhi2, slab.ERA, slab.ERB, slab.ERE, slab.ERF, slab.d)
+        else:
+            update_pml_2D_chunk(row, chunk, nchunks, slab.xs, slab.xf, slab.ys, slab.yf, slab.zs, slab.zf, updatecoeffs, ID, Ex, Ey, Ez, Hx, Hy, Hz, slab.HPhi1, slab.HPhi2, slab.HRA, slab.HRB, slab.HRE, slab.HRF, slab.d)
+        return
+
+    start = chunk * nrows * slab.ny // nchunks
+    stop = (chunk + 1) * nrows * slab.ny // nchunks
+    while start < stop:
+        a = start // slab.ny
+        j0 = start - a * slab.ny
+        j1 = min(slab.ny, j0 + stop - start)
+        if electric:
+            update_pml_row(row, row0 + a, j0, j1, 0, slab.nz, slab.xs, slab.xf, slab.ys, slab.yf, slab.zs, slab.zf, updatecoeffs, ID, Ex, Ey, Ez, Hx, Hy, Hz, slab.EPhi1, slab.EPhi2, slab.ERA, slab.ERB, slab.ERE, slab.ERF, slab.d)
+        else:
+            update_pml_row(row, row0 + a, j0, j1, 0, slab.nz, slab.xs, slab.xf, slab.ys, slab.yf, slab.zs, slab.zf, updatecoeffs, ID, Ex, Ey, Ez, Hx, Hy, Hz, slab.HPhi1, slab.HPhi2, slab.HRA, slab.HRB, slab.HRE, slab.HRF, slab.d)
+        start += j1 - j0
+
+
+cdef void update_pml_tile_chunk(
+                        PMLSlab slab,
+                        bint electric,
+                        Py_ssize_t xs,
+                        Py_ssize_t xf,
+                        Py_ssize_t chunk,
+                        Py_ssize_t nchunks,
+                        floattype_t[:, ::1] updatecoeffs,
+                        idtype_t[:, :, :, ::1] ID,
+                        floattype_t[:, :, ::1] Ex,
+                        floattype_t[:, :, ::1] Ey,
+                        floattype_t[:, :, ::1] Ez,
+                        floattype_t[:, :, ::1] Hx,
+                        floattype_t[:, :, ::1] Hy,
+                        floattype_t[:, :, ::1] Hz
+                ) noexcept nogil:
+    """Updates a chunk of the part of a slab in a tile of a 3D grid, i.e. the
+        rows of the slab at the x indices xs to xf of the grid, for the
+        cache-blocked (tiled) updates of the compiled solver.
+
+    Args:
+        slab (PMLSlab): PML slab
+        electric (bint): Whether to do the electric (or magnetic) field update
+        xs, xf (int): x indices of the tile
+        chunk, nchunks (int): Chunk to update and number of chunks
+        updatecoeffs, ID, E, H (memoryviews): Access to update coeffients, ID and field component arrays
+    """
+
+    # Rows of the slab at the x indices of the tile (the x index of a row of
+    # the magnetic field update of the xminus slab is one less than that of
+    # the electric field update)
+    if slab.xreversed:
+        update_pml_slab_chunk(slab, electric, slab.xf - xf + 1 - (not electric), slab.xf - xs + 1 - (not electric), chunk, nchunks, updatecoeffs, ID, Ex, Ey, Ez, Hx, Hy, Hz)
+    else:
+        update_pml_slab_chunk(slab, electric, xs - slab.xs, xf - slab.xs, chunk, nchunks, updatecoeffs, ID, Ex, Ey, Ez, Hx, Hy, Hz)
+
+
+cdef void update_pml_slabs(
+                        bint electric,
+                        int nthreads,
+                        PMLSlab xminus,
+                        PMLSlab yminus,
+                        PMLSlab zminus,
+                        PMLSlab xplus,
+                        PMLSlab yplus,
+                        PMLSlab zplus,
+                        floattype_t[:, ::1] updatecoeffs,
+                        idtype_t[:, :, :, ::1] ID,
+                        floattype_t[:, :, ::1] Ex,
+                        floattype_t[:, :, ::1] Ey,
+                        floattype_t[:, :, ::1] Ez,
+                        floattype_t[:, :, ::1] Hx,
+                        floattype_t[:, :, ::1] Hy,
+                        floattype_t[:, :, ::1] Hz
+                ) noexcept nogil:
+    """Updates the electric or magnetic field components with the PML
+        correction for all slabs in a single parallel region, i.e. the
+        threads are started once and the slabs are updated one after the
+        other (in the same order as by the separate functions for each slab).
+        Each slab is updated with the row functions for its own order.
+
+    Args:
+        electric (bint): Whether to do the electric (or magnetic) field update
+        nthreads (int): Number of threads to use
+        xminus, yminus, zminus, xplus, yplus, zplus (PMLSlab): PML slabs, or None if there is no slab
+        updatecoeffs, ID, E, H (memoryviews): Access to update coeffients, ID and field component arrays
+    """
+
+    cdef Py_ssize_t chunk
+    cdef bint hasxminus, hasyminus, haszminus, hasxplus, hasyplus, haszplus
+
+    hasxminus = xminus is not None
+    hasyminus = yminus is not None
+    haszminus = zminus is not None
+    hasxplus = xplus is not None
+    hasyplus = yplus is not None
+    haszplus = zplus is not None
+
+    with nogil, parallel(num_threads=nthreads):
+        if hasxminus:
+            for chunk in prange(0, nthreads, schedule='static'):
+                update_pml_slab_chunk(xminus, electric, 0, xminus.nx, chunk, nthreads, updatecoeffs, ID, Ex, Ey, Ez, Hx, Hy, Hz)
+        if hasyminus:
+            for chunk in prange(0, nthreads, schedule='static'):
+                update_pml_slab_chunk(yminus, electric, 0, yminus.nx, chunk, nthreads, updatecoeffs, ID, Ex, Ey, Ez, Hx, Hy, Hz)
+        if haszminus:
+            for chunk in prange(0, nthreads, schedule='static'):
+                update_pml_slab_chunk(zminus, electric, 0, zminus.nx, chunk, nthreads, updatecoeffs, ID, Ex, Ey, Ez, Hx, Hy, Hz)
+        if hasxplus:
+            for chunk in prange(0, nthreads, schedule='static'):
+                update_pml_slab_chunk(xplus, electric, 0, xplus.nx, chunk, nthreads, updatecoeffs, ID, Ex, Ey, Ez, Hx, Hy, Hz)
+        if hasyplus:
+            for chunk in prange(0, nthreads, schedule='static'):
+                update_pml_slab_chunk(yplus, electric, 0, yplus.nx, chunk, nthreads, updatecoeffs, ID, Ex, Ey, Ez, Hx, Hy, Hz)
+        if haszplus:
+            for chunk in prange(0, nthreads, schedule='static'):
+                update_pml_slab_chunk(zplus, electric, 0, zplus.nx, chunk, nthreads, updatecoeffs, ID, Ex, Ey, Ez, Hx, Hy, Hz)
+
+
+cpdef void update_pml_electric(
+                        int nthreads,
+                        PMLSlab xminus,
+                        PMLSlab yminus,
+                        PMLSlab zminus,
+                        PMLSlab xplus,
+                        PMLSlab yplus,
+                        PMLSlab zplus,
+                        floattype_t[:, ::1] updatecoeffsE,
+                        idtype_t[:, :, :, ::1] ID,
+                        floattype_t[:, :, ::1] Ex,
+                        floattype_t[:, :, ::1] Ey,
+                        floattype_t[:, :, ::1] Ez,
+                        floattype_t[:, :, ::1] Hx,
+                        floattype_t[:, :, ::1] Hy,
+                        floattype_t[:, :, ::1] Hz
+                ) noexcept nogil:
+    """This function updates the electric field components with the PML
+        correction for all slabs in a single parallel region.
+
+    Args:
+        nthreads (int): Number of threads to use
+        xminus, yminus, zminus, xplus, yplus, zplus (PMLSlab): PML slabs, or None if there is no slab
+        updatecoeffs, ID, E, H (memoryviews): Access to update coeffients, ID and field component arrays
+    """
+
+    update_pml_slabs(True, nthreads, xminus, yminus, zminus, xplus, yplus, zplus, updatecoeffsE, ID, Ex, Ey, Ez, Hx, Hy, Hz)
+
+
+cpdef void update_pml_magnetic(
+                        int nthreads,
+                        PMLSlab xminus,
+                        PMLSlab yminus,
+                        PMLSlab zminus,
+                        PMLSlab xplus,
+                        PMLSlab yplus,
+                        PMLSlab zplus,
+                        floattype_t[:, ::1] updatecoeffsH,
+                        idtype_t[:, :, :, ::1] ID,
+                        floattype_t[:, :, ::1] Ex,
+                        floattype_t[:, :, ::1] Ey,
+                        floattype_t[:, :, ::1] Ez,
+                        floattype_t[:, :, ::1] Hx,
+                        floattype_t[:, :, ::1] Hy,
+                        floattype_t[:, :, ::1] Hz
+                ) noexcept nogil:
+    """This function updates the magnetic field components with the PML
+        correction for all slabs in a single parallel region.
+
+    Args:
+        nthreads (int): Number of threads to use
+        xminus, yminus, zminus, xplus, yplus, zplus (PMLSlab): PML slabs, or None if there is no slab
+        updatecoeffs, ID, E, H (memoryviews): Access to update coeffients, ID and field component arrays
+    """
+
+    update_pml_slabs(False, nthreads, xminus, yminus, zminus, xplus, yplus, zplus, updatecoeffsH, ID, Ex, Ey, Ez, Hx, Hy, Hz)
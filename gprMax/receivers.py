@@ -27,7 +27,7 @@ class Rx(object):
     """Receiver output points."""
 
     allowableoutputs = ['Ex', 'Ey', 'Ez', 'Hx', 'Hy', 'Hz', 'Ix', 'Iy', 'Iz']
-    gpu_allowableoutputs = allowableoutputs[:-3]
+    gpu_allowableoutputs = allowableoutputs
     defaultoutputs = allowableoutputs[:-3]
 
     def __init__(self):
@@ -42,6 +42,47 @@ class Rx(object):
         self.zcoordorigin = None
 
 
+def initialise_rx_arrays(G):
+    """Initialise arrays of receiver coordinates and to store field components for receivers.
+
+    Args:
+        G (class): Grid class instance - holds essential parameters describing the model.
+
+    Returns:
+        rxcoords (list): For each of the allowable outputs, arrays of the
+                indices of the receivers that store the output, and their
+                x, y and z coordinates.
+        rxs (array): Array to store field components for receivers - rows are
+                field components; columns are iterations; pages are receivers.
+    """
+
+    rxcoords = []
+    for output in Rx.allowableoutputs:
+        rxindices = [i for i, rx in enumerate(G.rxs) if output in rx.outputs]
+        rxcoords.append((np.array(rxindices, dtype=np.intp),
+                         np.array([G.rxs[i].xcoord for i in rxindices], dtype=np.intp),
+                         np.array([G.rxs[i].ycoord for i in rxindices], dtype=np.intp),
+                         np.array([G.rxs[i].zcoord for i in rxindices], dtype=np.intp)))
+
+    rxs = np.zeros((len(Rx.allowableoutputs), G.iterations, len(G.rxs)), dtype=floattype)
+
+    return rxcoords, rxs
+
+
+def get_rx_array(rxs, rxcoords, G):
+    """Copy output from receivers array back to receiver objects.
+
+    Args:
+        rxs (array): numpy array of receiver data - rows are field components; columns are iterations; pages are receivers.
+        rxcoords (list): Indices and coordinates of receivers for each of the allowable outputs.
+        G (class): Grid class instance - holds essential parameters describing the model.
+    """
+
+    for component, (output, (rxindices, x, y, z)) in enumerate(zip(Rx.allowableoutputs, rxcoords)):
+        for rxindex in rxindices:
+            G.rxs[rxindex].outputs[output][:] = rxs[component, :, rxindex]
+
+
 def gpu_initialise_rx_arrays(G):
     """Initialise arrays on GPU for receiver coordinates and to store field components for receivers.
 
@@ -80,9 +121,5 @@ def gpu_get_rx_array(rxs_gpu, rxcoords_gpu, G):
     for rx in G.rxs:
         for rxgpu in range(len(G.rxs)):
             if rx.xcoord == rxcoords_gpu[rxgpu, 0] and rx.ycoord == rxcoords_gpu[rxgpu, 1] and rx.zcoord == rxcoords_gpu[rxgpu, 2]:
-                rx.outputs['Ex'] = rxs_gpu[0, :, rxgpu]
-                rx.outputs['Ey'] = rxs_gpu[1, :, rxgpu]
-                rx.outputs['Ez'] = rxs_gpu[2, :, rxgpu]
-                rx.outputs['Hx'] = rxs_gpu[3, :, rxgpu]
-                rx.outputs['Hy'] = rxs_gpu[4, :, rxgpu]
-                rx.outputs['Hz'] = rxs_gpu[5, :, rxgpu]
+                for output in rx.outputs:
+                    rx.outputs[output] = rxs_gpu[Rx.gpu_allowableoutputs.index(output), :, rxgpu]
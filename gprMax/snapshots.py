@@ -18,14 +18,19 @@
 
 import os
 import sys
+from queue import Queue
 from struct import pack
+from threading import Lock
+from threading import Thread
 
+import h5py
 import numpy as np
+from tqdm import tqdm
 
+from gprMax._version import __version__
 from gprMax.constants import floattype
-from gprMax.grid import Ix
-from gprMax.grid import Iy
-from gprMax.grid import Iz
+from gprMax.grid import calculate_currents
+from gprMax.utilities import get_terminal_width
 from gprMax.utilities import round_value
 
 
@@ -38,13 +43,14 @@ class Snapshot(object):
     else:
         byteorder = 'BigEndian'
 
-    # Set format text and string depending on float type
+    # Set format text depending on float type
     if np.dtype(floattype).name == 'float32':
         floatname = 'Float32'
-        floatstring = 'f'
     elif np.dtype(floattype).name == 'float64':
         floatname = 'Float64'
-        floatstring = 'd'
+
+    # Maximum number of cells of a snapshot volume to process and write at a time
+    chunkcells = 2**20
 
     def __init__(self, xs=None, ys=None, zs=None, xf=None, yf=None, zf=None, dx=None, dy=None, dz=None, time=None, filename=None):
         """
@@ -67,6 +73,58 @@ class Snapshot(object):
         self.time = time
         self.basefilename = filename
 
+    def due(self, iteration):
+        """Checks if the snapshot should be taken on an iteration.
+
+        Args:
+            iteration (int): Current iteration number (from zero).
+
+        Returns:
+            (boolean): True if the snapshot should be taken.
+        """
+
+        return self.time == iteration + 1
+
+    def snapshot_directory(self, appendmodelnumber, G):
+        """Creates (if necessary) the directory for snapshot files.
+
+        Args:
+            appendmodelnumber (str): Text to append to filename.
+            G (class): Grid class instance - holds essential parameters describing the model.
+
+        Returns:
+            snapshotdir (str): Name of the directory.
+        """
+
+        snapshotdir = os.path.join(G.inputdirectory, os.path.splitext(G.inputfilename)[0] + '_snaps' + appendmodelnumber)
+        if not os.path.exists(snapshotdir):
+            os.mkdir(snapshotdir)
+
+        return snapshotdir
+
+    def prepare(self, appendmodelnumber, G):
+        """Prepares the file for the snapshot.
+
+        Args:
+            appendmodelnumber (str): Text to append to filename.
+            G (class): Grid class instance - holds essential parameters describing the model.
+        """
+
+        self.prepare_vtk_imagedata(appendmodelnumber, G)
+
+    def write(self, iteration, fields, G, pbar, origin=(0, 0, 0)):
+        """Writes the snapshot to file.
+
+        Args:
+            iteration (int): Iteration number the snapshot was taken on (from zero).
+            fields (list): Ex, Ey, Ez, Hx, Hy, Hz values.
+            G (class): Grid class instance - holds essential parameters describing the model.
+            pbar (class): Progress bar class instance.
+            origin (tuple): Cell coordinates in the grid of the first value of the field arrays.
+        """
+
+        self.write_vtk_imagedata(*fields, G, pbar, origin=origin)
+
     def prepare_vtk_imagedata(self, appendmodelnumber, G):
         """Prepares a VTK ImageData (.vti) file for a snapshot.
 
@@ -81,9 +139,7 @@ class Snapshot(object):
         self.vtk_nz = self.zf - self.zs
 
         # Create directory and construct filename from user-supplied name and model run number
-        snapshotdir = os.path.join(G.inputdirectory, os.path.splitext(G.inputfilename)[0] + '_snaps' + appendmodelnumber)
-        if not os.path.exists(snapshotdir):
-            os.mkdir(snapshotdir)
+        snapshotdir = self.snapshot_directory(appendmodelnumber, G)
         self.filename = os.path.abspath(os.path.join(snapshotdir, self.basefilename + '.vti'))
 
         # Calculate number of cells according to requested sampling
@@ -108,48 +164,419 @@ class Snapshot(object):
         self.filehandle.write('</CellData>\n</Piece>\n</ImageData>\n<AppendedData encoding="raw">\n_'.encode('utf-8'))
         self.filehandle.close()
 
-    def write_vtk_imagedata(self, Ex, Ey, Ez, Hx, Hy, Hz, G, pbar):
+    def staging_region(self):
+        """Region of the field arrays needed to calculate the snapshot values,
+            i.e. the snapshot volume plus the following cell and, away from the
+            lower boundaries, the preceding cell.
+
+        Returns:
+            (tuple): Slices of the field arrays.
+        """
+
+        return (slice(max(self.xs - 1, 0), self.xf + 1), slice(max(self.ys - 1, 0), self.yf + 1), slice(max(self.zs - 1, 0), self.zf + 1))
+
+    def stage_fields(self, G, fields):
+        """Copies the field values needed to calculate the snapshot values.
+
+        Args:
+            G (class): Grid class instance - holds essential parameters describing the model.
+            fields (list): Arrays (shaped as the staging region) to copy the Ex, Ey, Ez, Hx, Hy, Hz values to.
+
+        Returns:
+            origin (tuple): Cell coordinates of the staging region in the grid.
+        """
+
+        region = self.staging_region()
+        for field, gridfield in zip(fields, (G.Ex, G.Ey, G.Ez, G.Hx, G.Hy, G.Hz)):
+            np.copyto(field, gridfield[region])
+
+        return tuple(s.start for s in region)
+
+    def write_vtk_imagedata(self, Ex, Ey, Ez, Hx, Hy, Hz, G, pbar, origin=(0, 0, 0)):
         """Writes electric and magnetic field values to VTK ImageData (.vti) file.
 
         Args:
             Ex, Ey, Ez, Hx, Hy, Hz (memory view): Electric and magnetic field values.
             G (class): Grid class instance - holds essential parameters describing the model.
             pbar (class): Progress bar class instance.
+            origin (tuple): Cell coordinates in the grid of the first value of the field arrays,
+                    i.e. non-zero if the field arrays are a staged copy of part of the grid.
         """
 
         self.filehandle = open(self.filename, 'ab')
 
         datasize = 3 * np.dtype(floattype).itemsize * (self.vtk_xfcells - self.vtk_xscells) * (self.vtk_yfcells - self.vtk_yscells) * (self.vtk_zfcells - self.vtk_zscells)
-        # Write number of bytes of appended data as UInt32
-        self.filehandle.write(pack('I', datasize))
-        for k in range(self.zs, self.zf, self.dz):
-            for j in range(self.ys, self.yf, self.dy):
-                for i in range(self.xs, self.xf, self.dx):
-                    pbar.update(n=12)
-                    # The electric field component value at a point comes from average of the 4 electric field component values in that cell
-                    self.filehandle.write(pack(Snapshot.floatstring, (Ex[i, j, k] + Ex[i, j + 1, k] + Ex[i, j, k + 1] + Ex[i, j + 1, k + 1]) / 4))
-                    self.filehandle.write(pack(Snapshot.floatstring, (Ey[i, j, k] + Ey[i + 1, j, k] + Ey[i, j, k + 1] + Ey[i + 1, j, k + 1]) / 4))
-                    self.filehandle.write(pack(Snapshot.floatstring, (Ez[i, j, k] + Ez[i + 1, j, k] + Ez[i, j + 1, k] + Ez[i + 1, j + 1, k]) / 4))
-
-        self.filehandle.write(pack('I', datasize))
-        for k in range(self.zs, self.zf, self.dz):
-            for j in range(self.ys, self.yf, self.dy):
-                for i in range(self.xs, self.xf, self.dx):
-                    pbar.update(n=12)
-                    # The magnetic field component value at a point comes from average
-                    # of 2 magnetic field component values in that cell and the following cell
-                    self.filehandle.write(pack(Snapshot.floatstring, (Hx[i, j, k] + Hx[i + 1, j, k]) / 2))
-                    self.filehandle.write(pack(Snapshot.floatstring, (Hy[i, j, k] + Hy[i, j + 1, k]) / 2))
-                    self.filehandle.write(pack(Snapshot.floatstring, (Hz[i, j, k] + Hz[i, j, k + 1]) / 2))
-
-        self.filehandle.write(pack('I', datasize))
-        for k in range(self.zs, self.zf, self.dz):
-            for j in range(self.ys, self.yf, self.dy):
-                for i in range(self.xs, self.xf, self.dx):
-                    pbar.update(n=12)
-                    self.filehandle.write(pack(Snapshot.floatstring, Ix(i, j, k, Hx, Hy, Hz, G)))
-                    self.filehandle.write(pack(Snapshot.floatstring, Iy(i, j, k, Hx, Hy, Hz, G)))
-                    self.filehandle.write(pack(Snapshot.floatstring, Iz(i, j, k, Hx, Hy, Hz, G)))
+
+        # Cells of the snapshot volume, and the number of z planes of cells
+        # that are processed and written at a time
+        i = slice(self.xs - origin[0], self.xf - origin[0], self.dx)
+        j = slice(self.ys - origin[1], self.yf - origin[1], self.dy)
+        nplanes = max(1, Snapshot.chunkcells // (len(range(self.xs, self.xf, self.dx)) * len(range(self.ys, self.yf, self.dy))))
+
+        for calculate_values in (calculate_electric_values, calculate_magnetic_values, calculate_current_values):
+            # Write number of bytes of appended data as UInt32
+            self.filehandle.write(pack('I', datasize))
+            for zs in range(self.zs - origin[2], self.zf - origin[2], nplanes * self.dz):
+                k = slice(zs, min(zs + nplanes * self.dz, self.zf - origin[2]), self.dz)
+                values = interleave_components(*calculate_values(i, j, k, Ex, Ey, Ez, Hx, Hy, Hz, G))
+                self.filehandle.write(values)
+                pbar.update(n=4 * values.size)
 
         self.filehandle.write('\n</AppendedData>\n</VTKFile>'.encode('utf-8'))
         self.filehandle.close()
+
+
+class SnapshotSeries(Snapshot):
+    """
+    Series of snapshots of the electric and magnetic field values, taken at
+        regular intervals and written to a single HDF5 file. The values are
+        stored in a chunked dataset indexed [time, component, k, j, i], i.e.
+        with x varying fastest as in VTK and XDMF, and an XDMF file describing
+        the series is written alongside for visualisation.
+    """
+
+    # Field components in the order they are stored
+    components = ['Ex', 'Ey', 'Ez', 'Hx', 'Hy', 'Hz', 'Ix', 'Iy', 'Iz']
+
+    def __init__(self, xs=None, ys=None, zs=None, xf=None, yf=None, zf=None, dx=None, dy=None, dz=None, start=None, stop=None, step=None, filename=None, compression=False):
+        """
+        Args:
+            xs, xf, ys, yf, zs, zf (float): Extent of the volume.
+            dx, dy, dz (float): Spatial discretisation.
+            start, stop (int): Iteration numbers to take the first and last snapshots on.
+            step (int): Number of iterations between snapshots.
+            filename (str): Filename to save to.
+            compression (boolean): Compress the snapshot values.
+        """
+
+        super().__init__(xs, ys, zs, xf, yf, zf, dx, dy, dz, start, filename)
+        self.stop = stop
+        self.step = step
+        self.compression = compression
+        self.iterations = range(start, stop + 1, step)
+
+    def due(self, iteration):
+        """Checks if a snapshot of the series should be taken on an iteration.
+
+        Args:
+            iteration (int): Current iteration number (from zero).
+
+        Returns:
+            (boolean): True if a snapshot should be taken.
+        """
+
+        return iteration + 1 in self.iterations
+
+    def prepare(self, appendmodelnumber, G):
+        """Prepares the HDF5 and XDMF files for the snapshot series.
+
+        Args:
+            appendmodelnumber (str): Text to append to filename.
+            G (class): Grid class instance - holds essential parameters describing the model.
+        """
+
+        snapshotdir = self.snapshot_directory(appendmodelnumber, G)
+        self.filename = os.path.abspath(os.path.join(snapshotdir, self.basefilename + '.h5'))
+        self.xdmffilename = os.path.abspath(os.path.join(snapshotdir, self.basefilename + '.xdmf'))
+
+        # Number of cells according to requested sampling
+        self.shape = (len(range(self.xs, self.xf, self.dx)), len(range(self.ys, self.yf, self.dy)), len(range(self.zs, self.zf, self.dz)))
+
+        # Chunk by snapshot and component, and split along z if a component
+        # of a snapshot has more than the maximum number of cells to process
+        nplanes = max(1, min(self.shape[2], Snapshot.chunkcells // (self.shape[0] * self.shape[1])))
+        chunks = (1, 1, nplanes, self.shape[1], self.shape[0])
+
+        f = h5py.File(self.filename, 'w')
+        f.attrs['gprMax'] = __version__
+        f.attrs['Title'] = G.title
+        f.attrs['dx, dy, dz'] = (self.dx * G.dx, self.dy * G.dy, self.dz * G.dz)
+        f.attrs['Origin'] = (self.xs * G.dx, self.ys * G.dy, self.zs * G.dz)
+        f.attrs['Iterations'] = np.array(self.iterations)
+        f.attrs['Times'] = (np.array(self.iterations) - 1) * G.dt
+        f.attrs['Components'] = [component.encode('utf-8') for component in SnapshotSeries.components]
+        if self.compression:
+            f.create_dataset('snapshots', (len(self.iterations), len(SnapshotSeries.components)) + self.shape[::-1], dtype=floattype, chunks=chunks, compression='gzip', shuffle=True)
+        else:
+            f.create_dataset('snapshots', (len(self.iterations), len(SnapshotSeries.components)) + self.shape[::-1], dtype=floattype, chunks=chunks)
+        f.close()
+
+        self.write_xdmf(G)
+
+    def write_xdmf(self, G):
+        """Writes an XDMF file describing the snapshot series, which refers
+            to the values in the HDF5 file. Dimensions, origin and spacing are
+            given slowest varying first, i.e. z, y, x, as XDMF requires.
+
+        Args:
+            G (class): Grid class instance - holds essential parameters describing the model.
+        """
+
+        ntimes = len(self.iterations)
+        ncomponents = len(SnapshotSeries.components)
+        precision = np.dtype(floattype).itemsize
+        celldims = '{} {} {}'.format(*self.shape[::-1])
+        pointdims = '{} {} {}'.format(*(n + 1 for n in self.shape[::-1]))
+
+        with open(self.xdmffilename, 'w') as f:
+            f.write('<?xml version="1.0" ?>\n')
+            f.write('<Xdmf Version="3.0">\n<Domain>\n')
+            f.write('<Grid Name="{}" GridType="Collection" CollectionType="Temporal">\n'.format(self.basefilename))
+            for t, iteration in enumerate(self.iterations):
+                f.write('<Grid Name="{}" GridType="Uniform">\n'.format(iteration))
+                f.write('<Time Value="{:g}" />\n'.format((iteration - 1) * G.dt))
+                f.write('<Topology TopologyType="3DCoRectMesh" Dimensions="{}" />\n'.format(pointdims))
+                f.write('<Geometry GeometryType="ORIGIN_DXDYDZ">\n')
+                f.write('<DataItem Format="XML" NumberType="Float" Dimensions="3">{:g} {:g} {:g}</DataItem>\n'.format(self.zs * G.dz, self.ys * G.dy, self.xs * G.dx))
+                f.write('<DataItem Format="XML" NumberType="Float" Dimensions="3">{:g} {:g} {:g}</DataItem>\n'.format(self.dz * G.dz, self.dy * G.dy, self.dx * G.dx))
+                f.write('</Geometry>\n')
+                for c, component in enumerate(SnapshotSeries.components):
+                    f.write('<Attribute Name="{}" AttributeType="Scalar" Center="Cell">\n'.format(component))
+                    f.write('<DataItem ItemType="HyperSlab" Dimensions="{}">\n'.format(celldims))
+                    f.write('<DataItem Format="XML" NumberType="UInt" Dimensions="3 5">{} {} 0 0 0 1 1 1 1 1 1 1 {}</DataItem>\n'.format(t, c, celldims))
+                    f.write('<DataItem Format="HDF" NumberType="Float" Precision="{}" Dimensions="{} {} {}">{}:/snapshots</DataItem>\n'.format(precision, ntimes, ncomponents, celldims, os.path.split(self.filename)[1]))
+                    f.write('</DataItem>\n</Attribute>\n')
+                f.write('</Grid>\n')
+            f.write('</Grid>\n</Domain>\n</Xdmf>\n')
+
+    def write(self, iteration, fields, G, pbar, origin=(0, 0, 0)):
+        """Writes a snapshot of the series to the HDF5 file.
+
+        Args:
+            iteration (int): Iteration number the snapshot was taken on (from zero).
+            fields (list): Ex, Ey, Ez, Hx, Hy, Hz values.
+            G (class): Grid class instance - holds essential parameters describing the model.
+            pbar (class): Progress bar class instance.
+            origin (tuple): Cell coordinates in the grid of the first value of the field arrays.
+        """
+
+        t = self.iterations.index(iteration + 1)
+
+        # Cells of the snapshot volume, and the number of z planes of cells
+        # that are processed and written at a time
+        i = slice(self.xs - origin[0], self.xf - origin[0], self.dx)
+        j = slice(self.ys - origin[1], self.yf - origin[1], self.dy)
+        nplanes = max(1, Snapshot.chunkcells // (self.shape[0] * self.shape[1]))
+
+        f = h5py.File(self.filename, 'r+')
+        dset = f['snapshots']
+        for c, calculate_values in enumerate((calculate_electric_values, calculate_magnetic_values, calculate_current_values)):
+            for plane in range(0, self.shape[2], nplanes):
+                zs = self.zs - origin[2] + plane * self.dz
+                k = slice(zs, min(zs + nplanes * self.dz, self.zf - origin[2]), self.dz)
+                for component, values in enumerate(calculate_values(i, j, k, *fields, G)):
+                    dset[t, 3 * c + component, plane:plane + values.shape[2]] = values.T.astype(floattype)
+                    pbar.update(n=4 * values.size)
+        f.close()
+
+
+class SnapshotWriter(object):
+    """
+    Writes snapshot files on a background thread so that the solver can
+        continue time-stepping while files are written. The field values
+        needed for a snapshot are copied to a staging buffer (reused from a
+        pool) and queued for writing. If the queue is full, i.e. writing has
+        fallen behind the solver, the solver waits for space in the queue.
+    """
+
+    def __init__(self, queuedepth, G):
+        """
+        Args:
+            queuedepth (int): Maximum number of snapshots waiting to be written.
+                    If zero, snapshots are written on the calling thread instead.
+            G (class): Grid class instance - holds essential parameters describing the model.
+        """
+
+        self.queuedepth = queuedepth
+        self.G = G
+        self.pool = {}
+        self.poollock = Lock()
+        self.error = None
+
+        if self.queuedepth > 0:
+            self.queue = Queue(maxsize=self.queuedepth)
+            self.thread = Thread(target=self.run, daemon=True)
+            self.thread.start()
+
+    def get_buffers(self, shape):
+        """Gets a set of staging buffers from the pool, or creates a new set if none are free.
+
+        Args:
+            shape (tuple): Shape of the staging region.
+
+        Returns:
+            (list): Arrays to stage Ex, Ey, Ez, Hx, Hy, Hz values in.
+        """
+
+        with self.poollock:
+            if self.pool.get(shape):
+                return self.pool[shape].pop()
+
+        return [np.empty(shape, dtype=floattype) for field in range(6)]
+
+    def release_buffers(self, fields):
+        """Returns a set of staging buffers to the pool.
+
+        Args:
+            fields (list): Arrays used to stage Ex, Ey, Ez, Hx, Hy, Hz values.
+        """
+
+        with self.poollock:
+            self.pool.setdefault(fields[0].shape, []).append(fields)
+
+    def put(self, snapindex, snap, iteration):
+        """Stages the field values for a snapshot and queues it to be written.
+
+        Args:
+            snapindex (int): Index of the snapshot in the list of snapshots.
+            snap (class): Snapshot class instance.
+            iteration (int): Current iteration number (from zero).
+        """
+
+        self.check()
+        fields = self.get_buffers(tuple(len(range(s.start, s.stop)) for s in snap.staging_region()))
+        origin = snap.stage_fields(self.G, fields)
+        if self.queuedepth > 0:
+            self.queue.put((snapindex, snap, iteration, fields, origin))
+        else:
+            self.write(snapindex, snap, iteration, fields, origin)
+
+    def write(self, snapindex, snap, iteration, fields, origin):
+        """Writes a snapshot file from staged field values.
+
+        Args:
+            snapindex (int): Index of the snapshot in the list of snapshots.
+            snap (class): Snapshot class instance.
+            iteration (int): Iteration number the snapshot was taken on (from zero).
+            fields (list): Staged Ex, Ey, Ez, Hx, Hy, Hz values.
+            origin (tuple): Cell coordinates of the staged values in the grid.
+        """
+
+        snapiters = 36 * (((snap.xf - snap.xs) / snap.dx) * ((snap.yf - snap.ys) / snap.dy) * ((snap.zf - snap.zs) / snap.dz))
+        pbar = tqdm(total=snapiters, leave=False, unit='byte', unit_scale=True, desc='  Writing snapshot file {} of {}, {}'.format(snapindex + 1, len(self.G.snapshots), os.path.split(snap.filename)[1]), ncols=get_terminal_width() - 1, file=sys.stdout, disable=self.G.tqdmdisable)
+        snap.write(iteration, fields, self.G, pbar, origin=origin)
+        pbar.close()
+        self.release_buffers(fields)
+
+    def run(self):
+        """Writes queued snapshots until a stop sentinel (None) is received."""
+
+        for item in iter(self.queue.get, None):
+            try:
+                # Once writing has failed, remaining snapshots are discarded
+                if self.error is None:
+                    self.write(*item)
+            except Exception as e:
+                self.error = e
+            finally:
+                self.queue.task_done()
+        self.queue.task_done()
+
+    def check(self):
+        """Re-raises any error from writing snapshots on the background thread."""
+
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+
+    def join(self):
+        """Waits for all queued snapshots to be written and stops the background
+            thread. Any error from writing snapshots is not raised (see check),
+            so that the writer can be stopped when solving has failed.
+        """
+
+        if self.queuedepth > 0:
+            self.queue.put(None)
+            self.thread.join()
+
+
+def shift(s, n):
+    """Shifts a slice of cells by a number of cells.
+
+    Args:
+        s (slice): Cells along an axis.
+        n (int): Number of cells to shift by.
+
+    Returns:
+        (slice): Shifted cells.
+    """
+
+    return slice(s.start + n, s.stop + n, s.step)
+
+
+def interleave_components(x, y, z):
+    """Interleaves x, y and z component values of a snapshot volume in the
+        order they are written to a VTK file, i.e. x varying fastest then y
+        then z, with the three components of each cell stored together.
+
+    Args:
+        x, y, z (array): Component values indexed [i, j, k].
+
+    Returns:
+        values (array): Component values indexed [k, j, i, component].
+    """
+
+    values = np.empty(x.shape[::-1] + (3,), dtype=floattype)
+    values[..., 0] = x.T
+    values[..., 1] = y.T
+    values[..., 2] = z.T
+
+    return values
+
+
+def calculate_electric_values(i, j, k, Ex, Ey, Ez, Hx, Hy, Hz, G):
+    """Calculates the electric field values of a snapshot volume. The electric
+        field component value in a cell comes from the average of the 4
+        electric field component values in that cell.
+
+    Args:
+        i, j, k (slice): Cells of the snapshot volume.
+        Ex, Ey, Ez, Hx, Hy, Hz (memory view): Electric and magnetic field values.
+        G (class): Grid class instance - holds essential parameters describing the model.
+
+    Returns:
+        (tuple): Arrays of x, y and z component values indexed [i, j, k].
+    """
+
+    x = (Ex[i, j, k] + Ex[i, shift(j, 1), k] + Ex[i, j, shift(k, 1)] + Ex[i, shift(j, 1), shift(k, 1)]) / 4
+    y = (Ey[i, j, k] + Ey[shift(i, 1), j, k] + Ey[i, j, shift(k, 1)] + Ey[shift(i, 1), j, shift(k, 1)]) / 4
+    z = (Ez[i, j, k] + Ez[shift(i, 1), j, k] + Ez[i, shift(j, 1), k] + Ez[shift(i, 1), shift(j, 1), k]) / 4
+
+    return x, y, z
+
+
+def calculate_magnetic_values(i, j, k, Ex, Ey, Ez, Hx, Hy, Hz, G):
+    """Calculates the magnetic field values of a snapshot volume. The magnetic
+        field component value in a cell comes from the average of 2 magnetic
+        field component values in that cell and the following cell.
+
+    Args:
+        i, j, k (slice): Cells of the snapshot volume.
+        Ex, Ey, Ez, Hx, Hy, Hz (memory view): Electric and magnetic field values.
+        G (class): Grid class instance - holds essential parameters describing the model.
+
+    Returns:
+        (tuple): Arrays of x, y and z component values indexed [i, j, k].
+    """
+
+    x = (Hx[i, j, k] + Hx[shift(i, 1), j, k]) / 2
+    y = (Hy[i, j, k] + Hy[i, shift(j, 1), k]) / 2
+    z = (Hz[i, j, k] + Hz[i, j, shift(k, 1)]) / 2
+
+    return x, y, z
+
+
+def calculate_current_values(i, j, k, Ex, Ey, Ez, Hx, Hy, Hz, G):
+    """Calculates the current values of a snapshot volume. Currents are
+        zero on the lower boundaries of the grid.
+
+    Args:
+        i, j, k (slice): Cells of the snapshot volume.
+        Ex, Ey, Ez, Hx, Hy, Hz (memory view): Electric and magnetic field values.
+        G (class): Grid class instance - holds essential parameters describing the model.
+
+    Returns:
+        (tuple): Arrays of x, y and z component values indexed [i, j, k].
+    """
+
+    return calculate_currents(i, j, k, Hx, Hy, Hz, G)
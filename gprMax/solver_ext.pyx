@@ -0,0 +1,503 @@
+# Copyright (C) 2015-2018: The University of Edinburgh
+#                 Authors: Craig Warren and Antonis Giannopoulos
+#
+# This file is part of gprMax.
+#
+# gprMax is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gprMax is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gprMax.  If not, see <http://www.gnu.org/licenses/>.
+
+import numpy as np
+cimport numpy as np
+cimport cython
+from cython.parallel import prange
+from cython.parallel import parallel
+
+from gprMax.constants cimport floattype_t
+from gprMax.constants cimport complextype_t
+from gprMax.constants cimport idtype_t
+from gprMax.fields_updates_ext cimport update_electric
+from gprMax.fields_updates_ext cimport update_magnetic
+from gprMax.fields_updates_ext cimport update_electric_dispersive_multipole_A
+from gprMax.fields_updates_ext cimport update_electric_dispersive_multipole_B
+from gprMax.fields_updates_ext cimport update_electric_dispersive_1pole_A
+from gprMax.fields_updates_ext cimport update_electric_dispersive_1pole_B
+from gprMax.fields_updates_ext cimport update_electric_dispersive_sparse_A
+from gprMax.fields_updates_ext cimport update_electric_dispersive_sparse_B
+from gprMax.fields_updates_ext cimport set_electric_dispersive_sparse
+from gprMax.fields_updates_ext cimport update_electric_tile_chunk
+from gprMax.fields_updates_ext cimport update_magnetic_tile_chunk
+from gprMax.light_cone import LightCone
+from gprMax.materials import Material
+from gprMax.pml import get_fused_pml_slabs
+from gprMax.pml_updates_ext cimport PMLSlab
+from gprMax.pml_updates_ext cimport update_pml_electric
+from gprMax.pml_updates_ext cimport update_pml_magnetic
+from gprMax.pml_updates_ext cimport update_pml_tile_chunk
+from gprMax.sources import cpu_initialise_src_arrays
+
+
+cdef class CompiledSolver:
+    """
+    Time-steps a model (on CPU) for a block of iterations in a single compiled
+        loop without the GIL, i.e. stores the receiver outputs, and does the
+        field, PML and source updates in the same order as the Python loop in
+        solve_cpu, with identical results. The PML updates are the fused
+        updates of all slabs. Transmission lines, which are updated in Python,
+        are updated with the GIL re-acquired.
+
+    Optionally, for 3D models of non-dispersive materials without transmission
+        lines, the updates are cache-blocked (tiled), i.e. the grid is split
+        into tiles of x indices (planes), and the magnetic and electric field
+        updates (including PML and source updates) are done for one tile
+        after another, so that the field arrays of a tile are read from cache
+        rather than from memory by the electric field update. The electric
+        field at an x index depends on the magnetic field at that index and
+        the one before, and the magnetic field on the electric field at that
+        index and the one after, so the tiles are updated in order of x.
+        Several iterations (time steps) can also be done for each tile
+        (temporal blocking), where each iteration lags one tile behind the
+        iteration before it (a wavefront through the tiles).
+
+    Optionally, if the updates are not tiled, the field, PML and dispersive
+        updates are restricted to the light cone of the sources (see
+        LightCone), which is grown in the same way on every iteration.
+    """
+
+    cdef object G
+    cdef int nx, ny, nz, nthreads, maxpoles, ntransmissionlines
+    cdef floattype_t[:, ::1] updatecoeffsE, updatecoeffsH
+    cdef complextype_t[:, ::1] updatecoeffsdispersive
+    cdef floattype_t[:, :, ::1] Ex, Ey, Ez, Hx, Hy, Hz
+    cdef complextype_t[:, :, :, ::1] Tx, Ty, Tz
+
+    # Temporary dispersive arrays if they are stored only for the edges of
+    # dispersive materials (see find_dispersive_edges)
+    cdef bint dispersivesparse
+    cdef int[:, ::1] edgesx, edgesy, edgesz
+    cdef complextype_t[:, ::1] Txsparse, Tysparse, Tzsparse
+    cdef floattype_t[::1] Exdispersive, Eydispersive, Ezdispersive
+    cdef bint haspmls
+    cdef PMLSlab xminus, yminus, zminus, xplus, yplus, zplus
+    cdef double dt, dx, dy, dz
+
+    # Material ID array - the iterations are compiled for each type of
+    # idtype_t, and only the memoryview of the type of the array is set
+    cdef int IDitemsize
+    cdef np.uint8_t[:, :, :, ::1] ID8
+    cdef np.uint16_t[:, :, :, ::1] ID16
+    cdef np.uint32_t[:, :, :, ::1] ID32
+
+    # Light cone - regions of the grid to update on each iteration (see
+    # LightCone), the extent of the region of the grid to update, and the PML
+    # slabs that overlap the region (or None)
+    cdef bint lightcone
+    cdef int[:, ::1] lightconeregions
+    cdef int region[6]
+    cdef int npmlslabsregion
+    cdef PMLSlab xminusregion, yminusregion, zminusregion, xplusregion, yplusregion, zplusregion
+
+    # Cache-blocking - number of x indices (planes) in each tile (or zero if
+    # the updates are not tiled), and number of iterations for each tile
+    cdef int tileplanes, tilesteps
+
+    # Receivers - component (row in rxs), index of receiver (page in rxs) and
+    # cell coordinates for every output of every receiver
+    cdef np.intp_t[:, ::1] rxinfo
+    cdef floattype_t[:, :, ::1] rxs
+
+    # Sources
+    cdef int[:, ::1] hertzianinfo, magneticinfo, voltageinfo
+    cdef double[:, ::1] hertzianparams, magneticparams, voltageparams
+    cdef floattype_t[:, ::1] hertzianwaves, magneticwaves, voltagewaves
+
+    def __init__(self, rxcoords, rxs, G):
+        """
+        Args:
+            rxcoords (list): Indices and coordinates of receivers for each of the allowable outputs.
+            rxs (array): Array to store field components for receivers - rows are field components; columns are iterations; pages are receivers.
+            G (class): Grid class instance - holds essential parameters describing the model.
+        """
+
+        self.G = G
+        self.nx = G.nx
+        self.ny = G.ny
+        self.nz = G.nz
+        self.nthreads = G.nthreads
+        self.dt = G.dt
+        self.dx = G.dx
+        self.dy = G.dy
+        self.dz = G.dz
+        self.updatecoeffsE = G.updatecoeffsE
+        self.updatecoeffsH = G.updatecoeffsH
+        self.IDitemsize = G.ID.itemsize
+        if self.IDitemsize == 1:
+            self.ID8 = G.ID
+        elif self.IDitemsize == 2:
+            self.ID16 = G.ID
+        else:
+            self.ID32 = G.ID
+        self.Ex = G.Ex
+        self.Ey = G.Ey
+        self.Ez = G.Ez
+        self.Hx = G.Hx
+        self.Hy = G.Hy
+        self.Hz = G.Hz
+        self.maxpoles = Material.maxpoles
+        if self.maxpoles != 0:
+            self.updatecoeffsdispersive = G.updatecoeffsdispersive
+            if G.dispersiveedges is None:
+                self.Tx = G.Tx
+                self.Ty = G.Ty
+                self.Tz = G.Tz
+            else:
+                self.dispersivesparse = True
+                self.edgesx, self.edgesy, self.edgesz = G.dispersiveedges
+                self.Txsparse = G.Tx
+                self.Tysparse = G.Ty
+                self.Tzsparse = G.Tz
+                self.Exdispersive, self.Eydispersive, self.Ezdispersive = G.Edispersive
+
+        if G.pmls:
+            self.haspmls = True
+            self.xminus, self.yminus, self.zminus, self.xplus, self.yplus, self.zplus = get_fused_pml_slabs(G)
+
+        self.rxinfo = np.array([(component, rxindex, x, y, z) for component, rxcoord in enumerate(rxcoords) for rxindex, x, y, z in zip(*rxcoord)], dtype=np.intp).reshape(-1, 5)
+        self.rxs = rxs
+
+        self.hertzianinfo, self.hertzianparams, self.hertzianwaves = cpu_initialise_src_arrays(G.hertziandipoles, G)
+        self.magneticinfo, self.magneticparams, self.magneticwaves = cpu_initialise_src_arrays(G.magneticdipoles, G)
+        self.voltageinfo, self.voltageparams, self.voltagewaves = cpu_initialise_src_arrays(G.voltagesources, G)
+        self.ntransmissionlines = len(G.transmissionlines)
+
+        if G.tileplanes and self.nx > 1 and self.ny > 1 and self.nz > 1 and self.maxpoles == 0 and not self.ntransmissionlines:
+            self.tileplanes = G.tileplanes
+            self.tilesteps = G.tilesteps
+
+        self.region = [0, self.nx, 0, self.ny, 0, self.nz]
+        self.xminusregion, self.yminusregion, self.zminusregion, self.xplusregion, self.yplusregion, self.zplusregion = self.xminus, self.yminus, self.zminus, self.xplus, self.yplus, self.zplus
+        if G.lightcone and not self.tileplanes:
+            self.lightcone = True
+            self.lightconeregions = LightCone(G).regions
+            self.npmlslabsregion = -1
+
+    @property
+    def tiled(self):
+        """Whether the updates are cache-blocked (tiled)."""
+        return self.tileplanes != 0
+
+    def run(self, int start, int stop):
+        """Time-steps the model from one iteration up to (but not including) another.
+
+        Args:
+            start (int): First iteration.
+            stop (int): Iteration to stop at.
+        """
+
+        with nogil:
+            if self.IDitemsize == 1:
+                self.iterate_ID(self.ID8, start, stop)
+            elif self.IDitemsize == 2:
+                self.iterate_ID(self.ID16, start, stop)
+            else:
+                self.iterate_ID(self.ID32, start, stop)
+
+    cdef void iterate_ID(self, idtype_t[:, :, :, ::1] ID, int start, int stop) noexcept nogil:
+        """Compiled loop over the iterations of a block, for a type of the ID array."""
+
+        if self.tileplanes:
+            self.iterate_tiled(ID, start, stop)
+        else:
+            self.iterate(ID, start, stop)
+
+    cdef void iterate(self, idtype_t[:, :, :, ::1] ID, int start, int stop) noexcept nogil:
+        """Compiled loop over the iterations of a block."""
+
+        cdef int iteration
+        cdef Py_ssize_t xs, xf, ys, yf, zs, zf
+        cdef idtype_t[:, :, :, ::1] IDregion
+        cdef floattype_t[:, :, ::1] Ex, Ey, Ez, Hx, Hy, Hz
+        cdef complextype_t[:, :, :, ::1] Tx, Ty, Tz
+
+        for iteration in range(start, stop):
+            # Store field component values for every receiver and transmission line
+            self.store_outputs(iteration, 0, self.nx + 1)
+            if self.ntransmissionlines:
+                with gil:
+                    for tl in self.G.transmissionlines:
+                        tl.Vtotal[iteration] = tl.voltage[tl.antpos]
+                        tl.Itotal[iteration] = tl.current[tl.antpos]
+
+            # Region of the grid to update (views of the arrays for the cells
+            # of the region)
+            if self.lightcone:
+                self.next_region(iteration)
+            xs, xf, ys, yf, zs, zf = self.region[0], self.region[1] + 1, self.region[2], self.region[3] + 1, self.region[4], self.region[5] + 1
+            IDregion = ID[:, xs:xf, ys:yf, zs:zf]
+            Ex = self.Ex[xs:xf, ys:yf, zs:zf]
+            Ey = self.Ey[xs:xf, ys:yf, zs:zf]
+            Ez = self.Ez[xs:xf, ys:yf, zs:zf]
+            Hx = self.Hx[xs:xf, ys:yf, zs:zf]
+            Hy = self.Hy[xs:xf, ys:yf, zs:zf]
+            Hz = self.Hz[xs:xf, ys:yf, zs:zf]
+            if self.maxpoles != 0 and not self.dispersivesparse:
+                Tx = self.Tx[:, xs:xf, ys:yf, zs:zf]
+                Ty = self.Ty[:, xs:xf, ys:yf, zs:zf]
+                Tz = self.Tz[:, xs:xf, ys:yf, zs:zf]
+
+            # Update magnetic field components
+            update_magnetic(xf - xs - 1, yf - ys - 1, zf - zs - 1, self.nthreads, self.updatecoeffsH, IDregion, Ex, Ey, Ez, Hx, Hy, Hz)
+
+            # Update magnetic field components with the PML correction
+            if self.haspmls:
+                update_pml_magnetic(self.nthreads, self.xminusregion, self.yminusregion, self.zminusregion, self.xplusregion, self.yplusregion, self.zplusregion, self.updatecoeffsH, ID, self.Ex, self.Ey, self.Ez, self.Hx, self.Hy, self.Hz)
+
+            # Update magnetic field components from sources
+            if self.ntransmissionlines:
+                with gil:
+                    for tl in self.G.transmissionlines:
+                        tl.update_magnetic(iteration, self.G.updatecoeffsH, self.G.ID, self.G.Hx, self.G.Hy, self.G.Hz, self.G)
+            self.update_sources(iteration, 0, self.nx + 1, self.magneticinfo, self.magneticparams, self.magneticwaves, self.updatecoeffsH, ID, self.Hx, self.Hy, self.Hz)
+
+            # Update electric field components
+            if self.maxpoles == 0:
+                update_electric(xf - xs - 1, yf - ys - 1, zf - zs - 1, self.nthreads, self.updatecoeffsE, IDregion, Ex, Ey, Ez, Hx, Hy, Hz)
+            elif self.dispersivesparse:
+                update_electric_dispersive_sparse_A(self.nthreads, self.maxpoles, self.updatecoeffsE, self.updatecoeffsdispersive, ID, self.edgesx, self.edgesy, self.edgesz, self.Txsparse, self.Tysparse, self.Tzsparse, self.Exdispersive, self.Eydispersive, self.Ezdispersive, self.Ex, self.Ey, self.Ez, self.Hx, self.Hy, self.Hz)
+                update_electric(xf - xs - 1, yf - ys - 1, zf - zs - 1, self.nthreads, self.updatecoeffsE, IDregion, Ex, Ey, Ez, Hx, Hy, Hz)
+                set_electric_dispersive_sparse(self.nthreads, self.edgesx, self.edgesy, self.edgesz, self.Exdispersive, self.Eydispersive, self.Ezdispersive, self.Ex, self.Ey, self.Ez)
+            elif self.maxpoles == 1:
+                update_electric_dispersive_1pole_A(xf - xs - 1, yf - ys - 1, zf - zs - 1, self.nthreads, self.updatecoeffsE, self.updatecoeffsdispersive, IDregion, Tx, Ty, Tz, Ex, Ey, Ez, Hx, Hy, Hz)
+            else:
+                update_electric_dispersive_multipole_A(xf - xs - 1, yf - ys - 1, zf - zs - 1, self.nthreads, self.maxpoles, self.updatecoeffsE, self.updatecoeffsdispersive, IDregion, Tx, Ty, Tz, Ex, Ey, Ez, Hx, Hy, Hz)
+
+            # Update electric field components with the PML correction
+            if self.haspmls:
+                update_pml_electric(self.nthreads, self.xminusregion, self.yminusregion, self.zminusregion, self.xplusregion, self.yplusregion, self.zplusregion, self.updatecoeffsE, ID, self.Ex, self.Ey, self.Ez, self.Hx, self.Hy, self.Hz)
+
+            # Update electric field components from sources (update any Hertzian dipole sources last)
+            self.update_sources(iteration, 0, self.nx + 1, self.voltageinfo, self.voltageparams, self.voltagewaves, self.updatecoeffsE, ID, self.Ex, self.Ey, self.Ez)
+            if self.ntransmissionlines:
+                with gil:
+                    for tl in self.G.transmissionlines:
+                        tl.update_electric(iteration, self.G.updatecoeffsE, self.G.ID, self.G.Ex, self.G.Ey, self.G.Ez, self.G)
+            self.update_sources(iteration, 0, self.nx + 1, self.hertzianinfo, self.hertzianparams, self.hertzianwaves, self.updatecoeffsE, ID, self.Ex, self.Ey, self.Ez)
+
+            # 2nd part of dispersive update
+            if self.dispersivesparse:
+                update_electric_dispersive_sparse_B(self.nthreads, self.maxpoles, self.updatecoeffsdispersive, ID, self.edgesx, self.edgesy, self.edgesz, self.Txsparse, self.Tysparse, self.Tzsparse, self.Ex, self.Ey, self.Ez)
+            elif self.maxpoles == 1:
+                update_electric_dispersive_1pole_B(xf - xs - 1, yf - ys - 1, zf - zs - 1, self.nthreads, self.updatecoeffsdispersive, IDregion, Tx, Ty, Tz, Ex, Ey, Ez)
+            elif self.maxpoles > 1:
+                update_electric_dispersive_multipole_B(xf - xs - 1, yf - ys - 1, zf - zs - 1, self.nthreads, self.maxpoles, self.updatecoeffsdispersive, IDregion, Tx, Ty, Tz, Ex, Ey, Ez)
+
+    @cython.cdivision(True)
+    cdef void iterate_tiled(self, idtype_t[:, :, :, ::1] ID, int start, int stop) noexcept nogil:
+        """Compiled loop over the iterations of a block, with cache-blocked (tiled) updates."""
+
+        cdef int block, nsteps, nplanes, ntiles, t, s, slab
+        cdef Py_ssize_t tile, xs, xf, chunk
+
+        # Tiles of x indices of the magnetic field components (0 to nx)
+        nplanes = self.nx + 1
+        ntiles = (nplanes + self.tileplanes - 1) // self.tileplanes
+
+        block = start
+        while block < stop:
+            nsteps = min(self.tilesteps, stop - block)
+
+            # Store field component values for every receiver
+            self.store_outputs(block, 0, nplanes)
+
+            # Iteration block + s is done for tile t - s
+            with parallel(num_threads=self.nthreads):
+                for t in range(ntiles + nsteps - 1):
+                    for s in range(nsteps):
+                        tile = t - s
+                        if tile >= 0 and tile < ntiles:
+                            xs = tile * self.tileplanes
+                            xf = min(xs + self.tileplanes, nplanes)
+
+                            # Update magnetic field components, with the PML
+                            # correction, and from sources
+                            for chunk in prange(self.nthreads, schedule='static'):
+                                update_magnetic_tile_chunk(xs, xf, chunk, self.nthreads, self.nx, self.ny, self.nz, self.updatecoeffsH, ID, self.Ex, self.Ey, self.Ez, self.Hx, self.Hy, self.Hz)
+                            if self.haspmls:
+                                for slab in range(6):
+                                    if self.has_pml_slab(slab):
+                                        for chunk in prange(self.nthreads, schedule='static'):
+                                            self.update_pml_tile(slab, False, xs, xf, chunk, self.updatecoeffsH, ID)
+                            for chunk in prange(1, schedule='static'):
+                                self.update_sources(block + s, xs, xf, self.magneticinfo, self.magneticparams, self.magneticwaves, self.updatecoeffsH, ID, self.Hx, self.Hy, self.Hz)
+
+                            # Update electric field components, with the PML
+                            # correction, and from sources
+                            for chunk in prange(self.nthreads, schedule='static'):
+                                update_electric_tile_chunk(xs, xf, chunk, self.nthreads, self.nx, self.ny, self.nz, self.updatecoeffsE, ID, self.Ex, self.Ey, self.Ez, self.Hx, self.Hy, self.Hz)
+                            if self.haspmls:
+                                for slab in range(6):
+                                    if self.has_pml_slab(slab):
+                                        for chunk in prange(self.nthreads, schedule='static'):
+                                            self.update_pml_tile(slab, True, xs, xf, chunk, self.updatecoeffsE, ID)
+                            for chunk in prange(1, schedule='static'):
+                                self.update_sources(block + s, xs, xf, self.voltageinfo, self.voltageparams, self.voltagewaves, self.updatecoeffsE, ID, self.Ex, self.Ey, self.Ez)
+                                self.update_sources(block + s, xs, xf, self.hertzianinfo, self.hertzianparams, self.hertzianwaves, self.updatecoeffsE, ID, self.Ex, self.Ey, self.Ez)
+
+                                # Store field component values for every
+                                # receiver in the tile for the next iteration
+                                # (currents use magnetic field values from the
+                                # tile before, which has not yet been updated
+                                # for the next iteration)
+                                if s + 1 < nsteps:
+                                    self.store_outputs(block + s + 1, xs, xf)
+
+            block = block + nsteps
+
+    cdef void next_region(self, int iteration) noexcept nogil:
+        """Sets the region to update for an iteration, and the PML slabs that
+            overlap it (see LightCone.region).
+        """
+
+        cdef int d, npmlslabs
+
+        iteration = min(iteration, self.lightconeregions.shape[0] - 1)
+        for d in range(6):
+            self.region[d] = self.lightconeregions[iteration, d]
+
+        # The PML slabs that overlap the region only change when their number does
+        npmlslabs = self.pml_slab_in_region(self.xminus) + self.pml_slab_in_region(self.yminus) + self.pml_slab_in_region(self.zminus) + self.pml_slab_in_region(self.xplus) + self.pml_slab_in_region(self.yplus) + self.pml_slab_in_region(self.zplus)
+        if npmlslabs != self.npmlslabsregion:
+            with gil:
+                self.xminusregion = self.xminus if self.pml_slab_in_region(self.xminus) else None
+                self.yminusregion = self.yminus if self.pml_slab_in_region(self.yminus) else None
+                self.zminusregion = self.zminus if self.pml_slab_in_region(self.zminus) else None
+                self.xplusregion = self.xplus if self.pml_slab_in_region(self.xplus) else None
+                self.yplusregion = self.yplus if self.pml_slab_in_region(self.yplus) else None
+                self.zplusregion = self.zplus if self.pml_slab_in_region(self.zplus) else None
+            self.npmlslabsregion = npmlslabs
+
+    cdef int pml_slab_in_region(self, PMLSlab slab) noexcept nogil:
+        """Checks if there is a PML slab and it overlaps the region to update."""
+
+        if slab is None:
+            return 0
+        return slab.xs <= self.region[1] and slab.xf >= self.region[0] and slab.ys <= self.region[3] and slab.yf >= self.region[2] and slab.zs <= self.region[5] and slab.zf >= self.region[4]
+
+    cdef bint has_pml_slab(self, int slab) noexcept nogil:
+        """Checks if there is a PML slab (in the order xminus, yminus, zminus, xplus, yplus, zplus)."""
+
+        if slab == 0:
+            return self.xminus is not None
+        elif slab == 1:
+            return self.yminus is not None
+        elif slab == 2:
+            return self.zminus is not None
+        elif slab == 3:
+            return self.xplus is not None
+        elif slab == 4:
+            return self.yplus is not None
+        else:
+            return self.zplus is not None
+
+    cdef void update_pml_tile(self, int slab, bint electric, Py_ssize_t xs, Py_ssize_t xf, Py_ssize_t chunk, floattype_t[:, ::1] updatecoeffs, idtype_t[:, :, :, ::1] ID) noexcept nogil:
+        """Updates a chunk of the part of a PML slab (see has_pml_slab) in a tile."""
+
+        if slab == 0:
+            update_pml_tile_chunk(self.xminus, electric, xs, xf, chunk, self.nthreads, updatecoeffs, ID, self.Ex, self.Ey, self.Ez, self.Hx, self.Hy, self.Hz)
+        elif slab == 1:
+            update_pml_tile_chunk(self.yminus, electric, xs, xf, chunk, self.nthreads, updatecoeffs, ID, self.Ex, self.Ey, self.Ez, self.Hx, self.Hy, self.Hz)
+        elif slab == 2:
+            update_pml_tile_chunk(self.zminus, electric, xs, xf, chunk, self.nthreads, updatecoeffs, ID, self.Ex, self.Ey, self.Ez, self.Hx, self.Hy, self.Hz)
+        elif slab == 3:
+            update_pml_tile_chunk(self.xplus, electric, xs, xf, chunk, self.nthreads, updatecoeffs, ID, self.Ex, self.Ey, self.Ez, self.Hx, self.Hy, self.Hz)
+        elif slab == 4:
+            update_pml_tile_chunk(self.yplus, electric, xs, xf, chunk, self.nthreads, updatecoeffs, ID, self.Ex, self.Ey, self.Ez, self.Hx, self.Hy, self.Hz)
+        else:
+            update_pml_tile_chunk(self.zplus, electric, xs, xf, chunk, self.nthreads, updatecoeffs, ID, self.Ex, self.Ey, self.Ez, self.Hx, self.Hy, self.Hz)
+
+    cdef void store_outputs(self, int iteration, Py_ssize_t xs, Py_ssize_t xf) noexcept nogil:
+        """Stores field component values for every receiver at the x indices xs to xf."""
+
+        cdef Py_ssize_t n, component, rxindex, x, y, z
+        cdef double current
+
+        for n in range(self.rxinfo.shape[0]):
+            component = self.rxinfo[n, 0]
+            rxindex = self.rxinfo[n, 1]
+            x = self.rxinfo[n, 2]
+            y = self.rxinfo[n, 3]
+            z = self.rxinfo[n, 4]
+            if x < xs or x >= xf:
+                continue
+            if component == 0:
+                self.rxs[component, iteration, rxindex] = self.Ex[x, y, z]
+            elif component == 1:
+                self.rxs[component, iteration, rxindex] = self.Ey[x, y, z]
+            elif component == 2:
+                self.rxs[component, iteration, rxindex] = self.Ez[x, y, z]
+            elif component == 3:
+                self.rxs[component, iteration, rxindex] = self.Hx[x, y, z]
+            elif component == 4:
+                self.rxs[component, iteration, rxindex] = self.Hy[x, y, z]
+            elif component == 5:
+                self.rxs[component, iteration, rxindex] = self.Hz[x, y, z]
+            # Currents (zero on the lower boundaries of the grid); differences
+            # of magnetic field values are taken at the field precision, and
+            # then scaled by the spatial discretisation at double precision
+            else:
+                current = 0
+                if component == 6 and y != 0 and z != 0:
+                    current = self.dy * <double>(self.Hy[x, y, z - 1] - self.Hy[x, y, z]) + self.dz * <double>(self.Hz[x, y, z] - self.Hz[x, y - 1, z])
+                elif component == 7 and x != 0 and z != 0:
+                    current = self.dx * <double>(self.Hx[x, y, z] - self.Hx[x, y, z - 1]) + self.dz * <double>(self.Hz[x - 1, y, z] - self.Hz[x, y, z])
+                elif component == 8 and x != 0 and y != 0:
+                    current = self.dx * <double>(self.Hx[x, y - 1, z] - self.Hx[x, y, z]) + self.dy * <double>(self.Hy[x, y, z] - self.Hy[x - 1, y, z])
+                self.rxs[component, iteration, rxindex] = <floattype_t>current
+
+    cdef void update_sources(self, int iteration, Py_ssize_t xs, Py_ssize_t xf, int[:, ::1] srcinfo, double[:, ::1] srcparams, floattype_t[:, ::1] srcwaves, floattype_t[:, ::1] updatecoeffs, idtype_t[:, :, :, ::1] ID, floattype_t[:, :, ::1] Fx, floattype_t[:, :, ::1] Fy, floattype_t[:, :, ::1] Fz) noexcept nogil:
+        """Updates field values for a list of sources of one class (see cpu_initialise_src_arrays) at the x indices xs to xf.
+            Arithmetic is done at the same precisions, and in the same order,
+            as the update_electric/update_magnetic methods of the sources.
+        """
+
+        cdef Py_ssize_t n, i, j, k, component
+        cdef floattype_t[:, :, ::1] F
+        cdef floattype_t value
+        cdef double time = iteration * self.dt
+
+        for n in range(srcinfo.shape[0]):
+            if time < srcparams[n, 0] or time > srcparams[n, 1]:
+                continue
+            i = srcinfo[n, 0]
+            if i < xs or i >= xf:
+                continue
+            j = srcinfo[n, 1]
+            k = srcinfo[n, 2]
+            component = srcinfo[n, 3]
+            if component % 3 == 0:
+                F = Fx
+            elif component % 3 == 1:
+                F = Fy
+            else:
+                F = Fz
+
+            # Hard voltage source
+            if srcparams[n, 3] != 0 and srcparams[n, 2] == 0:
+                F[i, j, k] = <floattype_t>(-1 * <double>srcwaves[n, iteration] / srcparams[n, 3])
+            else:
+                value = updatecoeffs[ID[component, i, j, k], 4] * srcwaves[n, iteration]
+                # Hertzian dipole
+                if srcparams[n, 3] != 0:
+                    F[i, j, k] = <floattype_t>(F[i, j, k] - value * srcparams[n, 2] * srcparams[n, 3])
+                # Magnetic dipole or resistive voltage source
+                else:
+                    F[i, j, k] = <floattype_t>(F[i, j, k] - value * srcparams[n, 2])
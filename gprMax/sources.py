@@ -51,21 +51,11 @@ class Source(object):
             G (class): Grid class instance - holds essential parameters describing the model.
         """
 
-        # Waveform values for electric sources - calculated half a timestep later
-        self.waveformvaluesJ = np.zeros((G.iterations), dtype=floattype)
-
-        # Waveform values for magnetic sources
-        self.waveformvaluesM = np.zeros((G.iterations), dtype=floattype)
-
         waveform = next(x for x in G.waveforms if x.ID == self.waveformID)
 
-        for iteration in range(G.iterations):
-            time = G.dt * iteration
-            if time >= self.start and time <= self.stop:
-                # Set the time of the waveform evaluation to account for any delay in the start
-                time -= self.start
-                self.waveformvaluesJ[iteration] = waveform.calculate_value(time + 0.5 * G.dt, G.dt)
-                self.waveformvaluesM[iteration] = waveform.calculate_value(time, G.dt)
+        # Waveform values for electric sources (calculated half a timestep
+        # later) and for magnetic sources
+        self.waveformvaluesJ, self.waveformvaluesM = waveform.calculate_source_values(G.dt, G.iterations, self.start, self.stop)
 
 
 class VoltageSource(Source):
@@ -129,7 +119,7 @@ class VoltageSource(Source):
 
             componentID = 'E' + self.polarisation
             requirednumID = G.ID[G.IDlookup[componentID], i, j, k]
-            material = next(x for x in G.materials if x.numID == requirednumID)
+            material = G.materials.get_by_numID(requirednumID)
             newmaterial = deepcopy(material)
             newmaterial.ID = material.ID + '+VoltageSource_' + str(self.resistance)
             newmaterial.numID = len(G.materials)
@@ -261,6 +251,52 @@ def gpu_initialise_src_arrays(sources, G):
     return srcinfo1_gpu, srcinfo2_gpu, srcwaves_gpu
 
 
+def cpu_initialise_src_arrays(sources, G):
+    """Initialise arrays of source coordinates/field component, other source information, and source waveform values for the compiled solver.
+
+    Args:
+        sources (list): Sources of one class, e.g. HertzianDipoles.
+        G (class): Grid class instance - holds essential parameters describing the model.
+
+    Returns:
+        srcinfo (int): numpy array of source cell coordinates and index of field component (in ID) updated.
+        srcparams (float): numpy array of source start and stop times, and factors that waveform values are scaled by.
+        srcwaves (float): numpy array of source waveform values.
+    """
+
+    srcinfo = np.zeros((len(sources), 4), dtype=np.int32)
+    srcparams = np.zeros((len(sources), 4), dtype=np.float64)
+    srcwaves = np.zeros((len(sources), G.iterations), dtype=floattype)
+    for i, src in enumerate(sources):
+        field = 'H' if src.__class__.__name__ == 'MagneticDipole' else 'E'
+        srcinfo[i, :] = (src.xcoord, src.ycoord, src.zcoord, G.IDlookup[field + src.polarisation])
+        srcparams[i, 0] = src.start
+        srcparams[i, 1] = src.stop
+
+        if src.__class__.__name__ == 'HertzianDipole':
+            srcparams[i, 2] = src.dl
+            srcparams[i, 3] = 1 / (G.dx * G.dy * G.dz)
+            srcwaves[i, :] = src.waveformvaluesJ
+        elif src.__class__.__name__ == 'MagneticDipole':
+            srcparams[i, 2] = 1 / (G.dx * G.dy * G.dz)
+            srcwaves[i, :] = src.waveformvaluesM
+        elif src.__class__.__name__ == 'VoltageSource':
+            # Resistive source - scaled by the conductance of the source;
+            # hard source - divided by the spatial discretisation
+            if src.resistance != 0:
+                if src.polarisation == 'x':
+                    srcparams[i, 2] = 1 / (src.resistance * G.dy * G.dz)
+                elif src.polarisation == 'y':
+                    srcparams[i, 2] = 1 / (src.resistance * G.dx * G.dz)
+                elif src.polarisation == 'z':
+                    srcparams[i, 2] = 1 / (src.resistance * G.dx * G.dy)
+            else:
+                srcparams[i, 3] = {'x': G.dx, 'y': G.dy, 'z': G.dz}[src.polarisation]
+            srcwaves[i, :] = src.waveformvaluesJ
+
+    return srcinfo, srcparams, srcwaves
+
+
 class TransmissionLine(Source):
     """
     A transmission line source is a one-dimensional transmission
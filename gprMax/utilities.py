@@ -36,6 +36,7 @@ from gprMax.constants import complextype
 from gprMax.constants import floattype
 from gprMax.exceptions import GeneralError
 from gprMax.materials import Material
+from gprMax.receivers import Rx
 
 
 def get_terminal_width():
@@ -133,6 +134,26 @@ def round_value(value, decimalplaces=0):
     return rounded
 
 
+def round_values(values):
+    """Rounds an array of values to the nearest integers in the same way as
+        round_value, i.e. half values are rounded towards zero.
+
+    Args:
+        values (array): Values to round.
+
+    Returns:
+        rounded (array): Rounded values.
+    """
+
+    values = np.asarray(values, dtype=np.float64)
+    magnitudes = np.abs(values)
+    rounded = np.floor(magnitudes)
+    rounded += (magnitudes - rounded) > 0.5
+    rounded = (np.sign(values) * rounded).astype(np.int64)
+
+    return rounded
+
+
 def round32(value):
     """Rounds up to nearest multiple of 32."""
     return int(32 * np.ceil(float(value) / 32))
@@ -335,6 +356,48 @@ def get_host_info():
     return hostinfo
 
 
+def get_cpu_groups(nworkers):
+    """Split the physical CPU cores available to the process into a group for
+        each worker of a task farm, keeping the logical CPUs (Hyper-Threads)
+        of each physical core in the same group.
+
+    Args:
+        nworkers (int): Number of workers.
+
+    Returns:
+        cpugroups (list): Logical CPU IDs and number of physical cores of each group.
+    """
+
+    # Logical CPUs the process can run on (CPU affinity is not available on macOS)
+    try:
+        cpus = psutil.Process().cpu_affinity()
+    except AttributeError:
+        cpus = list(range(psutil.cpu_count()))
+
+    # Group logical CPUs by physical core (Linux), otherwise take each logical CPU as a core
+    cores = {}
+    for cpu in cpus:
+        try:
+            with open('/sys/devices/system/cpu/cpu{}/topology/physical_package_id'.format(cpu)) as f:
+                package = f.read().strip()
+            with open('/sys/devices/system/cpu/cpu{}/topology/core_id'.format(cpu)) as f:
+                core = f.read().strip()
+            cores.setdefault((package, core), []).append(cpu)
+        except IOError:
+            cores.setdefault(cpu, []).append(cpu)
+    cores = sorted(cores.values())
+
+    if nworkers > len(cores):
+        raise GeneralError('The number of workers in a task farm ({}) cannot be greater than the number of physical CPU cores available ({})'.format(nworkers, len(cores)))
+
+    cpugroups = []
+    for worker in range(nworkers):
+        groupcores = cores[worker * len(cores) // nworkers:(worker + 1) * len(cores) // nworkers]
+        cpugroups.append(([cpu for core in groupcores for cpu in core], len(groupcores)))
+
+    return cpugroups
+
+
 class GPU(object):
     """GPU information."""
 
@@ -405,13 +468,23 @@ def memory_usage(G):
 
     stdoverhead = 50e6
 
-    # 6 x field arrays + 6 x ID arrays
-    fieldarrays = (6 + 6) * (G.nx + 1) * (G.ny + 1) * (G.nz + 1) * np.dtype(floattype).itemsize
+    # 6 x field arrays
+    fieldarrays = 6 * (G.nx + 1) * (G.ny + 1) * (G.nz + 1) * np.dtype(floattype).itemsize
 
-    solidarray = G.nx * G.ny * G.nz * np.dtype(np.uint32).itemsize
+    # 6 x ID arrays (32-bit integers until the model has been built, and then
+    # the narrowest type for the number of materials - see compact_ID_array)
+    IDtype = G.ID.dtype if hasattr(G, 'ID') else np.uint32
+    IDarrays = 6 * (G.nx + 1) * (G.ny + 1) * (G.nz + 1) * np.dtype(IDtype).itemsize
 
-    # 12 x rigidE array components + 6 x rigidH array components
-    rigidarrays = (12 + 6) * G.nx * G.ny * G.nz * np.dtype(np.int8).itemsize
+    # Solid and rigid arrays (until they are released once the model has been
+    # built - see release_geometry_arrays). Flags for the 12 rigidE and 6 rigidH
+    # array components are packed into 16-bit and 8-bit integers respectively.
+    if getattr(G, 'solid', True) is None:
+        solidarray = 0
+        rigidarrays = 0
+    else:
+        solidarray = G.nx * G.ny * G.nz * np.dtype(np.uint32).itemsize
+        rigidarrays = G.nx * G.ny * G.nz * (np.dtype(np.uint16).itemsize + np.dtype(np.uint8).itemsize)
 
     # PML arrays
     pmlarrays = 0
@@ -433,11 +506,22 @@ def memory_usage(G):
                 pmlarrays += ((G.nx + 1) * G.ny * v)
                 pmlarrays += (G.nx * (G.ny + 1) * v)
 
-    # Any dispersive material coefficients
+    # Any dispersive material coefficients, for every edge, or only for the
+    # edges of dispersive materials (with their cell coordinates and a value
+    # of the electric field for each edge) - see find_dispersive_edges
     disparrays = 0
     if Material.maxpoles != 0:
-        disparrays = 3 * Material.maxpoles * (G.nx + 1) * (G.ny + 1) * (G.nz + 1) * np.dtype(complextype).itemsize
+        if G.dispersiveedges is None:
+            disparrays = 3 * Material.maxpoles * (G.nx + 1) * (G.ny + 1) * (G.nz + 1) * np.dtype(complextype).itemsize
+        else:
+            nedges = sum(len(edges) for edges in G.dispersiveedges)
+            disparrays = nedges * (Material.maxpoles * np.dtype(complextype).itemsize + 3 * np.dtype(np.int32).itemsize + np.dtype(floattype).itemsize)
+
+    # Array to store field components for receivers, which has a row for each
+    # of the allowable outputs whether or not any receiver stores it (see
+    # initialise_rx_arrays), and the arrays of the outputs of each receiver
+    rxarrays = (len(Rx.allowableoutputs) * len(G.rxs) + sum(len(rx.outputs) for rx in G.rxs)) * G.iterations * np.dtype(floattype).itemsize
 
-    memestimate = int(stdoverhead + fieldarrays + solidarray + rigidarrays + pmlarrays + disparrays)
+    memestimate = int(stdoverhead + fieldarrays + IDarrays + solidarray + rigidarrays + pmlarrays + disparrays + rxarrays)
 
     return memestimate
@@ -16,8 +16,11 @@
 # You should have received a copy of the GNU General Public License
 # along with gprMax.  If not, see <http://www.gnu.org/licenses/>.
 
+from collections import OrderedDict
+
 import numpy as np
 
+from gprMax.constants import floattype
 from gprMax.utilities import round_value
 
 
@@ -34,6 +37,10 @@ class Waveform(object):
     # gaussiandot, gaussiandotnorm, gaussiandotdot, gaussiandotdotnorm, ricker waveforms have their centre frequencies
     # specified by the user, i.e. they are not derived from the 'base' gaussian
 
+    # Cache of waveform values calculated for sources, and maximum number of entries
+    cache = OrderedDict()
+    cachesize = 32
+
     def __init__(self):
         self.ID = None
         self.type = None
@@ -65,58 +72,100 @@ class Waveform(object):
             ampvalue (float): Calculated value for waveform.
         """
 
+        return self.calculate_values(np.array([time], dtype=np.float64), dt)[0]
+
+    def calculate_values(self, time, dt):
+        """Calculates values of the waveform at an array of times.
+
+        Args:
+            time (array): Absolute times.
+            dt (float): Absolute time discretisation.
+
+        Returns:
+            ampvalues (array): Calculated values for waveform.
+        """
+
         self.calculate_coefficients()
 
         # Waveforms
         if self.type == 'gaussian':
             delay = time - self.chi
-            ampvalue = np.exp(-self.zeta * delay**2)
+            ampvalues = np.exp(-self.zeta * delay**2)
 
         elif self.type == 'gaussiandot' or self.type == 'gaussianprime':
             delay = time - self.chi
-            ampvalue = -2 * self.zeta * delay * np.exp(-self.zeta * delay**2)
+            ampvalues = -2 * self.zeta * delay * np.exp(-self.zeta * delay**2)
 
         elif self.type == 'gaussiandotnorm':
             delay = time - self.chi
             normalise = np.sqrt(np.exp(1) / (2 * self.zeta))
-            ampvalue = -2 * self.zeta * delay * np.exp(-self.zeta * delay**2) * normalise
+            ampvalues = -2 * self.zeta * delay * np.exp(-self.zeta * delay**2) * normalise
 
         elif self.type == 'gaussiandotdot' or self.type == 'gaussiandoubleprime':
             delay = time - self.chi
-            ampvalue = 2 * self.zeta * (2 * self.zeta * delay**2 - 1) * np.exp(-self.zeta * delay**2)
+            ampvalues = 2 * self.zeta * (2 * self.zeta * delay**2 - 1) * np.exp(-self.zeta * delay**2)
 
         elif self.type == 'gaussiandotdotnorm':
             delay = time - self.chi
             normalise = 1 / (2 * self.zeta)
-            ampvalue = 2 * self.zeta * (2 * self.zeta * delay**2 - 1) * np.exp(-self.zeta * delay**2) * normalise
+            ampvalues = 2 * self.zeta * (2 * self.zeta * delay**2 - 1) * np.exp(-self.zeta * delay**2) * normalise
 
         elif self.type == 'ricker':
             delay = time - self.chi
             normalise = 1 / (2 * self.zeta)
-            ampvalue = - (2 * self.zeta * (2 * self.zeta * delay**2 - 1) * np.exp(-self.zeta * delay**2)) * normalise
+            ampvalues = - (2 * self.zeta * (2 * self.zeta * delay**2 - 1) * np.exp(-self.zeta * delay**2)) * normalise
 
         elif self.type == 'sine':
-            ampvalue = np.sin(2 * np.pi * self.freq * time)
-            if time * self.freq > 1:
-                ampvalue = 0
+            ampvalues = np.sin(2 * np.pi * self.freq * time)
+            ampvalues[time * self.freq > 1] = 0
 
         elif self.type == 'contsine':
             rampamp = 0.25
-            ramp = rampamp * time * self.freq
-            if ramp > 1:
-                ramp = 1
-            ampvalue = ramp * np.sin(2 * np.pi * self.freq * time)
+            ramp = np.minimum(rampamp * time * self.freq, 1)
+            ampvalues = ramp * np.sin(2 * np.pi * self.freq * time)
 
         elif self.type == 'impulse':
             # time < dt condition required to do impulsive magnetic dipole
-            if time == 0 or time < dt:
-                ampvalue = 1
-            elif time >= dt:
-                ampvalue = 0
+            ampvalues = np.where((time == 0) | (time < dt), 1.0, 0.0)
 
         elif self.type == 'user':
-            ampvalue = self.userfunc(time)
+            ampvalues = np.array(self.userfunc(time), dtype=np.float64)
+
+        ampvalues *= self.amp
+
+        return ampvalues
 
-        ampvalue *= self.amp
+    def calculate_source_values(self, dt, iterations, start, stop):
+        """Calculates values of the waveform for a source for the duration of a simulation.
+            Values are cached so sources using identical waveforms, and repeated
+            models, e.g. for a B-scan, reuse them.
+
+        Args:
+            dt (float): Absolute time discretisation.
+            iterations (int): Number of iterations.
+            start, stop (float): Times at which source starts and stops.
+
+        Returns:
+            valuesJ, valuesM (arrays): Values for electric sources (calculated half a timestep later), and for magnetic sources. The arrays are read-only as they can be shared.
+        """
 
-        return ampvalue
+        key = (self.type, self.amp, self.freq, self.userfunc, dt, iterations, start, stop)
+        if key in Waveform.cache:
+            return Waveform.cache[key]
+
+        time = dt * np.arange(iterations, dtype=np.float64)
+        active = (time >= start) & (time <= stop)
+        # Set the time of the waveform evaluation to account for any delay in the start
+        time = time[active] - start
+        valuesJ = np.zeros(iterations, dtype=floattype)
+        valuesM = np.zeros(iterations, dtype=floattype)
+        valuesJ[active] = self.calculate_values(time + 0.5 * dt, dt)
+        valuesM[active] = self.calculate_values(time, dt)
+        valuesJ.setflags(write=False)
+        valuesM.setflags(write=False)
+
+        if len(Waveform.cache) >= Waveform.cachesize:
+            Waveform.cache.popitem(last=False)
+        Waveform.cache[key] = (valuesJ, valuesM)
+
+        return valuesJ, valuesM
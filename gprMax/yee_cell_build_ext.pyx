@@ -18,8 +18,10 @@
 
 import numpy as np
 cimport numpy as np
+from cython.parallel import prange
 
-from gprMax.materials import Material
+from gprMax.yee_cell_setget_rigid_ext cimport rigidE_t
+from gprMax.yee_cell_setget_rigid_ext cimport rigidH_t
 from gprMax.yee_cell_setget_rigid_ext cimport get_rigid_Ex
 from gprMax.yee_cell_setget_rigid_ext cimport get_rigid_Ey
 from gprMax.yee_cell_setget_rigid_ext cimport get_rigid_Ez
@@ -27,87 +29,228 @@ from gprMax.yee_cell_setget_rigid_ext cimport get_rigid_Hx
 from gprMax.yee_cell_setget_rigid_ext cimport get_rigid_Hy
 from gprMax.yee_cell_setget_rigid_ext cimport get_rigid_Hz
 
+# Rigid arrays are packed differently for electric and magnetic components
+ctypedef fused rigid_t:
+    rigidE_t
+    rigidH_t
 
-cpdef void create_electric_average(int i, int j, int k, int numID1, int numID2, int numID3, int numID4, int componentID, G):
-    """This function creates a new material by averaging the dielectric properties of the surrounding cells.
+
+cdef inline bint get_edge_numIDs(int componentID, int i, int j, int k, np.uint32_t[:, :, ::1] solid, rigid_t[:, :, ::1] rigid, np.uint32_t *numIDs) noexcept nogil:
+    """This function gets the numeric IDs of the materials in the cells surrounding an edge.
 
     Args:
+        componentID (int): Numeric ID for field component.
         i, j, k (int): Cell coordinates.
-        numID1, numID2, numID3, numID4 (int): Numeric IDs for materials in surrounding cells.
-        componentID (int): Numeric ID for electric field component.
-        G (class): Grid class instance - holds essential parameters describing the model.
-    """
+        solid, rigid (memoryviews): Access to solid and rigid (electric or magnetic) arrays.
+        numIDs (pointer): Numeric IDs for materials in surrounding cells (4 for electric and 2 for magnetic components).
 
-    # Make an ID composed of the names of the four materials that will be averaged
-    requiredID = G.materials[numID1].ID + '+' + G.materials[numID2].ID + '+' + G.materials[numID3].ID + '+' + G.materials[numID4].ID
-
-    # Check if this material already exists
-    tmp = requiredID.split('+')
-    material = [x for x in G.materials if
-             x.ID.count(tmp[0]) == requiredID.count(tmp[0]) and
-             x.ID.count(tmp[1]) == requiredID.count(tmp[1]) and
-             x.ID.count(tmp[2]) == requiredID.count(tmp[2]) and
-             x.ID.count(tmp[3]) == requiredID.count(tmp[3])]
+    Returns:
+        (bint): Whether the edge is rigid, i.e. should not be averaged.
+    """
 
-    if material:
-        G.ID[componentID, i, j, k] = material[0].numID
+    if rigid_t is rigidE_t:
+        if componentID == 0:
+            if get_rigid_Ex(i, j, k, rigid):
+                return True
+            numIDs[0] = solid[i, j, k]
+            numIDs[1] = solid[i, j - 1, k]
+            numIDs[2] = solid[i, j - 1, k - 1]
+            numIDs[3] = solid[i, j, k - 1]
+        elif componentID == 1:
+            if get_rigid_Ey(i, j, k, rigid):
+                return True
+            numIDs[0] = solid[i, j, k]
+            numIDs[1] = solid[i - 1, j, k]
+            numIDs[2] = solid[i - 1, j, k - 1]
+            numIDs[3] = solid[i, j, k - 1]
+        elif componentID == 2:
+            if get_rigid_Ez(i, j, k, rigid):
+                return True
+            numIDs[0] = solid[i, j, k]
+            numIDs[1] = solid[i - 1, j, k]
+            numIDs[2] = solid[i - 1, j - 1, k]
+            numIDs[3] = solid[i, j - 1, k]
     else:
-        # Create new material
-        newNumID = len(G.materials)
-        m = Material(newNumID, requiredID)
-        m.type = 'dielectric-smoothed'
-        # Create averaged constituents for material
-        m.er = np.mean((G.materials[numID1].er, G.materials[numID2].er, G.materials[numID3].er, G.materials[numID4].er), axis=0)
-        m.se = np.mean((G.materials[numID1].se, G.materials[numID2].se, G.materials[numID3].se, G.materials[numID4].se), axis=0)
-        m.mr = np.mean((G.materials[numID1].mr, G.materials[numID2].mr, G.materials[numID3].mr, G.materials[numID4].mr), axis=0)
-        m.sm = np.mean((G.materials[numID1].sm, G.materials[numID2].sm, G.materials[numID3].sm, G.materials[numID4].sm), axis=0)
-
-        # Append the new material object to the materials list
-        G.materials.append(m)
-
-        G.ID[componentID, i, j, k] = newNumID
+        if componentID == 3:
+            if get_rigid_Hx(i, j, k, rigid):
+                return True
+            numIDs[0] = solid[i, j, k]
+            numIDs[1] = solid[i - 1, j, k]
+        elif componentID == 4:
+            if get_rigid_Hy(i, j, k, rigid):
+                return True
+            numIDs[0] = solid[i, j, k]
+            numIDs[1] = solid[i, j - 1, k]
+        elif componentID == 5:
+            if get_rigid_Hz(i, j, k, rigid):
+                return True
+            numIDs[0] = solid[i, j, k]
+            numIDs[1] = solid[i, j, k - 1]
+
+    return False
+
+
+cdef Py_ssize_t build_component_row(
+                    int componentID,
+                    int nmaterials,
+                    Py_ssize_t i,
+                    int ys,
+                    int yf,
+                    int zs,
+                    int zf,
+                    np.uint32_t[:, :, ::1] solid,
+                    rigid_t[:, :, ::1] rigid,
+                    np.uint32_t[:, :, :, ::1] ID,
+                    bint store,
+                    Py_ssize_t n,
+                    np.int64_t[::1] positions,
+                    np.uint32_t[:, ::1] numIDs,
+                    np.uint32_t[:, ::1] keys
+            ) noexcept nogil:
+    """This function builds a row (constant i) of edges of a field component in the ID array.
+        Edges surrounded by a single material are set in the ID array, and edges that require averaging
+        are counted or, if store is set, recorded.
 
+    Args:
+        componentID (int): Numeric ID for field component.
+        nmaterials (int): Number of materials surrounding an edge.
+        i (int): Cell coordinate of row.
+        ys, yf, zs, zf (int): Cell coordinates of extent of row.
+        solid, rigid, ID (memoryviews): Access to solid, rigid (electric or magnetic) and ID arrays.
+        store (bint): Record edges that require averaging rather than setting edges in the ID array.
+        n (int): Index at which to start recording edges that require averaging.
+        positions (memoryview): Indices of edges (in flattened ID array of field component) that require averaging.
+        numIDs (memoryview): Numeric IDs for materials surrounding edges that require averaging.
+        keys (memoryview): Sorted numeric IDs for materials surrounding edges that require averaging.
+
+    Returns:
+        count (int): Number of edges in row that require averaging.
+    """
 
-cpdef void create_magnetic_average(int i, int j, int k, int numID1, int numID2, int componentID, G):
-    """This function creates a new material by averaging the dielectric properties of the surrounding cells.
+    cdef Py_ssize_t j, k, m, l, count
+    cdef np.uint32_t edgenumIDs[4]
+    cdef np.uint32_t key
+    cdef bint same
+
+    count = 0
+    for j in range(ys, yf):
+        for k in range(zs, zf):
+
+            # If rigid is True do not average
+            if get_edge_numIDs(componentID, i, j, k, solid, rigid, edgenumIDs):
+                continue
+
+            # If all values are the same no need to average
+            same = True
+            for m in range(1, nmaterials):
+                if edgenumIDs[m] != edgenumIDs[0]:
+                    same = False
+            if same:
+                if not store:
+                    ID[componentID, i, j, k] = edgenumIDs[0]
+            else:
+                # Averaging is required
+                if store:
+                    positions[n + count] = (i * ID.shape[2] + j) * ID.shape[3] + k
+                    for m in range(nmaterials):
+                        numIDs[n + count, m] = edgenumIDs[m]
+                        # Insertion sort of numeric IDs
+                        key = edgenumIDs[m]
+                        l = m
+                        while l > 0 and keys[n + count, l - 1] > key:
+                            keys[n + count, l] = keys[n + count, l - 1]
+                            l = l - 1
+                        keys[n + count, l] = key
+                count += 1
+
+    return count
+
+
+cpdef find_averages(int componentID, int nmaterials, int xs, int xf, int ys, int yf, int zs, int zf, np.uint32_t[:, :, ::1] solid, rigid_t[:, :, ::1] rigid, np.uint32_t[:, :, :, ::1] ID, int nthreads):
+    """This function builds the edges of a field component in the ID array that do not require
+        averaging, and finds the edges that do. Both passes are performed in parallel.
 
     Args:
-        i, j, k (int): Cell coordinates.
-        numID1, numID2 (int): Numeric IDs for materials in surrounding cells.
-        componentID (int): Numeric ID for electric field component.
-        G (class): Grid class instance - holds essential parameters describing the model.
+        componentID (int): Numeric ID for field component.
+        nmaterials (int): Number of materials surrounding an edge.
+        xs, xf, ys, yf, zs, zf (int): Cell coordinates of extent of field component.
+        solid, rigid, ID (memoryviews): Access to solid, rigid (electric or magnetic) and ID arrays.
+        nthreads (int): Number of threads to use.
+
+    Returns:
+        positions (array): Indices of edges (in flattened ID array of field component) that require averaging, in (i, j, k) order.
+        numIDs (array): Numeric IDs for materials surrounding edges that require averaging.
+        keys (array): Sorted numeric IDs for materials surrounding edges that require averaging.
     """
 
-    # Make an ID composed of the names of the two materials that will be averaged
-    requiredID = G.materials[numID1].ID + '+' + G.materials[numID2].ID
+    cdef Py_ssize_t i
+    cdef Py_ssize_t nx = xf - xs
+    cdef np.int64_t[::1] positions = np.zeros(0, dtype=np.int64)
+    cdef np.uint32_t[:, ::1] numIDs = np.zeros((0, nmaterials), dtype=np.uint32)
+    cdef np.uint32_t[:, ::1] keys = numIDs
+    cdef np.intp_t[::1] counts = np.zeros(nx, dtype=np.intp)
+    cdef np.intp_t[::1] starts
 
-    # Check if this material already exists
-    tmp = requiredID.split('+')
-    material = [x for x in G.materials if
-                (x.ID.count(tmp[0]) == requiredID.count(tmp[0]) and
-                 x.ID.count(tmp[1]) == requiredID.count(tmp[1])) or
-                (x.ID.count(tmp[0]) % 2 == 0 and x.ID.count(tmp[1]) % 2 == 0)]
+    # Set edges that do not require averaging and count those that do
+    for i in prange(xs, xf, nogil=True, schedule='static', num_threads=nthreads):
+        counts[i - xs] = build_component_row(componentID, nmaterials, i, ys, yf, zs, zf, solid, rigid, ID, False, 0, positions, numIDs, keys)
 
-    if material:
-        G.ID[componentID, i, j, k] = material[0].numID
-    else:
-        # Create new material
-        newNumID = len(G.materials)
-        m = Material(newNumID, requiredID)
-        m.type = 'dielectric-smoothed'
-        # Create averaged constituents for material
-        m.er = np.mean((G.materials[numID1].er, G.materials[numID2].er), axis=0)
-        m.se = np.mean((G.materials[numID1].se, G.materials[numID2].se), axis=0)
-        m.mr = np.mean((G.materials[numID1].mr, G.materials[numID2].mr), axis=0)
-        m.sm = np.mean((G.materials[numID1].sm, G.materials[numID2].sm), axis=0)
+    # Record edges that require averaging
+    starts = np.concatenate(([0], np.cumsum(counts)))
+    positions = np.zeros(starts[nx], dtype=np.int64)
+    numIDs = np.zeros((starts[nx], nmaterials), dtype=np.uint32)
+    keys = np.zeros((starts[nx], nmaterials), dtype=np.uint32)
+    for i in prange(xs, xf, nogil=True, schedule='static', num_threads=nthreads):
+        if counts[i - xs] > 0:
+            build_component_row(componentID, nmaterials, i, ys, yf, zs, zf, solid, rigid, ID, True, starts[i - xs], positions, numIDs, keys)
+
+    return np.asarray(positions), np.asarray(numIDs), np.asarray(keys)
 
-        # Append the new material object to the materials list
-        G.materials.append(m)
 
-        G.ID[componentID, i, j, k] = newNumID
+def create_averages(averages, np.uint32_t[:, :, :, ::1] ID, G):
+    """This function creates new materials by averaging the properties of the materials surrounding
+        edges, and sets these edges in the ID array. Materials are created (and numbered) in the
+        order that their combination of surrounding materials is first encountered.
 
+    Args:
+        averages (list): Field component IDs, and positions, surrounding material numeric IDs and keys from find_averages, for edges that require averaging.
+        ID (memoryview): Access to ID array.
+        G (class): Grid class instance - holds essential parameters describing the model.
+    """
 
-cpdef void build_electric_components(np.uint32_t[:, :, ::1] solid, np.int8_t[:, :, :, ::1] rigidE, np.uint32_t[:, :, :, ::1] ID, G):
+    allnumIDs = np.concatenate([numIDs for componentID, positions, numIDs, keys in averages])
+    keys = np.concatenate([keys for componentID, positions, numIDs, keys in averages])
+    if keys.shape[0] == 0:
+        return
+
+    # Unique combinations of materials (independent of order) and where they
+    # are first encountered. If possible keys are packed into single integers
+    # as finding unique integers is much faster than finding unique rows.
+    nmaterials = len(G.materials)
+    if nmaterials**keys.shape[1] < np.iinfo(np.int64).max:
+        packedkeys = keys[:, 0].astype(np.int64)
+        for m in range(1, keys.shape[1]):
+            packedkeys *= nmaterials
+            packedkeys += keys[:, m]
+        combinations, first, inverse = np.unique(packedkeys, return_index=True, return_inverse=True)
+    else:
+        combinations, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    newnumIDs = np.zeros(len(combinations), dtype=np.uint32)
+    for combination in np.argsort(first):
+        # Look up the averaged material, or create it if it does not exist
+        material = G.materials.get_or_create_averaged([G.materials[numID] for numID in allnumIDs[first[combination]]])
+        newnumIDs[combination] = material.numID
+
+    # Set averaged edges in the ID array
+    newnumIDs = newnumIDs[inverse.reshape(-1)]
+    IDarray = np.asarray(ID)
+    start = 0
+    for componentID, positions, numIDs, keys in averages:
+        IDarray[componentID].reshape(-1)[positions] = newnumIDs[start:start + len(positions)]
+        start += len(positions)
+
+
+cpdef void build_electric_components(np.uint32_t[:, :, ::1] solid, rigidE_t[:, :, ::1] rigidE, np.uint32_t[:, :, :, ::1] ID, G):
     """This function builds the electric field components in the ID array.
 
     Args:
@@ -115,77 +258,26 @@ cpdef void build_electric_components(np.uint32_t[:, :, ::1] solid, np.int8_t[:,
         G (class): Grid class instance - holds essential parameters describing the model.
     """
 
-    cdef Py_ssize_t i, j, k
-    cdef int numID1, numID2, numID3, numID4, componentID
+    cdef int componentID
+    cdef int nx = G.nx, ny = G.ny, nz = G.nz, nthreads = G.nthreads
+    averages = []
 
     # Ex component
     componentID = G.IDlookup['Ex']
-    for i in range(0, G.nx):
-        for j in range(1, G.ny):
-            for k in range(1, G.nz):
-
-                # If rigid is True do not average
-                if get_rigid_Ex(i, j, k, rigidE):
-                    pass
-                else:
-                    numID1 = solid[i, j, k]
-                    numID2 = solid[i, j - 1, k]
-                    numID3 = solid[i, j - 1, k - 1]
-                    numID4 = solid[i, j, k - 1]
-
-                    # If all values are the same no need to average
-                    if numID1 == numID2 and numID1 == numID3 and numID1 == numID4:
-                        ID[componentID, i, j, k] = numID1
-                    else:
-                        # Averaging is required
-                        create_electric_average(i, j, k, numID1, numID2, numID3, numID4, componentID, G)
+    averages.append((componentID,) + find_averages(componentID, 4, 0, nx, 1, ny, 1, nz, solid, rigidE, ID, nthreads))
 
     # Ey component
     componentID = G.IDlookup['Ey']
-    for i in range(1, G.nx):
-        for j in range(0, G.ny):
-            for k in range(1, G.nz):
-
-                # If rigid is True do not average
-                if get_rigid_Ey(i, j, k, rigidE):
-                    pass
-                else:
-                    numID1 = solid[i, j, k]
-                    numID2 = solid[i - 1, j, k]
-                    numID3 = solid[i - 1, j, k - 1]
-                    numID4 = solid[i, j, k - 1]
-
-                    # If all values are the same no need to average
-                    if numID1 == numID2 and numID1 == numID3 and numID1 == numID4:
-                        ID[componentID, i, j, k] = numID1
-                    else:
-                        # Averaging is required
-                        create_electric_average(i, j, k, numID1, numID2, numID3, numID4, componentID, G)
+    averages.append((componentID,) + find_averages(componentID, 4, 1, nx, 0, ny, 1, nz, solid, rigidE, ID, nthreads))
 
     # Ez component
     componentID = G.IDlookup['Ez']
-    for i in range(1, G.nx):
-        for j in range(1, G.ny):
-            for k in range(0, G.nz):
-
-                # If rigid is True do not average
-                if get_rigid_Ez(i, j, k, rigidE):
-                    pass
-                else:
-                    numID1 = solid[i, j, k]
-                    numID2 = solid[i - 1, j, k]
-                    numID3 = solid[i - 1, j - 1, k]
-                    numID4 = solid[i, j - 1, k]
-
-                    # If all values are the same no need to average
-                    if numID1 == numID2 and numID1 == numID3 and numID1 == numID4:
-                        ID[componentID, i, j, k] = numID1
-                    else:
-                        # Averaging is required
-                        create_electric_average(i, j, k, numID1, numID2, numID3, numID4, componentID, G)
-
-
-cpdef void build_magnetic_components(np.uint32_t[:, :, ::1] solid, np.int8_t[:, :, :, ::1] rigidH, np.uint32_t[:, :, :, ::1] ID, G):
+    averages.append((componentID,) + find_averages(componentID, 4, 1, nx, 1, ny, 0, nz, solid, rigidE, ID, nthreads))
+
+    create_averages(averages, ID, G)
+
+
+cpdef void build_magnetic_components(np.uint32_t[:, :, ::1] solid, rigidH_t[:, :, ::1] rigidH, np.uint32_t[:, :, :, ::1] ID, G):
     """This function builds the magnetic field components in the ID array.
 
     Args:
@@ -193,65 +285,20 @@ cpdef void build_magnetic_components(np.uint32_t[:, :, ::1] solid, np.int8_t[:,
         G (class): Grid class instance - holds essential parameters describing the model.
     """
 
-    cdef Py_ssize_t i, j, k
-    cdef int numID1, numID2, componentID
+    cdef int componentID
+    cdef int nx = G.nx, ny = G.ny, nz = G.nz, nthreads = G.nthreads
+    averages = []
 
     # Hx component
     componentID = G.IDlookup['Hx']
-    for i in range(1, G.nx):
-        for j in range(0, G.ny):
-            for k in range(0, G.nz):
-
-                # If rigid is True do not average
-                if get_rigid_Hx(i, j, k, rigidH):
-                    pass
-                else:
-                    numID1 = solid[i, j, k]
-                    numID2 = solid[i - 1, j, k]
-
-                    # If all values are the same no need to average
-                    if numID1 == numID2:
-                        ID[componentID, i, j, k] = numID1
-                    else:
-                        # Averaging is required
-                        create_magnetic_average(i, j, k, numID1, numID2, componentID, G)
+    averages.append((componentID,) + find_averages(componentID, 2, 1, nx, 0, ny, 0, nz, solid, rigidH, ID, nthreads))
 
     # Hy component
     componentID = G.IDlookup['Hy']
-    for i in range(0, G.nx):
-        for j in range(1, G.ny):
-            for k in range(0, G.nz):
-
-                # If rigid is True do not average
-                if get_rigid_Hy(i, j, k, rigidH):
-                    pass
-                else:
-                    numID1 = solid[i, j, k]
-                    numID2 = solid[i, j - 1, k]
-
-                    # If all values are the same no need to average
-                    if numID1 == numID2:
-                        ID[4, i, j, k] = numID1
-                    else:
-                        # Averaging is required
-                        create_magnetic_average(i, j, k, numID1, numID2, componentID, G)
+    averages.append((componentID,) + find_averages(componentID, 2, 0, nx, 1, ny, 0, nz, solid, rigidH, ID, nthreads))
 
     # Hz component
     componentID = G.IDlookup['Hz']
-    for i in range(0, G.nx):
-        for j in range(0, G.ny):
-            for k in range(1, G.nz):
-
-                # If rigid is True do not average
-                if get_rigid_Hz(i, j, k, rigidH):
-                    pass
-                else:
-                    numID1 = solid[i, j, k]
-                    numID2 = solid[i, j, k - 1]
-
-                    # If all values are the same no need to average
-                    if numID1 == numID2:
-                        ID[5, i, j, k] = numID1
-                    else:
-                        # Averaging is required
-                        create_magnetic_average(i, j, k, numID1, numID2, componentID, G)
+    averages.append((componentID,) + find_averages(componentID, 2, 0, nx, 0, ny, 1, nz, solid, rigidH, ID, nthreads))
+
+    create_averages(averages, ID, G)
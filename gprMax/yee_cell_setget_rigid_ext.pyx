@@ -19,139 +19,175 @@
 import numpy as np
 cimport numpy as np
 
-# Get and set functions for the rigid electric component array. The rigid array is 4D with the 1st dimension holding
-# the 12 electric edge components of a cell - Ex1, Ex2, Ex3, Ex4, Ey1, Ey2, Ey3, Ey4, Ez1, Ez2, Ez3, Ez4
-cdef bint get_rigid_Ex(int i, int j, int k, np.int8_t[:, :, :, ::1] rigidE):
+# Get and set functions for the rigid electric component array. The rigid array is 3D with the bits 0 to 11 of each
+# element holding the 12 electric edge components of a cell - Ex1, Ex2, Ex3, Ex4, Ey1, Ey2, Ey3, Ey4, Ez1, Ez2, Ez3, Ez4
+cdef bint get_rigid_Ex(int i, int j, int k, rigidE_t[:, :, ::1] rigidE) noexcept nogil:
     cdef bint result
     result = False
-    if rigidE[0, i, j, k]:
+    if rigidE[i, j, k] & (1 << 0):
         result = True
     if j != 0:
-        if rigidE[1, i, j - 1, k]:
+        if rigidE[i, j - 1, k] & (1 << 1):
             result = True
     if k != 0:
-        if rigidE[3, i, j, k - 1]:
+        if rigidE[i, j, k - 1] & (1 << 3):
             result = True
     if j != 0 and k != 0:
-        if rigidE[2, i, j - 1, k - 1]:
+        if rigidE[i, j - 1, k - 1] & (1 << 2):
             result = True
     return result
 
-cdef bint get_rigid_Ey(int i, int j, int k, np.int8_t[:, :, :, ::1] rigidE):
+cdef bint get_rigid_Ey(int i, int j, int k, rigidE_t[:, :, ::1] rigidE) noexcept nogil:
     cdef bint result
     result = False
-    if rigidE[4, i, j, k]:
+    if rigidE[i, j, k] & (1 << 4):
         result = True
     if i != 0:
-        if rigidE[7, i - 1, j, k]:
+        if rigidE[i - 1, j, k] & (1 << 7):
             result = True
     if k != 0:
-        if rigidE[5, i, j, k - 1]:
+        if rigidE[i, j, k - 1] & (1 << 5):
             result = True
     if i != 0 and k != 0:
-        if rigidE[6, i - 1, j, k - 1]:
+        if rigidE[i - 1, j, k - 1] & (1 << 6):
             result = True
     return result
 
-cdef bint get_rigid_Ez(int i, int j, int k, np.int8_t[:, :, :, ::1] rigidE):
+cdef bint get_rigid_Ez(int i, int j, int k, rigidE_t[:, :, ::1] rigidE) noexcept nogil:
     cdef bint result
     result = False
-    if rigidE[8, i, j, k]:
+    if rigidE[i, j, k] & (1 << 8):
         result = True
     if i != 0:
-        if rigidE[9, i - 1, j, k]:
+        if rigidE[i - 1, j, k] & (1 << 9):
             result = True
     if j != 0:
-        if rigidE[11, i, j - 1, k]:
+        if rigidE[i, j - 1, k] & (1 << 11):
             result = True
     if i != 0 and j != 0:
-        if rigidE[10, i - 1, j - 1, k]:
+        if rigidE[i - 1, j - 1, k] & (1 << 10):
             result = True
     return result
 
-cdef void set_rigid_Ex(int i, int j, int k, np.int8_t[:, :, :, ::1] rigidE):
-    rigidE[0, i, j, k] = True
+cdef void set_rigid_Ex(int i, int j, int k, rigidE_t[:, :, ::1] rigidE) noexcept nogil:
+    rigidE[i, j, k] |= 1 << 0
     if j != 0:
-        rigidE[1, i, j - 1, k] = True
+        rigidE[i, j - 1, k] |= 1 << 1
     if k != 0:
-        rigidE[3, i, j, k - 1] = True
+        rigidE[i, j, k - 1] |= 1 << 3
     if j != 0 and k != 0:
-        rigidE[2, i, j - 1, k - 1] = True
+        rigidE[i, j - 1, k - 1] |= 1 << 2
 
-cdef void set_rigid_Ey(int i, int j, int k, np.int8_t[:, :, :, ::1] rigidE):
-    rigidE[4, i, j, k] = True
+cdef void set_rigid_Ey(int i, int j, int k, rigidE_t[:, :, ::1] rigidE) noexcept nogil:
+    rigidE[i, j, k] |= 1 << 4
     if i != 0:
-        rigidE[7, i - 1, j, k] = True
+        rigidE[i - 1, j, k] |= 1 << 7
     if k != 0:
-        rigidE[5, i, j, k - 1] = True
+        rigidE[i, j, k - 1] |= 1 << 5
     if i != 0 and k != 0:
-        rigidE[6, i - 1, j, k - 1] = True
+        rigidE[i - 1, j, k - 1] |= 1 << 6
 
-cdef void set_rigid_Ez(int i, int j, int k, np.int8_t[:, :, :, ::1] rigidE):
-    rigidE[8, i, j, k] = True
+cdef void set_rigid_Ez(int i, int j, int k, rigidE_t[:, :, ::1] rigidE) noexcept nogil:
+    rigidE[i, j, k] |= 1 << 8
     if i != 0:
-        rigidE[9, i - 1, j, k] = True
+        rigidE[i - 1, j, k] |= 1 << 9
     if j != 0:
-        rigidE[11, i, j - 1, k] = True
+        rigidE[i, j - 1, k] |= 1 << 11
     if i != 0 and j != 0:
-        rigidE[10, i - 1, j - 1, k] = True
+        rigidE[i - 1, j - 1, k] |= 1 << 10
 
-cdef void set_rigid_E(int i, int j, int k, np.int8_t[:, :, :, ::1] rigidE):
-    rigidE[:, i, j, k] = True
+cdef void set_rigid_E(int i, int j, int k, rigidE_t[:, :, ::1] rigidE) noexcept nogil:
+    rigidE[i, j, k] = (1 << 12) - 1
 
-cdef void unset_rigid_E(int i, int j, int k, np.int8_t[:, :, :, ::1] rigidE):
-    rigidE[:, i, j, k] = False
+cdef void unset_rigid_E(int i, int j, int k, rigidE_t[:, :, ::1] rigidE) noexcept nogil:
+    rigidE[i, j, k] = 0
 
-# Get and set functions for the rigid magnetic component array. The rigid array is 4D with the 1st dimension holding
-# the 6 magnetic edge components - Hx1, Hx2, Hy1, Hy2, Hz1, Hz2
-cdef bint get_rigid_Hx(int i, int j, int k, np.int8_t[:, :, :, ::1] rigidH):
+# Get and set functions for the rigid magnetic component array. The rigid array is 3D with the bits 0 to 5 of each
+# element holding the 6 magnetic edge components - Hx1, Hx2, Hy1, Hy2, Hz1, Hz2
+cdef bint get_rigid_Hx(int i, int j, int k, rigidH_t[:, :, ::1] rigidH) noexcept nogil:
     cdef bint result
     result = False
-    if rigidH[0, i, j, k]:
+    if rigidH[i, j, k] & (1 << 0):
         result = True
     if i != 0:
-        if rigidH[1, i - 1, j, k]:
+        if rigidH[i - 1, j, k] & (1 << 1):
             result = True
     return result
 
-cdef bint get_rigid_Hy(int i, int j, int k, np.int8_t[:, :, :, ::1] rigidH):
+cdef bint get_rigid_Hy(int i, int j, int k, rigidH_t[:, :, ::1] rigidH) noexcept nogil:
     cdef bint result
     result = False
-    if rigidH[2, i, j, k]:
+    if rigidH[i, j, k] & (1 << 2):
         result = True
     if j != 0:
-        if rigidH[3, i, j - 1, k]:
+        if rigidH[i, j - 1, k] & (1 << 3):
             result = True
     return result
 
-cdef bint get_rigid_Hz(int i, int j, int k, np.int8_t[:, :, :, ::1] rigidH):
+cdef bint get_rigid_Hz(int i, int j, int k, rigidH_t[:, :, ::1] rigidH) noexcept nogil:
     cdef bint result
     result = False
-    if rigidH[4, i, j, k]:
+    if rigidH[i, j, k] & (1 << 4):
         result = True
     if k != 0:
-        if rigidH[5, i, j, k - 1]:
+        if rigidH[i, j, k - 1] & (1 << 5):
             result = True
     return result
 
-cdef void set_rigid_Hx(int i, int j, int k, np.int8_t[:, :, :, ::1] rigidH):
-    rigidH[0, i, j, k] = True
+cdef void set_rigid_Hx(int i, int j, int k, rigidH_t[:, :, ::1] rigidH) noexcept nogil:
+    rigidH[i, j, k] |= 1 << 0
     if i != 0:
-        rigidH[1, i - 1, j, k] = True
+        rigidH[i - 1, j, k] |= 1 << 1
 
-cdef void set_rigid_Hy(int i, int j, int k, np.int8_t[:, :, :, ::1] rigidH):
-    rigidH[2, i, j, k] = True
+cdef void set_rigid_Hy(int i, int j, int k, rigidH_t[:, :, ::1] rigidH) noexcept nogil:
+    rigidH[i, j, k] |= 1 << 2
     if j != 0:
-        rigidH[3, i, j - 1, k] = True
+        rigidH[i, j - 1, k] |= 1 << 3
 
-cdef void set_rigid_Hz(int i, int j, int k, np.int8_t[:, :, :, ::1] rigidH):
-    rigidH[4, i, j, k] = True
+cdef void set_rigid_Hz(int i, int j, int k, rigidH_t[:, :, ::1] rigidH) noexcept nogil:
+    rigidH[i, j, k] |= 1 << 4
     if k != 0:
-        rigidH[5, i, j, k - 1] = True
+        rigidH[i, j, k - 1] |= 1 << 5
 
-cdef void set_rigid_H(int i, int j, int k, np.int8_t[:, :, :, ::1] rigidH):
-    rigidH[:, i, j, k] = True
+cdef void set_rigid_H(int i, int j, int k, rigidH_t[:, :, ::1] rigidH) noexcept nogil:
+    rigidH[i, j, k] = (1 << 6) - 1
 
-cdef void unset_rigid_H(int i, int j, int k, np.int8_t[:, :, :, ::1] rigidH):
-    rigidH[:, i, j, k] = False
+cdef void unset_rigid_H(int i, int j, int k, rigidH_t[:, :, ::1] rigidH) noexcept nogil:
+    rigidH[i, j, k] = 0
 
+
+def pack_rigid(rigid):
+    """Packs a rigid array with a boolean for each edge component of a cell
+        (e.g. from a geometry objects file), i.e. with the components in the
+        1st dimension, into the bits of an integer for each cell.
+
+    Args:
+        rigid (array): Rigid array with 12 (electric) or 6 (magnetic) components in the 1st dimension.
+
+    Returns:
+        (array): Bit-packed rigid array.
+    """
+
+    dtype = np.uint16 if rigid.shape[0] == 12 else np.uint8
+    packed = np.zeros(rigid.shape[1:], dtype=dtype)
+    for component in range(rigid.shape[0]):
+        packed |= (rigid[component] != 0).astype(dtype) << component
+
+    return packed
+
+
+def unpack_rigid(rigid):
+    """Unpacks a bit-packed rigid array into an array with a boolean (8-bit
+        integer) for each edge component of a cell, i.e. with the components
+        in the 1st dimension (e.g. to write to a geometry objects file).
+
+    Args:
+        rigid (array): Bit-packed rigid (electric or magnetic) array.
+
+    Returns:
+        (array): Rigid array with 12 (electric) or 6 (magnetic) components in the 1st dimension.
+    """
+
+    ncomponents = 12 if rigid.dtype == np.uint16 else 6
+
+    return np.array([(rigid >> component) & 1 for component in range(ncomponents)], dtype=np.int8)
@@ -134,11 +134,18 @@ for file in cythonfiles:
         fileext = tmp[1]
     else:
         fileext = '.c'
+    # The compiled solver must give identical results to the solver in Python
+    # (numpy) for source updates and receiver outputs, so multiplications and
+    # additions must not be contracted into fused multiply-adds
+    if tmp[0].endswith('solver_ext') and sys.platform != 'win32':
+        extracompileargs = compile_args + ['-ffp-contract=off']
+    else:
+        extracompileargs = compile_args
     extension = Extension(tmp[0].replace(os.sep, '.'),
                           [tmp[0] + fileext],
                           language='c',
                           include_dirs=[np.get_include()],
-                          extra_compile_args=compile_args,
+                          extra_compile_args=extracompileargs,
                           extra_link_args=linker_args,
                           extra_objects=extra_objects)
     extensions.append(extension)
@@ -0,0 +1,101 @@
+# Copyright (C) 2015-2018: The University of Edinburgh
+#                 Authors: Craig Warren and Antonis Giannopoulos
+#
+# This file is part of gprMax.
+#
+# gprMax is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gprMax is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gprMax.  If not, see <http://www.gnu.org/licenses/>.
+
+import argparse
+import os
+from time import perf_counter
+
+import numpy as np
+
+from gprMax.fields_updates_ext import update_electric
+from gprMax.fields_updates_ext import update_magnetic
+from gprMax.grid import FDTDGrid
+from gprMax.model_build_run import build_model
+from gprMax.model_build_run import process_model_cmds
+from gprMax.utilities import get_host_info
+
+"""Benchmarks the field and PML updates of the 2D models in tests/models_basic (2D_ExHyHz, 2D_EyHxHz and 2D_EzHxHy) with different numbers of OpenMP threads, i.e. shows how the updates of 2D models scale with the number of threads whichever dimension of the model is a single cell."""
+
+# Parse command line arguments
+parser = argparse.ArgumentParser(description='Benchmarks the field and PML updates of the 2D models in tests/models_basic (2D_ExHyHz, 2D_EyHxHz and 2D_EzHxHy) with different numbers of OpenMP threads, i.e. shows how the updates of 2D models scale with the number of threads whichever dimension of the model is a single cell.', usage='cd gprMax; python -m tests.benchmarking.bench_2D_updates')
+parser.add_argument('-models', default=['2D_ExHyHz', '2D_EyHxHz', '2D_EzHxHy'], help='names of 2D models in tests/models_basic to benchmark', nargs='+')
+parser.add_argument('-nthreads', default=[1, 2, 4, 8], type=int, help='numbers of OpenMP threads to benchmark', nargs='+')
+parser.add_argument('-scale', default=4, type=int, help='factor to scale the domain of the models by (in the two active dimensions)')
+parser.add_argument('-iterations', default=500, type=int, help='number of iterations to time')
+args = parser.parse_args()
+
+
+def model_cmds(name):
+    """Input commands of a 2D model with its domain scaled in the two active dimensions.
+
+    Args:
+        name (str): Name of model in tests/models_basic.
+
+    Returns:
+        cmds (list): Input commands.
+    """
+
+    with open(os.path.join(os.path.dirname(__file__), os.pardir, 'models_basic', name, name + '.in'), 'r') as f:
+        cmds = [line.strip() + '\n' for line in f if line.startswith('#')]
+    for i, cmd in enumerate(cmds):
+        if cmd.startswith('#domain:'):
+            domain = [float(x) for x in cmd.split(':')[1].split()]
+            dl = min(domain)
+            cmds[i] = '#domain: {}\n'.format(' '.join('{:g}'.format(x if x == dl else x * args.scale) for x in domain))
+    cmds.append('#messages: n\n')
+
+    return cmds
+
+
+def update(G):
+    """Field and PML updates for an iteration, in the same order as the solver."""
+
+    update_magnetic(G.nx, G.ny, G.nz, G.nthreads, G.updatecoeffsH, G.ID, G.Ex, G.Ey, G.Ez, G.Hx, G.Hy, G.Hz)
+    for pml in G.pmls:
+        pml.update_magnetic(G)
+    update_electric(G.nx, G.ny, G.nz, G.nthreads, G.updatecoeffsE, G.ID, G.Ex, G.Ey, G.Ez, G.Hx, G.Hy, G.Hz)
+    for pml in G.pmls:
+        pml.update_electric(G)
+
+
+for name in args.models:
+    G = FDTDGrid()
+    G.hostinfo = get_host_info()
+    G.tqdmdisable = True
+    build_model(process_model_cmds(model_cmds(name), G), G)
+    print('{}: {} x {} x {} cells, {} iterations:'.format(name, G.nx, G.ny, G.nz, args.iterations))
+    results = []
+    for nthreads in args.nthreads:
+        G.nthreads = nthreads
+        G.initialise_field_arrays()
+        for pml in G.pmls:
+            pml.initialise_field_arrays()
+        # Impulse in the active electric field component in the centre of the model
+        for field in (G.Ex, G.Ey, G.Ez):
+            field[G.nx // 2, G.ny // 2, G.nz // 2] = 1
+
+        start = perf_counter()
+        for iteration in range(args.iterations):
+            update(G)
+        t = perf_counter() - start
+        if not results:
+            tref = t
+        results.append([field.copy() for field in (G.Ex, G.Ey, G.Ez, G.Hx, G.Hy, G.Hz)])
+        print('  {} thread(s): {:.1f}us per iteration, speed-up {:.2f}'.format(nthreads, 1e6 * t / args.iterations, tref / t))
+    identical = all(np.array_equal(a, b) for result in results for a, b in zip(result, results[0]))
+    print('  Fields identical: {}'.format(identical))
@@ -0,0 +1,123 @@
+# Copyright (C) 2015-2018: The University of Edinburgh
+#                 Authors: Craig Warren and Antonis Giannopoulos
+#
+# This file is part of gprMax.
+#
+# gprMax is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gprMax is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gprMax.  If not, see <http://www.gnu.org/licenses/>.
+
+import argparse
+
+import numpy as np
+
+from gprMax.batch import Batch
+from gprMax.batch import batch_size
+from gprMax.grid import FDTDGrid
+from gprMax.model_build_run import build_model
+from gprMax.model_build_run import process_model_cmds
+from gprMax.model_build_run import solve_cpu
+from gprMax.model_build_run import solve_cpu_batch
+from gprMax.model_build_run import step_sources_receivers
+from gprMax.utilities import get_host_info
+
+"""Benchmarks running the traces of a B-scan with a fixed geometry in batches (-batch) against running them one after another (--geometry-fixed), i.e. compares the throughput in traces per minute for a cubic 3D model with PMLs, and checks the receiver outputs are identical."""
+
+# Parse command line arguments
+parser = argparse.ArgumentParser(description='Benchmarks running the traces of a B-scan with a fixed geometry in batches (-batch) against running them one after another (--geometry-fixed), i.e. compares the throughput in traces per minute for a cubic 3D model with PMLs, and checks the receiver outputs are identical.', usage='cd gprMax; python -m tests.benchmarking.bench_batch')
+parser.add_argument('-size', default=60, type=int, help='size (in cells) of the cubic model')
+parser.add_argument('-iterations', default=100, type=int, help='number of iterations of each trace')
+parser.add_argument('-traces', default=8, type=int, help='number of traces of the B-scan')
+parser.add_argument('-batch', default=[2, 4, 8, 0], type=int, help='largest numbers of traces in a batch to benchmark (0 to choose from the available memory)', nargs='+')
+parser.add_argument('-nthreads', default=1, type=int, help='number of OpenMP threads to use')
+parser.add_argument('-repeats', default=3, type=int, help='number of times to run the traces one after another and in batches (the fastest run is reported)')
+args = parser.parse_args()
+
+
+def build_bscan():
+    """Builds the grid of a cubic model of a dielectric half-space with a
+        buried cylinder, a Hertzian dipole source and a receiver that are
+        stepped across the model, and PMLs.
+
+    Returns:
+        G (class): Grid class instance.
+    """
+
+    dl = 0.001
+    extent = args.size * dl
+    cmds = ['#domain: {0:g} {0:g} {0:g}'.format(extent),
+            '#dx_dy_dz: {0:g} {0:g} {0:g}'.format(dl),
+            '#time_window: {:d}'.format(args.iterations),
+            '#messages: n',
+            '#material: 6 0.01 1 0 half_space',
+            '#box: 0 0 0 {0:g} {0:g} {1:g} half_space'.format(extent, extent / 2),
+            '#cylinder: 0 {0:g} {1:g} {2:g} {0:g} {1:g} {3:g} pec'.format(extent / 2, extent / 4, extent, extent / 10),
+            '#waveform: ricker 1 10e9 my_ricker',
+            '#hertzian_dipole: z {0:g} {1:g} {2:g} my_ricker'.format(0.3 * extent, extent / 2, 0.7 * extent),
+            '#rx: {0:g} {1:g} {2:g}'.format(0.35 * extent, extent / 2, 0.7 * extent),
+            '#src_steps: {0:g} 0 0'.format(0.4 * extent / args.traces),
+            '#rx_steps: {0:g} 0 0'.format(0.4 * extent / args.traces)]
+
+    G = FDTDGrid()
+    G.hostinfo = get_host_info()
+    G.tqdmdisable = True
+    geometry = process_model_cmds(cmds, G)
+    G.nthreads = args.nthreads
+    build_model(geometry, G)
+
+    return G
+
+
+G = build_bscan()
+modelruns = range(1, args.traces + 1)
+print('Model {} x {} x {} cells, {} iterations, B-scan of {} traces, {} thread(s):'.format(G.nx, G.ny, G.nz, G.iterations, args.traces, args.nthreads))
+
+# Traces one after another (geometry fixed)
+tsolves = []
+for repeat in range(args.repeats):
+    for stepped in G.hertziandipoles + G.rxs:
+        stepped.xcoord, stepped.ycoord, stepped.zcoord = stepped.xcoordorigin, stepped.ycoordorigin, stepped.zcoordorigin
+    tsolve = 0
+    results = []
+    for modelrun in modelruns:
+        G.initialise_field_arrays()
+        for pml in G.pmls:
+            pml.initialise_field_arrays()
+        step_sources_receivers(modelrun, args.traces, G)
+        tsolve += solve_cpu(modelrun, args.traces, G)
+        results.append([rx.outputs[output].copy() for rx in G.rxs for output in sorted(rx.outputs)])
+    tsolves.append(tsolve)
+tref = min(tsolves)
+print('  One after another: {:.1f} traces/min'.format(60 * args.traces / tref))
+
+# Traces in batches
+for maxbatch in args.batch:
+    nbatch = batch_size(args.traces, maxbatch, G)
+    tsolves = []
+    identical = True
+    for repeat in range(args.repeats):
+        for stepped in G.hertziandipoles + G.rxs:
+            stepped.xcoord, stepped.ycoord, stepped.zcoord = stepped.xcoordorigin, stepped.ycoordorigin, stepped.zcoordorigin
+        tsolve = 0
+        for batchstart in range(1, args.traces + 1, nbatch):
+            batch = Batch(len(modelruns[batchstart - 1:batchstart - 1 + nbatch]), G)
+            for modelrun in modelruns[batchstart - 1:batchstart - 1 + nbatch]:
+                step_sources_receivers(modelrun, args.traces, G)
+                batch.add_model(modelrun, str(modelrun), G)
+            tsolve += solve_cpu_batch(batch, args.traces, G)
+            for model in batch.models:
+                model.activate(G)
+                result = [rx.outputs[output] for rx in G.rxs for output in sorted(rx.outputs)]
+                identical = identical and all(np.array_equal(a, b) for a, b in zip(result, results[model.modelrun - 1]))
+            batch.restore(G)
+        tsolves.append(tsolve)
+    print('  Batches of {} traces: {:.1f} traces/min, speed-up {:.2f}, receiver outputs identical: {}'.format(nbatch, 60 * args.traces / min(tsolves), tref / min(tsolves), identical))
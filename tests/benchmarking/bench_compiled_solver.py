@@ -0,0 +1,87 @@
+# Copyright (C) 2015-2018: The University of Edinburgh
+#                 Authors: Craig Warren and Antonis Giannopoulos
+#
+# This file is part of gprMax.
+#
+# gprMax is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gprMax is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gprMax.  If not, see <http://www.gnu.org/licenses/>.
+
+import argparse
+import os
+
+import numpy as np
+
+from gprMax.grid import FDTDGrid
+from gprMax.materials import Material
+from gprMax.model_build_run import build_model
+from gprMax.model_build_run import process_model_cmds
+from gprMax.model_build_run import solve_cpu
+from gprMax.model_build_run import solve_cpu_compiled
+from gprMax.utilities import get_host_info
+
+"""Benchmarks the time-stepping loop in compiled code (--solver-compiled) against the loop in Python (with and without --pml-fused), i.e. compares the number of iterations per second for models in tests/models_basic, and checks the receiver outputs are identical."""
+
+# Parse command line arguments
+parser = argparse.ArgumentParser(description='Benchmarks the time-stepping loop in compiled code (--solver-compiled) against the loop in Python (with and without --pml-fused), i.e. compares the number of iterations per second for models in tests/models_basic, and checks the receiver outputs are identical.', usage='cd gprMax; python -m tests.benchmarking.bench_compiled_solver')
+parser.add_argument('-models', default=['2D_ExHyHz', '2D_EyHxHz', '2D_EzHxHy', 'cylinder_Ascan_2D'], help='names of models in tests/models_basic to benchmark', nargs='+')
+parser.add_argument('-nthreads', default=1, type=int, help='number of OpenMP threads to use')
+parser.add_argument('-repeats', default=3, type=int, help='number of times to run each model with each solver (the fastest run is reported)')
+args = parser.parse_args()
+
+
+def model_cmds(name):
+    """Input commands of a model.
+
+    Args:
+        name (str): Name of model in tests/models_basic.
+
+    Returns:
+        cmds (list): Input commands.
+    """
+
+    with open(os.path.join(os.path.dirname(__file__), os.pardir, 'models_basic', name, name + '.in'), 'r') as f:
+        cmds = [line.strip() + '\n' for line in f if line.startswith('#')]
+    cmds.append('#messages: n\n')
+
+    return cmds
+
+
+solvers = [('Python loop', False, solve_cpu),
+           ('Python loop, fused PMLs', True, solve_cpu),
+           ('Compiled loop', True, solve_cpu_compiled)]
+
+for name in args.models:
+    G = FDTDGrid()
+    G.hostinfo = get_host_info()
+    G.tqdmdisable = True
+    geometry = process_model_cmds(model_cmds(name), G)
+    G.nthreads = args.nthreads
+    build_model(geometry, G)
+    print('{}: {} x {} x {} cells, {} iterations, {} thread(s):'.format(name, G.nx, G.ny, G.nz, G.iterations, args.nthreads))
+    results = []
+    for solver, pmlfused, func in solvers:
+        G.pmlfused = pmlfused
+        tsolve = []
+        for repeat in range(args.repeats):
+            G.initialise_field_arrays()
+            for pml in G.pmls:
+                pml.initialise_field_arrays()
+            if Material.maxpoles != 0:
+                G.initialise_dispersive_arrays()
+            tsolve.append(func(1, 1, G))
+        results.append([rx.outputs[output].copy() for rx in G.rxs for output in sorted(rx.outputs)])
+        if solver == solvers[0][0]:
+            tref = min(tsolve)
+        print('  {}: {:.0f} iterations/s, speed-up {:.2f}'.format(solver, G.iterations / min(tsolve), tref / min(tsolve)))
+    identical = all(np.array_equal(a, b) for result in results for a, b in zip(result, results[0]))
+    print('  Receiver outputs identical: {}'.format(identical))
@@ -0,0 +1,95 @@
+# Copyright (C) 2015-2018: The University of Edinburgh
+#                 Authors: Craig Warren and Antonis Giannopoulos
+#
+# This file is part of gprMax.
+#
+# gprMax is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gprMax is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gprMax.  If not, see <http://www.gnu.org/licenses/>.
+
+import argparse
+import tempfile
+import timeit
+import tracemalloc
+
+import numpy as np
+
+from gprMax.grid import FDTDGrid
+from gprMax.input_cmds_geometry import process_geometrycmds
+from gprMax.model_build_run import process_model_cmds
+from gprMax.utilities import get_host_info
+from gprMax.utilities import human_size
+
+"""Benchmarks building a fractal box of soil (#fractal_box) with a rough surface, i.e. times generating the fractals with different numbers of threads, and reading the fractal volume from a cache (-fractal-cache), and reports the peak memory allocated by NumPy while building the fractal box."""
+
+# Parse command line arguments
+parser = argparse.ArgumentParser(description='Benchmarks building a fractal box of soil (#fractal_box) with a rough surface, i.e. times generating the fractals with different numbers of threads, and reading the fractal volume from a cache (-fractal-cache), and reports the peak memory allocated by NumPy while building the fractal box.', usage='cd gprMax; python -m tests.benchmarking.bench_fractals')
+parser.add_argument('-size', default=200, type=int, help='size (in cells) of the cubic fractal box')
+parser.add_argument('-nthreads', default=[1, 2, 4], type=int, help='numbers of threads to benchmark', nargs='+')
+args = parser.parse_args()
+
+dl = 0.002
+extent = args.size * dl
+
+
+def build_fractal_box(nthreads, fractalcache=None):
+    """Builds the grid and geometry of the model.
+
+    Args:
+        nthreads (int): Number of threads.
+        fractalcache (str): Directory to cache fractal volumes in.
+
+    Returns:
+        G (class): Grid class instance.
+        tbuild (float): Time to build the geometry.
+        peak (int): Peak memory allocated while building the geometry.
+    """
+
+    cmds = ['#domain: {0:g} {0:g} {1:g}'.format(extent, extent * 1.2),
+            '#dx_dy_dz: {0:g} {0:g} {0:g}'.format(dl),
+            '#time_window: 1',
+            '#messages: n',
+            '#soil_peplinski: 0.5 0.5 2.0 2.66 0.001 0.25 my_soil',
+            '#fractal_box: 0 0 0 {0:g} {0:g} {0:g} 1.5 1 1 1 50 my_soil my_fractal_box 42'.format(extent),
+            '#add_surface_roughness: 0 0 {0:g} {0:g} {0:g} {0:g} 1.5 1 1 {1:g} {2:g} my_fractal_box 43'.format(extent, extent * 0.9, extent * 1.1)]
+
+    G = FDTDGrid()
+    G.hostinfo = get_host_info()
+    G.tqdmdisable = True
+    G.fractalcache = fractalcache
+    geometry = process_model_cmds(cmds, G)
+    G.nthreads = nthreads
+
+    tracemalloc.start()
+    tstart = timeit.default_timer()
+    process_geometrycmds(geometry, G)
+    tbuild = timeit.default_timer() - tstart
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return G, tbuild, peak
+
+
+print('Fractal box {0} x {0} x {0} cells with a rough surface:'.format(args.size))
+
+reference = None
+for nthreads in args.nthreads:
+    G, tbuild, peak = build_fractal_box(nthreads)
+    if reference is None:
+        reference = G.solid
+    print('  {} thread(s): {:.2f} s, peak memory {}, identical: {}'.format(nthreads, tbuild, human_size(peak), np.array_equal(G.solid, reference)))
+
+with tempfile.TemporaryDirectory() as fractalcache:
+    G, tbuild, peak = build_fractal_box(args.nthreads[-1], fractalcache)
+    print('  Writing to cache: {:.2f} s, identical: {}'.format(tbuild, np.array_equal(G.solid, reference)))
+    G, tbuild, peak = build_fractal_box(args.nthreads[-1], fractalcache)
+    print('  Reading from cache: {:.2f} s, identical: {}'.format(tbuild, np.array_equal(G.solid, reference)))
@@ -0,0 +1,103 @@
+# Copyright (C) 2015-2018: The University of Edinburgh
+#                 Authors: Craig Warren and Antonis Giannopoulos
+#
+# This file is part of gprMax.
+#
+# gprMax is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gprMax is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gprMax.  If not, see <http://www.gnu.org/licenses/>.
+
+import argparse
+import os
+
+import numpy as np
+
+from gprMax.grid import FDTDGrid
+from gprMax.light_cone import LightCone
+from gprMax.materials import Material
+from gprMax.model_build_run import build_model
+from gprMax.model_build_run import process_model_cmds
+from gprMax.model_build_run import solve_cpu_compiled
+from gprMax.utilities import get_host_info
+
+"""Benchmarks restricting the updates of the compiled time-stepping loop to the light cone of the sources (--light-cone), i.e. reports the number of iterations of updates of the whole grid saved for models in tests/models_basic and tests/experimental, compares the number of iterations per second for the first iterations of the models, and checks the receiver outputs are identical."""
+
+# Parse command line arguments
+parser = argparse.ArgumentParser(description='Benchmarks restricting the updates of the compiled time-stepping loop to the light cone of the sources (--light-cone), i.e. reports the number of iterations of updates of the whole grid saved for models in tests/models_basic and tests/experimental, compares the number of iterations per second for the first iterations of the models, and checks the receiver outputs are identical.', usage='cd gprMax; python -m tests.benchmarking.bench_light_cone')
+parser.add_argument('-models', default=['models_basic/hertzian_dipole_fs', 'models_basic/hertzian_dipole_dispersive', 'models_basic/pmls', 'experimental/antenna_GSSI_1500_fs', 'experimental/antenna_MALA_1200_fs'], help='models (directories in tests) to benchmark', nargs='+')
+parser.add_argument('-iterations', default=200, type=int, help='number of iterations to time (from the start of each model)')
+parser.add_argument('-nthreads', default=1, type=int, help='number of OpenMP threads to use')
+parser.add_argument('-repeats', default=3, type=int, help='number of times to run each model with and without the light cone (the fastest run is reported)')
+args = parser.parse_args()
+
+
+def model_cmds(model, iterations=None):
+    """Input commands of a model.
+
+    Args:
+        model (str): Model directory in tests, which contains an input file of
+                the same name (or of the same name with _proc if any Python
+                code in the input file has been processed).
+        iterations (int): Number of iterations to run the model for (rather than its time window).
+
+    Returns:
+        cmds (list): Input commands.
+    """
+
+    name = os.path.basename(model)
+    inputfile = os.path.join(os.path.dirname(__file__), os.pardir, model, name + '_proc.in')
+    if not os.path.isfile(inputfile):
+        inputfile = os.path.join(os.path.dirname(__file__), os.pardir, model, name + '.in')
+    with open(inputfile, 'r') as f:
+        cmds = [line.strip() + '\n' for line in f if line.startswith('#') and not line.startswith(('##', '#geometry_view', '#geometry_objects_write', '#snapshot'))]
+    if iterations is not None:
+        cmds = [cmd for cmd in cmds if not cmd.startswith('#time_window:')] + ['#time_window: {:d}\n'.format(iterations)]
+    cmds.append('#messages: n\n')
+
+    return cmds
+
+
+for model in args.models:
+    # Iterations saved over the time window of the model
+    G = FDTDGrid()
+    G.hostinfo = get_host_info()
+    G.tqdmdisable = True
+    process_model_cmds(model_cmds(model), G)
+    iterationssaved = LightCone(G).iterationssaved(G.iterations)
+    print('{}: {} x {} x {} cells, {} iterations, {} thread(s):'.format(model, G.nx, G.ny, G.nz, G.iterations, args.nthreads))
+    print('  Iterations saved: {:.1f} ({:.1f}%)'.format(iterationssaved, 100 * iterationssaved / G.iterations))
+
+    # Time the first iterations
+    cmds = model_cmds(model, min(G.iterations, args.iterations))
+    G = FDTDGrid()
+    G.hostinfo = get_host_info()
+    G.tqdmdisable = True
+    geometry = process_model_cmds(cmds, G)
+    G.nthreads = args.nthreads
+    build_model(geometry, G)
+    results = []
+    for solver, uselightcone in (('Compiled loop', False), ('Compiled loop, light cone', True)):
+        G.lightcone = uselightcone
+        tsolve = []
+        for repeat in range(args.repeats):
+            G.initialise_field_arrays()
+            for pml in G.pmls:
+                pml.initialise_field_arrays()
+            if Material.maxpoles != 0:
+                G.initialise_dispersive_arrays()
+            tsolve.append(solve_cpu_compiled(1, 1, G))
+        results.append([rx.outputs[output].copy() for rx in G.rxs for output in sorted(rx.outputs)])
+        if not uselightcone:
+            tref = min(tsolve)
+        print('  {} (first {} iterations): {:.0f} iterations/s, speed-up {:.2f}'.format(solver, G.iterations, G.iterations / min(tsolve), tref / min(tsolve)))
+    identical = all(np.array_equal(a, b) for result in results for a, b in zip(result, results[0]))
+    print('  Receiver outputs identical: {}'.format(identical))
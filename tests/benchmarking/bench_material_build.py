@@ -0,0 +1,107 @@
+# Copyright (C) 2015-2018: The University of Edinburgh
+#                 Authors: Craig Warren and Antonis Giannopoulos
+#
+# This file is part of gprMax.
+#
+# gprMax is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gprMax is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gprMax.  If not, see <http://www.gnu.org/licenses/>.
+
+import argparse
+from time import perf_counter
+
+import numpy as np
+
+from gprMax.grid import FDTDGrid
+from gprMax.input_cmds_geometry import process_geometrycmds
+from gprMax.model_build_run import process_model_cmds
+from gprMax.utilities import get_host_info
+from gprMax.yee_cell_build_ext import build_electric_components
+from gprMax.yee_cell_build_ext import build_magnetic_components
+
+"""Benchmarks building models with many materials, i.e. a fractal box using a soil mixing model with many cylinders of different materials embedded in it, where many averaged materials are created. Times processing the geometry commands and building the main grid, and, optionally, compares looking up averaged materials in the material registry with the original scan of the materials list."""
+
+# Parse command line arguments
+parser = argparse.ArgumentParser(description='Benchmarks building models with many materials, i.e. a fractal box using a soil mixing model with many cylinders of different materials embedded in it, where many averaged materials are created. Times processing the geometry commands and building the main grid, and, optionally, compares looking up averaged materials in the material registry with the original scan of the materials list.', usage='cd gprMax; python -m tests.benchmarking.bench_material_build')
+parser.add_argument('-cylinders', default=[50, 100, 200], type=int, help='numbers of cylinders (each of a different material) in the fractal box to benchmark', nargs='+')
+parser.add_argument('-bins', default=50, type=int, help='number of materials (bins) in the fractal box')
+parser.add_argument('-size', default=100, type=int, help='size (in cells) of the cubic model')
+parser.add_argument('-nthreads', default=1, type=int, help='number of OpenMP threads to use')
+parser.add_argument('--reference', action='store_true', default=False, help='flag to also time looking up the averaged materials by scanning the materials list (the original behaviour)')
+args = parser.parse_args()
+
+
+def model_cmds(cylinders):
+    """Input commands for a model of a fractal box with embedded cylinders.
+
+    Args:
+        cylinders (int): Number of cylinders in the fractal box.
+
+    Returns:
+        (list): Input commands.
+    """
+
+    dl = 0.001
+    extent = args.size * dl
+    cmds = ['#domain: {:g} {:g} {:g}'.format(extent, extent, extent),
+            '#dx_dy_dz: {:g} {:g} {:g}'.format(dl, dl, dl),
+            '#time_window: 100',
+            '#messages: n',
+            '#soil_peplinski: 0.5 0.5 2.0 2.66 0.001 0.25 my_soil',
+            '#fractal_box: 0 0 0 {0:g} {0:g} {1:g} 1.5 1 1 1 {2:d} my_soil my_fractal_box 1'.format(extent, extent / 2, args.bins)]
+    R = np.random.RandomState(1)
+    for cylinder in range(cylinders):
+        x, y = R.uniform(0.1 * extent, 0.9 * extent, size=2)
+        cmds.append('#material: {:g} {:g} 1 0 cylinder{}'.format(R.uniform(2, 20), R.uniform(0, 0.1), cylinder))
+        cmds.append('#cylinder: {0:g} {1:g} 0 {0:g} {1:g} {2:g} {3:g} cylinder{4}'.format(x, y, extent, 0.02 * extent, cylinder))
+
+    return cmds
+
+
+def find_averaged_reference(constituents, materials):
+    """Original look up of an averaged material - counts the occurrences of the names of its constituents in the name of every material."""
+
+    requiredID = '+'.join(constituents)
+    return [x for x in materials if all(x.ID.count(y) == requiredID.count(y) for y in constituents)]
+
+
+for cylinders in args.cylinders:
+    G = FDTDGrid()
+    G.hostinfo = get_host_info()
+    G.tqdmdisable = True
+    geometry = process_model_cmds(model_cmds(cylinders), G)
+    G.nthreads = args.nthreads
+
+    start = perf_counter()
+    process_geometrycmds(geometry, G)
+    tgeometry = perf_counter() - start
+    nmaterials = len(G.materials)
+    start = perf_counter()
+    build_electric_components(G.solid, G.rigidE, G.ID, G)
+    build_magnetic_components(G.solid, G.rigidH, G.ID, G)
+    tbuild = perf_counter() - start
+
+    print('Model {0} x {0} x {0} cells, fractal box with {1} materials, {2} cylinders, {3} thread(s):'.format(args.size, args.bins, cylinders, args.nthreads))
+    print('  Geometry commands: {:.3f}s'.format(tgeometry))
+    print('  Building main grid: {:.3f}s ({} averaged materials created)'.format(tbuild, len(G.materials) - nmaterials))
+
+    if args.reference:
+        averaged = [material.ID.split('+') for material in G.materials if material.type == 'dielectric-smoothed']
+        start = perf_counter()
+        for constituents in averaged:
+            G.materials.get_averaged(constituents)
+        tregistry = perf_counter() - start
+        start = perf_counter()
+        for constituents in averaged:
+            find_averaged_reference(constituents, G.materials)
+        treference = perf_counter() - start
+        print('  Look ups of {} averaged materials: registry {:.2f}ms, scanning list {:.2f}ms'.format(len(averaged), 1e3 * tregistry, 1e3 * treference))
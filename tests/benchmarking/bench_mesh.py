@@ -0,0 +1,133 @@
+# Copyright (C) 2015-2018: The University of Edinburgh
+#                 Authors: Craig Warren and Antonis Giannopoulos
+#
+# This file is part of gprMax.
+#
+# gprMax is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gprMax is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gprMax.  If not, see <http://www.gnu.org/licenses/>.
+
+import argparse
+import os
+import tempfile
+import timeit
+
+import numpy as np
+
+from gprMax.geometry_mesh import stl_dtype
+from gprMax.grid import FDTDGrid
+from gprMax.input_cmds_geometry import process_geometrycmds
+from gprMax.model_build_run import process_model_cmds
+from gprMax.utilities import get_host_info
+
+"""Benchmarks reading and voxelising a triangle mesh of a torus (#geometry_mesh_read) with different numbers of OpenMP threads, checks the solid, rigid and ID arrays are identical, and counts the cells misclassified compared to the analytic torus (cells with centres further from its surface than the error of the mesh)."""
+
+# Parse command line arguments
+parser = argparse.ArgumentParser(description='Benchmarks reading and voxelising a triangle mesh of a torus (#geometry_mesh_read) with different numbers of OpenMP threads, checks the solid, rigid and ID arrays are identical, and counts the cells misclassified compared to the analytic torus.', usage='cd gprMax; python -m tests.benchmarking.bench_mesh')
+parser.add_argument('-size', default=200, type=int, help='size (in cells) of the cubic model')
+parser.add_argument('-triangles', default=1000000, type=int, help='approximate number of triangles in the mesh')
+parser.add_argument('-nthreads', default=[1, 2, 4], type=int, help='numbers of OpenMP threads to benchmark', nargs='+')
+args = parser.parse_args()
+
+dl = 0.002
+extent = args.size * dl
+centre = extent / 2
+R = 0.3 * extent
+r = 0.12 * extent
+
+
+def torus(ntriangles):
+    """Triangle mesh of a torus, in the xy-plane at the centre of the model.
+
+    Args:
+        ntriangles (int): Approximate number of triangles.
+
+    Returns:
+        triangles (array): Coordinates of the vertices of the triangles, shape (n, 3, 3).
+        error (float): Largest distance of the mesh from the surface of the torus.
+    """
+
+    nv = max(int(np.sqrt(ntriangles * r / R / 2)), 3)
+    nu = max(int(ntriangles / nv / 2), 3)
+    u, v = np.meshgrid(np.linspace(0, 2 * np.pi, nu + 1), np.linspace(0, 2 * np.pi, nv + 1), indexing='ij')
+    points = np.stack(((R + r * np.cos(v)) * np.cos(u), (R + r * np.cos(v)) * np.sin(u), r * np.sin(v)), axis=-1) + centre
+    a, b, c, d = points[:-1, :-1], points[1:, :-1], points[1:, 1:], points[:-1, 1:]
+    triangles = np.concatenate((np.stack((a, b, c), axis=2), np.stack((a, c, d), axis=2))).reshape(-1, 3, 3)
+    error = (R + r) * (1 - np.cos(np.pi / nu)) + r * (1 - np.cos(np.pi / nv))
+
+    return triangles, error
+
+
+def write_stl(filename, triangles):
+    """Writes a binary STL file.
+
+    Args:
+        filename (str): Name of STL file.
+        triangles (array): Coordinates of the vertices of the triangles, shape (n, 3, 3).
+    """
+
+    data = np.zeros(len(triangles), dtype=stl_dtype)
+    data['vertices'] = triangles
+    with open(filename, 'wb') as f:
+        f.write(b'gprMax torus'.ljust(80))
+        f.write(np.uint32(len(triangles)).tobytes())
+        data.tofile(f)
+
+
+def model_cmds(meshfile):
+    """Input commands of the model.
+
+    Args:
+        meshfile (str): Name of STL file.
+
+    Returns:
+        cmds (list): Input commands.
+    """
+
+    cmds = ['#domain: {0:g} {0:g} {0:g}'.format(extent),
+            '#dx_dy_dz: {0:g} {0:g} {0:g}'.format(dl),
+            '#time_window: 1',
+            '#messages: n',
+            '#material: 4 0.001 1 0 housing',
+            '#geometry_mesh_read: 0 0 0 1 {} housing'.format(meshfile)]
+
+    return cmds
+
+
+triangles, error = torus(args.triangles)
+with tempfile.TemporaryDirectory() as tmpdir:
+    meshfile = os.path.join(tmpdir, 'torus.stl')
+    write_stl(meshfile, triangles)
+    print('Model {0} x {0} x {0} cells, voxelising a torus with {1} triangles:'.format(args.size, len(triangles)))
+
+    reference = None
+    for nthreads in args.nthreads:
+        G = FDTDGrid()
+        G.hostinfo = get_host_info()
+        G.tqdmdisable = True
+        geometry = process_model_cmds(model_cmds(meshfile), G)
+        G.nthreads = nthreads
+        tstart = timeit.default_timer()
+        process_geometrycmds(geometry, G)
+        tbuild = timeit.default_timer() - tstart
+        arrays = [G.solid, G.rigidE, G.rigidH, G.ID]
+        if reference is None:
+            reference = arrays
+        identical = all(np.array_equal(array, ref) for array, ref in zip(arrays, reference))
+        print('  {} thread(s): {:.2f} s, arrays identical: {}'.format(nthreads, tbuild, identical))
+
+# Distance of cell centres from the surface of the torus
+x, y, z = (np.indices(G.solid.shape) + 0.5) * dl - centre
+distance = np.sqrt((np.sqrt(x**2 + y**2) - R)**2 + z**2) - r
+inside = G.solid == G.materials.get('housing').numID
+misclassified = np.count_nonzero(inside & (distance > 0)) + np.count_nonzero(~inside & (distance < -error))
+print('  {} cells inside, {} misclassified compared to the analytic torus'.format(np.count_nonzero(inside), misclassified))
@@ -0,0 +1,120 @@
+# Copyright (C) 2015-2018: The University of Edinburgh
+#                 Authors: Craig Warren and Antonis Giannopoulos
+#
+# This file is part of gprMax.
+#
+# gprMax is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gprMax is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gprMax.  If not, see <http://www.gnu.org/licenses/>.
+
+import argparse
+from importlib import import_module
+from time import perf_counter
+
+import numpy as np
+
+from gprMax.grid import FDTDGrid
+from gprMax.model_build_run import build_model
+from gprMax.model_build_run import process_model_cmds
+from gprMax.pml import get_fused_pml_slabs
+from gprMax.pml import update_pmls_electric
+from gprMax.pml import update_pmls_magnetic
+from gprMax.utilities import get_host_info
+
+"""Benchmarks the PML updates for each iteration of small (2D) models, where the overheads of calling the update functions are significant. Compares looking up the update functions on every call (the original behaviour), calling the update functions bound when the PML is built, and updating all PML slabs in a single parallel region."""
+
+# Parse command line arguments
+parser = argparse.ArgumentParser(description='Benchmarks the PML updates for each iteration of small (2D) models, where the overheads of calling the update functions are significant. Compares looking up the update functions on every call (the original behaviour), calling the update functions bound when the PML is built, and updating all PML slabs in a single parallel region.', usage='cd gprMax; python -m tests.benchmarking.bench_pml_updates')
+parser.add_argument('-sizes', default=[50, 100, 200], type=int, help='sizes (in cells) of square 2D models to benchmark', nargs='+')
+parser.add_argument('-iterations', default=2000, type=int, help='number of iterations to time')
+parser.add_argument('-nthreads', default=1, type=int, help='number of OpenMP threads to use')
+args = parser.parse_args()
+
+
+def update_lookup(G):
+    """Original PML updates - looks up the update functions on every call."""
+
+    for pml in G.pmls:
+        func = getattr(import_module('gprMax.pml_updates_ext'), 'update_pml_' + str(len(pml.CFS)) + 'order_magnetic_' + pml.direction)
+        func(pml.xs, pml.xf, pml.ys, pml.yf, pml.zs, pml.zf, G.nthreads, G.updatecoeffsH, G.ID, G.Ex, G.Ey, G.Ez, G.Hx, G.Hy, G.Hz, pml.HPhi1, pml.HPhi2, pml.HRA, pml.HRB, pml.HRE, pml.HRF, pml.d)
+    for pml in G.pmls:
+        func = getattr(import_module('gprMax.pml_updates_ext'), 'update_pml_' + str(len(pml.CFS)) + 'order_electric_' + pml.direction)
+        func(pml.xs, pml.xf, pml.ys, pml.yf, pml.zs, pml.zf, G.nthreads, G.updatecoeffsE, G.ID, G.Ex, G.Ey, G.Ez, G.Hx, G.Hy, G.Hz, pml.EPhi1, pml.EPhi2, pml.ERA, pml.ERB, pml.ERE, pml.ERF, pml.d)
+
+
+def update_bound(G):
+    """PML updates using the update functions bound when the PML is built."""
+
+    for pml in G.pmls:
+        pml.update_magnetic(G)
+    for pml in G.pmls:
+        pml.update_electric(G)
+
+
+def update_fused(G):
+    """PML updates for all PML slabs in a single parallel region."""
+
+    update_pmls_magnetic(G.pmlslabs, G)
+    update_pmls_electric(G.pmlslabs, G)
+
+
+def build_square_model(size):
+    """Builds a square 2D model of free space with PML on the x and y boundaries.
+
+    Args:
+        size (int): Number of cells in x and y.
+
+    Returns:
+        G (class): Grid class instance.
+    """
+
+    dl = 0.001
+    cmds = ['#domain: {0:g} {0:g} {1:g}'.format(size * dl, dl),
+            '#dx_dy_dz: {0:g} {0:g} {0:g}'.format(dl),
+            '#time_window: 5e-9',
+            '#messages: n',
+            '#waveform: gaussian 1 1e9 my_pulse']
+
+    G = FDTDGrid()
+    G.hostinfo = get_host_info()
+    G.tqdmdisable = True
+    geometry = process_model_cmds(cmds, G)
+    G.nthreads = args.nthreads
+    build_model(geometry, G)
+    G.pmlslabs = get_fused_pml_slabs(G)
+
+    return G
+
+
+for size in args.sizes:
+    print('2D model {} x {} cells, {} thread(s), {} iterations:'.format(size, size, args.nthreads, args.iterations))
+    results = {}
+    for name, update in (('Lookup on every call', update_lookup), ('Bound at build', update_bound), ('Fused', update_fused)):
+        G = build_square_model(size)
+
+        # Check results from a few iterations (the PML updates on their own
+        # are not stable for many iterations)
+        R = np.random.RandomState(1)
+        for field in (G.Ex, G.Ey, G.Ez, G.Hx, G.Hy, G.Hz):
+            field[:] = R.randn(*field.shape)
+        for iteration in range(10):
+            update(G)
+        results[name] = [field.copy() for field in (G.Ex, G.Ey, G.Ez, G.Hx, G.Hy, G.Hz)]
+
+        G.initialise_field_arrays()
+        start = perf_counter()
+        for iteration in range(args.iterations):
+            update(G)
+        t = perf_counter() - start
+        print('  {}: {:.1f}us per iteration'.format(name, 1e6 * t / args.iterations))
+    identical = all(np.array_equal(a, b) for name in results for a, b in zip(results[name], results['Lookup on every call']))
+    print('  Fields identical: {}'.format(identical))
@@ -0,0 +1,143 @@
+# Copyright (C) 2015-2018: The University of Edinburgh
+#                 Authors: Craig Warren and Antonis Giannopoulos
+#
+# This file is part of gprMax.
+#
+# gprMax is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gprMax is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gprMax.  If not, see <http://www.gnu.org/licenses/>.
+
+import argparse
+import importlib.util
+import timeit
+
+import numpy as np
+
+import gprMax.input_cmds_geometry
+from gprMax.grid import FDTDGrid
+from gprMax.input_cmds_geometry import process_geometrycmds
+from gprMax.model_build_run import process_model_cmds
+from gprMax.utilities import get_host_info
+
+"""Benchmarks building the geometry of a reinforced concrete slab with a grid of rebars, i.e. times building the #cylinder, #sphere, #cylindrical_sector and #triangle commands of the model with different numbers of OpenMP threads (and optionally with a previous build of the geometry_primitives_ext module), and checks the solid, rigid and ID arrays are identical."""
+
+# Parse command line arguments
+parser = argparse.ArgumentParser(description='Benchmarks building the geometry of a reinforced concrete slab with a grid of rebars, i.e. times building the #cylinder, #sphere, #cylindrical_sector and #triangle commands of the model with different numbers of OpenMP threads (and optionally with a previous build of the geometry_primitives_ext module), and checks the solid, rigid and ID arrays are identical.', usage='cd gprMax; python -m tests.benchmarking.bench_primitives')
+parser.add_argument('-size', default=200, type=int, help='size (in cells) of the square slab')
+parser.add_argument('-rebars', default=10, type=int, help='number of rebars in each direction of each layer of the grid')
+parser.add_argument('-nthreads', default=[1, 2, 4], type=int, help='numbers of OpenMP threads to benchmark', nargs='+')
+parser.add_argument('-reference', default=None, help='path to a previous build of the geometry_primitives_ext module (without the nthreads argument) to compare against')
+parser.add_argument('-repeats', default=3, type=int, help='number of times to build the geometry (the fastest build is reported)')
+args = parser.parse_args()
+
+
+def geometry_cmds():
+    """Input commands of a concrete slab with two layers of a grid of rebars,
+        spherical voids, and a triangular prism and cylindrical sector at
+        its edges.
+
+    Returns:
+        cmds (list): Input commands.
+    """
+
+    dl = 0.002
+    extent = args.size * dl
+    depth = extent / 4
+    spacing = extent / args.rebars
+    radius = 0.006
+    cmds = ['#domain: {0:g} {0:g} {1:g}'.format(extent, depth),
+            '#dx_dy_dz: {0:g} {0:g} {0:g}'.format(dl),
+            '#time_window: 1',
+            '#messages: n',
+            '#material: 6 0.01 1 0 concrete',
+            '#box: 0 0 0 {0:g} {0:g} {1:g} concrete'.format(extent, depth)]
+    for level in (depth / 3, 2 * depth / 3):
+        for n in range(args.rebars):
+            position = (n + 0.5) * spacing
+            cmds.append('#cylinder: {0:g} {1:g} {2:g} {3:g} {1:g} {2:g} {4:g} pec'.format(radius, position, level - radius, extent - radius, radius))
+            cmds.append('#cylinder: {0:g} {1:g} {2:g} {0:g} {3:g} {2:g} {4:g} pec'.format(position, radius, level + radius, extent - radius, radius))
+    for n in range(args.rebars - 1):
+        position = (n + 1) * spacing
+        cmds.append('#sphere: {0:g} {0:g} {1:g} {2:g} free_space'.format(position, depth / 2, spacing / 5))
+    cmds.append('#triangle: 0 0 0 {0:g} 0 0 0 {0:g} 0 {1:g} pec'.format(extent / 4, depth / 10))
+    cmds.append('#cylindrical_sector: z {0:g} {0:g} {1:g} {2:g} {3:g} 0 90 pec'.format(extent / 2, depth - 2 * dl, depth, extent / 4))
+
+    return cmds
+
+
+def build_geometry(nthreads):
+    """Builds the geometry of the slab.
+
+    Args:
+        nthreads (int): Number of OpenMP threads to use.
+
+    Returns:
+        G (class): Grid class instance.
+        tbuild (float): Time taken to build the geometry commands.
+    """
+
+    G = FDTDGrid()
+    G.hostinfo = get_host_info()
+    G.tqdmdisable = True
+    geometry = process_model_cmds(geometry_cmds(), G)
+    G.nthreads = nthreads
+    tstart = timeit.default_timer()
+    process_geometrycmds(geometry, G)
+    tbuild = timeit.default_timer() - tstart
+
+    return G, tbuild
+
+
+def time_build(nthreads):
+    """Builds the geometry of the slab a number of times.
+
+    Args:
+        nthreads (int): Number of OpenMP threads to use.
+
+    Returns:
+        arrays (list): Solid, rigid and ID arrays.
+        tbuild (float): Fastest time taken to build the geometry commands.
+    """
+
+    tbuilds = []
+    for repeat in range(args.repeats):
+        G, tbuild = build_geometry(nthreads)
+        tbuilds.append(tbuild)
+
+    return [G.solid, G.rigidE, G.rigidH, G.ID], min(tbuilds)
+
+
+print('Slab {0} x {0} x {1} cells, {2} rebars, building geometry:'.format(args.size, args.size // 4, 4 * args.rebars))
+
+results = []
+for nthreads in args.nthreads:
+    arrays, tbuild = time_build(nthreads)
+    if not results:
+        tref = tbuild
+        reference = arrays
+    identical = all(np.array_equal(a, b) for a, b in zip(arrays, reference))
+    results.append((nthreads, tbuild, identical))
+
+if args.reference:
+    # Replace the primitives with those from a previous build, which have no nthreads argument
+    spec = importlib.util.spec_from_file_location('geometry_primitives_ext', args.reference)
+    previous = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(previous)
+    for name in ('build_cylinder', 'build_sphere', 'build_cylindrical_sector', 'build_triangle'):
+        func = getattr(previous, name)
+        setattr(gprMax.input_cmds_geometry, name, lambda *cmdargs, func=func: func(*cmdargs[:-5], *cmdargs[-4:]))
+    arrays, tref = time_build(args.nthreads[0])
+    identical = all(np.array_equal(a, b) for a, b in zip(arrays, reference))
+    print('  Previous build: {:.2f} s, arrays identical: {}'.format(tref, identical))
+
+for nthreads, tbuild, identical in results:
+    print('  {} thread(s): {:.2f} s, speed-up {:.1f}, arrays identical: {}'.format(nthreads, tbuild, tref / tbuild, identical))
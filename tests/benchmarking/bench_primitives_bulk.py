@@ -0,0 +1,141 @@
+# Copyright (C) 2015-2018: The University of Edinburgh
+#                 Authors: Craig Warren and Antonis Giannopoulos
+#
+# This file is part of gprMax.
+#
+# gprMax is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gprMax is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gprMax.  If not, see <http://www.gnu.org/licenses/>.
+
+import argparse
+import timeit
+
+import numpy as np
+
+from gprMax.geometry_primitives import primitive_dtype
+from gprMax.geometry_primitives import process_primitives
+from gprMax.grid import FDTDGrid
+from gprMax.input_cmds_geometry import process_geometrycmds
+from gprMax.model_build_run import process_model_cmds
+from gprMax.utilities import get_host_info
+
+"""Benchmarks building a large number of boxes, cylinders and spheres (buried clutter) in one pass from a structured array (#geometry_primitives_read) against building them from one #box, #cylinder or #sphere command each, and checks the solid, rigid and ID arrays are identical."""
+
+# Parse command line arguments
+parser = argparse.ArgumentParser(description='Benchmarks building a large number of boxes, cylinders and spheres (buried clutter) in one pass from a structured array (#geometry_primitives_read) against building them from one #box, #cylinder or #sphere command each, and checks the solid, rigid and ID arrays are identical.', usage='cd gprMax; python -m tests.benchmarking.bench_primitives_bulk')
+parser.add_argument('-size', default=200, type=int, help='size (in cells) of the cubic model')
+parser.add_argument('-objects', default=[1000, 10000, 100000], type=int, help='numbers of objects to benchmark', nargs='+')
+parser.add_argument('-maxcommands', default=100000, type=int, help='largest number of objects to also build from commands')
+parser.add_argument('-nthreads', default=1, type=int, help='number of OpenMP threads to use')
+args = parser.parse_args()
+
+dl = 0.002
+extent = args.size * dl
+
+
+def clutter(nobjects):
+    """Random boxes, cylinders and spheres, of a few cells in size, buried in
+        a half-space.
+
+    Args:
+        nobjects (int): Number of objects.
+
+    Returns:
+        primitives (array): Structured array of geometry primitives.
+    """
+
+    rng = np.random.default_rng(0)
+    primitives = np.zeros(nobjects, dtype=primitive_dtype)
+    primitives['type'] = rng.choice(['box', 'cylinder', 'sphere'], nobjects)
+    primitives['material'] = rng.choice(['stone', 'clay', 'pec'], nobjects)
+    size = rng.uniform(2, 6, (nobjects, 3)) * dl
+    lower = rng.uniform(0, 1, (nobjects, 3)) * (np.array([extent, extent, extent / 2]) - size)
+    upper = lower + size
+    # Cylinders are vertical, and the centres of spheres are at the lower coordinates
+    cylinders = primitives['type'] == b'cylinder'
+    upper[cylinders, :2] = lower[cylinders, :2]
+    primitives['x1'], primitives['y1'], primitives['z1'] = lower.T
+    primitives['x2'], primitives['y2'], primitives['z2'] = upper.T
+    primitives['r'] = size[:, 0] / 2
+
+    return primitives
+
+
+def commands(primitives):
+    """Input commands for geometry primitives.
+
+    Args:
+        primitives (array): Structured array of geometry primitives.
+
+    Returns:
+        cmds (list): #box, #cylinder and #sphere commands.
+    """
+
+    cmds = []
+    for p in primitives:
+        material = p['material'].decode()
+        if p['type'] == b'box':
+            cmds.append('#box: {!r} {!r} {!r} {!r} {!r} {!r} {}'.format(p['x1'], p['y1'], p['z1'], p['x2'], p['y2'], p['z2'], material))
+        elif p['type'] == b'cylinder':
+            cmds.append('#cylinder: {!r} {!r} {!r} {!r} {!r} {!r} {!r} {}'.format(p['x1'], p['y1'], p['z1'], p['x2'], p['y2'], p['z2'], p['r'], material))
+        else:
+            cmds.append('#sphere: {!r} {!r} {!r} {!r} {}'.format(p['x1'], p['y1'], p['z1'], p['r'], material))
+
+    return cmds
+
+
+def model_cmds(geometrycmds=[]):
+    """Input commands of the model.
+
+    Args:
+        geometrycmds (list): Geometry commands.
+
+    Returns:
+        (list): Input commands.
+    """
+
+    cmds = ['#domain: {0:g} {0:g} {0:g}'.format(extent),
+            '#dx_dy_dz: {0:g} {0:g} {0:g}'.format(dl),
+            '#time_window: 1',
+            '#messages: n',
+            '#material: 6 0.01 1 0 stone',
+            '#material: 12 0.05 1 0 clay']
+
+    return cmds + geometrycmds
+
+
+print('Model {0} x {0} x {0} cells, {1} thread(s), building buried clutter:'.format(args.size, args.nthreads))
+
+for nobjects in args.objects:
+    primitives = clutter(nobjects)
+    G = FDTDGrid()
+    G.hostinfo = get_host_info()
+    G.tqdmdisable = True
+    process_model_cmds(model_cmds(), G)
+    G.nthreads = args.nthreads
+    tstart = timeit.default_timer()
+    process_primitives(primitives, G)
+    tbulk = timeit.default_timer() - tstart
+
+    if nobjects <= args.maxcommands:
+        tstart = timeit.default_timer()
+        Gcmds = FDTDGrid()
+        Gcmds.hostinfo = get_host_info()
+        Gcmds.tqdmdisable = True
+        geometry = process_model_cmds(model_cmds(commands(primitives)), Gcmds)
+        Gcmds.nthreads = args.nthreads
+        process_geometrycmds(geometry, Gcmds)
+        tcmds = timeit.default_timer() - tstart
+        identical = all(np.array_equal(getattr(G, array), getattr(Gcmds, array)) for array in ('solid', 'rigidE', 'rigidH', 'ID'))
+        print('  {} objects: {:.2f} s from commands, {:.2f} s in one pass, speed-up {:.1f}, arrays identical: {}'.format(nobjects, tcmds, tbulk, tcmds / tbulk, identical))
+    else:
+        print('  {} objects: {:.2f} s in one pass'.format(nobjects, tbulk))
@@ -0,0 +1,119 @@
+# Copyright (C) 2015-2018: The University of Edinburgh
+#                 Authors: Craig Warren and Antonis Giannopoulos
+#
+# This file is part of gprMax.
+#
+# gprMax is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gprMax is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gprMax.  If not, see <http://www.gnu.org/licenses/>.
+
+import argparse
+import filecmp
+import os
+import tempfile
+from struct import pack
+from time import perf_counter
+
+import numpy as np
+from tqdm import tqdm
+
+from gprMax.constants import floattype
+from gprMax.grid import FDTDGrid
+from gprMax.grid import Ix
+from gprMax.grid import Iy
+from gprMax.grid import Iz
+from gprMax.model_build_run import build_model
+from gprMax.model_build_run import process_model_cmds
+from gprMax.snapshots import Snapshot
+from gprMax.utilities import get_host_info
+
+"""Benchmarks writing snapshot files. Times the snapshot writer for cubic snapshots of different sizes and, optionally, compares it (timing and file contents) to the original per-value writer."""
+
+# Parse command line arguments
+parser = argparse.ArgumentParser(description='Benchmarks writing snapshot files. Times the snapshot writer for cubic snapshots of different sizes and, optionally, compares it (timing and file contents) to the original per-value writer.', usage='cd gprMax; python -m tests.benchmarking.bench_snapshots')
+parser.add_argument('-sizes', default=[100, 300], type=int, help='sizes (in cells) of cubic snapshots to benchmark', nargs='+')
+parser.add_argument('--reference', action='store_true', default=False, help='flag to also time the original per-value writer and check the files are identical (slow for large snapshots)')
+args = parser.parse_args()
+
+
+def write_reference(snap, Ex, Ey, Ez, Hx, Hy, Hz, G):
+    """Original snapshot writer - calculates and writes every value individually."""
+
+    snap.filehandle = open(snap.filename, 'ab')
+    floatstring = 'f' if np.dtype(floattype).name == 'float32' else 'd'
+    datasize = 3 * np.dtype(floattype).itemsize * (snap.vtk_xfcells - snap.vtk_xscells) * (snap.vtk_yfcells - snap.vtk_yscells) * (snap.vtk_zfcells - snap.vtk_zscells)
+    snap.filehandle.write(pack('I', datasize))
+    for k in range(snap.zs, snap.zf, snap.dz):
+        for j in range(snap.ys, snap.yf, snap.dy):
+            for i in range(snap.xs, snap.xf, snap.dx):
+                snap.filehandle.write(pack(floatstring, (Ex[i, j, k] + Ex[i, j + 1, k] + Ex[i, j, k + 1] + Ex[i, j + 1, k + 1]) / 4))
+                snap.filehandle.write(pack(floatstring, (Ey[i, j, k] + Ey[i + 1, j, k] + Ey[i, j, k + 1] + Ey[i + 1, j, k + 1]) / 4))
+                snap.filehandle.write(pack(floatstring, (Ez[i, j, k] + Ez[i + 1, j, k] + Ez[i, j + 1, k] + Ez[i + 1, j + 1, k]) / 4))
+    snap.filehandle.write(pack('I', datasize))
+    for k in range(snap.zs, snap.zf, snap.dz):
+        for j in range(snap.ys, snap.yf, snap.dy):
+            for i in range(snap.xs, snap.xf, snap.dx):
+                snap.filehandle.write(pack(floatstring, (Hx[i, j, k] + Hx[i + 1, j, k]) / 2))
+                snap.filehandle.write(pack(floatstring, (Hy[i, j, k] + Hy[i, j + 1, k]) / 2))
+                snap.filehandle.write(pack(floatstring, (Hz[i, j, k] + Hz[i, j, k + 1]) / 2))
+    snap.filehandle.write(pack('I', datasize))
+    for k in range(snap.zs, snap.zf, snap.dz):
+        for j in range(snap.ys, snap.yf, snap.dy):
+            for i in range(snap.xs, snap.xf, snap.dx):
+                snap.filehandle.write(pack(floatstring, Ix(i, j, k, Hx, Hy, Hz, G)))
+                snap.filehandle.write(pack(floatstring, Iy(i, j, k, Hx, Hy, Hz, G)))
+                snap.filehandle.write(pack(floatstring, Iz(i, j, k, Hx, Hy, Hz, G)))
+    snap.filehandle.write('\n</AppendedData>\n</VTKFile>'.encode('utf-8'))
+    snap.filehandle.close()
+
+
+tmpdir = tempfile.mkdtemp()
+pbar = tqdm(disable=True)
+R = np.random.RandomState(1)
+
+for size in args.sizes:
+    dl = 0.001
+    cmds = ['#domain: {0:g} {0:g} {0:g}'.format(size * dl),
+            '#dx_dy_dz: {0:g} {0:g} {0:g}'.format(dl),
+            '#time_window: 5e-9',
+            '#messages: n',
+            '#pml_cells: 0',
+            '#waveform: gaussian 1 1e9 my_pulse']
+    G = FDTDGrid()
+    G.hostinfo = get_host_info()
+    G.tqdmdisable = True
+    G.inputdirectory = tmpdir
+    G.inputfilename = 'bench_snapshots.in'
+    build_model(process_model_cmds(cmds, G), G)
+    for field in (G.Ex, G.Ey, G.Ez, G.Hx, G.Hy, G.Hz):
+        field[:] = R.randn(*field.shape)
+
+    print('Snapshot {} x {} x {} cells:'.format(size, size, size))
+
+    snap = Snapshot(0, 0, 0, size, size, size, 1, 1, 1, 1, 'snapshot{}'.format(size))
+    snap.prepare_vtk_imagedata('', G)
+    start = perf_counter()
+    snap.write_vtk_imagedata(G.Ex, G.Ey, G.Ez, G.Hx, G.Hy, G.Hz, G, pbar)
+    tsnapshot = perf_counter() - start
+    print('  Snapshot writer: {:.3f}s ({:.1f} Mcells/s)'.format(tsnapshot, size**3 / tsnapshot / 1e6))
+
+    if args.reference:
+        ref = Snapshot(0, 0, 0, size, size, size, 1, 1, 1, 1, 'reference{}'.format(size))
+        ref.prepare_vtk_imagedata('', G)
+        start = perf_counter()
+        write_reference(ref, G.Ex, G.Ey, G.Ez, G.Hx, G.Hy, G.Hz, G)
+        treference = perf_counter() - start
+        print('  Per-value writer: {:.3f}s ({:.1f} Mcells/s)'.format(treference, size**3 / treference / 1e6))
+        print('  Speedup: {:.1f}x, files identical: {}'.format(treference / tsnapshot, filecmp.cmp(snap.filename, ref.filename, shallow=False)))
+        os.remove(ref.filename)
+
+    os.remove(snap.filename)
@@ -0,0 +1,93 @@
+# Copyright (C) 2015-2018: The University of Edinburgh
+#                 Authors: Craig Warren and Antonis Giannopoulos
+#
+# This file is part of gprMax.
+#
+# gprMax is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gprMax is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gprMax.  If not, see <http://www.gnu.org/licenses/>.
+
+import argparse
+
+import numpy as np
+
+from gprMax.grid import FDTDGrid
+from gprMax.model_build_run import build_model
+from gprMax.model_build_run import process_model_cmds
+from gprMax.model_build_run import solve_cpu
+from gprMax.model_build_run import solve_cpu_compiled
+from gprMax.utilities import get_host_info
+
+"""Benchmarks the cache-blocked (tiled) updates of the compiled solver (-tile-planes and -tile-steps) against the current field and PML updates with different numbers of OpenMP threads, i.e. compares the throughput in millions of cells per second (Mcells/s) for a cubic 3D model with PMLs, and checks the receiver outputs are identical."""
+
+# Parse command line arguments
+parser = argparse.ArgumentParser(description='Benchmarks the cache-blocked (tiled) updates of the compiled solver (-tile-planes and -tile-steps) against the current field and PML updates with different numbers of OpenMP threads, i.e. compares the throughput in millions of cells per second (Mcells/s) for a cubic 3D model with PMLs, and checks the receiver outputs are identical.', usage='cd gprMax; python -m tests.benchmarking.bench_tiled_updates')
+parser.add_argument('-size', default=100, type=int, help='size (in cells) of the cubic model')
+parser.add_argument('-iterations', default=100, type=int, help='number of iterations to time')
+parser.add_argument('-nthreads', default=[1, 2, 4, 8], type=int, help='numbers of OpenMP threads to benchmark', nargs='+')
+parser.add_argument('-tile-planes', default=4, type=int, help='number of x planes of the grid in each tile')
+parser.add_argument('-tile-steps', default=4, type=int, help='number of iterations each tile is advanced by with temporal blocking')
+args = parser.parse_args()
+
+
+def model_cmds():
+    """Input commands for a cubic model of a dielectric half-space with a
+        Hertzian dipole source and PMLs.
+
+    Returns:
+        cmds (list): Input commands.
+    """
+
+    dl = 0.001
+    extent = args.size * dl
+    cmds = ['#domain: {0:g} {0:g} {0:g}'.format(extent),
+            '#dx_dy_dz: {0:g} {0:g} {0:g}'.format(dl),
+            '#time_window: {:d}'.format(args.iterations),
+            '#messages: n',
+            '#material: 6 0.01 1 0 half_space',
+            '#box: 0 0 0 {0:g} {0:g} {1:g} half_space'.format(extent, extent / 2),
+            '#waveform: ricker 1 10e9 my_ricker',
+            '#hertzian_dipole: z {0:g} {0:g} {1:g} my_ricker'.format(extent / 2, 0.7 * extent),
+            '#rx: {0:g} {0:g} {1:g}'.format(0.6 * extent, 0.7 * extent)]
+
+    return cmds
+
+
+solvers = [('Current updates', solve_cpu, 0, 1),
+           ('Compiled loop', solve_cpu_compiled, 0, 1),
+           ('Tiled', solve_cpu_compiled, args.tile_planes, 1),
+           ('Tiled, temporal blocking', solve_cpu_compiled, args.tile_planes, args.tile_steps)]
+
+G = FDTDGrid()
+G.hostinfo = get_host_info()
+G.tqdmdisable = True
+build_model(process_model_cmds(model_cmds(), G), G)
+G.pmlfused = True
+ncells = (G.nx + 1) * (G.ny + 1) * (G.nz + 1)
+print('Model {} x {} x {} cells, {} iterations, tiles of {} x planes, temporal blocking of {} iterations:'.format(G.nx, G.ny, G.nz, G.iterations, args.tile_planes, args.tile_steps))
+for nthreads in args.nthreads:
+    G.nthreads = nthreads
+    print('  {} thread(s):'.format(nthreads))
+    results = []
+    for solver, func, tileplanes, tilesteps in solvers:
+        G.tileplanes = tileplanes
+        G.tilesteps = tilesteps
+        G.initialise_field_arrays()
+        for pml in G.pmls:
+            pml.initialise_field_arrays()
+        tsolve = func(1, 1, G)
+        results.append([rx.outputs[output].copy() for rx in G.rxs for output in sorted(rx.outputs)])
+        if solver == solvers[0][0]:
+            tref = tsolve
+        print('    {}: {:.1f} Mcells/s, speed-up {:.2f}'.format(solver, 1e-6 * ncells * G.iterations / tsolve, tref / tsolve))
+    identical = all(np.array_equal(a, b) for result in results for a, b in zip(result, results[0]))
+    print('    Receiver outputs identical: {}'.format(identical))
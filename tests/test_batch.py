@@ -0,0 +1,93 @@
+# Copyright (C) 2015-2018: The University of Edinburgh
+#                 Authors: Craig Warren and Antonis Giannopoulos
+#
+# This file is part of gprMax.
+#
+# gprMax is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gprMax is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gprMax.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import tempfile
+import unittest
+
+import h5py
+import numpy as np
+
+from gprMax.gprMax import api
+
+"""Tests running the traces of a B-scan with a fixed geometry in batches (-batch) against running them one after another (--geometry-fixed).
+
+    Usage:
+        cd gprMax
+        python -m unittest tests.test_batch
+"""
+
+# B-scan over a dispersive half-space, so that the temporary values of the
+# dispersive materials must be reset between traces
+model = """#title: B-scan over a dispersive half-space
+#domain: 0.06 0.04 0.04
+#dx_dy_dz: 0.002 0.002 0.002
+#time_window: 1e-9
+#pml_cells: 4
+#material: 3 0.01 1 0 half_space
+#add_dispersion_debye: 1 5 1e-10 half_space
+#box: 0 0 0 0.06 0.04 0.02 half_space
+#waveform: ricker 1 10e9 my_ricker
+#hertzian_dipole: z 0.016 0.02 0.026 my_ricker
+#rx: 0.022 0.02 0.026
+#src_steps: 0.006 0 0
+#rx_steps: 0.006 0 0
+"""
+
+
+class My_batch_test(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def run_traces(self, batch):
+        """Runs the traces of the B-scan.
+
+        Args:
+            batch (int): Largest number of traces in a batch, or None to run
+                    the traces one after another.
+
+        Returns:
+            (list): Receiver outputs of each trace.
+        """
+
+        inputfile = os.path.join(self.tmpdir.name, 'bscan.in')
+        with open(inputfile, 'w') as f:
+            f.write(model)
+        api(inputfile, n=3, geometry_fixed=True, batch=batch)
+        traces = []
+        for modelrun in range(1, 4):
+            with h5py.File(os.path.join(self.tmpdir.name, 'bscan{}.out'.format(modelrun)), 'r') as f:
+                traces.append({output: f['/rxs/rx1/' + output][:] for output in f['/rxs/rx1']})
+
+        return traces
+
+    def test_batch(self):
+        sequential = self.run_traces(None)
+        batched = self.run_traces(2)
+        for trace, (a, b) in enumerate(zip(sequential, batched)):
+            self.assertEqual(sorted(a), sorted(b))
+            for output in a:
+                self.assertTrue(np.any(a[output]), 'trace {} {} is zero'.format(trace + 1, output))
+                self.assertTrue(np.array_equal(a[output], b[output]), 'trace {} {} differs'.format(trace + 1, output))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+# Copyright (C) 2015-2018: The University of Edinburgh
+#                 Authors: Craig Warren and Antonis Giannopoulos
+#
+# This file is part of gprMax.
+#
+# gprMax is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gprMax is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gprMax.  If not, see <http://www.gnu.org/licenses/>.
+
+import glob
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from gprMax.fractals import FractalVolume
+from gprMax.grid import FDTDGrid
+
+"""Tests storing seeded fractal volumes in a cache directory (-fractal-cache) and reading them instead of generating them again.
+
+    Usage:
+        cd gprMax
+        python -m unittest tests.test_fractal_cache
+"""
+
+
+def generate_fractal_volume(seed, fractalcache=None):
+    """Generates the fractal volume of a fractal box.
+
+    Args:
+        seed (int): Seed for the random number generator.
+        fractalcache (str): Directory to cache fractal volumes in.
+
+    Returns:
+        (array): Fractal volume (binned).
+    """
+
+    G = FDTDGrid()
+    G.nthreads = 1
+    G.fractalcache = fractalcache
+    volume = FractalVolume(0, 16, 0, 12, 0, 10, 1.5)
+    volume.seed = seed
+    volume.nbins = 5
+    volume.generate_fractal_volume(G)
+
+    return volume.fractalvolume
+
+
+class My_fractal_cache_test(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.fractalcache = os.path.join(self.tmpdir.name, 'fractals')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_cache_hit(self):
+        fresh = generate_fractal_volume(42)
+
+        # The first model stores the fractal volume in the cache, which is
+        # created if it does not exist
+        stored = generate_fractal_volume(42, self.fractalcache)
+        self.assertEqual(len(glob.glob(os.path.join(self.fractalcache, 'fractal_*.npy'))), 1)
+        self.assertTrue(np.array_equal(stored, fresh))
+
+        # Later models read it without generating it again
+        with mock.patch('gprMax.fractals.generate_fractal', side_effect=AssertionError('fractal generated again')):
+            read = generate_fractal_volume(42, self.fractalcache)
+        self.assertEqual(read.dtype, fresh.dtype)
+        self.assertTrue(np.array_equal(read, fresh))
+
+    def test_cache_key(self):
+        # Fractal volumes with another seed are stored separately
+        generate_fractal_volume(42, self.fractalcache)
+        other = generate_fractal_volume(43, self.fractalcache)
+        self.assertEqual(len(glob.glob(os.path.join(self.fractalcache, 'fractal_*.npy'))), 2)
+        self.assertFalse(np.array_equal(other, generate_fractal_volume(42)))
+        self.assertTrue(np.array_equal(other, generate_fractal_volume(43)))
+
+
+if __name__ == '__main__':
+    unittest.main()
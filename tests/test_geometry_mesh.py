@@ -0,0 +1,190 @@
+# Copyright (C) 2015-2018: The University of Edinburgh
+#                 Authors: Craig Warren and Antonis Giannopoulos
+#
+# This file is part of gprMax.
+#
+# gprMax is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gprMax is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gprMax.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from gprMax.exceptions import CmdInputError
+from gprMax.geometry_mesh import read_mesh
+from gprMax.geometry_mesh import stl_dtype
+from gprMax.grid import FDTDGrid
+from gprMax.input_cmds_geometry import process_geometrycmds
+from gprMax.materials import Material
+
+"""Tests reading triangle meshes from STL and OBJ files and voxelising them (#geometry_mesh_read).
+
+    Usage:
+        cd gprMax
+        python -m unittest tests.test_geometry_mesh
+"""
+
+# Vertices of a tetrahedron, placed so that no cell centres lie on its faces
+tetrahedron_vertices = np.array([[0.031, 0.027, 0.023],
+                                 [0.171, 0.043, 0.029],
+                                 [0.052, 0.163, 0.037],
+                                 [0.067, 0.071, 0.177]])
+tetrahedron_faces = np.array([[0, 2, 1], [0, 1, 3], [1, 2, 3], [0, 3, 2]])
+
+# Vertices of a cube, placed so that the diagonals of its top and bottom faces
+# are above cell centres
+cube_vertices = np.array([[0.04, 0.04, 0.043], [0.14, 0.04, 0.043], [0.14, 0.14, 0.043], [0.04, 0.14, 0.043],
+                          [0.04, 0.04, 0.137], [0.14, 0.04, 0.137], [0.14, 0.14, 0.137], [0.04, 0.14, 0.137]])
+# Triangles are not oriented consistently, and the diagonals of the top and
+# bottom faces are in different directions
+cube_faces = np.array([[0, 1, 2], [0, 2, 3], [4, 5, 7], [5, 6, 7],
+                       [0, 1, 5], [0, 5, 4], [1, 2, 6], [1, 6, 5],
+                       [2, 3, 7], [2, 7, 6], [3, 0, 4], [3, 4, 7]])
+
+
+def write_stl(filename, triangles, binary=True):
+    """Writes the triangles of a mesh to a binary or ASCII STL file."""
+
+    if binary:
+        data = np.zeros(len(triangles), dtype=stl_dtype)
+        data['vertices'] = triangles
+        with open(filename, 'wb') as f:
+            f.write(b'solid binary'.ljust(80))
+            f.write(np.uint32(len(triangles)).tobytes())
+            data.tofile(f)
+    else:
+        with open(filename, 'w') as f:
+            f.write('solid ascii\n')
+            for triangle in triangles:
+                f.write('facet normal 0 0 0\nouter loop\n')
+                for vertex in triangle:
+                    f.write('vertex {!r} {!r} {!r}\n'.format(*vertex))
+                f.write('endloop\nendfacet\n')
+            f.write('endsolid ascii\n')
+
+
+def write_obj(filename, vertices, faces):
+    """Writes the vertices and faces of a mesh to a Wavefront OBJ file."""
+
+    with open(filename, 'w') as f:
+        for vertex in vertices:
+            f.write('v {!r} {!r} {!r}\n'.format(*vertex))
+        for face in faces:
+            f.write('f {} {} {}\n'.format(*(face + 1)))
+
+
+def build_mesh(cmd, *materials):
+    """Builds a #geometry_mesh_read command in a 20 x 20 x 20 cell model.
+
+    Args:
+        cmd (str): #geometry_mesh_read command.
+        materials (tuple): Tuples of the name, relative permeability and
+                magnetic loss of materials to create.
+
+    Returns:
+        G (class): Grid class instance.
+    """
+
+    G = FDTDGrid()
+    G.nx = G.ny = G.nz = 20
+    G.dx = G.dy = G.dz = 0.01
+    G.nthreads = 1
+    G.messages = False
+    G.materials.add_builtin_materials()
+    for ID, mr, sm in materials:
+        m = Material(len(G.materials), ID)
+        m.mr = mr
+        m.sm = sm
+        G.materials.append(m)
+    G.initialise_geometry_arrays()
+    process_geometrycmds([cmd], G)
+
+    return G
+
+
+class My_geometry_mesh_test(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def tetrahedron_inside(self):
+        """Cells with centres inside the tetrahedron."""
+
+        centres = (np.indices((20, 20, 20)).transpose(1, 2, 3, 0) + 0.5) * 0.01
+        inside = np.ones((20, 20, 20), dtype=bool)
+        for face in tetrahedron_faces:
+            opposite = tetrahedron_vertices[np.setdiff1d(np.arange(4), face)[0]]
+            a, b, c = tetrahedron_vertices[face]
+            normal = np.cross(b - a, c - a)
+            inside &= np.sign((centres - a) @ normal) == np.sign((opposite - a) @ normal)
+
+        return inside
+
+    def test_read_stl_obj(self):
+        triangles = tetrahedron_vertices[tetrahedron_faces]
+        filename = os.path.join(self.tmpdir.name, 'tetrahedron')
+        write_stl(filename + '_binary.stl', triangles)
+        write_stl(filename + '_ascii.stl', triangles, binary=False)
+        write_obj(filename + '.obj', tetrahedron_vertices, tetrahedron_faces)
+        self.assertTrue(np.allclose(read_mesh(filename + '_binary.stl'), triangles))
+        self.assertTrue(np.array_equal(read_mesh(filename + '_ascii.stl'), triangles))
+        self.assertTrue(np.array_equal(read_mesh(filename + '.obj'), triangles))
+
+    def test_tetrahedron(self):
+        filename = os.path.join(self.tmpdir.name, 'tetrahedron.obj')
+        write_obj(filename, tetrahedron_vertices, tetrahedron_faces)
+        G = build_mesh('#geometry_mesh_read: 0 0 0 1 {} stone'.format(filename), ('stone', 1, 0))
+        inside = self.tetrahedron_inside()
+        self.assertTrue(inside.any())
+        self.assertTrue(np.array_equal(G.solid == 2, inside))
+
+    def test_offset_scale(self):
+        filename = os.path.join(self.tmpdir.name, 'tetrahedron.obj')
+        write_obj(filename, (tetrahedron_vertices - 0.01) * 1000, tetrahedron_faces)
+        G = build_mesh('#geometry_mesh_read: 0.01 0.01 0.01 0.001 {} stone'.format(filename), ('stone', 1, 0))
+        self.assertTrue(np.array_equal(G.solid == 2, self.tetrahedron_inside()))
+
+    def test_shared_edges(self):
+        # Rays along columns of cells through the edges shared by the
+        # triangles of the top and bottom faces must cross each face once
+        filename = os.path.join(self.tmpdir.name, 'cube.stl')
+        write_stl(filename, cube_vertices[cube_faces])
+        G = build_mesh('#geometry_mesh_read: 0 0 0 1 {} stone'.format(filename), ('stone', 1, 0))
+        inside = np.zeros((20, 20, 20), dtype=bool)
+        inside[4:14, 4:14, 4:14] = True
+        self.assertTrue(np.array_equal(G.solid == 2, inside))
+
+    def test_anisotropic(self):
+        filename = os.path.join(self.tmpdir.name, 'cube.stl')
+        write_stl(filename, cube_vertices[cube_faces])
+        G = build_mesh('#geometry_mesh_read: 0 0 0 1 {} matX matY matZ'.format(filename), ('matX', 1, 0), ('matY', 2, 0.003), ('matZ', 3, 0.006))
+        averaged = G.materials.get_averaged(['matX', 'matY', 'matZ'])
+        self.assertEqual(averaged.mr, 2)
+        self.assertAlmostEqual(averaged.sm, 0.003)
+        self.assertTrue(np.all(G.solid[4:14, 4:14, 4:14] == averaged.numID))
+
+    def test_open_mesh(self):
+        filename = os.path.join(self.tmpdir.name, 'tetrahedron.stl')
+        write_stl(filename, tetrahedron_vertices[tetrahedron_faces[:3]])
+        with self.assertRaises(CmdInputError):
+            read_mesh(filename)
+        with self.assertRaises(CmdInputError):
+            build_mesh('#geometry_mesh_read: 0 0 0 1 {} stone'.format(filename), ('stone', 1, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,10 +1,14 @@
+import os
 import sys
+import tempfile
 import unittest
 
 # http://stackoverflow.com/a/17981937/1942837
 from contextlib import contextmanager
 from io import StringIO
 
+import numpy as np
+
 
 @contextmanager
 def captured_output():
@@ -18,7 +22,15 @@ def captured_output():
 
 # end stack copy
 
-from gprMax.input_cmd_funcs import *
+from gprMax.geometry_primitives import primitive_dtype
+from gprMax.geometry_primitives import read_primitives
+from gprMax.grid import FDTDGrid
+from gprMax.input_cmd_funcs import geometry_primitives
+from gprMax.input_cmd_funcs import rx
+from gprMax.input_cmd_funcs import rx_steps
+from gprMax.input_cmd_funcs import src_steps
+from gprMax.input_cmds_geometry import process_geometrycmds
+from gprMax.materials import Material
 
 
 class My_input_cmd_funcs_test(unittest.TestCase):
@@ -81,5 +93,38 @@ class My_input_cmd_funcs_test(unittest.TestCase):
             rx_steps(42, 43, 44.2)
         self.assert_output(out, '#rx_steps: 42 43 44.2')
 
+    def test_geometry_primitives(self):
+        primitives = np.zeros(3, dtype=primitive_dtype)
+        primitives[0] = ('box', 0.01, 0.02, 0.03, 0.15, 0.14, 0.13, 0, 'pec', '')
+        primitives[1] = ('cylinder', 0.05, 0.06, 0.02, 0.12, 0.11, 0.16, 0.03, 'stone', '')
+        primitives[2] = ('sphere', 0.08, 0.09, 0.1, 0, 0, 0, 0.045, 'free_space', 'n')
+        cmds = ['#box: 0.01 0.02 0.03 0.15 0.14 0.13 pec',
+                '#cylinder: 0.05 0.06 0.02 0.12 0.11 0.16 0.03 stone',
+                '#sphere: 0.08 0.09 0.1 0.045 free_space n']
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, 'primitives.h5')
+            with captured_output() as (out, err):
+                geometry_primitives(primitives, filename)
+            self.assert_output(out, '#geometry_primitives_read: ' + filename)
+            self.assertTrue(np.array_equal(read_primitives(filename), primitives))
+
+            # Building the primitives in one pass sets the same arrays as
+            # the equivalent commands
+            grids = []
+            for geometry in (['#geometry_primitives_read: ' + filename], cmds):
+                G = FDTDGrid()
+                G.nx = G.ny = G.nz = 20
+                G.dx = G.dy = G.dz = 0.01
+                G.nthreads = 1
+                G.messages = False
+                G.materials.add_builtin_materials()
+                G.materials.append(Material(len(G.materials), 'stone'))
+                G.initialise_geometry_arrays()
+                process_geometrycmds(geometry, G)
+                grids.append(G)
+        for array in ('solid', 'rigidE', 'rigidH', 'ID'):
+            self.assertTrue(np.array_equal(getattr(grids[0], array), getattr(grids[1], array)))
+        self.assertTrue(np.any(grids[0].solid == 2))
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,122 @@
+# Copyright (C) 2015-2018: The University of Edinburgh
+#                 Authors: Craig Warren and Antonis Giannopoulos
+#
+# This file is part of gprMax.
+#
+# gprMax is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gprMax is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gprMax.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+
+import h5py
+import numpy as np
+
+from gprMax.constants import floattype
+from gprMax.gprMax import api
+
+"""Tests the values of a snapshot series (#snapshot_series) against a snapshot (#snapshot) taken on the same iteration, and the XDMF file describing the series.
+
+    Usage:
+        cd gprMax
+        python -m unittest tests.test_snapshots
+"""
+
+# Snapshot volume has a different number of cells in each direction, so that
+# the order of the dimensions of the values can be checked
+model = """#title: Snapshots
+#domain: 0.050 0.040 0.030
+#dx_dy_dz: 0.001 0.001 0.001
+#time_window: 60
+#messages: n
+#pml_cells: 5
+#waveform: gaussiandot 1 10e9 myWave
+#hertzian_dipole: z 0.025 0.020 0.015 myWave
+#snapshot_series: 0.006 0.008 0.010 0.042 0.032 0.022 0.002 0.001 0.001 20 60 20 series
+#snapshot: 0.006 0.008 0.010 0.042 0.032 0.022 0.002 0.001 0.001 40 snapshot
+"""
+
+# Number of cells of the snapshots in the x, y and z directions
+shape = (18, 24, 12)
+
+
+def read_vti(filename):
+    """Reads the electric field, magnetic field and current values of a
+        snapshot from a VTK ImageData (.vti) file.
+
+    Args:
+        filename (str): Name of the file.
+
+    Returns:
+        (list): Values of each vector quantity indexed [k, j, i, component].
+    """
+
+    with open(filename, 'rb') as f:
+        data = f.read()
+    offset = data.index(b'<AppendedData encoding="raw">\n_') + len(b'<AppendedData encoding="raw">\n_')
+    values = []
+    for quantity in range(3):
+        size = int(np.frombuffer(data, dtype=np.uint32, count=1, offset=offset)[0])
+        offset += np.dtype(np.uint32).itemsize
+        values.append(np.frombuffer(data, dtype=floattype, count=size // np.dtype(floattype).itemsize, offset=offset).reshape(shape[::-1] + (3,)))
+        offset += size
+
+    return values
+
+
+class My_snapshots_test(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        inputfile = os.path.join(self.tmpdir.name, 'snapshots.in')
+        with open(inputfile, 'w') as f:
+            f.write(model)
+        api(inputfile)
+        self.snapshotdir = os.path.join(self.tmpdir.name, 'snapshots_snaps')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_snapshot_series_values(self):
+        with h5py.File(os.path.join(self.snapshotdir, 'series.h5'), 'r') as f:
+            self.assertEqual(list(f.attrs['Iterations']), [20, 40, 60])
+            self.assertEqual(f['snapshots'].shape, (3, 9) + shape[::-1])
+            series = f['snapshots'][list(f.attrs['Iterations']).index(40)]
+        snapshot = read_vti(os.path.join(self.snapshotdir, 'snapshot.vti'))
+        for c, component in enumerate(('Ex', 'Ey', 'Ez', 'Hx', 'Hy', 'Hz', 'Ix', 'Iy', 'Iz')):
+            values = snapshot[c // 3][..., c % 3]
+            self.assertTrue(np.any(values), '{} is zero'.format(component))
+            self.assertTrue(np.array_equal(series[c], values), '{} differs'.format(component))
+
+    def test_snapshot_series_xdmf(self):
+        # Dimensions, origin and spacing are given in z, y, x order
+        nx, ny, nz = shape
+        root = ET.parse(os.path.join(self.snapshotdir, 'series.xdmf')).getroot()
+        grids = root.findall('./Domain/Grid/Grid')
+        self.assertEqual([grid.get('Name') for grid in grids], ['20', '40', '60'])
+        for grid in grids:
+            self.assertEqual(grid.find('Topology').get('Dimensions').split(), [str(nz + 1), str(ny + 1), str(nx + 1)])
+            origin, spacing = grid.findall('./Geometry/DataItem')
+            np.testing.assert_allclose([float(x) for x in origin.text.split()], [0.010, 0.008, 0.006])
+            np.testing.assert_allclose([float(x) for x in spacing.text.split()], [0.001, 0.001, 0.002])
+            attributes = grid.findall('Attribute')
+            self.assertEqual(len(attributes), 9)
+            for attribute in attributes:
+                hyperslab = attribute.find('DataItem')
+                self.assertEqual(hyperslab.get('Dimensions').split(), [str(nz), str(ny), str(nx)])
+                self.assertEqual(hyperslab.findall('DataItem')[1].get('Dimensions').split(), ['3', '9', str(nz), str(ny), str(nx)])
+
+
+if __name__ == '__main__':
+    unittest.main()
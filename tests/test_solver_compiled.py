@@ -0,0 +1,146 @@
+# Copyright (C) 2015-2018: The University of Edinburgh
+#                 Authors: Craig Warren and Antonis Giannopoulos
+#
+# This file is part of gprMax.
+#
+# gprMax is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gprMax is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gprMax.  If not, see <http://www.gnu.org/licenses/>.
+
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+import h5py
+import numpy as np
+
+from gprMax.gprMax import api
+
+"""Tests running models with the time-stepping loop in compiled code (--solver-compiled) against the loop in Python, i.e. that the receiver (and transmission line) outputs are identical.
+
+    Usage:
+        cd gprMax
+        python -m unittest tests.test_solver_compiled
+"""
+
+# Number of iterations the models in tests/models_basic are run for (rather
+# than their time windows), which is enough for the fields to reach the receivers
+iterations = 150
+
+
+def model_cmds(name, iterations=iterations):
+    """Input commands of a model in tests/models_basic, without any geometry
+        views or snapshots, run for a number of iterations.
+
+    Args:
+        name (str): Name of model in tests/models_basic.
+        iterations (int): Number of iterations to run the model for.
+
+    Returns:
+        (str): Input commands.
+    """
+
+    with open(os.path.join(os.path.dirname(__file__), 'models_basic', name, name + '.in'), 'r') as f:
+        cmds = [line for line in f if not line.startswith(('#time_window:', '#geometry_view:', '#snapshot:'))]
+    cmds.append('#time_window: {:d}\n'.format(iterations))
+
+    return ''.join(cmds)
+
+
+# 2D models, 3D models with first-order (CFS) PMLs, a dispersive material, a
+# transmission line, and second-order PMLs (pmls model)
+models = {name: model_cmds(name) for name in ('2D_ExHyHz', '2D_EyHxHz', '2D_EzHxHy', 'cylinder_Ascan_2D', 'hertzian_dipole_fs', 'hertzian_dipole_dispersive', 'pmls')}
+models['transmission_line_fs'] = model_cmds('hertzian_dipole_fs').replace('#hertzian_dipole: z 0.050 0.050 0.050 myWave', '#transmission_line: z 0.050 0.050 0.050 50 myWave')
+
+
+class My_solver_compiled_test(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Outputs of the models with the loop in Python
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        cls.reference = {name: cls.run_model(name)[0] for name in models}
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmpdir.cleanup()
+
+    @classmethod
+    def run_model(cls, name, **kwargs):
+        """Runs a model.
+
+        Args:
+            name (str): Name of model in models.
+            kwargs (dict): Command line arguments for the model.
+
+        Returns:
+            outputs (dict): Receiver and transmission line outputs.
+            stdout (str): Messages printed while running the model.
+        """
+
+        inputfile = os.path.join(cls.tmpdir.name, name + '.in')
+        with open(inputfile, 'w') as f:
+            f.write(models[name])
+        stdout = io.StringIO()
+        with redirect_stdout(stdout):
+            api(inputfile, **kwargs)
+        outputs = {}
+        with h5py.File(os.path.join(cls.tmpdir.name, name + '.out'), 'r') as f:
+            f.visititems(lambda path, item: outputs.update({path: item[:]}) if isinstance(item, h5py.Dataset) else None)
+
+        return outputs, stdout.getvalue()
+
+    def assert_identical(self, **kwargs):
+        """Asserts the outputs of every model are identical when run with the
+            given command line arguments and with the loop in Python.
+
+        Returns:
+            stdouts (dict): Messages printed while running each model.
+        """
+
+        stdouts = {}
+        for name in models:
+            with self.subTest(model=name, **kwargs):
+                a = self.reference[name]
+                b, stdouts[name] = self.run_model(name, **kwargs)
+                self.assertEqual(sorted(a), sorted(b))
+                # Some field components are zero in 2D models, but every
+                # receiver or transmission line should have an output
+                for group in set(os.path.dirname(path) for path in a):
+                    self.assertTrue(any(np.any(a[path]) for path in a if path.startswith(group + '/')), '{} {} is zero'.format(name, group))
+                for path in a:
+                    self.assertTrue(np.array_equal(a[path], b[path]), '{} {} differs'.format(name, path))
+
+        return stdouts
+
+    def test_solver_compiled(self):
+        self.assert_identical(solver_compiled=True)
+
+    def test_solver_compiled_tiled(self):
+        # Only 3D models of non-dispersive materials without transmission
+        # lines are tiled, the rest fall back to untiled updates with a warning
+        tiled = ('hertzian_dipole_fs', 'pmls')
+        for tile_steps in (1, 3):
+            stdouts = self.assert_identical(solver_compiled=True, tile_planes=8, tile_steps=tile_steps)
+            for name, stdout in stdouts.items():
+                with self.subTest(model=name, tile_steps=tile_steps):
+                    self.assertEqual('updates will not be tiled' not in stdout, name in tiled)
+
+    def test_solver_compiled_light_cone(self):
+        # The light cones of the sources reach the PMLs (and the dispersive
+        # material of hertzian_dipole_dispersive) part way through the models
+        self.assert_identical(light_cone=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+# Copyright (C) 2015-2018: The University of Edinburgh
+#                 Authors: Craig Warren and Antonis Giannopoulos
+#
+# This file is part of gprMax.
+#
+# gprMax is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gprMax is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gprMax.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import tempfile
+import unittest
+
+import h5py
+import numpy as np
+
+from gprMax.gprMax import api
+from tools.outputfiles_merge import merge_files
+
+"""Tests stopping a model early once the fields have decayed (#time_window_decay).
+
+    Usage:
+        cd gprMax
+        python -m unittest tests.test_time_window_decay
+"""
+
+model = """#title: Hertzian dipole in a small free space model
+#domain: 0.04 0.04 0.04
+#dx_dy_dz: 0.002 0.002 0.002
+#time_window: 5e-9
+#pml_cells: 4
+#waveform: gaussiandot 1 10e9 my_pulse
+#hertzian_dipole: z 0.02 0.02 0.02 my_pulse
+#rx: 0.026 0.02 0.02
+"""
+
+
+class My_time_window_decay_test(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def run_model(self, name, cmds):
+        """Runs a model and renames its output file.
+
+        Args:
+            name (str): Name of the output file.
+            cmds (str): Input commands.
+
+        Returns:
+            (str): Name of the output file.
+        """
+
+        inputfile = os.path.join(self.tmpdir.name, 'model.in')
+        with open(inputfile, 'w') as f:
+            f.write(cmds)
+        api(inputfile)
+        outputfile = os.path.join(self.tmpdir.name, name)
+        os.replace(os.path.join(self.tmpdir.name, 'model.out'), outputfile)
+
+        return outputfile
+
+    def test_decay(self):
+        full = self.run_model('trace2.out', model)
+        decayed = self.run_model('trace1.out', model + '#time_window_decay: 30 20\n')
+
+        with h5py.File(full, 'r') as f:
+            iterations = f.attrs['Iterations']
+            fullEz = f['/rxs/rx1/Ez'][:]
+        with h5py.File(decayed, 'r') as f:
+            iterationsrun = f.attrs['Iterations']
+            decayedEz = f['/rxs/rx1/Ez'][:]
+
+        # The model stops before the end of its time window, and outputs are
+        # only stored for the iterations that were run, which are identical
+        # to those of the full model
+        self.assertEqual(len(fullEz), iterations)
+        self.assertLess(iterationsrun, iterations)
+        self.assertEqual(len(decayedEz), iterationsrun)
+        self.assertTrue(np.array_equal(decayedEz, fullEz[:iterationsrun]))
+
+        # Merging pads the shorter trace with zeros
+        self.assertEqual(merge_files(os.path.join(self.tmpdir.name, 'trace')), 2)
+        with h5py.File(os.path.join(self.tmpdir.name, 'trace_merged.out'), 'r') as f:
+            self.assertEqual(f.attrs['Iterations'], iterations)
+            mergedEz = f['/rxs/rx1/Ez'][:]
+        self.assertEqual(mergedEz.shape, (iterations, 2))
+        self.assertTrue(np.array_equal(mergedEz[:iterationsrun, 0], decayedEz))
+        self.assertTrue(np.all(mergedEz[iterationsrun:, 0] == 0))
+        self.assertTrue(np.array_equal(mergedEz[:, 1], fullEz))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+# Copyright (C) 2015-2018: The University of Edinburgh
+#                 Authors: Craig Warren and Antonis Giannopoulos
+#
+# This file is part of gprMax.
+#
+# gprMax is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gprMax is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gprMax.  If not, see <http://www.gnu.org/licenses/>.
+
+import unittest
+
+from gprMax.grid import FDTDGrid
+from gprMax.model_build_run import build_model
+from gprMax.model_build_run import process_model_cmds
+from gprMax.utilities import get_host_info
+
+"""Tests building the main grid, i.e. setting the material of every edge of every Yee cell, and the materials averaged from other materials.
+
+    Usage:
+        cd gprMax
+        python -m unittest tests.test_yee_cell_build
+"""
+
+
+def build_grid(cmds):
+    """Builds a model from its input commands."""
+
+    G = FDTDGrid()
+    G.hostinfo = get_host_info()
+    G.tqdmdisable = True
+    build_model(process_model_cmds(cmds, G), G)
+
+    return G
+
+
+class TestYeeCellBuild(unittest.TestCase):
+
+    def test_magnetic_averaging(self):
+        # A box of a magnetic material in free space, with dielectric smoothing
+        G = build_grid(['#domain: 0.02 0.02 0.02',
+                        '#dx_dy_dz: 0.001 0.001 0.001',
+                        '#time_window: 1',
+                        '#messages: n',
+                        '#pml_cells: 0',
+                        '#waveform: gaussian 1 1e9 my_pulse',
+                        '#material: 3 0.01 2 0.001 magnetic',
+                        '#box: 0.005 0.005 0.005 0.015 0.015 0.015 magnetic'])
+        magnetic = G.materials.get('magnetic')
+        freespace = G.materials.get('free_space')
+
+        # Edges of magnetic components inside the box, and on its x, y and z
+        # faces, i.e. between the box and free space
+        i = j = k = 10
+        for componentID, face in ((G.IDlookup['Hx'], (5, j, k)), (G.IDlookup['Hy'], (i, 5, k)), (G.IDlookup['Hz'], (i, j, 5))):
+            self.assertEqual(G.ID[componentID, i, j, k], magnetic.numID)
+            averaged = G.materials[int(G.ID[(componentID,) + face])]
+            self.assertEqual(averaged.type, 'dielectric-smoothed')
+            self.assertEqual(sorted(averaged.ID.split('+')), ['free_space', 'magnetic'])
+            self.assertAlmostEqual(averaged.mr, (magnetic.mr + freespace.mr) / 2)
+            self.assertAlmostEqual(averaged.sm, (magnetic.sm + freespace.sm) / 2)
+
+    def test_anisotropic_averaged_material(self):
+        # An anisotropic box, i.e. with a material for each direction, whose
+        # cells (solid array) are of a material averaged from all three
+        G = build_grid(['#domain: 0.02 0.02 0.02',
+                        '#dx_dy_dz: 0.001 0.001 0.001',
+                        '#time_window: 1',
+                        '#messages: n',
+                        '#pml_cells: 0',
+                        '#waveform: gaussian 1 1e9 my_pulse',
+                        '#material: 3 0.01 2 0.001 magnetic',
+                        '#material: 4 0.001 3 0.002 diel',
+                        '#box: 0.005 0.005 0.005 0.015 0.015 0.015 diel magnetic free_space'])
+        materials = [G.materials.get(ID) for ID in ('diel', 'magnetic', 'free_space')]
+        averaged = G.materials.get_averaged([x.ID for x in materials])
+        self.assertEqual(averaged.type, 'dielectric-smoothed')
+        for parameter in ('er', 'se', 'mr', 'sm'):
+            self.assertAlmostEqual(getattr(averaged, parameter), sum(getattr(x, parameter) for x in materials) / 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -25,56 +25,78 @@ import numpy as np
 
 from gprMax._version import __version__
 
-"""Merges traces (A-scans) from multiple output files into one new file, then removes the series of output files."""
-
-# Parse command line arguments
-parser = argparse.ArgumentParser(description='Merges traces (A-scans) from multiple output files into one new file, then removes the series of output files.', usage='cd gprMax; python -m tools.outputfiles_merge basefilename')
-parser.add_argument('basefilename', help='base name of output file series including path')
-args = parser.parse_args()
-
-basefilename = args.basefilename
-outputfile = basefilename + '_merged.out'
-files = glob.glob(basefilename + '*.out')
-outputfiles = [filename for filename in files if '_merged' not in filename]
-modelruns = len(outputfiles)
-print('Found {} files to merge'.format(modelruns))
-
-# Combined output file
-fout = h5py.File(outputfile, 'w')
-
-# Add positional data for rxs
-for model in range(modelruns):
-    fin = h5py.File(basefilename + str(model + 1) + '.out', 'r')
-    nrx = fin.attrs['nrx']
-
-    # Write properties for merged file on first iteration
-    if model == 0:
-        fout.attrs['Title'] = fin.attrs['Title']
-        fout.attrs['gprMax'] = __version__
-        fout.attrs['Iterations'] = fin.attrs['Iterations']
-        fout.attrs['dt'] = fin.attrs['dt']
-        fout.attrs['nrx'] = fin.attrs['nrx']
+
+def merge_files(basefilename):
+    """Merges traces (A-scans) from multiple output files into one new file.
+
+    Args:
+        basefilename (string): Base name of output file series including path.
+
+    Returns:
+        modelruns (int): Number of output files merged.
+    """
+
+    outputfile = basefilename + '_merged.out'
+    files = glob.glob(basefilename + '*.out')
+    outputfiles = [filename for filename in files if '_merged' not in filename]
+    modelruns = len(outputfiles)
+    print('Found {} files to merge'.format(modelruns))
+
+    # Models may have been stopped early once the fields decayed (#time_window_decay),
+    # so traces are padded with zeros to the largest number of iterations
+    iterations = 0
+    for model in range(modelruns):
+        with h5py.File(basefilename + str(model + 1) + '.out', 'r') as fin:
+            iterations = max(iterations, fin.attrs['Iterations'])
+
+    # Combined output file
+    fout = h5py.File(outputfile, 'w')
+
+    # Add positional data for rxs
+    for model in range(modelruns):
+        fin = h5py.File(basefilename + str(model + 1) + '.out', 'r')
+        nrx = fin.attrs['nrx']
+
+        # Write properties for merged file on first iteration
+        if model == 0:
+            fout.attrs['Title'] = fin.attrs['Title']
+            fout.attrs['gprMax'] = __version__
+            fout.attrs['Iterations'] = iterations
+            fout.attrs['dt'] = fin.attrs['dt']
+            fout.attrs['nrx'] = fin.attrs['nrx']
+            for rx in range(1, nrx + 1):
+                path = '/rxs/rx' + str(rx)
+                grp = fout.create_group(path)
+                availableoutputs = list(fin[path].keys())
+                for output in availableoutputs:
+                    grp.create_dataset(output, (fout.attrs['Iterations'], modelruns), dtype=fin[path + '/' + output].dtype)
+
+        # For all receivers
         for rx in range(1, nrx + 1):
-            path = '/rxs/rx' + str(rx)
-            grp = fout.create_group(path)
+            path = '/rxs/rx' + str(rx) + '/'
             availableoutputs = list(fin[path].keys())
+            # For all receiver outputs
             for output in availableoutputs:
-                grp.create_dataset(output, (fout.attrs['Iterations'], modelruns), dtype=fin[path + '/' + output].dtype)
+                fout[path + '/' + output][:fin.attrs['Iterations'], model] = fin[path + '/' + output][:]
 
-    # For all receivers
-    for rx in range(1, nrx + 1):
-        path = '/rxs/rx' + str(rx) + '/'
-        availableoutputs = list(fin[path].keys())
-        # For all receiver outputs
-        for output in availableoutputs:
-            fout[path + '/' + output][:, model] = fin[path + '/' + output][:]
+        fin.close()
 
-    fin.close()
+    fout.close()
 
-fout.close()
+    return modelruns
 
-check = input('Do you want to remove the multiple individual output files? [y] or n:')
-if not check or check == 'y':
-    for model in range(modelruns):
-        file = basefilename + str(model + 1) + '.out'
-        os.remove(file)
+
+if __name__ == "__main__":
+
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(description='Merges traces (A-scans) from multiple output files into one new file, then removes the series of output files.', usage='cd gprMax; python -m tools.outputfiles_merge basefilename')
+    parser.add_argument('basefilename', help='base name of output file series including path')
+    args = parser.parse_args()
+
+    modelruns = merge_files(args.basefilename)
+
+    check = input('Do you want to remove the multiple individual output files? [y] or n:')
+    if not check or check == 'y':
+        for model in range(modelruns):
+            file = args.basefilename + str(model + 1) + '.out'
+            os.remove(file)
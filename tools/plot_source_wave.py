@@ -75,12 +75,7 @@ def mpl_plot(w, timewindow, dt, iterations, fft=False):
 
     time = np.linspace(0, 1, iterations)
     time *= (iterations * dt)
-    waveform = np.zeros(len(time))
-    timeiter = np.nditer(time, flags=['c_index'])
-
-    while not timeiter.finished:
-        waveform[timeiter.index] = w.calculate_value(timeiter[0], dt)
-        timeiter.iternext()
+    waveform = w.calculate_values(time, dt)
 
     print('Waveform characteristics...')
     print('Type: {}'.format(w.type))